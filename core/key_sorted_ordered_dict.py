@@ -42,10 +42,13 @@ class KeySortedOrderedDict(hobject.PrintableMixin):
         return self._odict[key]
 
     def __setitem__(self, key: Any, value: Any) -> None:
-        hdbg.dassert_isinstance(key, self._key_type)
-        if self._odict:
-            last_key = next(reversed(self._odict))
-            hdbg.dassert_lt(last_key, key)
+        # This is called on every bar, so the checks are skipped when the
+        # cheap assertions are disabled.
+        if hdbg.is_check_enabled("cheap"):
+            hdbg.dassert_isinstance(key, self._key_type)
+            if self._odict:
+                last_key = next(reversed(self._odict))
+                hdbg.dassert_lt(last_key, key)
         self._odict[key] = value
         if self._max_keys is not None and len(self._odict) > self._max_keys:
             self._odict.popitem(last=False)
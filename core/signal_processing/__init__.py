@@ -18,6 +18,7 @@ from core.signal_processing.fir_utils import *  # pylint: disable=unused-import
 from core.signal_processing.incremental_pca import *  # pylint: disable=unused-import # NOQA
 from core.signal_processing.misc_transformations import *  # pylint: disable=unused-import # NOQA
 from core.signal_processing.outliers import *  # pylint: disable=unused-import # NOQA
+from core.signal_processing.rolling_moments import *  # pylint: disable=unused-import # NOQA
 from core.signal_processing.special_functions import *  # pylint: disable=unused-import # NOQA
 from core.signal_processing.summation import *  # pylint: disable=unused-import # NOQA
 from core.signal_processing.swt import *  # pylint: disable=unused-import # NOQA
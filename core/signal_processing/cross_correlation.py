@@ -247,12 +247,60 @@ def compute_cross_correlation(
     # Drop rows with no y value.
     _LOG.debug("y_col=`%s` count=%i", y_col, df[y_col].count())
     df = df.dropna(subset=[y_col])
-    x_vars = df[x_cols]
-    y_var = df[y_col]
-    correlations = []
-    for lag in lags:
-        corr = x_vars.shift(lag).apply(lambda x: x.corr(y_var))
-        corr.name = lag
-        correlations.append(corr)
-    corr_df = pd.concat(correlations, axis=1)
-    return corr_df.transpose()
+    x_vals = df[x_cols].values.astype(float)
+    y_vals = df[y_col].values.astype(float).reshape(-1, 1)
+    # Stack the lagged x variables as columns to correlate them with y at once.
+    lagged_x_vals = np.hstack([_shift_rows(x_vals, lag) for lag in lags])
+    corrs = compute_columnwise_correlation(lagged_x_vals, y_vals)
+    corr_df = pd.DataFrame(corrs.reshape(len(lags), len(x_cols)), lags, x_cols)
+    return corr_df
+
+
+def compute_columnwise_correlation(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    """
+    Compute the Pearson correlation of each column of `x` with the
+    corresponding column of `y`.
+
+    Like in `pd.Series.corr()`, only the rows where both values are not NaN
+    are used for each pair of columns.
+
+    :param x: array of shape `(num_rows, num_cols)`
+    :param y: array of shape `(num_rows, num_cols)` or `(num_rows, 1)` to
+        correlate all the columns of `x` with the same column
+    :return: array of shape `(num_cols,)` with NaN for the columns with less
+        than 2 valid rows or a constant value
+    """
+    hdbg.dassert_eq(x.ndim, 2)
+    hdbg.dassert_eq(y.ndim, 2)
+    y = np.broadcast_to(y, x.shape)
+    mask = ~(np.isnan(x) | np.isnan(y))
+    count = mask.sum(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # Demean before multiplying, like `np.corrcoef()`.
+        x_mean = np.where(mask, x, 0.0).sum(axis=0) / count
+        y_mean = np.where(mask, y, 0.0).sum(axis=0) / count
+        x_demeaned = np.where(mask, x - x_mean, 0.0)
+        y_demeaned = np.where(mask, y - y_mean, 0.0)
+        covar = np.einsum("ij,ij->j", x_demeaned, y_demeaned)
+        x_var = np.einsum("ij,ij->j", x_demeaned, x_demeaned)
+        y_var = np.einsum("ij,ij->j", y_demeaned, y_demeaned)
+        corr = covar / np.sqrt(x_var * y_var)
+    corr[count < 2] = np.nan
+    # Remove the rounding errors like `np.corrcoef()`.
+    corr = np.clip(corr, -1, 1)
+    return corr
+
+
+def _shift_rows(values: np.ndarray, lag: int) -> np.ndarray:
+    """
+    Shift the rows of `values` like `pd.DataFrame.shift()`.
+    """
+    shifted = np.full(values.shape, np.nan)
+    num_rows = values.shape[0]
+    if abs(lag) >= num_rows:
+        return shifted
+    if lag >= 0:
+        shifted[lag:] = values[: num_rows - lag]
+    else:
+        shifted[:lag] = values[-lag:]
+    return shifted
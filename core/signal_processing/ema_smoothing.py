@@ -4,7 +4,6 @@ Import as:
 import core.signal_processing.ema_smoothing as cspremsm
 """
 
-import functools
 import logging
 from typing import Any, Optional, Union
 
@@ -146,11 +145,18 @@ def compute_smooth_moving_average(
     hdbg.dassert_lte(min_depth, max_depth)
     range_ = tau * (min_depth + max_depth) / 2.0
     _LOG.debug("Range = %0.2f", range_)
-    ema_eval = functools.partial(compute_ema, signal, tau, min_periods)
     denom = float(max_depth - min_depth + 1)
-    # Not the most efficient implementation, but follows 3.56 of Dacorogna
-    # directly.
-    return sum(map(ema_eval, range(min_depth, max_depth + 1))) / denom
+    # Follow 3.56 of Dacorogna, reusing the iterated EMA of depth `n - 1` to
+    # compute the one of depth `n` instead of recomputing each depth from
+    # scratch. This gives the same result as summing
+    # `compute_ema(signal, tau, min_periods, depth)` over the depths.
+    signal_hat = signal
+    smooth = 0
+    for depth in range(1, max_depth + 1):
+        signal_hat = compute_ema(signal_hat, tau, min_periods, 1)
+        if depth >= min_depth:
+            smooth = smooth + signal_hat
+    return smooth / denom
 
 
 def extract_smooth_moving_average_weights(
@@ -7,9 +7,11 @@ import core.signal_processing.ema_sweep as csprema
 import logging
 from typing import List
 
+import numpy as np
 import pandas as pd
 from tqdm.autonotebook import tqdm
 
+import core.signal_processing.cross_correlation as csprcrco
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 
@@ -63,35 +65,36 @@ def sweep_horizon_and_com(
     # TODO(Paul): Add a check on `delay`, but not a hard inequality (we want
     #   to warn on future peeking but allow it in exploratory research as a
     #   check).
-    # Perform outer sweep over time horizons.
-    corrs = []
     item_ids = signal_df.columns.to_list()
+    # Smooth all the items with all the centers of mass, i.e., the columns are
+    # `(com, item_id)`. The smoothing doesn't depend on the time horizon.
+    smoothed_signal_df = pd.concat(
+        [signal_df.ewm(com).mean() for com in coms], axis=1, keys=coms
+    )
+    # Perform the sweep over time horizons.
+    corrs = []
     for time_horizon in tqdm(time_horizons, desc="time_horizon"):
-        com_sweep = {}
-        # Perform inner sweep over centers of mass.
-        for com in tqdm(coms, desc="com"):
-            corr_vals = []
-            # Perform the sweep independently for each item.
-            for item_id in item_ids:
-                smoothed_signal = signal_df[item_id].ewm(com).mean()
-                # Resample smoothed signal to latest and shift by `delay`.
-                smoothed_signal = (
-                    smoothed_signal.resample(str(time_horizon) + horizon_unit)
-                    .last()
-                    .shift(delay)
-                )
-                # Resample target by averaging over time horizon.
-                target = (
-                    target_df[item_id]
-                    .resample(str(time_horizon) + horizon_unit)
-                    .mean()
-                )
-                corr = smoothed_signal.corr(target)
-                corr_vals.append(corr)
-            corr_vals = pd.Series(corr_vals)
-            # Approximate typical correlation across items by mean of correlations.
-            com_sweep[com] = corr_vals.mean()
-        com_sweep = pd.Series(com_sweep, name=time_horizon)
+        rule = str(time_horizon) + horizon_unit
+        # Resample smoothed signal to latest and shift by `delay`.
+        smoothed_signal = smoothed_signal_df.resample(rule).last().shift(delay)
+        # Resample target by averaging over time horizon.
+        target = target_df[item_ids].resample(rule).mean()
+        # Align like `pd.Series.corr()`.
+        smoothed_signal, target = smoothed_signal.align(
+            target, join="inner", axis=0
+        )
+        # Correlate all the items for all the centers of mass at once.
+        num_rows = smoothed_signal.shape[0]
+        target_vals = np.tile(target.values, (1, len(coms)))
+        corr_vals = csprcrco.compute_columnwise_correlation(
+            smoothed_signal.values.reshape(num_rows, -1).astype(float),
+            target_vals.reshape(num_rows, -1).astype(float),
+        )
+        corr_vals = pd.DataFrame(corr_vals.reshape(len(coms), len(item_ids)))
+        # Approximate typical correlation across items by mean of correlations.
+        com_sweep = pd.Series(
+            corr_vals.mean(axis=1).values, index=coms, name=time_horizon
+        )
         corrs.append(com_sweep)
     corrs = pd.concat(corrs, axis=1)
     return corrs
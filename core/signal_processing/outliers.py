@@ -5,7 +5,7 @@ import core.signal_processing.outliers as csiprout
 """
 
 import logging
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -72,81 +72,29 @@ def process_outliers(
     :return: transformed series with the same number of elements as the input
         series. The operation is not in place.
     """
-    # Check parameters.
     hdbg.dassert_isinstance(srs, pd.Series)
-    hdbg.dassert_lte(0.0, lower_quantile)
-    if upper_quantile is None:
-        upper_quantile = 1.0 - lower_quantile
-    hdbg.dassert_lte(lower_quantile, upper_quantile)
-    hdbg.dassert_lte(upper_quantile, 1.0)
-    # Process default `min_periods` and `window` parameters.
-    if min_periods is None:
-        if window is None:
-            min_periods = 0
-        else:
-            min_periods = window
-    if window is None:
-        window = srs.shape[0]
-    if window < 30:
-        _LOG.warning("`window`=`%s` < `30`", window)
-    if min_periods > window:
-        _LOG.warning("`min_periods`=`%s` > `window`=`%s`", min_periods, window)
-    # Compute bounds.
-    l_bound = srs.rolling(window, min_periods=min_periods, center=False).quantile(
-        lower_quantile
-    )
-    u_bound = srs.rolling(window, min_periods=min_periods, center=False).quantile(
-        upper_quantile
-    )
-    _LOG.debug(
-        "Removing outliers in [%s, %s] with mode=%s",
-        lower_quantile,
-        upper_quantile,
-        mode,
-    )
-    # Compute stats.
     if info is not None:
         hdbg.dassert_isinstance(info, dict)
         # Dictionary should be empty.
         hdbg.dassert(not info)
-        info["series_name"] = srs.name
-        info["num_elems_before"] = len(srs)
-        info["num_nans_before"] = np.isnan(srs).sum()
-        info["num_infs_before"] = np.isinf(srs).sum()
-        info["quantiles"] = (lower_quantile, upper_quantile)
-        info["mode"] = mode
-    #
-    srs = srs.copy()
-    # Here we implement the functions instead of using library functions (e.g,
-    # `scipy.stats.mstats.winsorize`) since we want to compute some statistics
-    # that are not readily available from the library function.
-    l_mask = srs < l_bound
-    u_mask = u_bound < srs
-    if mode == "winsorize":
-        # Assign the outliers to the value of the bounds.
-        srs[l_mask] = l_bound[l_mask]
-        srs[u_mask] = u_bound[u_mask]
-    else:
-        mask = u_mask | l_mask
-        if mode == "set_to_nan":
-            srs[mask] = np.nan
-        elif mode == "set_to_zero":
-            srs[mask] = 0.0
-        else:
-            hdbg.dfatal("Invalid mode='%s'" % mode)
-    # Append more the stats.
+    # Process the series as a dataframe with a single column, so that the
+    # series and the dataframe versions can't diverge.
+    df = srs.to_frame()
+    col = df.columns[0]
+    df_info: Optional[Dict[Any, Any]] = None if info is None else {}
+    df = process_outlier_df(
+        df,
+        mode,
+        lower_quantile,
+        upper_quantile=upper_quantile,
+        window=window,
+        min_periods=min_periods,
+        info=df_info,
+    )
     if info is not None:
-        info["bounds"] = pd.DataFrame({"l_bound": l_bound, "u_bound": u_bound})
-        num_removed = l_mask.sum() + u_mask.sum()
-        info["num_elems_removed"] = num_removed
-        info["num_elems_after"] = (
-            info["num_elems_before"] - info["num_elems_removed"]
-        )
-        info["percentage_removed"] = (
-            100.0 * info["num_elems_removed"] / info["num_elems_before"]
-        )
-        info["num_nans_after"] = np.isnan(srs).sum()
-        info["num_infs_after"] = np.isinf(srs).sum()
+        info.update(df_info[col])
+        info["series_name"] = srs.name
+    srs = df[col].rename(srs.name)
     return srs
 
 
@@ -162,32 +110,64 @@ def process_outlier_df(
     """
     Extend `process_outliers` to dataframes.
 
-    TODO(*): Revisit this with a decorator approach:
-    https://github.com/.../.../issues/568
+    The bounds of all the columns are computed at once and the outliers are
+    processed without looping over the columns.
+
+    Params as in `process_outliers()`.
+
+    :param info: empty dict-like object that this function will populate with
+        the statistics of `process_outliers()` for each column
     """
+    hdbg.dassert_isinstance(df, pd.DataFrame)
+    hdbg.dassert_lte(0.0, lower_quantile)
+    if upper_quantile is None:
+        upper_quantile = 1.0 - lower_quantile
+    hdbg.dassert_lte(lower_quantile, upper_quantile)
+    hdbg.dassert_lte(upper_quantile, 1.0)
     if info is not None:
         hdbg.dassert_isinstance(info, dict)
         # Dictionary should be empty.
         hdbg.dassert(not info)
-    cols = {}
-    for col in df.columns:
-        if info is not None:
-            maybe_stats: Optional[Dict[str, Any]] = {}
-        else:
-            maybe_stats = None
-        srs = process_outliers(
-            df[col],
-            mode,
-            lower_quantile,
-            upper_quantile=upper_quantile,
-            window=window,
-            min_periods=min_periods,
-            info=maybe_stats,
-        )
-        cols[col] = srs
-        if info is not None:
-            info[col] = maybe_stats
-    ret = pd.DataFrame.from_dict(cols)
+    window, min_periods = _get_window_params(window, min_periods, df.shape[0])
+    # Compute bounds.
+    rolling = df.rolling(window, min_periods=min_periods, center=False)
+    l_bound = rolling.quantile(lower_quantile)
+    u_bound = rolling.quantile(upper_quantile)
+    _LOG.debug(
+        "Removing outliers in [%s, %s] with mode=%s",
+        lower_quantile,
+        upper_quantile,
+        mode,
+    )
+    ret, l_mask, u_mask = _apply_outlier_bounds(df, l_bound, u_bound, mode)
+    if info is not None:
+        # Compute the stats of all the columns at once.
+        num_nans_before = df.isna().sum()
+        num_infs_before = np.isinf(df).sum()
+        num_removed = l_mask.sum() + u_mask.sum()
+        num_nans_after = ret.isna().sum()
+        num_infs_after = np.isinf(ret).sum()
+        for col in df.columns:
+            stats: Dict[str, Any] = {}
+            stats["series_name"] = col
+            stats["num_elems_before"] = df.shape[0]
+            stats["num_nans_before"] = num_nans_before[col]
+            stats["num_infs_before"] = num_infs_before[col]
+            stats["quantiles"] = (lower_quantile, upper_quantile)
+            stats["mode"] = mode
+            stats["bounds"] = pd.DataFrame(
+                {"l_bound": l_bound[col], "u_bound": u_bound[col]}
+            )
+            stats["num_elems_removed"] = num_removed[col]
+            stats["num_elems_after"] = (
+                stats["num_elems_before"] - stats["num_elems_removed"]
+            )
+            stats["percentage_removed"] = (
+                100.0 * stats["num_elems_removed"] / stats["num_elems_before"]
+            )
+            stats["num_nans_after"] = num_nans_after[col]
+            stats["num_infs_after"] = num_infs_after[col]
+            info[col] = stats
     # Check that the columns are the same. We don't use dassert_eq because of
     # #665.
     hdbg.dassert(
@@ -199,6 +179,138 @@ def process_outlier_df(
     return ret
 
 
+class IncrementalOutlierProcessor:
+    """
+    Process the outliers of multiple signals one sample at a time.
+
+    The bounds are the quantiles of the last `window` samples, including the
+    current one, like in `process_outlier_df()` with a finite `window`, so
+    that a real-time node doesn't need to recompute the rolling quantiles over
+    the entire history at each bar.
+    """
+
+    def __init__(
+        self,
+        mode: str,
+        lower_quantile: float,
+        window: int,
+        num_cols: int,
+        *,
+        upper_quantile: Optional[float] = None,
+        min_periods: Optional[int] = None,
+    ) -> None:
+        """
+        Constructor.
+
+        Params as in `process_outliers()`.
+
+        :param num_cols: number of signals to process at the same time
+        """
+        hdbg.dassert_in(mode, ("winsorize", "set_to_nan", "set_to_zero"))
+        hdbg.dassert_lte(0.0, lower_quantile)
+        if upper_quantile is None:
+            upper_quantile = 1.0 - lower_quantile
+        hdbg.dassert_lte(lower_quantile, upper_quantile)
+        hdbg.dassert_lte(upper_quantile, 1.0)
+        hdbg.dassert_isinstance(window, int)
+        hdbg.dassert_lte(1, window)
+        hdbg.dassert_lte(1, num_cols)
+        self._mode = mode
+        self._quantiles = [lower_quantile, upper_quantile]
+        self._window, self._min_periods = _get_window_params(
+            window, min_periods, window
+        )
+        # Ring buffer with the last `window` samples.
+        self._buffer = np.full((window, num_cols), np.nan)
+        self._num_samples = 0
+
+    def update(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Process the next sample of the signals.
+
+        :param values: next sample of each signal, as an array of shape
+            `(num_cols,)`
+        :return: the processed sample and the bounds as an array of shape
+            `(2, num_cols)` with the lower and upper bound of each signal
+        """
+        values = np.asarray(values, dtype=float).reshape(-1)
+        hdbg.dassert_eq(values.size, self._buffer.shape[1])
+        # Like `pd.DataFrame.rolling()`, the infinite values are not used to
+        # compute the bounds.
+        self._buffer[self._num_samples % self._window] = np.where(
+            np.isfinite(values), values, np.nan
+        )
+        self._num_samples += 1
+        # Compute the bounds of the signals with enough samples, like
+        # `pd.DataFrame.rolling()`.
+        count = np.count_nonzero(~np.isnan(self._buffer), axis=0)
+        is_valid = count >= max(self._min_periods, 1)
+        bounds = np.full((2, values.size), np.nan)
+        if is_valid.any():
+            bounds[:, is_valid] = np.nanquantile(
+                self._buffer[:, is_valid], self._quantiles, axis=0
+            )
+        # Process the outliers.
+        l_mask = values < bounds[0]
+        u_mask = bounds[1] < values
+        values = values.copy()
+        if self._mode == "winsorize":
+            values[l_mask] = bounds[0][l_mask]
+            values[u_mask] = bounds[1][u_mask]
+        elif self._mode == "set_to_nan":
+            values[l_mask | u_mask] = np.nan
+        else:
+            values[l_mask | u_mask] = 0.0
+        return values, bounds
+
+
+def _get_window_params(
+    window: Optional[int], min_periods: Optional[int], num_rows: int
+) -> Tuple[int, int]:
+    """
+    Process default `min_periods` and `window` parameters.
+
+    See `process_outliers()` for the default behavior.
+    """
+    if min_periods is None:
+        if window is None:
+            min_periods = 0
+        else:
+            min_periods = window
+    if window is None:
+        window = num_rows
+    if window < 30:
+        _LOG.warning("`window`=`%s` < `30`", window)
+    if min_periods > window:
+        _LOG.warning("`min_periods`=`%s` > `window`=`%s`", min_periods, window)
+    return window, min_periods
+
+
+def _apply_outlier_bounds(
+    df: pd.DataFrame, l_bound: pd.DataFrame, u_bound: pd.DataFrame, mode: str
+) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Process the values outside of the bounds.
+
+    :return: the processed dataframe and the masks of the values below the
+        lower bound and above the upper bound
+    """
+    l_mask = df < l_bound
+    u_mask = u_bound < df
+    if mode == "winsorize":
+        # Assign the outliers to the value of the bounds.
+        df = df.mask(l_mask, l_bound).mask(u_mask, u_bound)
+    else:
+        mask = u_mask | l_mask
+        if mode == "set_to_nan":
+            df = df.mask(mask)
+        elif mode == "set_to_zero":
+            df = df.mask(mask, 0.0)
+        else:
+            hdbg.dfatal("Invalid mode='%s'" % mode)
+    return df, l_mask, u_mask
+
+
 def process_nonfinite(
     srs: pd.Series,
     remove_nan: bool = True,
@@ -0,0 +1,467 @@
+"""
+Fused and incremental computation of smooth moving moments.
+
+Import as:
+
+import core.signal_processing.rolling_moments as csprromo
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import core.signal_processing.special_functions as csprspfu
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# _SmoothMovingAverage
+# #############################################################################
+
+
+class _SmoothMovingAverage:
+    """
+    Stateful version of `compute_smooth_moving_average()` for many columns.
+
+    The iterated EMAs are computed with the same recursion used by pandas
+    `ewm(adjust=True, ignore_na=False).mean()`, so that the result of
+    processing data in batch or row by row is the same as the one of
+    `compute_smooth_moving_average()` on the entire data.
+    """
+
+    def __init__(
+        self, tau: float, min_periods: int, min_depth: int, max_depth: int
+    ) -> None:
+        hdbg.dassert_lt(0, tau)
+        hdbg.dassert_lte(1, min_depth)
+        hdbg.dassert_lte(min_depth, max_depth)
+        self._com = csprspfu.calculate_com_from_tau(tau)
+        # Same as in `pandas.ewm()`.
+        self._min_periods = max(min_periods, 1)
+        self._min_depth = min_depth
+        self._max_depth = max_depth
+        self._old_wt_factor = 1.0 - 1.0 / (1.0 + self._com)
+        # State for each depth, initialized at the first call.
+        self._weighted: Optional[List[np.ndarray]] = None
+        self._old_wt: Optional[List[np.ndarray]] = None
+        self._nobs: Optional[List[np.ndarray]] = None
+
+    def update(self, values: np.ndarray) -> np.ndarray:
+        """
+        Process new rows and return the smooth moving average for them.
+
+        :param values: 2D array with the new rows
+        :return: 2D array with the same shape as `values`
+        """
+        hdbg.dassert_eq(values.ndim, 2)
+        if self._weighted is None:
+            # Use the vectorized implementation from pandas when there is
+            # no state.
+            return self._update_from_scratch(values)
+        hdbg.dassert_eq(values.shape[1], self._weighted[0].shape[0])
+        smooth = np.zeros(values.shape)
+        signal_hat = values
+        for depth in range(self._max_depth):
+            signal_hat = self._update_ema(depth, signal_hat)
+            if depth + 1 >= self._min_depth:
+                smooth = smooth + signal_hat
+        return smooth / float(self._max_depth - self._min_depth + 1)
+
+    def _update_from_scratch(self, values: np.ndarray) -> np.ndarray:
+        self._weighted = []
+        self._old_wt = []
+        self._nobs = []
+        smooth = np.zeros(values.shape)
+        signal_hat = values
+        for depth in range(self._max_depth):
+            df = pd.DataFrame(signal_hat)
+            ewm_kwargs = {"com": self._com, "adjust": True, "ignore_na": False}
+            # The unmasked EMA is the state of the pandas recursion.
+            weighted = df.ewm(min_periods=0, **ewm_kwargs).mean().to_numpy()
+            is_observation = ~np.isnan(signal_hat)
+            if len(values) > 0:
+                self._weighted.append(weighted[-1].copy())
+                self._old_wt.append(
+                    self._get_old_wt(is_observation, ewm_kwargs)
+                )
+                self._nobs.append(is_observation.sum(axis=0))
+            else:
+                num_cols = values.shape[1]
+                self._weighted.append(np.full(num_cols, np.nan))
+                self._old_wt.append(np.ones(num_cols))
+                self._nobs.append(np.zeros(num_cols, dtype=int))
+            if self._min_periods > 1:
+                nobs = np.cumsum(is_observation, axis=0)
+                signal_hat = np.where(
+                    nobs >= self._min_periods, weighted, np.nan
+                )
+            else:
+                # The EMA is NaN only before the first observation.
+                signal_hat = weighted
+            if depth + 1 >= self._min_depth:
+                smooth = smooth + signal_hat
+        return smooth / float(self._max_depth - self._min_depth + 1)
+
+    @staticmethod
+    def _get_old_wt(
+        is_observation: np.ndarray, ewm_kwargs: Dict[str, Any]
+    ) -> np.ndarray:
+        """
+        Compute the weight of the past in the pandas recursion at the last row.
+
+        The weight is the EMA sum of the observations mask, and it depends
+        only on the mask, so it's computed once for each distinct mask (e.g.,
+        once for all the columns without NaNs).
+        """
+        # Find the distinct masks hashing the packed bits of each column.
+        packed = np.packbits(is_observation, axis=0)
+        mask_to_idx: Dict[bytes, int] = {}
+        inverse = np.empty(is_observation.shape[1], dtype=int)
+        for col_idx in range(is_observation.shape[1]):
+            key = packed[:, col_idx].tobytes()
+            inverse[col_idx] = mask_to_idx.setdefault(key, len(mask_to_idx))
+        unique_idxs = list(
+            {idx: col_idx for col_idx, idx in enumerate(inverse)}.values()
+        )
+        ones = np.where(is_observation[:, unique_idxs], 1.0, np.nan)
+        old_wt = pd.DataFrame(ones).ewm(**ewm_kwargs).sum().to_numpy()[-1]
+        # Before the first observation the weight is the initial one.
+        old_wt = np.nan_to_num(old_wt, nan=1.0)
+        return old_wt[inverse]
+
+    def _update_ema(self, depth: int, values: np.ndarray) -> np.ndarray:
+        """
+        Apply the recursion of `pandas.ewm().mean()` to each row of `values`.
+        """
+        weighted = self._weighted[depth]
+        old_wt = self._old_wt[depth]
+        nobs = self._nobs[depth]
+        out = np.empty(values.shape)
+        for i in range(values.shape[0]):
+            cur = values[i]
+            is_observation = ~np.isnan(cur)
+            nobs = nobs + is_observation
+            has_weighted = ~np.isnan(weighted)
+            # Decay the weight of the past.
+            old_wt = np.where(has_weighted, old_wt * self._old_wt_factor, old_wt)
+            # Update with the new observations, avoiding numerical errors on
+            # constant series like pandas does.
+            mask = has_weighted & is_observation
+            with np.errstate(invalid="ignore"):
+                new_weighted = (old_wt * weighted + cur) / (old_wt + 1.0)
+            weighted = np.where(
+                mask & (weighted != cur), new_weighted, weighted
+            )
+            old_wt = np.where(mask, old_wt + 1.0, old_wt)
+            # Start from the first observation.
+            weighted = np.where(~has_weighted & is_observation, cur, weighted)
+            out[i] = np.where(nobs >= self._min_periods, weighted, np.nan)
+        self._weighted[depth] = weighted
+        self._old_wt[depth] = old_wt
+        self._nobs[depth] = nobs
+        return out
+
+
+# #############################################################################
+# RollingMomentsEngine
+# #############################################################################
+
+
+_VALID_MOMENTS = [
+    "mean",
+    "demean",
+    "var",
+    "std",
+    "norm",
+    "zscore",
+    "skew",
+    "kurtosis",
+    "sharpe_ratio",
+    "cov",
+    "corr",
+]
+
+
+class RollingMomentsEngine:
+    """
+    Compute several smooth moving moments of the columns of a DataFrame.
+
+    The moments match the functions in `ema_smoothing.py` with the same
+    parameters:
+    - "mean": `compute_smooth_moving_average()`
+    - "demean": `compute_rolling_demean()`
+    - "var", "std": `compute_rolling_var()`, `compute_rolling_std()`
+    - "norm": `compute_rolling_norm()`
+    - "zscore": `compute_rolling_zscore()`
+    - "skew", "kurtosis": `compute_rolling_skew()`,
+      `compute_rolling_kurtosis()` with `tau_z=tau`, computed on the
+      "zscore" (i.e., using `demean`, `delay`, `atol` of the engine)
+    - "sharpe_ratio": `compute_rolling_sharpe_ratio()`
+    - "cov", "corr": `compute_rolling_cov()`, `compute_rolling_corr()` for
+      each pair of columns in `column_pairs`
+
+    Instead of chaining full-series calls for each moment and each column,
+    the inputs of the smooth moving averages are stacked and smoothed
+    together, and the intermediate results (e.g., the moving average used to
+    demean) are shared across moments.
+
+    The engine can be used:
+    - in batch mode with `compute()`, which resets the state
+    - in incremental mode with `update()`, which processes only the new rows
+      starting from the state left by the previous call, e.g., in a real-time
+      DAG node
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        moments: List[str],
+        *,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+        p_moment: float = 2,
+        demean: bool = True,
+        delay: int = 0,
+        atol: float = 0,
+        tau_s: Optional[float] = None,
+        column_pairs: Optional[List[Tuple[str, str]]] = None,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, min_periods, min_depth, max_depth, p_moment: as in
+            `compute_rolling_zscore()`
+        :param moments: moments to compute among `_VALID_MOMENTS`
+        :param demean, delay, atol: as in `compute_rolling_zscore()`, used for
+            "zscore", "skew", "kurtosis"; `demean` is also used for "cov" and
+            "corr"
+        :param tau_s: as in `compute_rolling_skew()`, `None` to use `tau`
+        :param column_pairs: pairs of columns to compute "cov" and "corr" for
+        """
+        hdbg.dassert_lt(0, len(moments))
+        hdbg.dassert_is_subset(moments, _VALID_MOMENTS)
+        hdbg.dassert_no_duplicates(moments)
+        hdbg.dassert_lte(0, delay)
+        hdbg.dassert_isinstance(delay, int)
+        self._moments = moments
+        self._tau = tau
+        self._tau_s = tau if tau_s is None else tau_s
+        self._min_periods = min_periods
+        self._min_depth = min_depth
+        self._max_depth = max_depth
+        self._p_moment = p_moment
+        self._demean = demean
+        self._delay = delay
+        self._atol = atol
+        if "cov" in moments or "corr" in moments:
+            hdbg.dassert_is_not(column_pairs, None)
+            hdbg.dassert_lt(0, len(column_pairs))
+        self._column_pairs = column_pairs or []
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Reset the state of the engine.
+        """
+        self._columns: Optional[pd.Index] = None
+        self._pair_idxs: List[Tuple[int, int]] = []
+        self._smas: Dict[str, _SmoothMovingAverage] = {}
+        # Last `delay` rows of the numerator shift and the denominator of the
+        # z-score, used to shift the values across calls.
+        self._zscore_history: Optional[Tuple[np.ndarray, np.ndarray]] = None
+
+    def compute(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Compute the moments on `df` from scratch.
+
+        :param df: data with one column per signal
+        :return: map from moment to a DataFrame with the same index as `df`
+            and the same columns (or one column per pair for "cov" and "corr")
+        """
+        self.reset()
+        return self.update(df)
+
+    def update(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Compute the moments for the new rows in `df`.
+
+        :param df: new rows of the data, with the same columns passed in the
+            previous calls
+        :return: same as `compute()` for the rows of `df`
+        """
+        hdbg.dassert_isinstance(df, pd.DataFrame)
+        if self._columns is None:
+            self._init_state(df.columns)
+        else:
+            hdbg.dassert_eq(df.columns.tolist(), self._columns.tolist())
+        values = df.to_numpy(dtype=float)
+        # Propagate NaNs and infs without warnings, like pandas does.
+        with np.errstate(divide="ignore", invalid="ignore"):
+            results = self._update(values)
+        dfs = {}
+        pair_columns = [f"{col1}.{col2}" for col1, col2 in self._column_pairs]
+        for moment in self._moments:
+            columns = pair_columns if moment in ("cov", "corr") else df.columns
+            dfs[moment] = pd.DataFrame(
+                results[moment], index=df.index, columns=columns
+            )
+        return dfs
+
+    def _init_state(self, columns: pd.Index) -> None:
+        self._columns = columns
+        for col1, col2 in self._column_pairs:
+            self._pair_idxs.append(
+                (columns.get_loc(col1), columns.get_loc(col2))
+            )
+        sma_kwargs = {
+            "min_periods": self._min_periods,
+            "min_depth": self._min_depth,
+            "max_depth": self._max_depth,
+        }
+        # Each stage smooths the inputs depending only on the previous stages.
+        for stage in ["signal", "centered", "zscore"]:
+            tau = self._tau_s if stage == "zscore" else self._tau
+            self._smas[stage] = _SmoothMovingAverage(tau, **sma_kwargs)
+        num_cols = len(columns)
+        self._zscore_history = (
+            np.full((self._delay, num_cols), np.nan),
+            np.full((self._delay, num_cols), np.nan),
+        )
+
+    def _needs(self, *moments: str) -> bool:
+        return any(moment in self._moments for moment in moments)
+
+    def _update(self, signal: np.ndarray) -> Dict[str, np.ndarray]:
+        p_moment = self._p_moment
+        needs_zscore = self._needs("zscore", "skew", "kurtosis")
+        needs_pairs = self._needs("cov", "corr")
+        # Stage 1: smooth the signal and its absolute powers.
+        # - the moving average is used to demean
+        needs_mean = (
+            self._needs("mean", "demean", "var", "std", "sharpe_ratio")
+            or (needs_zscore and self._demean)
+            or (needs_pairs and self._demean)
+        )
+        # - the non-centered norm
+        needs_norm = (
+            self._needs("norm", "sharpe_ratio")
+            or (needs_zscore and not self._demean)
+            or (self._needs("corr") and not self._demean)
+        )
+        stage1 = []
+        if needs_mean:
+            stage1.append(signal)
+        if needs_norm:
+            stage1.append(np.abs(signal) ** p_moment)
+        smoothed = self._smooth("signal", stage1)
+        signal_ma = smoothed.pop(0) if needs_mean else None
+        norm = smoothed.pop(0) ** (1.0 / p_moment) if needs_norm else None
+        # Stage 2: smooth the centered signal powers and products.
+        centered = signal - signal_ma if needs_mean else None
+        needs_std = self._needs("var", "std") or (
+            self._demean and (needs_zscore or self._needs("corr"))
+        )
+        stage2 = []
+        if needs_std:
+            stage2.append(np.abs(centered) ** p_moment)
+        if needs_pairs:
+            adj = centered if self._demean else signal
+            idxs1 = [idx1 for idx1, _ in self._pair_idxs]
+            idxs2 = [idx2 for _, idx2 in self._pair_idxs]
+            stage2.append(adj[:, idxs1] * adj[:, idxs2])
+        smoothed = self._smooth("centered", stage2)
+        var = smoothed.pop(0) if needs_std else None
+        std = var ** (1.0 / p_moment) if needs_std else None
+        cov = smoothed.pop(0) if needs_pairs else None
+        # Compute the z-score.
+        zscore = None
+        if needs_zscore:
+            if self._demean:
+                signal_ma_shift, denominator = self._shift_zscore_inputs(
+                    signal_ma, std
+                )
+                numerator = signal - signal_ma_shift
+            else:
+                _, denominator = self._shift_zscore_inputs(
+                    np.zeros(signal.shape), norm
+                )
+                numerator = signal
+            denominator = np.where(
+                np.abs(denominator) <= self._atol, np.nan, denominator
+            )
+            zscore = numerator / denominator
+        # Stage 3: smooth the z-score powers.
+        z_powers = {"skew": 3, "kurtosis": 4}
+        z_moments = [moment for moment in z_powers if self._needs(moment)]
+        smoothed = self._smooth(
+            "zscore", [zscore ** z_powers[moment] for moment in z_moments]
+        )
+        smoothed_zscore = dict(zip(z_moments, smoothed))
+        # Assemble the results.
+        results: Dict[str, np.ndarray] = {}
+        for moment in self._moments:
+            if moment == "mean":
+                results[moment] = signal_ma
+            elif moment == "demean":
+                results[moment] = centered
+            elif moment == "var":
+                results[moment] = var
+            elif moment == "std":
+                results[moment] = std
+            elif moment == "norm":
+                results[moment] = norm
+            elif moment == "zscore":
+                results[moment] = zscore
+            elif moment in ("skew", "kurtosis"):
+                results[moment] = smoothed_zscore[moment]
+            elif moment == "sharpe_ratio":
+                results[moment] = signal_ma / norm
+            elif moment == "cov":
+                results[moment] = cov
+            elif moment == "corr":
+                pair_std = std if self._demean else norm
+                idxs1 = [idx1 for idx1, _ in self._pair_idxs]
+                idxs2 = [idx2 for _, idx2 in self._pair_idxs]
+                results[moment] = cov / (
+                    pair_std[:, idxs1] * pair_std[:, idxs2]
+                )
+            else:
+                raise ValueError(f"Invalid moment='{moment}'")
+        return results
+
+    def _smooth(self, stage: str, inputs: List[np.ndarray]) -> List[np.ndarray]:
+        """
+        Smooth all the inputs of a stage together.
+
+        :return: smoothed inputs, in the same order as `inputs`
+        """
+        if not inputs:
+            return []
+        num_cols = [input_.shape[1] for input_ in inputs]
+        smoothed = self._smas[stage].update(np.hstack(inputs))
+        splits = np.cumsum(num_cols)[:-1]
+        return list(np.hsplit(smoothed, splits))
+
+    def _shift_zscore_inputs(
+        self, numerator_shift: np.ndarray, denominator: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Shift the inputs of the z-score by `delay` rows across calls.
+        """
+        if self._delay == 0:
+            return numerator_shift, denominator
+        shifted = []
+        history = []
+        for prev, curr in zip(
+            self._zscore_history, (numerator_shift, denominator)
+        ):
+            values = np.vstack([prev, curr])
+            shifted.append(values[: len(curr)])
+            history.append(values[len(curr) :])
+        self._zscore_history = (history[0], history[1])
+        return shifted[0], shifted[1]
@@ -72,24 +72,19 @@ def get_swt(
     if timing_mode is None:
         timing_mode = "knowledge_time"
     # _LOG.debug("timing_mode=`%s`", timing_mode)
-    if output_mode is None:
-        output_mode = "tuple"
-    # _LOG.debug("output_mode=`%s`", output_mode)
+    if timing_mode == "knowledge_time":
+        # The knowledge time transform is computed with a causal filter bank,
+        # which is equivalent to `pywt.swt` followed by the removal of the
+        # warm-up artifacts and the reindexing.
+        smooth_df, detail_df = _compute_causal_swt_dfs(sig, wavelet, depth)
+        return _format_swt_output(smooth_df, detail_df, depth, output_mode)
     smooth_df, detail_df = pad_compute_swt_and_trim(sig, wavelet, depth)
     levels = detail_df.shape[1]
     # Record wavelet width (required for removing warm-up artifacts).
     # width = len(pywt.Wavelet(wavelet).filter_bank[0])
     width = pywt.Wavelet(wavelet).dec_len
     # _LOG.debug("wavelet width=%s", width)
-    if timing_mode == "knowledge_time":
-        for j in range(1, levels + 1):
-            # Remove "warm-up" artifacts.
-            _set_warmup_region_to_nan(detail_df[j], width, j)
-            _set_warmup_region_to_nan(smooth_df[j], width, j)
-            # Index by knowledge time.
-            detail_df[j] = _reindex_by_knowledge_time(detail_df[j], width, j)
-            smooth_df[j] = _reindex_by_knowledge_time(smooth_df[j], width, j)
-    elif timing_mode == "zero_phase":
+    if timing_mode == "zero_phase":
         for j in range(1, levels + 1):
             # Delete "warm-up" artifacts.
             _set_warmup_region_to_nan(detail_df[j], width, j)
@@ -98,28 +93,7 @@ def get_swt(
         pass
     else:
         raise ValueError(f"Unsupported timing_mode `{timing_mode}`")
-    # Drop columns that are all-NaNs (e.g., artifacts of padding).
-    smooth_df.dropna(how="all", axis=1, inplace=True)
-    detail_df.dropna(how="all", axis=1, inplace=True)
-    if depth:
-        cols = set(range(1, depth + 1))
-        msg = "Insufficient data to generate transform up to requested depth."
-        if not cols.issubset(smooth_df.columns):
-            raise ValueError(msg)
-        if not cols.issubset(detail_df.columns):
-            raise ValueError(msg)
-    if output_mode == "tuple":
-        return smooth_df, detail_df
-    if output_mode == "smooth":
-        return smooth_df
-    if output_mode == "detail":
-        return detail_df
-    if output_mode == "detail_and_last_smooth":
-        effective_levels = smooth_df.columns.size
-        hdbg.dassert_in(effective_levels, smooth_df.columns)
-        detail_df[f"{effective_levels}_smooth"] = smooth_df[effective_levels]
-        return detail_df
-    raise ValueError(f"Unsupported output_mode `{output_mode}`")
+    return _format_swt_output(smooth_df, detail_df, depth, output_mode)
 
 
 def get_swt_level(
@@ -168,12 +142,30 @@ def apply_swt(
     timing_mode: Optional[str] = None,
     output_mode: Optional[str] = None,
 ) -> pd.DataFrame:
+    """
+    Apply `get_swt()` to each column of `sig`.
+
+    The output columns are named `{col}_{level}`, e.g., `close_1`.
+
+    Params as in `get_swt()`.
+    """
     hdbg.dassert_isinstance(sig, pd.DataFrame)
     if output_mode is None or output_mode == "tuple":
         raise AssertionError("Unsupported `output_mode`=%s" % str(output_mode))
+    if timing_mode is None or timing_mode == "knowledge_time":
+        # Filter all the columns at once.
+        wavelet = wavelet or "haar"
+        smooth, detail = _compute_causal_swt(
+            sig.values, wavelet, _get_swt_depth(sig.shape[0], depth)
+        )
     dfs = []
-    for col in sig.columns:
-        df = get_swt(sig[col], wavelet, depth, timing_mode, output_mode)
+    for idx, col in enumerate(sig.columns):
+        if timing_mode is None or timing_mode == "knowledge_time":
+            smooth_df = _to_swt_df(smooth[:, :, idx], sig.index)
+            detail_df = _to_swt_df(detail[:, :, idx], sig.index)
+            df = _format_swt_output(smooth_df, detail_df, depth, output_mode)
+        else:
+            df = get_swt(sig[col], wavelet, depth, timing_mode, output_mode)
         df = df.rename(columns=lambda x: str(col) + "_" + str(x))
         dfs.append(df)
     df = pd.concat(dfs, axis=1)
@@ -436,6 +428,44 @@ def pad_compute_swt_and_trim(
     return smooth_df, detail_df
 
 
+def _format_swt_output(
+    smooth_df: pd.DataFrame,
+    detail_df: pd.DataFrame,
+    depth: Optional[int],
+    output_mode: Optional[str],
+) -> Union[pd.DataFrame, Tuple[pd.DataFrame, pd.DataFrame]]:
+    """
+    Drop the levels without data and return the swt as per `output_mode`.
+
+    Params as in `get_swt()`.
+    """
+    if output_mode is None:
+        output_mode = "tuple"
+    # _LOG.debug("output_mode=`%s`", output_mode)
+    # Drop columns that are all-NaNs (e.g., artifacts of padding).
+    smooth_df.dropna(how="all", axis=1, inplace=True)
+    detail_df.dropna(how="all", axis=1, inplace=True)
+    if depth:
+        cols = set(range(1, depth + 1))
+        msg = "Insufficient data to generate transform up to requested depth."
+        if not cols.issubset(smooth_df.columns):
+            raise ValueError(msg)
+        if not cols.issubset(detail_df.columns):
+            raise ValueError(msg)
+    if output_mode == "tuple":
+        return smooth_df, detail_df
+    if output_mode == "smooth":
+        return smooth_df
+    if output_mode == "detail":
+        return detail_df
+    if output_mode == "detail_and_last_smooth":
+        effective_levels = smooth_df.columns.size
+        hdbg.dassert_in(effective_levels, smooth_df.columns)
+        detail_df[f"{effective_levels}_smooth"] = smooth_df[effective_levels]
+        return detail_df
+    raise ValueError(f"Unsupported output_mode `{output_mode}`")
+
+
 def _get_artifact_length(
     width: int,
     level: int,
@@ -493,6 +523,199 @@ def _reindex_by_knowledge_time(
     return srs.shift(warmup_region)
 
 
+# #############################################################################
+# Causal filter bank
+# #############################################################################
+
+
+# The knowledge time swt at level `j` is computed with the "à trous" filter
+# bank
+#   smooth_j[n] = sum_k lo[k] smooth_{j-1}[n - k 2^{j-1}]
+#   detail_j[n] = sum_k hi[k] smooth_{j-1}[n - k 2^{j-1}]
+# where `smooth_0` is the signal and `lo`, `hi` are the decomposition filters
+# of the wavelet normalized as in `pywt.swt(..., norm=True)`. Each output only
+# depends on past samples, and it is valid after the warm-up period of
+# `get_knowledge_time_warmup_lengths()`.
+
+
+def _get_causal_swt_filters(wavelet: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return the low-pass and high-pass filters of the causal filter bank.
+    """
+    wavelet_ = pywt.Wavelet(wavelet)
+    lo = np.array(wavelet_.dec_lo) / np.sqrt(2)
+    hi = np.array(wavelet_.dec_hi) / np.sqrt(2)
+    return lo, hi
+
+
+def _get_swt_depth(num_samples: int, depth: Optional[int]) -> int:
+    """
+    Return the number of levels computed by `pywt.swt` on the padded signal.
+    """
+    hdbg.dassert_lt(0, num_samples)
+    if depth:
+        return depth
+    pow2_ceil = int(2 ** np.ceil(np.log2(num_samples)))
+    depth = pywt.swt_max_level(pow2_ceil)
+    return depth
+
+
+def _compute_causal_swt(
+    values: np.ndarray,
+    wavelet: str,
+    depth: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Compute the knowledge time swt of multiple signals with the filter bank.
+
+    :param values: signals as an array of shape `(num_samples, num_cols)`
+    :param wavelet: pywt wavelet name, e.g., "db8"
+    :param depth: number of levels to compute
+    :return: smooth and detail arrays of shape
+        `(depth, num_samples, num_cols)`, with NaNs in the warm-up period
+    """
+    hdbg.dassert_eq(values.ndim, 2)
+    hdbg.dassert_lte(1, depth)
+    lo, hi = _get_causal_swt_filters(wavelet)
+    width = lo.size
+    num_samples = values.shape[0]
+    smooth = np.full((depth,) + values.shape, np.nan)
+    detail = np.full((depth,) + values.shape, np.nan)
+    approx = values.astype(float)
+    # Number of leading samples of `approx` that are not defined.
+    num_undefined = 0
+    for level in range(1, depth + 1):
+        dilation = 2 ** (level - 1)
+        num_undefined += (width - 1) * dilation
+        warmup = 2 * _get_artifact_length(width, level)
+        if num_samples <= warmup:
+            # There is not enough data for this level and the next ones.
+            break
+        # Compute the outputs from index `num_undefined`.
+        smooth_level = np.zeros((num_samples - num_undefined, values.shape[1]))
+        detail_level = np.zeros_like(smooth_level)
+        for k in range(width):
+            start = num_undefined - k * dilation
+            lagged = approx[start : start + smooth_level.shape[0]]
+            smooth_level += lo[k] * lagged
+            detail_level += hi[k] * lagged
+        approx = np.full(values.shape, np.nan)
+        approx[num_undefined:] = smooth_level
+        smooth[level - 1, warmup:] = approx[warmup:]
+        detail[level - 1, warmup:] = detail_level[warmup - num_undefined :]
+    return smooth, detail
+
+
+def _to_swt_df(values: np.ndarray, index: pd.Index) -> pd.DataFrame:
+    """
+    Convert an array of shape `(depth, num_samples)` to a dataframe with one
+    column per level.
+    """
+    df = pd.DataFrame(values.T, index=index)
+    df.columns = range(1, values.shape[0] + 1)
+    return df
+
+
+def _compute_causal_swt_dfs(
+    sig: pd.Series, wavelet: str, depth: Optional[int]
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Compute the knowledge time swt of a series with the filter bank.
+
+    :return: tuple of smooth and detail dataframes
+    """
+    hdbg.dassert_isinstance(sig, pd.Series)
+    depth = _get_swt_depth(sig.size, depth)
+    smooth, detail = _compute_causal_swt(
+        sig.values.reshape(-1, 1), wavelet, depth
+    )
+    smooth_df = _to_swt_df(smooth[:, :, 0], sig.index)
+    detail_df = _to_swt_df(detail[:, :, 0], sig.index)
+    return smooth_df, detail_df
+
+
+class CausalSwt:
+    """
+    Compute the knowledge time swt incrementally, one sample at a time.
+
+    Each level stores the last inputs of its filters in a ring buffer, so that
+    an update costs `O(depth * width)` instead of recomputing the transform
+    over the entire history like `get_swt()`.
+
+    E.g., for a real-time node receiving one bar at a time:
+    ```
+    swt = CausalSwt(depth=4, num_cols=2)
+    for values in bars:
+        smooth, detail = swt.update(values)
+    ```
+    """
+
+    def __init__(
+        self,
+        wavelet: Optional[str] = None,
+        depth: int = 1,
+        num_cols: int = 1,
+    ) -> None:
+        """
+        Constructor.
+
+        :param wavelet: pywt wavelet name, e.g., "db8"
+        :param depth: number of levels to compute
+        :param num_cols: number of signals to transform at the same time
+        """
+        hdbg.dassert_lte(1, depth)
+        hdbg.dassert_lte(1, num_cols)
+        self._wavelet = wavelet or "haar"
+        self._depth = depth
+        self._num_cols = num_cols
+        self._lo, self._hi = _get_causal_swt_filters(self._wavelet)
+        width = self._lo.size
+        # Dilation of the filters of each level.
+        self._dilations = [2 ** (level - 1) for level in range(1, depth + 1)]
+        # Number of samples after which the output of each level is valid.
+        self._warmups = [
+            2 * _get_artifact_length(width, level)
+            for level in range(1, depth + 1)
+        ]
+        # Ring buffer of the inputs of each level, i.e., the signal for level
+        # 1 and the smooth of the previous level otherwise.
+        self._buffers = [
+            np.full(((width - 1) * dilation + 1, num_cols), np.nan)
+            for dilation in self._dilations
+        ]
+        self._num_samples = 0
+
+    def update(self, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Process the next sample of the signals.
+
+        :param values: next sample of each signal, as an array of shape
+            `(num_cols,)`
+        :return: smooth and detail arrays of shape `(depth, num_cols)` for the
+            sample, with NaNs in the warm-up period, like the rows of
+            `get_swt(..., timing_mode="knowledge_time")`
+        """
+        values = np.asarray(values, dtype=float).reshape(-1)
+        hdbg.dassert_eq(values.size, self._num_cols)
+        smooth = np.full((self._depth, self._num_cols), np.nan)
+        detail = np.full((self._depth, self._num_cols), np.nan)
+        approx = values
+        for level_idx, dilation in enumerate(self._dilations):
+            buffer = self._buffers[level_idx]
+            buffer_len = buffer.shape[0]
+            pos = self._num_samples % buffer_len
+            buffer[pos] = approx
+            # Tap `k` is the input `k * dilation` samples ago.
+            idxs = (pos - np.arange(self._lo.size) * dilation) % buffer_len
+            taps = buffer[idxs]
+            approx = self._lo @ taps
+            if self._num_samples >= self._warmups[level_idx]:
+                smooth[level_idx] = approx
+                detail[level_idx] = self._hi @ taps
+        self._num_samples += 1
+        return smooth, detail
+
+
 # #############################################################################
 # Wavelet variance/covariance
 # #############################################################################
@@ -1,5 +1,6 @@
 import logging
 
+import numpy as np
 import pandas as pd
 
 import core.artificial_signal_generators as carsigen
@@ -113,3 +114,45 @@ class Test_calculate_presudoinverse(hunitest.TestCase):
             csprcrco.compute_pseudoinverse(df)
         )
         self.check_string(inverse_df)
+
+
+class Test_compute_cross_correlation(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that the correlations are like `pd.Series.corr()` for each lag.
+        """
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(rng.normal(size=(200, 3)), columns=["x1", "x2", "y"])
+        df["x2"] += df["y"].shift(-1)
+        df.iloc[3:9, 0] = np.nan
+        df.iloc[20:25, 2] = np.nan
+        lags = [-1, 0, 1, 2]
+        actual = csprcrco.compute_cross_correlation(df, ["x1", "x2"], "y", lags)
+        # Compute the expected correlations one lag at a time.
+        df = df.dropna(subset=["y"])
+        expected = pd.concat(
+            [
+                df[["x1", "x2"]].shift(lag).apply(lambda x: x.corr(df["y"]))
+                for lag in lags
+            ],
+            axis=1,
+            keys=lags,
+        ).T
+        self.assert_dfs_close(actual, expected)
+        # The lagged `x2` is correlated with `y`.
+        self.assertGreater(actual.loc[1, "x2"], 0.5)
+
+
+class Test_compute_columnwise_correlation(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check the columns with not enough data or a constant value.
+        """
+        x = np.array(
+            [[1.0, 1.0, 1.0], [2.0, np.nan, 1.0], [3.0, np.nan, 1.0]]
+        )
+        y = np.array([[2.0], [4.0], [5.0]])
+        actual = csprcrco.compute_columnwise_correlation(x, y)
+        corr = np.corrcoef(x[:, 0], y[:, 0])[0, 1]
+        expected = np.array([corr, np.nan, np.nan])
+        np.testing.assert_allclose(actual, expected)
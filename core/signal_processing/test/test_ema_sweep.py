@@ -0,0 +1,63 @@
+import logging
+
+import numpy as np
+import pandas as pd
+
+import core.signal_processing.ema_sweep as csprema
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+class Test_sweep_horizon_and_com(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that the sweep is like correlating each item separately.
+        """
+        rng = np.random.default_rng(1)
+        index = pd.date_range("2022-01-03 09:30", periods=300, freq="T")
+        signal_df = pd.DataFrame(rng.normal(size=(300, 3)), index)
+        target_df = pd.DataFrame(rng.normal(size=(300, 3)), index)
+        target_df += 0.5 * signal_df.shift(-1)
+        signal_df.iloc[10:30, 1] = np.nan
+        time_horizons = [1, 5]
+        coms = [1.0, 4.0]
+        actual = csprema.sweep_horizon_and_com(
+            signal_df, target_df, time_horizons, coms
+        )
+        expected = self._sweep_horizon_and_com(
+            signal_df, target_df, time_horizons, coms
+        )
+        self.assert_dfs_close(actual, expected)
+
+    @staticmethod
+    def _sweep_horizon_and_com(
+        signal_df: pd.DataFrame,
+        target_df: pd.DataFrame,
+        time_horizons: list,
+        coms: list,
+    ) -> pd.DataFrame:
+        """
+        Compute the sweep looping over each time horizon, com and item.
+        """
+        corrs = {}
+        for time_horizon in time_horizons:
+            rule = f"{time_horizon}T"
+            com_sweep = {}
+            for com in coms:
+                corr_vals = []
+                for item_id in signal_df.columns:
+                    smoothed_signal = (
+                        signal_df[item_id]
+                        .ewm(com)
+                        .mean()
+                        .resample(rule)
+                        .last()
+                        .shift(1)
+                    )
+                    target = target_df[item_id].resample(rule).mean()
+                    corr_vals.append(smoothed_signal.corr(target))
+                com_sweep[com] = np.mean(corr_vals)
+            corrs[time_horizon] = pd.Series(com_sweep)
+        df = pd.DataFrame(corrs)
+        return df
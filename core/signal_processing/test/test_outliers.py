@@ -103,6 +103,66 @@ class Test_process_outliers1(hunitest.TestCase):
         self.check_string("\n".join(txt))
 
 
+class Test_process_outlier_df1(hunitest.TestCase):
+    def helper(self, mode: str) -> None:
+        """
+        Check that processing the dataframe is like processing each column.
+        """
+        df = self._get_data()
+        info: collections.OrderedDict = collections.OrderedDict()
+        actual = csiprout.process_outlier_df(
+            df, mode, 0.05, window=50, min_periods=10, info=info
+        )
+        for col in df.columns:
+            col_info: collections.OrderedDict = collections.OrderedDict()
+            expected = csiprout.process_outliers(
+                df[col], mode, 0.05, window=50, min_periods=10, info=col_info
+            )
+            self.assert_dfs_close(
+                actual[col].to_frame(), expected.to_frame(), equal_nan=True
+            )
+            self.assertEqual(
+                pprint.pformat(dict(info[col])), pprint.pformat(dict(col_info))
+            )
+
+    def test_winsorize1(self) -> None:
+        self.helper("winsorize")
+
+    def test_set_to_nan1(self) -> None:
+        self.helper("set_to_nan")
+
+    def test_set_to_zero1(self) -> None:
+        self.helper("set_to_zero")
+
+    @staticmethod
+    def _get_data() -> pd.DataFrame:
+        rng = np.random.default_rng(1)
+        df = pd.DataFrame(
+            rng.standard_t(3, size=(200, 3)), columns=["a", "b", "c"]
+        )
+        df.iloc[20:40, 1] = np.nan
+        df.iloc[60, 2] = np.inf
+        return df
+
+
+class Test_IncrementalOutlierProcessor1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that processing one row at a time is like processing the
+        dataframe.
+        """
+        df = Test_process_outlier_df1._get_data()
+        processor = csiprout.IncrementalOutlierProcessor(
+            "winsorize", 0.05, 50, df.shape[1], min_periods=10
+        )
+        rows = [processor.update(values)[0] for values in df.values]
+        actual = pd.DataFrame(rows, index=df.index, columns=df.columns)
+        expected = csiprout.process_outlier_df(
+            df, "winsorize", 0.05, window=50, min_periods=10
+        )
+        self.assert_dfs_close(actual, expected, equal_nan=True)
+
+
 class TestProcessNonfinite1(hunitest.TestCase):
     def test1(self) -> None:
         series = self._get_messy_series(1)
@@ -0,0 +1,112 @@
+import logging
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+import core.signal_processing.ema_smoothing as cspremsm
+import core.signal_processing.rolling_moments as csprromo
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+def _get_data() -> pd.DataFrame:
+    np.random.seed(42)
+    n = 300
+    df = pd.DataFrame(np.random.randn(n, 3), columns=["a", "b", "c"])
+    # Add NaNs at the beginning, in the middle and a constant stretch.
+    df.iloc[0, 2] = np.nan
+    df.iloc[3:40, 1] = np.nan
+    df.iloc[100:110, 0] = np.nan
+    df.iloc[200:220, 2] = 1.0
+    return df
+
+
+def _get_expected(
+    df: pd.DataFrame, tau: float, kwargs: Dict[str, Any]
+) -> Dict[str, pd.DataFrame]:
+    """
+    Compute the moments with the functions in `ema_smoothing.py`.
+    """
+    min_periods = kwargs.get("min_periods", 0)
+    min_depth = kwargs.get("min_depth", 1)
+    max_depth = kwargs.get("max_depth", 1)
+    p_moment = kwargs.get("p_moment", 2)
+    demean = kwargs.get("demean", True)
+    delay = kwargs.get("delay", 0)
+    atol = kwargs.get("atol", 0)
+    sma_args = (tau, min_periods, min_depth, max_depth)
+    zscore = cspremsm.compute_rolling_zscore(
+        df, *sma_args, p_moment, demean, delay, atol
+    )
+    expected = {
+        "mean": cspremsm.compute_smooth_moving_average(df, *sma_args),
+        "std": cspremsm.compute_rolling_std(df, *sma_args, p_moment),
+        "norm": cspremsm.compute_rolling_norm(df, *sma_args, p_moment),
+        "zscore": zscore,
+        "skew": cspremsm.compute_smooth_moving_average(zscore**3, *sma_args),
+        "sharpe_ratio": cspremsm.compute_rolling_sharpe_ratio(
+            df, *sma_args, p_moment
+        ),
+        "corr": pd.DataFrame(
+            {
+                "a.b": cspremsm.compute_rolling_corr(
+                    df["a"], df["b"], tau, demean, *sma_args[1:], p_moment
+                ),
+            }
+        ),
+    }
+    return expected
+
+
+# #############################################################################
+# TestRollingMomentsEngine1
+# #############################################################################
+
+
+class TestRollingMomentsEngine1(hunitest.TestCase):
+    def helper(self, tau: float, **kwargs: Any) -> None:
+        """
+        Check batch and incremental results against `ema_smoothing.py`.
+        """
+        df = _get_data()
+        expected = _get_expected(df, tau, kwargs)
+        moments = list(expected.keys())
+        engine = csprromo.RollingMomentsEngine(
+            tau, moments, column_pairs=[("a", "b")], **kwargs
+        )
+        # Check batch mode.
+        actual = engine.compute(df)
+        for moment in moments:
+            hunitest.compare_df(actual[moment], expected[moment])
+        # Check incremental mode.
+        engine.reset()
+        chunks = [
+            engine.update(df.iloc[start:end])
+            for start, end in [(0, 50), (50, 51), (51, 120), (120, 300)]
+        ]
+        for moment in moments:
+            actual_moment = pd.concat([chunk[moment] for chunk in chunks])
+            hunitest.compare_df(actual_moment, expected[moment])
+
+    def test_default1(self) -> None:
+        self.helper(5)
+
+    def test_depth_and_delay1(self) -> None:
+        self.helper(
+            4,
+            min_periods=5,
+            min_depth=2,
+            max_depth=3,
+            p_moment=1,
+            delay=2,
+            atol=0.1,
+        )
+
+    def test_no_demean1(self) -> None:
+        self.helper(6, demean=False, delay=1)
+
+    def test_invalid_moment1(self) -> None:
+        with self.assertRaises(AssertionError):
+            csprromo.RollingMomentsEngine(5, ["mean", "median"])
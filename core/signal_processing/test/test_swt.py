@@ -3,6 +3,7 @@ from typing import Optional
 
 import numpy as np
 import pandas as pd
+import pywt
 
 import core.artificial_signal_generators as carsigen
 import core.signal_processing.swt as csiprswt
@@ -109,8 +110,12 @@ class Test_get_swt(hunitest.TestCase):
             # The raise comes from the `get_swt` implementation.
             csiprswt.get_swt(series, depth=3, output_mode="detail")
         with self.assertRaises(ValueError):
-            # This raise comes from `pywt`.
             csiprswt.get_swt(series, depth=5, output_mode="detail")
+        with self.assertRaises(ValueError):
+            # This raise comes from `pywt`.
+            csiprswt.get_swt(
+                series, depth=5, timing_mode="raw", output_mode="detail"
+            )
 
     @staticmethod
     def _get_series(seed: int, periods: int = 20) -> pd.Series:
@@ -478,6 +483,113 @@ class Test_get_swt_3(hunitest.TestCase):
         return swt
 
 
+class Test_get_swt_4(hunitest.TestCase):
+    """
+    Compare the knowledge time swt to `pywt.swt`.
+    """
+
+    def helper(self, wavelet: str, depth: int) -> None:
+        srs = cstrasam.get_iid_standard_gaussian_samples(300, seed=1)
+        smooth_df, detail_df = csiprswt.get_swt(
+            srs, wavelet, depth, timing_mode="knowledge_time"
+        )
+        # Compute the transform with `pywt.swt`.
+        expected_smooth_df, expected_detail_df = (
+            csiprswt.pad_compute_swt_and_trim(srs, wavelet, depth)
+        )
+        width = len(pywt.Wavelet(wavelet).filter_bank[0])
+        for level in range(1, depth + 1):
+            for df in [expected_smooth_df, expected_detail_df]:
+                csiprswt._set_warmup_region_to_nan(df[level], width, level)
+                df[level] = csiprswt._reindex_by_knowledge_time(
+                    df[level], width, level
+                )
+        self.assert_dfs_close(smooth_df, expected_smooth_df, equal_nan=True)
+        self.assert_dfs_close(detail_df, expected_detail_df, equal_nan=True)
+
+    def test_haar1(self) -> None:
+        self.helper("haar", 5)
+
+    def test_db3(self) -> None:
+        self.helper("db3", 4)
+
+
+class Test_apply_swt(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that filtering all the columns at once is like filtering each
+        column.
+        """
+        df = pd.concat(
+            [
+                cstrasam.get_iid_standard_gaussian_samples(100, seed=seed)
+                for seed in range(3)
+            ],
+            axis=1,
+        )
+        df.columns = ["a", "b", "c"]
+        df.iloc[50, 1] = np.nan
+        actual = csiprswt.apply_swt(
+            df, "db2", 3, output_mode="detail_and_last_smooth"
+        )
+        expected = pd.concat(
+            [
+                csiprswt.get_swt(
+                    df[col], "db2", 3, output_mode="detail_and_last_smooth"
+                ).rename(columns=lambda x, col=col: f"{col}_{x}")
+                for col in df.columns
+            ],
+            axis=1,
+        )
+        self.assert_dfs_close(actual, expected, equal_nan=True)
+        self.assertEqual(
+            actual.columns.tolist()[:4], ["a_1", "a_2", "a_3", "a_3_smooth"]
+        )
+
+
+class Test_CausalSwt(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that the incremental transform is equal to `get_swt()`.
+        """
+        wavelet = "db2"
+        depth = 3
+        df = pd.concat(
+            [
+                cstrasam.get_iid_standard_gaussian_samples(80, seed=seed)
+                for seed in range(2)
+            ],
+            axis=1,
+        )
+        swt = csiprswt.CausalSwt(wavelet, depth, num_cols=2)
+        smooths = []
+        details = []
+        for values in df.values:
+            smooth, detail = swt.update(values)
+            smooths.append(smooth)
+            details.append(detail)
+        for col_idx in range(df.shape[1]):
+            expected_smooth_df, expected_detail_df = csiprswt.get_swt(
+                df.iloc[:, col_idx], wavelet, depth
+            )
+            smooth_df = pd.DataFrame(
+                [smooth[:, col_idx] for smooth in smooths],
+                index=df.index,
+                columns=expected_smooth_df.columns,
+            )
+            detail_df = pd.DataFrame(
+                [detail[:, col_idx] for detail in details],
+                index=df.index,
+                columns=expected_detail_df.columns,
+            )
+            self.assert_dfs_close(
+                smooth_df, expected_smooth_df, equal_nan=True
+            )
+            self.assert_dfs_close(
+                detail_df, expected_detail_df, equal_nan=True
+            )
+
+
 class Test_compute_lag_weights(hunitest.TestCase):
     def test1(self) -> None:
         weights = [-1, -1, 1]
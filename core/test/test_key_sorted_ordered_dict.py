@@ -0,0 +1,54 @@
+from typing import Any, Generator
+
+import pandas as pd
+import pytest
+
+import core.key_sorted_ordered_dict as cksoordi
+import helpers.hdbg as hdbg
+import helpers.hunit_test as hunitest
+
+
+# #############################################################################
+# TestKeySortedOrderedDict1
+# #############################################################################
+
+
+class TestKeySortedOrderedDict1(hunitest.TestCase):
+    # This will be run before and after each test.
+    @pytest.fixture(autouse=True)
+    def setup_teardown_test(self) -> Generator[Any, Any, Any]:
+        # Run before each test.
+        self.set_up_test()
+        yield
+        # Run after each test.
+        self.tear_down_test()
+
+    def set_up_test(self) -> None:
+        self._old_check_level = hdbg.get_check_level()
+
+    def tear_down_test(self) -> None:
+        hdbg.set_check_level(self._old_check_level)
+
+    def test_setitem1(self) -> None:
+        """
+        Check that the keys must be increasing and of the right type.
+        """
+        hdbg.set_check_level("cheap")
+        odict = cksoordi.KeySortedOrderedDict(pd.Timestamp, max_keys=2)
+        for day in [1, 2, 3]:
+            odict[pd.Timestamp(f"2022-01-0{day}")] = day
+        self.assertEqual(list(odict.get_ordered_dict().values()), [2, 3])
+        with self.assertRaises(AssertionError):
+            odict[pd.Timestamp("2022-01-01")] = 0
+        with self.assertRaises(AssertionError):
+            odict["2022-01-04"] = 4
+
+    def test_setitem2(self) -> None:
+        """
+        Check that the checks are skipped at check level "off".
+        """
+        hdbg.set_check_level("off")
+        odict = cksoordi.KeySortedOrderedDict(pd.Timestamp)
+        odict[pd.Timestamp("2022-01-02")] = 2
+        odict[pd.Timestamp("2022-01-01")] = 1
+        self.assertEqual(len(odict), 2)
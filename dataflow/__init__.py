@@ -4,8 +4,7 @@ Import as:
 import dataflow as cdataf
 """
 
-import dataflow.backtest  # pylint: disable=unused-import # NOQA
-import dataflow.core  # pylint: disable=unused-import # NOQA
-import dataflow.model  # pylint: disable=unused-import # NOQA
-import dataflow.pipelines  # pylint: disable=unused-import # NOQA
-import dataflow.system  # pylint: disable=unused-import # NOQA
+import helpers.hintrospection as hintros
+
+# Import the subpackages only when accessed, e.g., `dataflow.core`.
+__getattr__, __dir__ = hintros.get_lazy_package_getattr(__name__, [])
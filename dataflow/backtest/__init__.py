@@ -4,7 +4,16 @@ Import as:
 import dataflow.backtest as dtfbcktst
 """
 
-from dataflow.backtest.backtest_api import *  # pylint: disable=unused-import # NOQA
-from dataflow.backtest.backtest_test_case import *  # pylint: disable=unused-import # NOQA
-from dataflow.backtest.dataflow_backtest_utils import *  # pylint: disable=unused-import # NOQA
-from dataflow.backtest.master_backtest import *  # pylint: disable=unused-import # NOQA
+import helpers.hintrospection as hintros
+
+# Import the modules only when one of their names is accessed, instead of
+# star-importing all of them.
+__getattr__, __dir__ = hintros.get_lazy_package_getattr(
+    __name__,
+    [
+        "dataflow.backtest.backtest_api",
+        "dataflow.backtest.backtest_test_case",
+        "dataflow.backtest.dataflow_backtest_utils",
+        "dataflow.backtest.master_backtest",
+    ],
+)
@@ -10,10 +10,20 @@ Run a list of experiments consisting of multiple model runs based on the passed:
     --config_builder "dataflow_lm.RH1E.config.build_15min_model_configs()" \
     --dst_dir experiment1 \
     --num_threads 2
+
+# Run the experiments from the longest to the shortest one in the previous
+# runs in `dst_dir`, using at most 64GB and killing experiments using more than
+# 16GB:
+> run_config_list.py \
+    ... \
+    --schedule_by_cost \
+    --memory_budget_in_GB 64 \
+    --max_mem_per_task_in_GB 16
 """
 
 
 import argparse
+import glob
 import logging
 import os
 from typing import cast
@@ -140,6 +150,28 @@ def _parse() -> argparse.ArgumentParser:
         required=True,
         help="File storing the pipeline to iterate over",
     )
+    parser.add_argument(
+        "--schedule_by_cost",
+        action="store_true",
+        help="Run the experiments from the longest to the shortest one, based "
+        "on the logs of the previous runs in `dst_dir`",
+    )
+    parser.add_argument(
+        "--memory_budget_in_GB",
+        action="store",
+        type=float,
+        default=None,
+        help="Max memory used by the experiments running at the same time "
+        "(requires `--schedule_by_cost`)",
+    )
+    parser.add_argument(
+        "--max_mem_per_task_in_GB",
+        action="store",
+        type=float,
+        default=None,
+        help="Kill an experiment using more memory and restart it alone "
+        "(requires `--schedule_by_cost`)",
+    )
     parser.add_argument(
         "--archive_on_S3",
         action="store_true",
@@ -171,6 +203,8 @@ def _main(parser: argparse.ArgumentParser) -> None:
     incremental = not args.no_incremental
     abort_on_error = not args.skip_on_error
     num_attempts = args.num_attempts
+    # The logs of the previous runs store the cost of each experiment.
+    prev_log_files = sorted(glob.glob(os.path.join(dst_dir, "log.*.txt")))
     # Prepare the log file.
     timestamp = hdateti.get_current_timestamp_as_string("naive_ET")
     log_file = os.path.join(dst_dir, f"log.{timestamp}.txt")
@@ -180,6 +214,21 @@ def _main(parser: argparse.ArgumentParser) -> None:
     # TODO(gp): Is this the correct backend? It might not matter since we spawn
     # a process with system.
     backend = "asyncio_threading"
+    kwargs = {}
+    if args.schedule_by_cost:
+        backend = "scheduled_multiprocessing"
+        kwargs["task_cost_log_files"] = prev_log_files
+        if args.memory_budget_in_GB is not None:
+            kwargs["memory_budget_in_bytes"] = int(
+                args.memory_budget_in_GB * 1024**3
+            )
+        if args.max_mem_per_task_in_GB is not None:
+            kwargs["max_mem_per_task_in_bytes"] = int(
+                args.max_mem_per_task_in_GB * 1024**3
+            )
+    else:
+        hdbg.dassert_is(args.memory_budget_in_GB, None)
+        hdbg.dassert_is(args.max_mem_per_task_in_GB, None)
     hjoblib.parallel_execute(
         workload,
         dry_run,
@@ -189,6 +238,7 @@ def _main(parser: argparse.ArgumentParser) -> None:
         num_attempts,
         log_file,
         backend=backend,
+        **kwargs,
     )
     #
     _LOG.info("dst_dir='%s'", dst_dir)
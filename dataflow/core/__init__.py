@@ -4,23 +4,32 @@ Import as:
 import dataflow.core as dtfcore
 """
 
-from dataflow.core.dag import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.dag_builder import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.dag_builder_example import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.dag_runner import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.dag_statistics import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.node import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.base import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.local_level_model import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.regression_models import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.sarimax_models import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.sinks import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.sklearn_models import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.sources import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.transformers import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.unsupervised_sklearn_models import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.nodes.volatility_models import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.result_bundle import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.utils import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.visitors import *  # pylint: disable=unused-import # NOQA
-from dataflow.core.visualization import *  # pylint: disable=unused-import # NOQA
+import helpers.hintrospection as hintros
+
+# Import the modules only when one of their names is accessed, instead of
+# star-importing all of them.
+__getattr__, __dir__ = hintros.get_lazy_package_getattr(
+    __name__,
+    [
+        "dataflow.core.dag",
+        "dataflow.core.dag_builder",
+        "dataflow.core.dag_builder_example",
+        "dataflow.core.dag_runner",
+        "dataflow.core.dag_statistics",
+        "dataflow.core.node",
+        "dataflow.core.nodes.base",
+        "dataflow.core.nodes.local_level_model",
+        "dataflow.core.nodes.regression_models",
+        "dataflow.core.nodes.sarimax_models",
+        "dataflow.core.nodes.sinks",
+        "dataflow.core.nodes.sklearn_models",
+        "dataflow.core.nodes.sources",
+        "dataflow.core.nodes.transformers",
+        "dataflow.core.nodes.unsupervised_sklearn_models",
+        "dataflow.core.nodes.volatility_models",
+        "dataflow.core.result_bundle",
+        "dataflow.core.utils",
+        "dataflow.core.visitors",
+        "dataflow.core.visualization",
+    ],
+)
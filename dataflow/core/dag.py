@@ -8,6 +8,7 @@ import itertools
 import json
 import logging
 import os
+import time
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import networkx as networ
@@ -25,15 +26,48 @@ import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
 import helpers.hprint as hprint
 import helpers.hsystem as hsystem
+import helpers.hthreading as hthread
 import helpers.htimer as htimer
 import helpers.hwall_clock_time as hwacltim
 
 _LOG = logging.getLogger(__name__)
 
+# Indices of the files with the node metrics written by this process, see
+# `DAG._write_node_metrics_to_dst_dir()`.
+_NODE_METRICS_FILE_IDXS = itertools.count()
+
 
 DagOutput = Dict[dtfcornode.NodeId, dtfcornode.NodeOutput]
 
 
+class _IncrementState:
+    """
+    State of a node executed incrementally.
+    """
+
+    def __init__(
+        self,
+        state: Any,
+        checkpoint: Any,
+        last_input_idx: Any,
+        first_input_idx: Any,
+    ) -> None:
+        """
+        Constructor.
+
+        :param state: state of the node after processing all the input rows
+        :param checkpoint: state of the node before processing the last input
+            row, used to reprocess the last row when it changes
+        :param last_input_idx: index of the last input row processed
+        :param first_input_idx: index of the first input row when the node
+            was executed from scratch
+        """
+        self.state = state
+        self.checkpoint = checkpoint
+        self.last_input_idx = last_input_idx
+        self.first_input_idx = first_input_idx
+
+
 # TODO(gp): Consider calling it `Dag` given our convention of snake case
 #  abbreviations in the code (but not in comments).
 class DAG(hobject.PrintableMixin):
@@ -88,6 +122,17 @@ class DAG(hobject.PrintableMixin):
         self._save_node_df_out_stats = False
         self._profile_execution = False
         self._dst_dir: Optional[str] = None
+        # Worker writing the debug info off the critical path, if any, and
+        # its `max_pending_writes` and `drop_writes_when_full`.
+        self._debug_writer: Optional[hthread.BackgroundWorker] = None
+        self._debug_writer_params: Optional[Tuple[int, bool]] = None
+        # Metrics of the nodes executed by the current `run_dag()` or
+        # `run_leq_node()` call and writer appending them to the file of the
+        # debug session, see `_write_node_metrics_to_dst_dir()`.
+        self._node_metrics: List[Dict[str, Any]] = []
+        self._node_metrics_writer: Optional[hparque.ParquetRowGroupWriter] = (
+            None
+        )
         self.set_debug_mode(
             self._save_node_io,
             self._save_node_df_out_stats,
@@ -96,6 +141,34 @@ class DAG(hobject.PrintableMixin):
         )
         # Disable freeing nodes.
         self.force_free_nodes = False
+        # State of the nodes executed incrementally, see
+        # `_run_node_incrementally()`.
+        self._increment_states: Dict[dtfcornode.NodeId, _IncrementState] = {}
+        # New or changed rows of the outputs of each node computed by the last
+        # incremental execution, or `None` if unknown.
+        self._output_deltas: Dict[
+            dtfcornode.NodeId, Dict[str, Optional[pd.DataFrame]]
+        ] = {}
+
+    def __str__(
+        self,
+        attr_names_to_skip: Optional[List[str]] = None,
+    ) -> str:
+        if attr_names_to_skip is None:
+            attr_names_to_skip = []
+        # Skip the state of the incremental executions, which is not part of
+        # the DAG description.
+        attr_names_to_skip.extend(
+            [
+                "_increment_states",
+                "_output_deltas",
+                "_debug_writer",
+                "_debug_writer_params",
+                "_node_metrics",
+                "_node_metrics_writer",
+            ]
+        )
+        return super().__str__(attr_names_to_skip=attr_names_to_skip)
 
     def __repr__(self) -> str:
         """
@@ -120,7 +193,18 @@ class DAG(hobject.PrintableMixin):
         """
         txt = []
         # Get the representation for the class.
-        txt.append(super().__repr__())
+        txt.append(
+            super().__repr__(
+                attr_names_to_skip=[
+                    "_increment_states",
+                    "_output_deltas",
+                    "_debug_writer",
+                    "_debug_writer_params",
+                    "_node_metrics",
+                    "_node_metrics_writer",
+                ]
+            )
+        )
         # Add more details.
         res = []
         res.append("nodes=" + str(self.nx_dag.nodes(data=True)))
@@ -139,6 +223,10 @@ class DAG(hobject.PrintableMixin):
         save_node_df_out_stats: bool,
         profile_execution: bool,
         dst_dir: Optional[str],
+        *,
+        write_in_background: bool = False,
+        max_pending_writes: int = 64,
+        drop_writes_when_full: bool = False,
     ) -> None:
         """
         Set the debug parameters.
@@ -155,9 +243,19 @@ class DAG(hobject.PrintableMixin):
             - `df_as_parquet`: like `df_as_csv` but using Parquet for dataframes
         :param save_node_df_out_stats: save high level information about the output DataFrame, e.g.,
             dtype info, shape info, memory usage, nans info
-        :param profile_execution: if not `None`, store information about the
-            execution of the nodes
+        :param profile_execution: if not `None`, store a table of metrics
+            about the execution of the nodes (see
+            `_write_node_metrics_to_dst_dir()`)
         :param dst_dir: directory to save node interface and execution profiling info
+        :param write_in_background: write the debug info in a background thread
+            instead of while running the nodes. The outputs of the nodes are
+            copied before being queued. The files are the same as in the
+            synchronous case, and `flush_debug_writes()` waits until they are
+            written
+        :param max_pending_writes: max number of files waiting to be written in
+            the background
+        :param drop_writes_when_full: when there are `max_pending_writes`
+            pending files, drop the new ones instead of waiting
         """
         hdbg.dassert_in(
             save_node_io,
@@ -170,15 +268,30 @@ class DAG(hobject.PrintableMixin):
                 )
             )
         self._save_node_io = save_node_io
-        # To process the profiling info in a human consumable form:
-        # ```
-        # ls -tr -1 tmp.dag_profile/*after* | xargs -n 1 -i sh -c 'echo; echo; echo "# {}"; cat {}'
-        # ```
         self._save_node_df_out_stats = save_node_df_out_stats
         self._profile_execution = profile_execution
         self._dst_dir = dst_dir
+        # Write the pending debug info before the dir is re-created.
+        self.flush_debug_writes()
         if self._dst_dir:
             hio.create_dir(self._dst_dir, incremental=False)
+        # Reuse the current worker, if it has the requested params, instead of
+        # starting a new thread.
+        debug_writer_params = (max_pending_writes, drop_writes_when_full)
+        if self._debug_writer is not None and (
+            not write_in_background
+            or debug_writer_params != self._debug_writer_params
+        ):
+            self._debug_writer.close()
+            self._debug_writer = None
+            self._debug_writer_params = None
+        if write_in_background and self._debug_writer is None:
+            self._debug_writer = hthread.BackgroundWorker(
+                max_pending_writes,
+                drop_when_full=drop_writes_when_full,
+                name="dag_debug_writer",
+            )
+            self._debug_writer_params = debug_writer_params
         if any(
             [
                 self._save_node_io,
@@ -196,6 +309,19 @@ class DAG(hobject.PrintableMixin):
                 dst_dir, None, "Need to specify a directory to save the data"
             )
 
+    def flush_debug_writes(self) -> None:
+        """
+        Wait until the debug info written in the background is on disk.
+
+        This also closes the file with the node metrics, so that it can be
+        read, and the next executions are saved in a new file.
+        """
+        if self._debug_writer is not None:
+            self._debug_writer.flush()
+        if self._node_metrics_writer is not None:
+            self._node_metrics_writer.close()
+            self._node_metrics_writer = None
+
     # /////////////////////////////////////////////////////////////////////////////
     # Accessor.
     # /////////////////////////////////////////////////////////////////////////////
@@ -495,6 +621,8 @@ class DAG(hobject.PrintableMixin):
         sinks = self.get_sinks()
         for id_, nid in enumerate(networ.topological_sort(self._nx_dag)):
             self._run_node(id_, nid, method)
+        if self._profile_execution:
+            self._write_node_metrics_to_dst_dir(method)
         return {sink: self.get_node(sink).get_outputs(method) for sink in sinks}
 
     def run_leq_node(
@@ -502,6 +630,8 @@ class DAG(hobject.PrintableMixin):
         nid: dtfcornode.NodeId,
         method: dtfcornode.Method,
         progress_bar: bool = True,
+        *,
+        incremental: bool = False,
     ) -> dtfcornode.NodeOutput:
         """
         Execute DAG up to (and including) Node `nid` and return output.
@@ -512,11 +642,20 @@ class DAG(hobject.PrintableMixin):
 
         :param nid: desired terminal node for execution
         :param method: `Node` subclass method to be executed
+        :param incremental: if True, process only the rows added since the
+            previous incremental execution in the nodes implementing
+            `IncrementalNode`, and run `predict()` on the entire input for
+            the other nodes. The new rows are processed incrementally only
+            when the outputs are append-only, i.e., a new execution only adds
+            new rows and can change the last one, otherwise the nodes are
+            executed on the entire input
         :return: the mapping from output name to corresponding value (i.e., the
             result of node `nid`'s `get_outputs(method)`
         """
         hdbg.dassert_isinstance(nid, dtfcornode.NodeId)
         hdbg.dassert_isinstance(method, dtfcornode.Method)
+        if incremental:
+            hdbg.dassert_eq(method, "predict")
         ancestors = filter(
             lambda x: x in networ.ancestors(self._nx_dag, nid),
             networ.topological_sort(self._nx_dag),
@@ -530,7 +669,9 @@ class DAG(hobject.PrintableMixin):
         for id_, pred_nid in enumerate(nids):
             if _LOG.isEnabledFor(logging.DEBUG):
                 _LOG.debug("Executing node '%s'", pred_nid)
-            self._run_node(id_, pred_nid, method)
+            self._run_node(id_, pred_nid, method, incremental=incremental)
+        if self._profile_execution:
+            self._write_node_metrics_to_dst_dir(method)
         # Retrieve the output the node.
         node = self.get_node(nid)
         node_output = node.get_outputs(method)
@@ -540,6 +681,132 @@ class DAG(hobject.PrintableMixin):
     # Private methods.
     # /////////////////////////////////////////////////////////////////////////////
 
+    @staticmethod
+    def _predict_increment(
+        node: dtfcornode.Node, new_rows: pd.DataFrame, state: Any
+    ) -> Tuple[pd.DataFrame, Any, Any]:
+        """
+        Run `predict_increment()` on the new rows, saving the state before the
+        last row.
+
+        :return: new or changed output rows, state before the last row, state
+            after all the rows
+        """
+        if new_rows.shape[0] > 1:
+            df_out1, checkpoint = node.predict_increment(
+                new_rows.iloc[:-1], state
+            )
+            df_out2, state = node.predict_increment(
+                new_rows.iloc[-1:], checkpoint
+            )
+            df_out = _append_rows(df_out1, df_out2)
+        else:
+            checkpoint = state
+            df_out, state = node.predict_increment(new_rows, state)
+        return df_out, checkpoint, state
+
+    def _run_node_incrementally(
+        self,
+        node: dtfcornode.Node,
+        kwargs: Dict[str, Any],
+        input_deltas: Dict[str, Optional[pd.DataFrame]],
+    ) -> dtfcornode.NodeOutput:
+        """
+        Run `predict()` on a node processing only the new input rows, if
+        possible.
+
+        The new rows are processed with `predict_increment()` when:
+        - the node implements `IncrementalNode` and `can_predict_increment()`
+        - the node was already executed incrementally
+        - the input starts at the same row as when the node was executed
+          from scratch, e.g., a sliding lookback window didn't drop rows
+        - the new input rows are known and start at or after the last input
+          row already processed
+        Otherwise the node is executed on the entire input.
+
+        :param node: node to execute
+        :param kwargs: entire inputs of the node
+        :param input_deltas: new or changed rows of each input, `None` if
+            unknown
+        :return: entire outputs of the node
+        """
+        # Import locally to avoid an import cycle.
+        import dataflow.core.nodes.base as dtfconobas
+
+        nid = node.nid
+        # pylint: disable=protected-access
+        old_outputs = node._output_vals.get("predict", {})
+        is_incremental = (
+            isinstance(node, dtfconobas.IncrementalNode)
+            and node.input_names == ["df_in"]
+            and node.output_names == ["df_out"]
+            and node.can_predict_increment()
+        )
+        if not is_incremental or kwargs["df_in"].empty:
+            self._increment_states.pop(nid, None)
+            output = node.predict(**kwargs)
+            # Find the rows changed by the execution.
+            self._output_deltas[nid] = {
+                output_name: _get_new_rows(
+                    old_outputs.get(output_name), output[output_name]
+                )
+                for output_name in node.output_names
+            }
+            return output
+        df_in = kwargs["df_in"]
+        new_rows = input_deltas.get("df_in")
+        increment_state = self._increment_states.get(nid)
+        old_df_out = old_outputs.get("df_out")
+        # Find the state to start from.
+        start_state = None
+        if (
+            increment_state is not None
+            and new_rows is not None
+            and old_df_out is not None
+        ):
+            if new_rows.empty:
+                # Nothing changed.
+                self._output_deltas[nid] = {"df_out": old_df_out.iloc[:0]}
+                return {"df_out": old_df_out}
+            first_idx = new_rows.index[0]
+            if df_in.index[0] != increment_state.first_input_idx:
+                # The start of the input changed (e.g., a sliding lookback
+                # window dropped its first rows), so `predict()` on the
+                # entire input restarts from a different row and the state
+                # can't be reused.
+                increment_state = None
+            elif first_idx > increment_state.last_input_idx:
+                start_state = increment_state.state
+            elif first_idx == increment_state.last_input_idx:
+                # The last input row changed, so reprocess it.
+                start_state = increment_state.checkpoint
+            else:
+                increment_state = None
+        else:
+            increment_state = None
+        if increment_state is None or (
+            start_state is None and new_rows.shape[0] != df_in.shape[0]
+        ):
+            # Execute the node from scratch.
+            if _LOG.isEnabledFor(logging.DEBUG):
+                _LOG.debug("Running nid='%s' on the entire input", nid)
+            df_out_delta, checkpoint, state = self._predict_increment(
+                node, df_in, None
+            )
+            df_out = df_out_delta
+            first_input_idx = df_in.index[0]
+        else:
+            df_out_delta, checkpoint, state = self._predict_increment(
+                node, new_rows, start_state
+            )
+            df_out = _append_rows(old_df_out, df_out_delta)
+            first_input_idx = increment_state.first_input_idx
+        self._increment_states[nid] = _IncrementState(
+            state, checkpoint, df_in.index[-1], first_input_idx
+        )
+        self._output_deltas[nid] = {"df_out": df_out_delta}
+        return {"df_out": df_out}
+
     def _to_json(self) -> str:
         # Get internal networkx representation of the DAG.
         graph: networ.classes.digraph.DiGraph = self.nx_dag
@@ -560,68 +827,60 @@ class DAG(hobject.PrintableMixin):
         json_node_link_data = json.dumps(node_link_data, indent=4, sort_keys=True)
         return json_node_link_data
 
-    def _write_prof_stats_to_dst_dir(
-        self,
-        topological_id: int,
-        nid: dtfcornode.NodeId,
-        method: dtfcornode.Method,
-        output_name: str,
-        *,
-        extra_txt: str = "",
-    ) -> None:
+    def _write_node_metrics_to_dst_dir(self, method: dtfcornode.Method) -> None:
         """
-        Write information about the system (e.g., time and memory) before
-        running a node.
+        Write the metrics of the nodes executed by `run_dag()` or
+        `run_leq_node()`.
+
+        The metrics of each execution are appended as a row group, with one
+        row per node, to a single Parquet file per debug session, i.e., until
+        `flush_debug_writes()` is called. The file becomes visible when it
+        is closed, and the metrics of all the bars can be loaded with a
+        single scan, see `load_node_metrics_from_dst_dir()`.
 
         The file has a format like:
         ```
         {dst_dir}/
-           node_io.stats/
-               {method}.{topological_id}.{nid}.{output_name}.{machine_timestamp}.txt
+           node_io.metrics/
+               node_metrics.{machine_timestamp}.{pid}.{file_idx}.parquet
         ```
         E.g.,
         ```
             system_log_dir/20220808/dag/
-                node_io.prof/
-                    predict.0.read_data.df_out.20220808_161500.txt
+                node_io.metrics/
+                    node_metrics.20220808_161502.1234.000000.parquet
         ```
 
-        :param topological_id, nid, method: information about the node and its method
-            to run
-        :param output_name: the tag to add to the file (e.g., `df_out`)
+        :param method: method run on the nodes
         """
-        txt = []
-        # We use the machine timestamp here since this is information about the
-        # actual run and not the simulation.
-        curr_timestamp = hwacltim.get_machine_wall_clock_time(as_str=True)
-        txt.append(f"timestamp={curr_timestamp}")
-        memory_as_str = str(hloggin.get_memory_usage_as_str(process=None))
-        txt.append("memory=%s" % memory_as_str)
-        if extra_txt:
-            txt.append(extra_txt)
-        txt = "\n".join(txt)
-        # Report the information on the screen.
-        _LOG.info(
-            "\n%s\n%s",
-            hprint.frame(
-                "%s: method '%s' for node topological_id=%s nid='%s'"
-                % (output_name, method, topological_id, nid)
-            ),
-            txt,
+        if not self._node_metrics:
+            return
+        df = pd.DataFrame(self._node_metrics)
+        self._node_metrics = []
+        # Use the same dtype for the runs with and without a bar, so that all
+        # the row groups have the same schema.
+        bar_timestamp = hwacltim.get_current_bar_timestamp()
+        df.insert(
+            0,
+            "bar_timestamp",
+            pd.to_datetime(pd.Series([bar_timestamp] * df.shape[0]), utc=True),
         )
-        # Save information to file.
-        # E.g., system_log_dir/20220808/dag/
-        #   node_io.prof/
-        #   predict.0.read_data.df_out.20220808_161500.txt
-        dst_dir = cast(str, self._dst_dir)
-        bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
-        filename = (
-            f"{method}.{topological_id}.{nid}.{output_name}.{bar_timestamp}.txt"
-        )
-        file_name = os.path.join(dst_dir, "node_io.prof", filename)
-        hio.to_file(file_name, txt)
-        if _LOG.isEnabledFor(logging.DEBUG):
-            _LOG.debug("Saved log file '%s'", file_name)
+        if self._node_metrics_writer is None:
+            # We use the machine timestamp here since this is information
+            # about the actual run and not the simulation.
+            machine_timestamp = hwacltim.get_machine_wall_clock_time(
+                as_str=True
+            )
+            # Distinguish the DAGs writing to the same dir in the same second.
+            file_idx = next(_NODE_METRICS_FILE_IDXS)
+            basename = (
+                f"node_metrics.{machine_timestamp}.{os.getpid()}."
+                f"{file_idx:06d}.parquet"
+            )
+            dst_dir = cast(str, self._dst_dir)
+            file_name = os.path.join(dst_dir, "node_io.metrics", basename)
+            self._node_metrics_writer = hparque.ParquetRowGroupWriter(file_name)
+        self._write(self._node_metrics_writer.append, df)
 
     def _write_node_interface_to_dst_dir(
         self,
@@ -648,7 +907,10 @@ class DAG(hobject.PrintableMixin):
                     predict.0.read_data.df_out.20220808_161500.csv
         ```
 
-        :param: similar to `_write_prof_stats_to_dst_dir()`
+        :param topological_id, nid, method: information about the node and its
+            method to run
+        :param output_name: name of the output of the node (e.g., `df_out`)
+        :param obj: value of the output
         """
         dst_dir = cast(str, self._dst_dir)
         bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
@@ -660,32 +922,24 @@ class DAG(hobject.PrintableMixin):
         if isinstance(obj, pd.Series):
             obj = pd.DataFrame(obj)
         if isinstance(obj, pd.DataFrame):
-            df = obj
-            if self._save_node_df_out_stats:
-                # Save high level description about the df.
-                _LOG.debug("Saving node df out stats...")
-                txt = hpandas.df_to_str(
-                    df,
-                    print_dtypes=True,
-                    print_shape_info=True,
-                    print_memory_usage=True,
-                    print_nan_info=True,
-                )
-                hio.to_file(file_name + ".txt", txt)
-            # Save content of the df.
-            if self._save_node_io == "df_as_csv":
-                csv_file_name = f"{file_name}.csv.gz"
-                df.to_csv(csv_file_name, compression="gzip")
-            elif self._save_node_io == "df_as_pq":
-                parquet_file_name = f"{file_name}.parquet"
-                hparque.to_parquet(df, parquet_file_name)
-            elif self._save_node_io == "df_as_csv_and_pq":
-                csv_file_name = f"{file_name}.csv.gz"
-                df.to_csv(csv_file_name, compression="gzip")
-                parquet_file_name = f"{file_name}.parquet"
-                hparque.to_parquet(df, parquet_file_name)
-            else:
+            if self._save_node_io not in (
+                "df_as_csv",
+                "df_as_pq",
+                "df_as_csv_and_pq",
+            ):
                 raise ValueError(f"Invalid save_node_io='{self._save_node_io}'")
+            df = obj
+            if self._debug_writer is not None:
+                # Snapshot the df since it can be modified after the node is
+                # run (e.g., by an incremental execution).
+                df = df.copy()
+            self._write(
+                _write_df,
+                df,
+                file_name,
+                self._save_node_io,
+                self._save_node_df_out_stats,
+            )
             if _LOG.isEnabledFor(logging.DEBUG):
                 _LOG.debug("Saved log dir in '%s'", file_name)
         else:
@@ -695,16 +949,29 @@ class DAG(hobject.PrintableMixin):
                 obj,
             )
 
+    def _write(self, func: Callable, *args: Any) -> None:
+        """
+        Write debug info calling `func(*args)`, in the background if needed.
+        """
+        if self._debug_writer is None:
+            func(*args)
+        else:
+            self._debug_writer.submit(func, *args)
+
     def _run_node(
         self,
         topological_id: int,
         nid: dtfcornode.NodeId,
         method: dtfcornode.Method,
+        *,
+        incremental: bool = False,
     ) -> None:
         """
         Run the requested `method` on a single node.
 
         This method DOES NOT run (or re-run) ancestors of `nid`.
+
+        :param incremental: same as in `run_leq_node()`
         """
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug(
@@ -716,14 +983,12 @@ class DAG(hobject.PrintableMixin):
             )
         # Save system info before execution of the node.
         if self._profile_execution:
-            file_tag = "before_execution"
-            self._write_prof_stats_to_dst_dir(
-                topological_id, nid, method, file_tag
-            )
-            run_node_dtimer = htimer.dtimer_start(logging.DEBUG, "run_node")
-            run_node_dmemory = htimer.dmemory_start(logging.DEBUG, "run_node")
+            start_rss_in_GB = hloggin.get_memory_usage()[0]
+            start_wall_time = time.perf_counter()
+            start_cpu_time = time.process_time()
         # Retrieve the arguments needed to execute the `method` on the node.
         kwargs = {}
+        input_deltas = {}
         for pred_nid in self._nx_dag.predecessors(nid):
             kvs = self._nx_dag.edges[[pred_nid, nid]]
             if _LOG.isEnabledFor(logging.DEBUG):
@@ -732,6 +997,9 @@ class DAG(hobject.PrintableMixin):
             for input_name, value in kvs.items():
                 # Retrieve output from store.
                 kwargs[input_name] = pred_node.get_output(method, value)
+                input_deltas[input_name] = self._output_deltas.get(
+                    pred_nid, {}
+                ).get(value)
                 if self.force_free_nodes:
                     _LOG.warning(
                         "Forcing deallocation of pred_node=%s", pred_node
@@ -744,10 +1012,19 @@ class DAG(hobject.PrintableMixin):
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("kwargs are %s", kwargs)
         # Execute `node.method()`.
-        with htimer.TimedScope(logging.DEBUG, "node_execution") as ts:
+        with htimer.TimedScope(logging.DEBUG, "node_execution"):
             node = self.get_node(nid)
             try:
-                output = getattr(node, method)(**kwargs)
+                if incremental:
+                    output = self._run_node_incrementally(
+                        node, kwargs, input_deltas
+                    )
+                else:
+                    # A non-incremental execution invalidates the state of the
+                    # incremental ones.
+                    self._increment_states.pop(nid, None)
+                    self._output_deltas.pop(nid, None)
+                    output = getattr(node, method)(**kwargs)
             except AttributeError as e:
                 raise AttributeError(
                     f"An exception occurred in node '{nid}'\n{str(e)}"
@@ -765,23 +1042,116 @@ class DAG(hobject.PrintableMixin):
                 )
         # Save system info after execution the node.
         if self._profile_execution:
-            file_tag = "after_execution"
-            txt = []
-            txt.append(ts.get_result())
-            txt.append(htimer.dtimer_stop(run_node_dtimer)[0])
-            txt.append(htimer.dmemory_stop(run_node_dmemory))
-            txt = "\n".join(txt)
-            self._write_prof_stats_to_dst_dir(
-                topological_id,
-                nid,
-                method,
-                file_tag,
-                extra_txt=txt,
+            wall_time_in_secs = time.perf_counter() - start_wall_time
+            cpu_time_in_secs = time.process_time() - start_cpu_time
+            end_rss_in_GB = hloggin.get_memory_usage()[0]
+            df_out = output.get("df_out")
+            num_rows, num_cols = (
+                df_out.shape if isinstance(df_out, pd.DataFrame) else (-1, -1)
             )
+            self._node_metrics.append(
+                {
+                    "method": method,
+                    "topological_id": topological_id,
+                    "nid": nid,
+                    "wall_time_in_secs": wall_time_in_secs,
+                    "cpu_time_in_secs": cpu_time_in_secs,
+                    "rss_delta_in_GB": end_rss_in_GB - start_rss_in_GB,
+                    "num_rows": num_rows,
+                    "num_cols": num_cols,
+                }
+            )
+
+
+def _write_df(
+    df: pd.DataFrame,
+    file_name: str,
+    save_node_io: str,
+    save_node_df_out_stats: bool,
+) -> None:
+    """
+    Save a df at the interface of a node, see `DAG.set_debug_mode()`.
+
+    :param file_name: path of the files without the extension
+    """
+    if save_node_df_out_stats:
+        # Save high level description about the df.
+        _LOG.debug("Saving node df out stats...")
+        txt = hpandas.df_to_str(
+            df,
+            print_dtypes=True,
+            print_shape_info=True,
+            print_memory_usage=True,
+            print_nan_info=True,
+        )
+        hio.to_file(file_name + ".txt", txt)
+    # Save content of the df.
+    if save_node_io in ("df_as_csv", "df_as_csv_and_pq"):
+        csv_file_name = f"{file_name}.csv.gz"
+        df.to_csv(csv_file_name, compression="gzip")
+    if save_node_io in ("df_as_pq", "df_as_csv_and_pq"):
+        parquet_file_name = f"{file_name}.parquet"
+        hparque.to_parquet(df, parquet_file_name)
+
+
+def _get_new_rows(
+    old_df: Optional[pd.DataFrame], new_df: Any
+) -> Optional[pd.DataFrame]:
+    """
+    Return the rows of `new_df` that are not in `old_df` or that changed.
+
+    `new_df` must be obtained from `old_df` by appending rows and possibly
+    revising the last row of `old_df`, so that the new rows can be processed
+    incrementally. E.g., when the first rows are dropped (like in a sliding
+    lookback window) or an earlier row is revised, the new rows are unknown.
+
+    :return: new or changed rows, or `None` if `new_df` is not obtained from
+        `old_df` by appending rows
+    """
+    if not isinstance(new_df, pd.DataFrame):
+        return None
+    if old_df is None or old_df.empty:
+        return new_df
+    if not (
+        new_df.index.is_monotonic_increasing
+        and new_df.columns.equals(old_df.columns)
+    ):
+        return None
+    if new_df.empty or new_df.index[0] != old_df.index[0]:
+        # The first rows were removed or new rows were prepended.
+        return None
+    last_idx = old_df.index[-1]
+    pos = new_df.index.searchsorted(last_idx)
+    if pos == new_df.shape[0] or new_df.index[pos] != last_idx:
+        # The last row was removed.
+        return None
+    if not new_df.iloc[:pos].equals(old_df.iloc[:-1]):
+        # Rows before the last one were inserted, removed or revised.
+        return None
+    if new_df.iloc[pos : pos + 1].equals(old_df.iloc[-1:]):
+        pos += 1
+    return new_df.iloc[pos:]
+
+
+def _append_rows(
+    df: Optional[pd.DataFrame], new_rows: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Append `new_rows` to `df` replacing the rows with the same index.
+    """
+    if df is None or df.empty:
+        return new_rows
+    if new_rows.empty:
+        return df
+    pos = df.index.searchsorted(new_rows.index[0])
+    hdbg.dassert_lte(
+        df.shape[0] - 1, pos, "Only the last row of the output can change"
+    )
+    return pd.concat([df.iloc[:pos], new_rows])
 
 
 # TODO(Grisha): consider creating a class `DagStatsComputer` and moving the
-# function (together with `DAG._write_prof_stats_to_dst_dir()`) there.
+# function there.
 def load_prof_stats_from_dst_dir(
     dst_dir: str,
     topological_id: int,
@@ -794,7 +1164,9 @@ def load_prof_stats_from_dst_dir(
     Load information about the system (e.g., time and memory) before or after
     running a node.
 
-    This function is mirroring `DAG._write_prof_stats_to_dst_dir()`.
+    The DAG doesn't write these text files anymore, and saves the metrics
+    loaded by `load_node_metrics_from_dst_dir()` instead. This function is
+    kept to read the dirs written by the previous versions of the DAG.
 
     Output example:
     ```
@@ -818,6 +1190,45 @@ def load_prof_stats_from_dst_dir(
     return txt
 
 
+def load_node_metrics_from_dst_dir(dst_dir: str) -> pd.DataFrame:
+    """
+    Load the metrics about the execution of the nodes.
+
+    This function is mirroring `DAG._write_node_metrics_to_dst_dir()`.
+
+    Output example:
+    ```
+                  bar_timestamp   method  topological_id        nid  wall_time_in_secs  cpu_time_in_secs  rss_delta_in_GB  num_rows  num_cols
+    0 2023-02-21 08:05:00+00:00  predict               0  read_data              5.036             1.201            0.029      1440        20
+    1 2023-02-21 08:05:00+00:00  predict               1   resample              2.023             2.001            0.001       288        20
+    ```
+
+    The metrics of a debug session that is still running are not returned,
+    since its file is closed only by `DAG.flush_debug_writes()`.
+
+    :param dst_dir: dir that contains the DAG output
+    :return: one row per bar timestamp, method, and node, sorted by bar
+        timestamp and topological id
+    """
+    metrics_dir = os.path.join(dst_dir, "node_io.metrics")
+    hdbg.dassert_dir_exists(metrics_dir)
+    # The files being written start with `_`, see
+    # `hparque.ParquetRowGroupWriter`.
+    file_names = [
+        file_name
+        for file_name in os.listdir(metrics_dir)
+        if not file_name.startswith("_")
+    ]
+    hdbg.dassert_lt(
+        0, len(file_names), "No closed metrics file in '%s'", metrics_dir
+    )
+    df = hparque.from_parquet(metrics_dir)
+    df = df.sort_values(
+        ["bar_timestamp", "method", "topological_id"], kind="stable"
+    ).reset_index(drop=True)
+    return df
+
+
 # TODO(Grisha): consider creating a class `DagStatsComputer` and moving the
 # function there.
 def load_node_df_out_stats_from_dst_dir(
@@ -5,8 +5,9 @@ import dataflow.core.dag_runner as dtfcodarun
 """
 
 import abc
+import copy
 import logging
-from typing import Generator, List, Optional, Tuple
+from typing import Any, Callable, Generator, List, Optional, Tuple, Union
 
 import pandas as pd
 
@@ -18,6 +19,7 @@ import dataflow.core.utils as dtfcorutil
 import dataflow.core.visitors as dtfcorvisi
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
+import helpers.hjoblib as hjoblib
 import helpers.hobject as hobject
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
@@ -62,6 +64,10 @@ class DagRunner(abc.ABC, hobject.PrintableMixin):
         # We should pass None to `ResultBundle` in order not to rely on the
         # default value in `ResultBundle`.
         self._column_to_tags_mapping = None
+        # Whether to run `predict()` only on the new data, see
+        # `DAG.run_leq_node()`. This is set by the derived classes that
+        # execute a DAG repeatedly on growing data.
+        self._incremental_predict = False
         # Extract the sink node.
         self._result_nid = self.dag.get_unique_sink()
         if _LOG.isEnabledFor(logging.DEBUG):
@@ -136,8 +142,11 @@ class DagRunner(abc.ABC, hobject.PrintableMixin):
             Info
         """
         nid = self._result_nid
+        incremental = self._incremental_predict and method == "predict"
         # TODO(gp): Add a check for `df_out`.
-        df_out = self.dag.run_leq_node(nid, method)["df_out"]
+        df_out = self.dag.run_leq_node(nid, method, incremental=incremental)[
+            "df_out"
+        ]
         info = dtfcorvisi.extract_info(self.dag, [method])
         return df_out, info
 
@@ -300,6 +309,11 @@ class RollingFitPredictDagRunner(DagRunner):
         predict_end_timestamp: pd.Timestamp,
         retraining_freq: str,
         retraining_lookback: int,
+        *,
+        dag_builder_func: Optional[Callable[[], dtfcordag.DAG]] = None,
+        num_threads: Union[str, int] = "serial",
+        backend: str = "loky",
+        max_windows_in_flight: Optional[int] = None,
     ) -> None:
         """
         Constructor.
@@ -314,6 +328,16 @@ class RollingFitPredictDagRunner(DagRunner):
             sampling from predict_start_timestamp, while "1W" aligns on Sundays
         :param retraining_lookback: number of periods of past data to include
             in retraining, expressed in integral units of `retraining_freq`
+        :param dag_builder_func: function building a new instance of `dag`,
+            which is required to run the windows in parallel. Each window is
+            run on its own DAG instance, which needs to be picklable for
+            process-based backends
+        :param num_threads, backend: how to run the fit / predict windows, as
+            in `hjoblib.parallel_imap()`
+        :param max_windows_in_flight: max number of windows being run or
+            whose results are not yet returned, to bound the memory used by
+            the DAG instances and their results. `None` means the number of
+            threads
         """
         super().__init__(dag)
         # Save input parameters.
@@ -326,6 +350,16 @@ class RollingFitPredictDagRunner(DagRunner):
         self._retraining_freq = retraining_freq
         hdbg.dassert_isinstance(retraining_lookback, int)
         self._retraining_lookback = retraining_lookback
+        self._dag_builder_func = dag_builder_func
+        self._num_threads = num_threads
+        self._backend = backend
+        self._max_windows_in_flight = max_windows_in_flight
+        if hjoblib.get_num_executing_threads(num_threads) > 1:
+            hdbg.dassert_is_not(
+                dag_builder_func,
+                None,
+                "A DAG builder is needed to run the windows in parallel",
+            )
         # Generate retraining dates.
         self._retraining_datetimes = self.generate_retraining_datetimes(
             predict_start_timestamp=self._predict_start_timestamp,
@@ -452,6 +486,11 @@ class RollingFitPredictDagRunner(DagRunner):
         """
         Fit at each retraining date and predict until next retraining date.
 
+        The windows are returned in time order also when they are run in
+        parallel. In this case, before returning a window, the fit state of
+        `self.dag` is set to the one of the window, so that it can be
+        inspected as in the serial case.
+
         :return: the training time, fit `ResultBundle`, predict `ResultBundle`
         """
         if _LOG.isEnabledFor(logging.DEBUG):
@@ -459,23 +498,27 @@ class RollingFitPredictDagRunner(DagRunner):
                 "retraining_datetimes=%s",
                 hpandas.df_to_str(self._retraining_datetimes),
             )
-        for row in self._retraining_datetimes.iterrows():
-            if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug("row=%s", row)
-                _LOG.debug("fit/predict cycle=%d", row[0])
-            #
-            fit_start = row[1].fit_start
-            fit_end = row[1].fit_end
-            fit_interval = (fit_start, fit_end)
-            fit_result_bundle = self._fit(fit_interval)
-            #
-            predict_start = row[1].predict_start
-            predict_end = row[1].predict_end
-            predict_interval = (fit_start, predict_end)
-            predict_result_bundle = self._predict(predict_interval, predict_start)
-            # TODO(gp): Better to return a pd.Timestamp rather than its representation.
-            training_datetime_str = fit_start.strftime("%Y%m%d_%H%M%S")
-            yield training_datetime_str, fit_result_bundle, predict_result_bundle
+        rows = self._retraining_datetimes.iterrows()
+        num_executing_threads = hjoblib.get_num_executing_threads(
+            self._num_threads
+        )
+        if num_executing_threads == 1:
+            for row in rows:
+                yield self._fit_predict_window(row)
+            return
+        # Build the DAG of each window only when the window is submitted, so
+        # that at most `max_windows_in_flight` DAG instances are alive.
+        tasks = (((self._get_window_dag_runner(), row), {}) for row in rows)
+        outputs = hjoblib.parallel_imap(
+            _fit_predict_window,
+            tasks,
+            num_threads=num_executing_threads,
+            backend=self._backend,
+            max_tasks_in_flight=self._max_windows_in_flight,
+        )
+        for window_output, fit_state in outputs:
+            dtfcorvisi.set_fit_state(self.dag, fit_state)
+            yield window_output
 
     # ///////////////////////////////////////////////////////////////////////////
     # Private methods.
@@ -506,6 +549,45 @@ class RollingFitPredictDagRunner(DagRunner):
             )
         return left_aligned_timestamp
 
+    def _get_window_dag_runner(self) -> "RollingFitPredictDagRunner":
+        """
+        Return a copy of this runner on a new instance of the DAG.
+        """
+        dag = self._dag_builder_func()
+        hdbg.dassert_isinstance(dag, dtfcordag.DAG)
+        hdbg.dassert_eq(dag.get_unique_sink(), self._result_nid)
+        dag_runner = copy.copy(self)
+        dag_runner.dag = dag
+        # The builder is not needed in the workers and might not be
+        # picklable.
+        dag_runner._dag_builder_func = None
+        return dag_runner
+
+    def _fit_predict_window(
+        self, row: Tuple[Any, pd.Series]
+    ) -> Tuple[str, dtfcorebun.ResultBundle, dtfcorebun.ResultBundle]:
+        """
+        Fit and predict on a window of `self._retraining_datetimes`.
+
+        :param row: index and row of `self._retraining_datetimes`
+        """
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug("row=%s", row)
+            _LOG.debug("fit/predict cycle=%d", row[0])
+        #
+        fit_start = row[1].fit_start
+        fit_end = row[1].fit_end
+        fit_interval = (fit_start, fit_end)
+        fit_result_bundle = self._fit(fit_interval)
+        #
+        predict_start = row[1].predict_start
+        predict_end = row[1].predict_end
+        predict_interval = (fit_start, predict_end)
+        predict_result_bundle = self._predict(predict_interval, predict_start)
+        # TODO(gp): Better to return a pd.Timestamp rather than its representation.
+        training_datetime_str = fit_start.strftime("%Y%m%d_%H%M%S")
+        return training_datetime_str, fit_result_bundle, predict_result_bundle
+
     def _fit(
         self,
         interval: dtfcorutil.Intervals,
@@ -543,6 +625,20 @@ class RollingFitPredictDagRunner(DagRunner):
         return self._to_result_bundle(method, df_out, info)
 
 
+def _fit_predict_window(
+    dag_runner: RollingFitPredictDagRunner, row: Tuple[Any, pd.Series]
+) -> Tuple[
+    Tuple[str, dtfcorebun.ResultBundle, dtfcorebun.ResultBundle],
+    dtfcorvisi.NodeState,
+]:
+    """
+    Run a window in a worker, returning also the fit state of the DAG.
+    """
+    window_output = dag_runner._fit_predict_window(row)
+    fit_state = dtfcorvisi.get_fit_state(dag_runner.dag)
+    return window_output, fit_state
+
+
 # #############################################################################
 # IncrementalDagRunner
 # #############################################################################
@@ -563,6 +659,8 @@ class IncrementalDagRunner(DagRunner):
         end_timestamp: pd.Timestamp,
         freq: str,
         fit_state: cconfig.Config,
+        *,
+        incremental_predict: bool = False,
     ) -> None:
         """
         Constructor.
@@ -576,8 +674,12 @@ class IncrementalDagRunner(DagRunner):
             of the underlying DAG)
         :param fit_state: Config containing any learned state required for
             initializing the DAG
+        :param incremental_predict: process only the new data at each step in
+            the nodes implementing `IncrementalNode`, see
+            `DAG.run_leq_node()`
         """
         super().__init__(dag)
+        self._incremental_predict = incremental_predict
         self._start_timestamp = start_timestamp
         self._end_timestamp = end_timestamp
         self._freq = freq
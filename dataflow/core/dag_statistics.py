@@ -709,6 +709,11 @@ def get_execution_time_for_all_dag_nodes(dag_data_dir: str) -> pd.DataFrame:
     """
     # Get a dir that contains DAG data and info.
     dag_dir = dag_data_dir.strip("node_io.data")
+    if os.path.isdir(os.path.join(dag_dir, "node_io.metrics")):
+        # Use the metrics table, which is much faster to load than the
+        # profiling text files.
+        df_res = get_execution_time_for_all_dag_nodes_from_metrics(dag_dir)
+        return df_res
     # Get all the DAG node names.
     dag_node_names = get_dag_node_names(dag_data_dir)
     delays_dict = {}
@@ -735,6 +740,74 @@ def get_execution_time_for_all_dag_nodes(dag_data_dir: str) -> pd.DataFrame:
     return df_res
 
 
+def get_execution_time_for_all_dag_nodes_from_metrics(
+    dag_dir: str, *, method: str = "predict"
+) -> pd.DataFrame:
+    """
+    Same as `get_execution_time_for_all_dag_nodes()` but using the metrics
+    saved by the DAG, see `dtfcordag.load_node_metrics_from_dst_dir()`.
+
+    :param dag_dir: dir with DAG data and info
+    :param method: method to get the execution time for
+    :return: exection delays for all DAG nodes and bar timestamps
+    """
+    metrics = dtfcordag.load_node_metrics_from_dst_dir(dag_dir)
+    metrics = metrics[metrics["method"] == method]
+    # Keep the executions without a bar timestamp (i.e., `NaT`), e.g., when
+    # running a DAG outside a real-time loop.
+    df_res = metrics.pivot_table(
+        index="bar_timestamp",
+        columns="nid",
+        values="wall_time_in_secs",
+        aggfunc="last",
+        dropna=False,
+    )
+    # Order the nodes as they are executed.
+    nids = metrics.drop_duplicates("nid").sort_values("topological_id")["nid"]
+    df_res = df_res[nids.tolist()]
+    df_res.columns.name = None
+    # Add column with summary nodes delay.
+    df_res.insert(0, "all_nodes", df_res.sum(axis=1))
+    return df_res
+
+
+def get_slowest_dag_nodes(
+    dag_dir: str, *, method: str = "predict"
+) -> pd.DataFrame:
+    """
+    Compute statistics of the execution of each DAG node across all bars.
+
+    E.g.,
+    ```
+                       wall_time_in_secs                      cpu_time_in_secs  rss_delta_in_GB  num_bars
+                                    mean    max  quantile_95              mean             mean
+    nid
+    read_data                     11.483 12.397       12.310             1.201            0.029         3
+    predict                        2.862  2.903        2.899             2.760            0.001         3
+    ```
+
+    :param dag_dir: dir with DAG data and info
+    :param method: method to compute the statistics for
+    :return: statistics sorted by decreasing mean wall time
+    """
+    metrics = dtfcordag.load_node_metrics_from_dst_dir(dag_dir)
+    metrics = metrics[metrics["method"] == method]
+    grouped = metrics.groupby("nid")
+    wall_time = grouped["wall_time_in_secs"]
+    df_res = pd.DataFrame(
+        {
+            ("wall_time_in_secs", "mean"): wall_time.mean(),
+            ("wall_time_in_secs", "max"): wall_time.max(),
+            ("wall_time_in_secs", "quantile_95"): wall_time.quantile(0.95),
+            ("cpu_time_in_secs", "mean"): grouped["cpu_time_in_secs"].mean(),
+            ("rss_delta_in_GB", "mean"): grouped["rss_delta_in_GB"].mean(),
+            ("num_bars", ""): grouped.size(),
+        }
+    )
+    df_res = df_res.sort_values(("wall_time_in_secs", "mean"), ascending=False)
+    return df_res
+
+
 def plot_dag_execution_stats(
     df_dag_execution_time: pd.DataFrame, *, report_stats: bool = False
 ) -> None:
@@ -16,6 +16,7 @@ import pandas as pd
 import dataflow.core.node as dtfcornode
 import dataflow.core.utils as dtfcorutil
 import helpers.hdbg as hdbg
+import helpers.hjoblib as hjoblib
 
 _LOG = logging.getLogger(__name__)
 
@@ -300,6 +301,61 @@ class Transformer(FitPredictNode, abc.ABC):
         """
 
 
+# #############################################################################
+# IncrementalNode
+# #############################################################################
+
+
+class IncrementalNode(abc.ABC):
+    """
+    Mixin for single-input single-output nodes that can `predict()` only the
+    rows added to the input since the previous invocation.
+
+    A DAG run with `run_leq_node(..., incremental=True)` routes only the new
+    rows (i.e., the delta) through the nodes deriving from this class,
+    carrying the state of each node across invocations, and falls back to a
+    full `predict()` for all the other nodes.
+
+    The contract of `predict_increment()` is:
+    - when `state` is `None`, `new_rows` is the entire input and the output is
+      the same as `predict(new_rows)["df_out"]`
+    - otherwise `state` is the one returned by the previous invocation and
+      `new_rows` contains only rows with an index larger than the ones
+      already processed
+    - the output contains the rows of `df_out` that are new or changed: the
+      first row can have the same index as the last row already emitted
+      (e.g., a bar of a resampler that is still open), in which case it
+      replaces it
+    - `state` is not modified in place, since the DAG reuses a previous state
+      to reprocess a revised input row
+
+    Concatenating the outputs of successive invocations (replacing the
+    revised rows) must give the same result as calling `predict()` on the
+    entire input.
+    """
+
+    def can_predict_increment(self) -> bool:
+        """
+        Return whether the node can be executed incrementally given its
+        parameters (e.g., a node looking into the future cannot).
+        """
+        _ = self
+        return True
+
+    @abc.abstractmethod
+    def predict_increment(
+        self, new_rows: pd.DataFrame, state: Optional[Any]
+    ) -> Tuple[pd.DataFrame, Any]:
+        """
+        Compute the output for the new rows of the input.
+
+        :param new_rows: new rows of the input dataframe
+        :param state: state returned by the previous invocation, `None` to
+            start from scratch
+        :return: new or changed rows of the output dataframe, updated state
+        """
+
+
 # #############################################################################
 # Plumbing nodes
 # #############################################################################
@@ -471,6 +527,79 @@ class ColModeMixin:
         return df_out
 
 
+# #############################################################################
+# Per-key fit / predict
+# #############################################################################
+
+
+def _fit_predict_node(
+    node: FitPredictNode,
+    df: pd.DataFrame,
+    fit: bool,
+    fit_state: Optional[FitPredictNode.NodeState],
+) -> Tuple[
+    pd.DataFrame,
+    Optional[collections.OrderedDict],
+    Optional[FitPredictNode.NodeState],
+]:
+    """
+    Fit or predict a single node.
+
+    :return: output df, info, and fit state of the node
+    """
+    if fit:
+        df_out = node.fit(df)["df_out"]
+        return df_out, node.get_info("fit"), node.get_fit_state()
+    node.set_fit_state(fit_state)
+    df_out = node.predict(df)["df_out"]
+    return df_out, node.get_info("predict"), fit_state
+
+
+def fit_predict_nodes(
+    node_dfs: Dict[Any, Tuple[FitPredictNode, pd.DataFrame]],
+    fit: bool,
+    key_fit_state: Dict[Any, FitPredictNode.NodeState],
+    *,
+    num_threads: Union[str, int] = "serial",
+    backend: str = "loky",
+) -> Tuple[Dict[Any, pd.DataFrame], collections.OrderedDict]:
+    """
+    Fit or predict a node for each key (e.g., a model for each asset).
+
+    The keys are independent, so they can be processed in parallel. The
+    results are the same as processing the keys serially in order.
+
+    :param node_dfs: node and input df for each key
+    :param fit: fit the nodes if True, otherwise predict
+    :param key_fit_state: fit state for each key, updated when fitting and
+        used to initialize the nodes when predicting
+    :param num_threads: as in `hjoblib.parallel_map()`
+    :param backend: "loky" or "threading". The "multiprocessing" backend is
+        not supported since it can't pickle the nodes, whose parameters are
+        often lambdas (e.g., `col_rename_func`), while "loky" uses
+        `cloudpickle`
+    :return: output df and info for each key, in the order of `node_dfs`
+    """
+    hdbg.dassert_in(backend, ("loky", "threading"))
+    keys = list(node_dfs.keys())
+    tasks = []
+    for key in keys:
+        node, df = node_dfs[key]
+        fit_state = None if fit else key_fit_state[key]
+        tasks.append(((node, df, fit, fit_state), {}))
+    outputs = hjoblib.parallel_map(
+        _fit_predict_node, tasks, num_threads=num_threads, backend=backend
+    )
+    results = {}
+    info = collections.OrderedDict()
+    for key, (df_out, info_out, fit_state) in zip(keys, outputs):
+        results[key] = df_out
+        info[key] = info_out
+        if fit:
+            key_fit_state[key] = fit_state
+    return results, info
+
+
 # #############################################################################
 # Column processing helpers
 # #############################################################################
@@ -6,7 +6,7 @@ import dataflow.core.nodes.regression_models as dtfcnoremo
 
 import collections
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -219,6 +219,9 @@ class MultiindexLinearRegression(dtfconobas.FitPredictNode):
         nan_mode: Optional[str] = None,
         sample_weight_col: Optional[dtfcorutil.NodeColumnList] = None,
         feature_weights: Optional[List[float]] = None,
+        *,
+        num_threads: Union[str, int] = "serial",
+        backend: str = "loky",
     ) -> None:
         """
         Params not listed are as in `ContinuousSkLearnModel`.
@@ -229,6 +232,8 @@ class MultiindexLinearRegression(dtfconobas.FitPredictNode):
             of the dataframe with the `x_vars` and `y_vars`.
         :param out_col_group: column level prefix of length
             `df_in.columns.nlevels - 2`. It may be an empty tuple.
+        :param num_threads, backend: how to fit / predict the models of the
+            different keys, as in `dtfconobas.fit_predict_nodes()`
         """
         super().__init__(nid)
         hdbg.dassert_isinstance(in_col_groups, list)
@@ -243,6 +248,8 @@ class MultiindexLinearRegression(dtfconobas.FitPredictNode):
         self._nan_mode = nan_mode
         self._sample_weight_col = sample_weight_col
         self._feature_weights = feature_weights
+        self._num_threads = num_threads
+        self._backend = backend
         #
         self._key_fit_state: Dict[str, Any] = {}
 
@@ -270,9 +277,10 @@ class MultiindexLinearRegression(dtfconobas.FitPredictNode):
         dfs = dtfconobas.GroupedColDfToDfColProcessor.preprocess(
             df_in, self._in_col_groups
         )
-        results = {}
-        info = collections.OrderedDict()
+        node_dfs = {}
         for key, df in dfs.items():
+            if not fit:
+                hdbg.dassert_in(key, self._key_fit_state)
             lr = LinearRegression(
                 "linear_regression",
                 x_vars=self._x_vars,
@@ -285,17 +293,14 @@ class MultiindexLinearRegression(dtfconobas.FitPredictNode):
                 sample_weight_col=self._sample_weight_col,
                 feature_weights=self._feature_weights,
             )
-            if fit:
-                df_out = lr.fit(df)["df_out"]
-                info_out = lr.get_info("fit")
-                self._key_fit_state[key] = lr.get_fit_state()
-            else:
-                hdbg.dassert_in(key, self._key_fit_state)
-                lr.set_fit_state(self._key_fit_state[key])
-                df_out = lr.predict(df)["df_out"]
-                info_out = lr.get_info("predict")
-            results[key] = df_out
-            info[key] = info_out
+            node_dfs[key] = (lr, df)
+        results, info = dtfconobas.fit_predict_nodes(
+            node_dfs,
+            fit,
+            self._key_fit_state,
+            num_threads=self._num_threads,
+            backend=self._backend,
+        )
         df_out = dtfconobas.GroupedColDfToDfColProcessor.postprocess(
             results, self._out_col_group
         )
@@ -361,6 +361,9 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
         steps_ahead: int,
         model_kwargs: Optional[Any] = None,
         nan_mode: Optional[str] = None,
+        *,
+        num_threads: Union[str, int] = "serial",
+        backend: str = "loky",
     ) -> None:
         """
         Params not listed are as in `ContinuousSkLearnModel`.
@@ -371,6 +374,8 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
             of the dataframe with the `x_vars` and `y_vars`.
         :param out_col_group: column level prefix of length
             `df_in.columns.nlevels - 2`. It may be an empty tuple.
+        :param num_threads, backend: how to fit / predict the models of the
+            different keys, as in `dtfconobas.fit_predict_nodes()`
         """
         super().__init__(nid)
         hdbg.dassert_isinstance(in_col_groups, list)
@@ -383,6 +388,8 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
         self._steps_ahead = steps_ahead
         self._model_kwargs = model_kwargs
         self._nan_mode = nan_mode
+        self._num_threads = num_threads
+        self._backend = backend
         #
         self._key_fit_state: Dict[str, Any] = {}
 
@@ -410,19 +417,8 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
         dfs = dtfconobas.GroupedColDfToDfColProcessor.preprocess(
             df_in, self._in_col_groups
         )
-        results = {}
-        info = collections.OrderedDict()
+        node_dfs = {}
         for key, df in dfs.items():
-            csklm = ContinuousSkLearnModel(
-                "sklearn",
-                model_func=self._model_func,
-                x_vars=self._x_vars,
-                y_vars=self._y_vars,
-                steps_ahead=self._steps_ahead,
-                model_kwargs=self._model_kwargs,
-                col_mode="replace_all",
-                nan_mode=self._nan_mode,
-            )
             if fit:
                 df_drop_na = hpandas.dropna(df, how="all")
                 if df_drop_na.empty:
@@ -433,9 +429,6 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
                         "No data found for key=%s, skipping the fit stage", key
                     )
                     continue
-                df_out = csklm.fit(df)["df_out"]
-                info_out = csklm.get_info("fit")
-                self._key_fit_state[key] = csklm.get_fit_state()
             else:
                 if key not in self._key_fit_state:
                     # TODO(Grisha): come up with a better mechanism to handle
@@ -445,11 +438,24 @@ class MultiindexSkLearnModel(dtfconobas.FitPredictNode):
                         key,
                     )
                     continue
-                csklm.set_fit_state(self._key_fit_state[key])
-                df_out = csklm.predict(df)["df_out"]
-                info_out = csklm.get_info("predict")
-            results[key] = df_out
-            info[key] = info_out
+            csklm = ContinuousSkLearnModel(
+                "sklearn",
+                model_func=self._model_func,
+                x_vars=self._x_vars,
+                y_vars=self._y_vars,
+                steps_ahead=self._steps_ahead,
+                model_kwargs=self._model_kwargs,
+                col_mode="replace_all",
+                nan_mode=self._nan_mode,
+            )
+            node_dfs[key] = (csklm, df)
+        results, info = dtfconobas.fit_predict_nodes(
+            node_dfs,
+            fit,
+            self._key_fit_state,
+            num_threads=self._num_threads,
+            backend=self._backend,
+        )
         df_out = dtfconobas.GroupedColDfToDfColProcessor.postprocess(
             results, self._out_col_group
         )
@@ -1,9 +1,12 @@
-from typing import Tuple
+from typing import Callable, List, Optional, Tuple
 
 import pandas as pd
 
 import core.config as cconfig
+import dataflow.core.dag as dtfcordag
 import dataflow.core.node as dtfcornode
+import dataflow.core.nodes.sources as dtfconosou
+import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 
 
@@ -68,3 +71,84 @@ def get_fit_predict_outputs(
         df_predict_out.round(decimals), num_rows=None, precision=decimals
     )
     return fit, predict
+
+
+def check_incremental_predict(
+    get_nodes: Callable[[], List[dtfcornode.Node]],
+    data: pd.DataFrame,
+    num_initial_rows: int,
+    *,
+    window_size: Optional[int] = None,
+) -> int:
+    """
+    Check that predicting incrementally gives the same output as predicting on
+    the entire data, bar by bar.
+
+    The nodes are connected in a linear pipeline fed by `data`, which is
+    revealed one row at a time after the first `num_initial_rows` rows. At
+    each step, the pipeline executed incrementally is compared with a new
+    pipeline executed from scratch.
+
+    :param get_nodes: build the nodes of the pipeline
+    :param data: data to feed the pipeline
+    :param num_initial_rows: number of rows available at the first step
+    :param window_size: if not `None`, feed only the last `window_size` rows
+        at each step, like a real-time source with a lookback window
+    :return: number of steps checked
+    """
+
+    def _get_dag() -> Tuple[dtfcordag.DAG, dtfconosou.DfDataSource]:
+        dag = dtfcordag.DAG(mode="strict")
+        source = dtfconosou.DfDataSource("data", data)
+        dag.add_node(source)
+        tail_nid = source.nid
+        for node in get_nodes():
+            dag.add_node(node)
+            dag.connect(tail_nid, node.nid)
+            tail_nid = node.nid
+        return dag, source
+
+    def _run(
+        dag: dtfcordag.DAG,
+        source: dtfconosou.DfDataSource,
+        start_timestamp: Optional[pd.Timestamp],
+        end_timestamp: pd.Timestamp,
+        incremental: bool,
+    ) -> pd.DataFrame:
+        source.set_predict_intervals([(start_timestamp, end_timestamp)])
+        df_out = dag.run_leq_node(
+            dag.get_unique_sink(),
+            "predict",
+            progress_bar=False,
+            incremental=incremental,
+        )["df_out"]
+        return df_out
+
+    hdbg.dassert_lte(1, num_initial_rows)
+    incremental_dag, incremental_source = _get_dag()
+    num_steps = 0
+    for end_idx in range(num_initial_rows - 1, data.shape[0]):
+        end_timestamp = data.index[end_idx]
+        start_timestamp = None
+        if window_size is not None:
+            start_timestamp = data.index[max(0, end_idx - window_size + 1)]
+        actual = _run(
+            incremental_dag,
+            incremental_source,
+            start_timestamp,
+            end_timestamp,
+            incremental=True,
+        )
+        expected = _run(
+            *_get_dag(), start_timestamp, end_timestamp, incremental=False
+        )
+        # The frequency of the index is not propagated when appending rows,
+        # so compare only values, dtypes, and indices.
+        hdbg.dassert(
+            actual.equals(expected),
+            "Outputs differ at end_timestamp=%s:\n%s",
+            end_timestamp,
+            actual.compare(expected) if actual.shape == expected.shape else "",
+        )
+        num_steps += 1
+    return num_steps
@@ -311,6 +311,54 @@ class TestMultiindexSkLearnModel(hunitest.TestCase):
         )
         self.check_string(df_str, fuzzy_match=True)
 
+    def test_parallel1(self) -> None:
+        """
+        Check that fitting the keys in parallel gives the same results as
+        fitting them serially.
+        """
+        data = self._get_data()
+        data_fit = data.loc[:"2000-01-31"]  # type: ignore[misc]
+        data_predict = data.loc["2000-01-31":]  # type: ignore[misc]
+        outputs = []
+        for num_threads in ["serial", 2]:
+            node = dtfcnoskmo.MultiindexSkLearnModel(
+                "sklearn",
+                in_col_groups=[("ret_0",)],
+                out_col_group=(),
+                model_func=slmode.Ridge,
+                x_vars=["ret_0"],
+                y_vars=["ret_0"],
+                steps_ahead=1,
+                model_kwargs={"alpha": 0.5},
+                num_threads=num_threads,
+                backend="threading",
+            )
+            df_fit = node.fit(data_fit)["df_out"]
+            df_predict = node.predict(data_predict)["df_out"]
+            outputs.append((df_fit, df_predict, node.get_info("fit")))
+        hunitest.compare_df(outputs[0][0], outputs[1][0])
+        hunitest.compare_df(outputs[0][1], outputs[1][1])
+        self.assertEqual(list(outputs[0][2].keys()), list(outputs[1][2].keys()))
+
+    def test_parallel2(self) -> None:
+        """
+        Check that the backend that can't pickle lambdas is rejected.
+        """
+        data = self._get_data()
+        node = dtfcnoskmo.MultiindexSkLearnModel(
+            "sklearn",
+            in_col_groups=[("ret_0",)],
+            out_col_group=(),
+            model_func=slmode.Ridge,
+            x_vars=["ret_0"],
+            y_vars=["ret_0"],
+            steps_ahead=1,
+            num_threads=2,
+            backend="multiprocessing",
+        )
+        with self.assertRaises(AssertionError):
+            node.fit(data)
+
     def _get_data(self) -> pd.DataFrame:
         """
         Generate multivariate normal returns.
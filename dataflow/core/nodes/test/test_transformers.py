@@ -1,5 +1,6 @@
 import io
 import logging
+from typing import Any, List
 
 import numpy as np
 import pandas as pd
@@ -7,6 +8,9 @@ import pytest
 
 import core.artificial_signal_generators as carsigen
 import core.config as cconfig
+import core.finance as cofinanc
+import core.signal_processing as csigproc
+import dataflow.core.node as dtfcornode
 import dataflow.core.nodes.test.helpers as cdnth
 import dataflow.core.nodes.transformers as dtfconotra
 import helpers.hpandas as hpandas
@@ -966,3 +970,231 @@ class TestMultiindexTwapVwapComputer(hunitest.TestCase):
             volume[col] = volume_srs
         df = pd.concat([prices, volume], axis=1, keys=["close", "volume"])
         return df
+
+
+def _get_bar_data() -> pd.DataFrame:
+    """
+    Build 1-minute bars with some NaNs.
+    """
+    np.random.seed(42)
+    num_rows = 40
+    index = pd.date_range(
+        "2022-01-03 09:31", periods=num_rows, freq="1T", tz="America/New_York"
+    )
+    data = pd.DataFrame(
+        {
+            "close": 100 + np.random.randn(num_rows).cumsum(),
+            "volume": np.random.randint(1, 100, num_rows).astype(float),
+        },
+        index=index,
+    )
+    data.iloc[5:8, 0] = np.nan
+    data.iloc[20, 1] = np.nan
+    return data
+
+
+class TestColumnTransformer1(hunitest.TestCase):
+    def test_incremental1(self) -> None:
+        """
+        Check the EMA computed incrementally.
+        """
+
+        def _get_nodes() -> List[dtfcornode.Node]:
+            node = dtfconotra.ColumnTransformer(
+                "ema",
+                transformer_func=csigproc.compute_smooth_moving_average,
+                transformer_kwargs={"tau": 3},
+                col_rename_func=lambda x: x + "_ema",
+                col_mode="merge_all",
+            )
+            self.assertTrue(node.can_predict_increment())
+            return [node]
+
+        num_steps = cdnth.check_incremental_predict(
+            _get_nodes, _get_bar_data(), 1
+        )
+        self.assertEqual(num_steps, 40)
+
+    def test_incremental2(self) -> None:
+        """
+        Check the z-score computed incrementally dropping NaNs.
+        """
+
+        def _get_nodes() -> List[dtfcornode.Node]:
+            node = dtfconotra.ColumnTransformer(
+                "zscore",
+                transformer_func=csigproc.compute_rolling_zscore,
+                transformer_kwargs={"tau": 4, "min_periods": 2, "delay": 1},
+                col_mode="replace_all",
+                nan_mode="drop",
+            )
+            self.assertTrue(node.can_predict_increment())
+            return [node]
+
+        num_steps = cdnth.check_incremental_predict(
+            _get_nodes, _get_bar_data(), 10
+        )
+        self.assertEqual(num_steps, 31)
+
+    def test_sliding_window1(self) -> None:
+        """
+        Check the EMA when the input is a sliding window dropping its first
+        rows, like the one of a real-time source with a lookback.
+        """
+
+        def _get_nodes() -> List[dtfcornode.Node]:
+            node = dtfconotra.ColumnTransformer(
+                "ema",
+                transformer_func=csigproc.compute_smooth_moving_average,
+                transformer_kwargs={"tau": 3},
+                col_mode="replace_all",
+            )
+            return [node]
+
+        num_steps = cdnth.check_incremental_predict(
+            _get_nodes, _get_bar_data(), 1, window_size=10
+        )
+        self.assertEqual(num_steps, 40)
+
+    def test_can_predict_increment1(self) -> None:
+        """
+        Check the nodes that can't be executed incrementally.
+        """
+        # A function without an incremental version.
+        node = dtfconotra.ColumnTransformer(
+            "ret_0", transformer_func=lambda df: df.pct_change()
+        )
+        self.assertFalse(node.can_predict_increment())
+        # A kwarg not supported by the incremental version.
+        node = dtfconotra.ColumnTransformer(
+            "norm",
+            transformer_func=csigproc.compute_rolling_norm,
+            transformer_kwargs={"tau": 3, "delay": 1},
+        )
+        self.assertFalse(node.can_predict_increment())
+
+
+class TestGroupedColDfToDfTransformer5(hunitest.TestCase):
+    @staticmethod
+    def get_data() -> pd.DataFrame:
+        """
+        Build 1-minute bars for 2 assets.
+        """
+        data = _get_bar_data()
+        data = pd.concat({101: data, 202: 2 * data}, axis=1)
+        data = data.swaplevel(axis=1).sort_index(axis=1)
+        return data
+
+    @staticmethod
+    def get_resampler(**kwargs: Any) -> dtfconotra.GroupedColDfToDfTransformer:
+        node = dtfconotra.GroupedColDfToDfTransformer(
+            "resample",
+            in_col_groups=[("close",), ("volume",)],
+            out_col_group=(),
+            transformer_func=cofinanc.resample_bars,
+            transformer_kwargs={
+                "rule": "5T",
+                "resampling_groups": [
+                    ({"close": "close"}, "last", {}),
+                    ({"volume": "volume"}, "sum", {"min_count": 1}),
+                ],
+                "vwap_groups": [("close", "volume", "vwap")],
+            },
+            reindex_like_input=False,
+            join_output_with_input=False,
+            **kwargs,
+        )
+        return node
+
+    def test_incremental1(self) -> None:
+        """
+        Check the resampling computed incrementally, where the last bar is
+        updated by each new row.
+        """
+
+        def _get_nodes() -> List[dtfcornode.Node]:
+            node = self.get_resampler()
+            self.assertTrue(node.can_predict_increment())
+            return [node]
+
+        num_steps = cdnth.check_incremental_predict(
+            _get_nodes, self.get_data(), 1
+        )
+        self.assertEqual(num_steps, 40)
+
+    def test_pipeline1(self) -> None:
+        """
+        Check a pipeline propagating the updates of the last bar through
+        incremental and non-incremental nodes.
+        """
+
+        def _get_nodes() -> List[dtfcornode.Node]:
+            nodes = [
+                self.get_resampler(),
+                # Not incremental.
+                dtfconotra.ColumnTransformer(
+                    "compute_ret_0",
+                    transformer_func=lambda df: df.pct_change(),
+                    col_mode="replace_all",
+                ),
+                dtfconotra.ColumnTransformer(
+                    "compute_vol",
+                    transformer_func=csigproc.compute_rolling_norm,
+                    transformer_kwargs={"tau": 2},
+                    col_mode="replace_all",
+                ),
+            ]
+            return nodes
+
+        num_steps = cdnth.check_incremental_predict(
+            _get_nodes, self.get_data(), 3
+        )
+        self.assertEqual(num_steps, 38)
+
+    def test_sliding_window1(self) -> None:
+        """
+        Check the resampling when the input is a sliding window dropping its
+        first rows.
+        """
+        num_steps = cdnth.check_incremental_predict(
+            lambda: [self.get_resampler()], self.get_data(), 1, window_size=12
+        )
+        self.assertEqual(num_steps, 40)
+
+    def test_empty_output1(self) -> None:
+        """
+        Check the incremental resampling of increments without rows.
+        """
+        data = self.get_data()
+        node = self.get_resampler()
+        df_out, state = node.predict_increment(data.iloc[:0], None)
+        self.assertTrue(df_out.empty)
+        self.assertTrue(state.empty)
+        # The next increments are computed as if the empty one never happened.
+        df_out, state = node.predict_increment(data.iloc[:12], state)
+        self.assertEqual(len(state), 2)
+        # An empty increment recomputes the last bar from the state.
+        last_bar = df_out.iloc[-1:]
+        df_out, state = node.predict_increment(data.iloc[12:12], state)
+        hunitest.compare_df(df_out, last_bar)
+        self.assertEqual(len(state), 2)
+        df_out, _ = node.predict_increment(data.iloc[12:14], state)
+        expected = self.get_resampler().predict(data.iloc[:14])["df_out"]
+        hunitest.compare_df(df_out, expected.iloc[-1:])
+
+    def test_can_predict_increment1(self) -> None:
+        """
+        Check that resampling joined with the input is not incremental.
+        """
+        node = dtfconotra.GroupedColDfToDfTransformer(
+            "resample",
+            in_col_groups=[("close",), ("volume",)],
+            out_col_group=(),
+            transformer_func=cofinanc.resample_bars,
+            transformer_kwargs={
+                "rule": "5T",
+                "resampling_groups": [({"close": "close"}, "last", {})],
+                "vwap_groups": [],
+            },
+        )
+        self.assertFalse(node.can_predict_increment())
@@ -10,6 +10,7 @@ import pytest
 import core.artificial_signal_generators as carsigen
 import core.config as cconfig
 import core.signal_processing as csigproc
+import dataflow.core.node as dtfcornode
 import dataflow.core.nodes.test.helpers as cdnth
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
@@ -835,3 +836,66 @@ class TestVolatilityModulator(hunitest.TestCase):
         self.check_string(act, fuzzy_match=True)
         self.check_dataframe(df_in, tag="df_in", err_threshold=0.01)
         self.check_dataframe(df_out, tag="df_out", err_threshold=0.01)
+
+
+class TestVolatilityModulator2(hunitest.TestCase):
+    @staticmethod
+    def get_data() -> pd.DataFrame:
+        """
+        Build 1-minute bars with some NaNs.
+        """
+        np.random.seed(42)
+        num_rows = 40
+        index = pd.date_range(
+            "2022-01-03 09:31",
+            periods=num_rows,
+            freq="1T",
+            tz="America/New_York",
+        )
+        data = pd.DataFrame(
+            {
+                "close": 100 + np.random.randn(num_rows).cumsum(),
+                "volume": np.random.randint(1, 100, num_rows).astype(float),
+            },
+            index=index,
+        )
+        data.iloc[5:8, 0] = np.nan
+        data.iloc[20, 1] = np.nan
+        return data
+
+    def test_incremental1(self) -> None:
+        """
+        Check the demodulation computed incrementally dropping NaNs.
+        """
+
+        def _get_nodes() -> List[dtfcornode.Node]:
+            node = VolatilityModulator(
+                "modulate",
+                signal_cols=["volume"],
+                volatility_col="close",
+                signal_steps_ahead=0,
+                volatility_steps_ahead=2,
+                mode="modulate",
+                nan_mode="drop",
+            )
+            self.assertTrue(node.can_predict_increment())
+            return [node]
+
+        num_steps = cdnth.check_incremental_predict(
+            _get_nodes, self.get_data(), 1
+        )
+        self.assertEqual(num_steps, 40)
+
+    def test_can_predict_increment1(self) -> None:
+        """
+        Check that a node shifting the volatility backward is not incremental.
+        """
+        node = VolatilityModulator(
+            "modulate",
+            signal_cols=["volume"],
+            volatility_col="close",
+            signal_steps_ahead=2,
+            volatility_steps_ahead=0,
+            mode="modulate",
+        )
+        self.assertFalse(node.can_predict_increment())
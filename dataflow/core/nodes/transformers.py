@@ -4,6 +4,7 @@ Import as:
 import dataflow.core.nodes.transformers as dtfconotra
 """
 import collections
+import copy
 import inspect
 import logging
 from typing import (
@@ -22,6 +23,7 @@ import numpy as np
 import pandas as pd
 
 import core.finance as cofinanc
+import core.signal_processing as csigproc
 import dataflow.core.node as dtfcornode
 import dataflow.core.nodes.base as dtfconobas
 import dataflow.core.utils as dtfcorutil
@@ -37,9 +39,33 @@ _ResamplingRule = Union[pd.DateOffset, pd.Timedelta, str]
 # #############################################################################
 
 
-class ColumnTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
+_MOMENT_KWARGS = ["tau", "min_periods", "min_depth", "max_depth"]
+
+# Functions computed incrementally by `ColumnTransformer` with
+# `csigproc.RollingMomentsEngine`, mapped to the moment of the engine and to
+# the kwargs of the function supported by the engine.
+_INCREMENTAL_MOMENTS = {
+    csigproc.compute_smooth_moving_average: ("mean", _MOMENT_KWARGS),
+    csigproc.compute_rolling_demean: ("demean", _MOMENT_KWARGS),
+    csigproc.compute_rolling_var: ("var", _MOMENT_KWARGS + ["p_moment"]),
+    csigproc.compute_rolling_std: ("std", _MOMENT_KWARGS + ["p_moment"]),
+    csigproc.compute_rolling_norm: ("norm", _MOMENT_KWARGS + ["p_moment"]),
+    csigproc.compute_rolling_zscore: (
+        "zscore",
+        _MOMENT_KWARGS + ["p_moment", "demean", "delay", "atol"],
+    ),
+}
+
+
+class ColumnTransformer(
+    dtfconobas.Transformer, dtfconobas.ColModeMixin, dtfconobas.IncrementalNode
+):
     """
     Perform non-index modifying changes of columns.
+
+    The node can be executed incrementally when `transformer_func` is a smooth
+    moving moment, e.g., `csigproc.compute_rolling_zscore()`, see
+    `_INCREMENTAL_MOMENTS`.
     """
 
     def __init__(
@@ -96,9 +122,59 @@ class ColumnTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         col_names = cast(List[str], col_names)
         return col_names
 
+    def can_predict_increment(self) -> bool:
+        return self._get_incremental_moment() is not None
+
+    def predict_increment(
+        self, new_rows: pd.DataFrame, state: Optional[Any]
+    ) -> Tuple[pd.DataFrame, Any]:
+        moment = self._get_incremental_moment()
+        hdbg.dassert_is_not(moment, None)
+        # The state is the engine after processing the previous rows.
+        if state is None:
+            engine = csigproc.RollingMomentsEngine(
+                moments=[moment], **self._transformer_kwargs
+            )
+        else:
+            engine = copy.deepcopy(state)
+        # The kwargs of `transformer_func` are already used by the engine.
+        df_out, info = self._transform_with_func(
+            new_rows, lambda df, **kwargs: engine.update(df)[moment]
+        )
+        self._set_info("predict", info)
+        return df_out, engine
+
+    def _get_incremental_moment(self) -> Optional[str]:
+        """
+        Return the moment of `csigproc.RollingMomentsEngine` computing
+        `transformer_func`, or `None` if the node is not incremental.
+        """
+        if type(self)._transform is not ColumnTransformer._transform:
+            # A derived class can transform the data in a different way.
+            return None
+        if self._transformer_func not in _INCREMENTAL_MOMENTS:
+            return None
+        moment, supported_kwargs = _INCREMENTAL_MOMENTS[self._transformer_func]
+        if "tau" not in self._transformer_kwargs or not set(
+            self._transformer_kwargs
+        ).issubset(supported_kwargs):
+            return None
+        return moment
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
+        return self._transform_with_func(df, self._transformer_func)
+
+    def _transform_with_func(
+        self, df: pd.DataFrame, transformer_func: Callable[..., pd.DataFrame]
+    ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
+        """
+        Transform the columns of `df` with `transformer_func`.
+
+        :param transformer_func: same as in the constructor
+        :return: df, info
+        """
         df_in = df.copy()
         df = df.copy()
         if self._fit_cols is None:
@@ -120,15 +196,13 @@ class ColumnTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
         # Introspect to see whether `_transformer_func` contains an `info`
         # parameter. If so, inject an empty dict to be populated when
         # `_transformer_func` is executed.
-        func_sig = inspect.signature(self._transformer_func)
+        func_sig = inspect.signature(transformer_func)
         if "info" in func_sig.parameters:
             func_info = collections.OrderedDict()  # type: ignore
-            df = self._transformer_func(
-                df, info=func_info, **self._transformer_kwargs
-            )
+            df = transformer_func(df, info=func_info, **self._transformer_kwargs)
             info["func_info"] = func_info
         else:
-            df = self._transformer_func(df, **self._transformer_kwargs)
+            df = transformer_func(df, **self._transformer_kwargs)
         # Reindex df to align it with the original data.
         df = df.reindex(index=idx)
         # TODO(Paul): Consider supporting the option of relaxing or foregoing this
@@ -265,9 +339,16 @@ class SeriesTransformer(dtfconobas.Transformer, dtfconobas.ColModeMixin):
 # #############################################################################
 
 
-class GroupedColDfToDfTransformer(dtfconobas.Transformer):
+class GroupedColDfToDfTransformer(
+    dtfconobas.Transformer, dtfconobas.IncrementalNode
+):
     """
     Wrap transformers using the `GroupedColDfToDfColProcessor` pattern.
+
+    The node can be executed incrementally when resampling bars with
+    `cofinanc.resample_bars()`: only the input rows of the last bar are kept,
+    since the last bar can still change, and the resampling is recomputed on
+    these rows and the new ones.
     """
 
     def __init__(
@@ -328,6 +409,45 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         # The leaf col names are determined from the dataframe at runtime.
         self._leaf_cols = None
 
+    def can_predict_increment(self) -> bool:
+        if self._transformer_func is not cofinanc.resample_bars:
+            return False
+        if self._join_output_with_input or self._reindex_like_input:
+            # The output is not indexed by the bars.
+            return False
+        # The rows of the last bar are found assuming that the bars are
+        # `(a, b]` intervals labeled with `b`, which is the default of
+        # `cofinanc.resample()`.
+        resample_kwargs = self._transformer_kwargs.get("resample_kwargs") or {}
+        return (
+            resample_kwargs.get("closed", "right") == "right"
+            and resample_kwargs.get("label", "right") == "right"
+        )
+
+    def predict_increment(
+        self, new_rows: pd.DataFrame, state: Optional[Any]
+    ) -> Tuple[pd.DataFrame, Any]:
+        # The state is the input rows of the last bar.
+        if state is None:
+            df = new_rows
+        else:
+            df = pd.concat([state, new_rows])
+        if df.empty:
+            # No input rows yet, e.g., when the first increment is empty.
+            return pd.DataFrame(index=df.index), df
+        df_out, info = self._transform(df)
+        self._set_info("predict", info)
+        if df_out.empty:
+            # No bar yet, e.g., when the transformer failed with a permitted
+            # exception, so keep all the rows.
+            return df_out, df
+        # Keep the input rows of the last bar.
+        bar_start = df_out.index[-1] - pd.tseries.frequencies.to_offset(
+            self._transformer_kwargs["rule"]
+        )
+        state = df.iloc[df.index.searchsorted(bar_start, side="right") :]
+        return df_out, state
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
@@ -426,6 +546,45 @@ class CrossSectionalDfToDfTransformer(dtfconobas.Transformer):
         # The leaf col names are determined from the dataframe at runtime.
         self._leaf_cols = None
 
+    def can_predict_increment(self) -> bool:
+        if self._transformer_func is not cofinanc.resample_bars:
+            return False
+        if self._join_output_with_input or self._reindex_like_input:
+            # The output is not indexed by the bars.
+            return False
+        # The rows of the last bar are found assuming that the bars are
+        # `(a, b]` intervals labeled with `b`, which is the default of
+        # `cofinanc.resample()`.
+        resample_kwargs = self._transformer_kwargs.get("resample_kwargs") or {}
+        return (
+            resample_kwargs.get("closed", "right") == "right"
+            and resample_kwargs.get("label", "right") == "right"
+        )
+
+    def predict_increment(
+        self, new_rows: pd.DataFrame, state: Optional[Any]
+    ) -> Tuple[pd.DataFrame, Any]:
+        # The state is the input rows of the last bar.
+        if state is None:
+            df = new_rows
+        else:
+            df = pd.concat([state, new_rows])
+        if df.empty:
+            # No input rows yet, e.g., when the first increment is empty.
+            return pd.DataFrame(index=df.index), df
+        df_out, info = self._transform(df)
+        self._set_info("predict", info)
+        if df_out.empty:
+            # No bar yet, e.g., when the transformer failed with a permitted
+            # exception, so keep all the rows.
+            return df_out, df
+        # Keep the input rows of the last bar.
+        bar_start = df_out.index[-1] - pd.tseries.frequencies.to_offset(
+            self._transformer_kwargs["rule"]
+        )
+        state = df.iloc[df.index.searchsorted(bar_start, side="right") :]
+        return df_out, state
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
@@ -6,7 +6,7 @@ import dataflow.core.nodes.volatility_models as dtfcnovomo
 
 import collections
 import logging
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -418,8 +418,7 @@ class _MultiColVolatilityModelMixin:
     def _fit_predict_volatility_model(
         self, df: pd.DataFrame, fit: bool, out_col_prefix: Optional[str] = None
     ) -> Tuple[Dict[str, pd.DataFrame], collections.OrderedDict]:
-        dfs = {}
-        info = collections.OrderedDict()
+        node_dfs = {}
         for col in df.columns:
             local_out_col_prefix = out_col_prefix or col
             scvm = SingleColumnVolatilityModel(
@@ -432,16 +431,14 @@ class _MultiColVolatilityModelMixin:
                 nan_mode=self._nan_mode,
                 out_col_prefix=local_out_col_prefix,
             )
-            if fit:
-                df_out = scvm.fit(df[[col]])["df_out"]
-                info_out = scvm.get_info("fit")
-                self._col_fit_state[col] = scvm.get_fit_state()
-            else:
-                scvm.set_fit_state(self._col_fit_state[col])
-                df_out = scvm.predict(df[[col]])["df_out"]
-                info_out = scvm.get_info("predict")
-            dfs[col] = df_out
-            info[col] = info_out
+            node_dfs[col] = (scvm, df[[col]])
+        dfs, info = dtfconobas.fit_predict_nodes(
+            node_dfs,
+            fit,
+            self._col_fit_state,
+            num_threads=self._num_threads,
+            backend=self._backend,
+        )
         return dfs, info
 
 
@@ -468,6 +465,9 @@ class VolatilityModel(
         col_rename_func: Callable[[Any], Any] = lambda x: f"{x}_zscored",
         col_mode: Optional[str] = None,
         nan_mode: Optional[str] = None,
+        *,
+        num_threads: Union[str, int] = "serial",
+        backend: str = "loky",
     ) -> None:
         """
         Specify the data and smooth moving average (SMA) modeling parameters.
@@ -486,6 +486,8 @@ class VolatilityModel(
               and transformed selected columns
             - If "replace_all", leave only transformed selected columns
         :param nan_mode: as in ContinuousSkLearnModel
+        :param num_threads, backend: how to fit / predict the models of the
+            different columns, as in `dtfconobas.fit_predict_nodes()`
         """
         super().__init__(nid)
         self._cols = cols
@@ -501,6 +503,8 @@ class VolatilityModel(
         self._col_rename_func = col_rename_func
         self._col_mode = col_mode or "merge_all"
         self._nan_mode = nan_mode
+        self._num_threads = num_threads
+        self._backend = backend
         # State of the model to serialize/deserialize.
         self._fit_cols: List[dtfcorutil.NodeColumn] = []
         self._col_fit_state = {}
@@ -563,6 +567,9 @@ class MultiindexVolatilityModel(
         progress_bar: bool = False,
         tau: Optional[float] = None,
         nan_mode: Optional[str] = None,
+        *,
+        num_threads: Union[str, int] = "serial",
+        backend: str = "loky",
     ) -> None:
         """
         Specify the data and sma modeling parameters.
@@ -573,6 +580,8 @@ class MultiindexVolatilityModel(
         :param tau: as in `csigproc.compute_smooth_moving_average`. If `None`,
             learn this parameter
         :param nan_mode: as in ContinuousSkLearnModel
+        :param num_threads, backend: how to fit / predict the models of the
+            different columns, as in `dtfconobas.fit_predict_nodes()`
         """
         super().__init__(nid)
         hdbg.dassert_isinstance(in_col_group, tuple)
@@ -588,6 +597,8 @@ class MultiindexVolatilityModel(
         #
         self._tau = tau
         self._nan_mode = nan_mode
+        self._num_threads = num_threads
+        self._backend = backend
         #
         self._col_fit_state = {}
 
@@ -625,7 +636,11 @@ class MultiindexVolatilityModel(
         return {"df_out": df_out}
 
 
-class VolatilityModulator(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
+class VolatilityModulator(
+    dtfconobas.FitPredictNode,
+    dtfconobas.ColModeMixin,
+    dtfconobas.IncrementalNode,
+):
     """
     Modulate or demodulate signal by volatility.
 
@@ -690,26 +705,49 @@ class VolatilityModulator(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
         self._nan_mode = nan_mode or "leave_unchanged"
 
     def fit(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-        df_out = self._process_signal(df_in)
+        df_out, _ = self._process_signal(df_in)
         info = collections.OrderedDict()
         info["df_out_info"] = dtfcorutil.get_df_info_as_string(df_out)
         self._set_info("fit", info)
         return {"df_out": df_out}
 
     def predict(self, df_in: pd.DataFrame) -> Dict[str, pd.DataFrame]:
-        df_out = self._process_signal(df_in)
+        df_out, _ = self._process_signal(df_in)
         info = collections.OrderedDict()
         info["df_out_info"] = dtfcorutil.get_df_info_as_string(df_out)
         self._set_info("predict", info)
         return {"df_out": df_out}
 
-    def _process_signal(self, df_in: pd.DataFrame) -> pd.DataFrame:
+    def can_predict_increment(self) -> bool:
+        # Shifting the volatility backward requires future values.
+        return self._volatility_steps_ahead >= self._signal_steps_ahead
+
+    def predict_increment(
+        self, new_rows: pd.DataFrame, state: Optional[Any]
+    ) -> Tuple[pd.DataFrame, Any]:
+        # The state is the tail of the volatility needed to shift it.
+        df_out, state = self._process_signal(new_rows, volatility_history=state)
+        info = collections.OrderedDict()
+        info["df_out_info"] = dtfcorutil.get_df_info_as_string(df_out)
+        self._set_info("predict", info)
+        return df_out, state
+
+    def _process_signal(
+        self,
+        df_in: pd.DataFrame,
+        *,
+        volatility_history: Optional[pd.Series] = None,
+    ) -> Tuple[pd.DataFrame, pd.Series]:
         """
         Modulate or demodulate signal by volatility prediction.
 
         :param df_in: dataframe with `self._signal_cols` and
             `self._volatility_col` columns
-        :return: adjusted signal indexed in the same way as the input signal
+        :param volatility_history: volatility values preceding `df_in`
+            needed to shift the volatility, as returned by a previous call
+        :return:
+            - adjusted signal indexed in the same way as the input signal
+            - volatility values needed to process the rows following `df_in`
         """
         hdbg.dassert_is_subset(self._signal_cols, df_in.columns.tolist())
         hdbg.dassert_in(self._volatility_col, df_in.columns)
@@ -723,7 +761,15 @@ class VolatilityModulator(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
             pass
         else:
             raise ValueError(f"Unrecognized `nan_mode` {self._nan_mode}")
+        num_history_rows = 0
+        if volatility_history is not None:
+            num_history_rows = volatility_history.shape[0]
+            fwd_volatility = pd.concat([volatility_history, fwd_volatility])
         volatility_aligned = fwd_volatility.shift(volatility_shift)
+        volatility_aligned = volatility_aligned.iloc[num_history_rows:]
+        volatility_history = fwd_volatility.iloc[
+            max(fwd_volatility.shape[0] - max(volatility_shift, 0), 0) :
+        ]
         # Adjust signal by volatility.
         if self._mode == "demodulate":
             adjusted_signal = fwd_signal.divide(volatility_aligned, axis=0)
@@ -738,4 +784,4 @@ class VolatilityModulator(dtfconobas.FitPredictNode, dtfconobas.ColModeMixin):
             col_rename_func=self._col_rename_func,
             col_mode=self._col_mode,
         )
-        return df_out
+        return df_out, volatility_history
@@ -1,8 +1,13 @@
 import logging
 import os
+from typing import List
+
+import pandas as pd
 
 import dataflow.core.dag as dtfcordag
 import dataflow.core.node as dtfcornode
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
 import dataflow.core.visualization as dtfcorvisu
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
@@ -528,3 +533,97 @@ class Test_dataflow_core_DAG5(_TestDataflowHelper):
         #
         dag1.compose(dag2)
         self._check(dag1)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG6
+# #############################################################################
+
+
+class Test_dataflow_core_DAG6(hunitest.TestCase):
+    def test_write_in_background1(self) -> None:
+        """
+        Check that the debug info written in the background is the same as
+        the one written synchronously.
+        """
+        sync_dir = os.path.join(self.get_scratch_space(), "sync")
+        self._run_dag(sync_dir, write_in_background=False)
+        background_dir = os.path.join(self.get_scratch_space(), "background")
+        self._run_dag(background_dir, write_in_background=True)
+        # Check the file names, skipping the metrics whose names contain the
+        # machine timestamp and the pid.
+        sync_file_names = self._get_file_names(sync_dir)
+        background_file_names = self._get_file_names(background_dir)
+        self.assertEqual(sync_file_names, background_file_names)
+        self.assertEqual(len(sync_file_names), 6)
+        self.assertEqual(
+            len(os.listdir(os.path.join(background_dir, "node_io.metrics"))), 1
+        )
+        # Check the data.
+        for file_name in sync_file_names:
+            if file_name.endswith(".csv.gz"):
+                sync_df = pd.read_csv(os.path.join(sync_dir, file_name))
+                background_df = pd.read_csv(
+                    os.path.join(background_dir, file_name)
+                )
+                self.assertTrue(sync_df.equals(background_df))
+
+    def test_set_debug_mode1(self) -> None:
+        """
+        Check that setting the debug mode again reuses the background worker
+        if it has the same params.
+        """
+        dst_dir = self.get_scratch_space()
+        dag = dtfcordag.DAG()
+        dag.set_debug_mode("", False, False, dst_dir, write_in_background=True)
+        debug_writer = dag._debug_writer
+        self.assertIsNotNone(debug_writer)
+        dag.set_debug_mode("", False, False, dst_dir, write_in_background=True)
+        self.assertIs(dag._debug_writer, debug_writer)
+        # Changing the params starts a new worker.
+        dag.set_debug_mode(
+            "",
+            False,
+            False,
+            dst_dir,
+            write_in_background=True,
+            drop_writes_when_full=True,
+        )
+        self.assertIsNot(dag._debug_writer, debug_writer)
+        # Disabling the background writes stops the worker.
+        dag.set_debug_mode("", False, False, dst_dir)
+        self.assertIsNone(dag._debug_writer)
+
+    @staticmethod
+    def _run_dag(dst_dir: str, write_in_background: bool) -> None:
+        wall_clock_time = pd.Timestamp("2022-01-03 09:35", tz="America/New_York")
+        dag = dtfcordag.DAG(get_wall_clock_time=lambda: wall_clock_time)
+        df = pd.DataFrame(
+            {"close": [100.0, 101.0, 102.0]},
+            index=pd.date_range("2022-01-03 09:31", periods=3, freq="1T"),
+        )
+        dag.append_to_tail(dtfconosou.DfDataSource("read_data", df))
+        dag.append_to_tail(
+            dtfconotra.FunctionWrapper("compute_ret_0", lambda df: df.diff())
+        )
+        dag.set_debug_mode(
+            "df_as_csv_and_pq",
+            True,
+            True,
+            dst_dir,
+            write_in_background=write_in_background,
+            max_pending_writes=1,
+        )
+        dag.run_leq_node("compute_ret_0", "predict")
+        dag.flush_debug_writes()
+
+    @staticmethod
+    def _get_file_names(dir_name: str) -> List[str]:
+        file_names = []
+        for root, _, files in os.walk(dir_name):
+            if os.path.basename(root) == "node_io.metrics":
+                continue
+            for file_name in files:
+                file_name = os.path.join(root, file_name)
+                file_names.append(os.path.relpath(file_name, dir_name))
+        return sorted(file_names)
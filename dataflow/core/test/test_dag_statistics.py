@@ -2,10 +2,15 @@ import logging
 import os
 
 import pandas as pd
+import pyarrow.parquet as pq
 
+import dataflow.core.dag as dtfcordag
 import dataflow.core.dag_statistics as dtfcodasta
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
 import helpers.hparquet as hparque
 import helpers.hunit_test as hunitest
+import helpers.hwall_clock_time as hwacltim
 
 _LOG = logging.getLogger(__name__)
 
@@ -88,3 +93,89 @@ class Test_compare_dag_outputs(hunitest.TestCase):
         # Check. It should exit from the function safely, i.e. return `None`.
         expected = "None"
         self.assert_equal(actual, expected)
+
+
+class Test_get_execution_time_for_all_dag_nodes_from_metrics(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check the execution time loaded from the metrics saved by a DAG.
+        """
+        dag_dir = self.get_scratch_space()
+        dag = dtfcordag.DAG()
+        df = pd.DataFrame(
+            {"close": [100.0, 101.0, 102.0]},
+            index=pd.date_range("2022-01-03 09:31", periods=3, freq="1T"),
+        )
+        dag.append_to_tail(dtfconosou.DfDataSource("read_data", df))
+        dag.append_to_tail(
+            dtfconotra.FunctionWrapper("compute_ret_0", lambda df: df.diff())
+        )
+        dag.set_debug_mode("", False, True, dag_dir)
+        # Run the DAG for 3 bars.
+        bar_timestamps = pd.date_range(
+            "2022-01-03 09:35", periods=3, freq="5T", tz="America/New_York"
+        )
+        try:
+            for bar_timestamp in bar_timestamps:
+                hwacltim.set_current_bar_timestamp(bar_timestamp)
+                dag.run_leq_node("compute_ret_0", "predict")
+        finally:
+            hwacltim.reset_current_bar_timestamp()
+        # The metrics of all the bars are saved in a single file, with a row
+        # group per bar.
+        dag.flush_debug_writes()
+        metrics_dir = os.path.join(dag_dir, "node_io.metrics")
+        file_names = os.listdir(metrics_dir)
+        self.assertEqual(len(file_names), 1)
+        file_name = os.path.join(metrics_dir, file_names[0])
+        self.assertEqual(pq.ParquetFile(file_name).num_row_groups, 3)
+        # Check the execution time.
+        actual = dtfcodasta.get_execution_time_for_all_dag_nodes_from_metrics(
+            dag_dir
+        )
+        self.assertEqual(
+            actual.columns.tolist(), ["all_nodes", "read_data", "compute_ret_0"]
+        )
+        self.assertEqual(actual.index.tolist(), bar_timestamps.tolist())
+        self.assertTrue((actual > 0).all().all())
+        # Check the stats.
+        actual = dtfcodasta.get_slowest_dag_nodes(dag_dir)
+        self.assertEqual(
+            sorted(actual.index.tolist()), ["compute_ret_0", "read_data"]
+        )
+        self.assertEqual(actual[("num_bars", "")].tolist(), [3, 3])
+        # Check the output shapes.
+        metrics = dtfcordag.load_node_metrics_from_dst_dir(dag_dir)
+        self.assertEqual(metrics.shape[0], 6)
+        self.assertEqual(metrics["num_rows"].tolist(), [3] * 6)
+        self.assertEqual(metrics["num_cols"].tolist(), [1] * 6)
+
+    def test2(self) -> None:
+        """
+        Check the execution time of a DAG run with `run_dag()` outside a
+        real-time loop, i.e., without a bar timestamp.
+        """
+        dag_dir = self.get_scratch_space()
+        dag = dtfcordag.DAG()
+        df = pd.DataFrame(
+            {"close": [100.0, 101.0, 102.0]},
+            index=pd.date_range("2022-01-03 09:31", periods=3, freq="1T"),
+        )
+        dag.append_to_tail(dtfconosou.DfDataSource("read_data", df))
+        dag.append_to_tail(
+            dtfconotra.FunctionWrapper("compute_ret_0", lambda df: df.diff())
+        )
+        dag.set_debug_mode("", False, True, dag_dir)
+        hwacltim.reset_current_bar_timestamp()
+        dag.run_dag("predict")
+        dag.flush_debug_writes()
+        # Check the execution time.
+        actual = dtfcodasta.get_execution_time_for_all_dag_nodes_from_metrics(
+            dag_dir
+        )
+        self.assertEqual(
+            actual.columns.tolist(), ["all_nodes", "read_data", "compute_ret_0"]
+        )
+        self.assertEqual(actual.shape[0], 1)
+        self.assertTrue(pd.isna(actual.index[0]))
+        self.assertTrue((actual > 0).all().all())
@@ -1,4 +1,5 @@
 import logging
+from typing import Any, List, Tuple
 
 import pandas as pd
 
@@ -91,6 +92,61 @@ class TestRollingFitPredictDagRunner1(hunitest.TestCase):
 """
         self.assert_equal(actual, expected, fuzzy_match=True)
 
+    def test_parallel1(self) -> None:
+        """
+        Check that running the windows in parallel gives the same results as
+        running them serially.
+        """
+        serial_outputs = self._fit_predict()
+        self.assertEqual(len(serial_outputs), 2)
+        parallel_outputs = self._fit_predict(
+            num_threads=2, backend="threading", max_windows_in_flight=1
+        )
+        self.assertEqual(len(parallel_outputs), 2)
+        for serial_output, parallel_output in zip(
+            serial_outputs, parallel_outputs
+        ):
+            self.assertEqual(serial_output[0], parallel_output[0])
+            self.assertTrue(serial_output[1].equals(parallel_output[1]))
+            self.assertTrue(serial_output[2].equals(parallel_output[2]))
+            self.assert_equal(serial_output[3], parallel_output[3])
+
+    @staticmethod
+    def _fit_predict(**kwargs: Any) -> List[Tuple[str, Any, Any, str]]:
+        """
+        Run a `RollingFitPredictDagRunner` using `ArmaReturnsBuilder`.
+
+        :return: training time, fit df, predict df and fit state of the DAG
+            for each window
+        """
+        dag_builder = dtfcdabuex.ArmaReturnsBuilder()
+        config = dag_builder.get_config_template()
+        config.update_mode = "overwrite"
+        config["rets/read_data", "end_date"] = "2010-01-22 16:30:00"
+        dag = dag_builder.get_dag(config)
+        dag_builder_func = lambda: dag_builder.get_dag(config)
+        dag_runner = dtfcodarun.RollingFitPredictDagRunner(
+            dag,
+            pd.Timestamp("2010-01-12 09:00"),
+            pd.Timestamp("2010-01-20 16:00"),
+            "1W",
+            1,
+            dag_builder_func=dag_builder_func,
+            **kwargs,
+        )
+        outputs = []
+        for training_datetime_str, fit_rb, predict_rb in dag_runner.fit_predict():
+            fit_state = str(dtfcorvisi.get_fit_state(dag_runner.dag))
+            outputs.append(
+                (
+                    training_datetime_str,
+                    fit_rb.result_df,
+                    predict_rb.result_df,
+                    fit_state,
+                )
+            )
+        return outputs
+
 
 # #############################################################################
 
@@ -125,3 +181,32 @@ class TestIncrementalDagRunner1(hunitest.TestCase):
             srs_i = rb_i.result_df[col]
             srs_i_next = rb_i_next.result_df[col]
             self.assertTrue(srs_i.compare(srs_i_next[:-1]).empty)
+
+    def test_incremental_predict1(self) -> None:
+        """
+        Check that predicting incrementally gives the same results.
+        """
+        dag_builder = dtfcdabuex.ArmaReturnsBuilder()
+        config = dag_builder.get_config_template()
+        result_dfs = []
+        for incremental_predict in [False, True]:
+            dag = dag_builder.get_dag(config)
+            nid = dag.get_unique_sink()
+            dag.run_leq_node(nid, "fit")
+            fit_state = dtfcorvisi.get_fit_state(dag)
+            dag_runner = dtfcodarun.IncrementalDagRunner(
+                dag=dag,
+                start_timestamp="2010-01-04 15:30",
+                end_timestamp="2010-01-04 15:45",
+                freq="5T",
+                fit_state=fit_state,
+                incremental_predict=incremental_predict,
+            )
+            result_dfs.append(
+                [
+                    result_bundle.result_df
+                    for result_bundle in dag_runner.predict()
+                ]
+            )
+        for expected, actual in zip(*result_dfs):
+            self.assertTrue(actual.equals(expected))
@@ -4,14 +4,23 @@ Import as:
 import dataflow.model as dtfmod
 """
 
-from dataflow.model.backtest_notebook_utils import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.correlation import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.forecast_evaluator_from_prices import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.forecast_evaluator_from_returns import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.forecast_mixer import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.metrics import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.parquet_tile_analyzer import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.regression_analyzer import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.stats_computer import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.tiled_flows import *  # pylint: disable=unused-import # NOQA
-from dataflow.model.abstract_forecast_evaluator import * # pylint: disable=unused-import # NOQA
+import helpers.hintrospection as hintros
+
+# Import the modules only when one of their names is accessed, instead of
+# star-importing all of them.
+__getattr__, __dir__ = hintros.get_lazy_package_getattr(
+    __name__,
+    [
+        "dataflow.model.backtest_notebook_utils",
+        "dataflow.model.correlation",
+        "dataflow.model.forecast_evaluator_from_prices",
+        "dataflow.model.forecast_evaluator_from_returns",
+        "dataflow.model.forecast_mixer",
+        "dataflow.model.metrics",
+        "dataflow.model.parquet_tile_analyzer",
+        "dataflow.model.regression_analyzer",
+        "dataflow.model.stats_computer",
+        "dataflow.model.tiled_flows",
+        "dataflow.model.abstract_forecast_evaluator",
+    ],
+)
@@ -4,12 +4,21 @@ Import as:
 import dataflow.system as dtfsys
 """
 
-from dataflow.system.real_time_dag_adapter import *  # pylint: disable=unused-import # NOQA
-from dataflow.system.real_time_dag_runner import *  # pylint: disable=unused-import # NOQA
-from dataflow.system.sink_nodes import *  # pylint: disable=unused-import # NOQA
-from dataflow.system.source_nodes import *  # pylint: disable=unused-import # NOQA
-from dataflow.system.system import *  # pylint: disable=unused-import # NOQA
-from dataflow.system.system_builder_utils import *  # pylint: disable=unused-import # NOQA
-from dataflow.system.system_config_list import *  # pylint: disable=unused-import # NOQA
-from dataflow.system.system_signature import *  # pylint: disable=unused-import # NOQA
-from dataflow.system.system_test_case import *  # pylint: disable=unused-import # NOQA
+import helpers.hintrospection as hintros
+
+# Import the modules only when one of their names is accessed, instead of
+# star-importing all of them.
+__getattr__, __dir__ = hintros.get_lazy_package_getattr(
+    __name__,
+    [
+        "dataflow.system.real_time_dag_adapter",
+        "dataflow.system.real_time_dag_runner",
+        "dataflow.system.sink_nodes",
+        "dataflow.system.source_nodes",
+        "dataflow.system.system",
+        "dataflow.system.system_builder_utils",
+        "dataflow.system.system_config_list",
+        "dataflow.system.system_signature",
+        "dataflow.system.system_test_case",
+    ],
+)
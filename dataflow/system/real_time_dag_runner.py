@@ -51,6 +51,7 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         set_current_bar_timestamp: bool = True,
         # TODO(Danya): -> `max_allowed_delay_from_bar_start_in_secs`.
         max_distance_in_secs: int = 30,
+        incremental_predict: bool = False,
     ) -> None:
         """
         Build object.
@@ -73,8 +74,12 @@ class RealTimeDagRunner(dtfcore.DagRunner):
             that last a multiple of one minute.
         :param max_distance_in_secs: maximal distance that is allowed
             from the start of the bar.
+        :param incremental_predict: process only the new bars at each
+            execution in the nodes implementing `IncrementalNode`, see
+            `DAG.run_leq_node()`
         """
         super().__init__(dag)
+        self._incremental_predict = incremental_predict
         # Save input parameters.
         # TODO(gp): Use this for stateful DAGs.
         _ = fit_state
@@ -130,9 +135,14 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         # We need to set the first bar outside the loop so that
         # `predict_at_datetime()` can recover the current bar time.
         self._apply_current_bar_timestamp()
-        async for result_bundle in self.predict_at_datetime():
-            self._apply_current_bar_timestamp()
-            result_bundles.append(result_bundle)
+        try:
+            async for result_bundle in self.predict_at_datetime():
+                self._apply_current_bar_timestamp()
+                result_bundles.append(result_bundle)
+        finally:
+            # Make sure that the debug info written in the background is on
+            # disk, also when the loop is interrupted.
+            self.dag.flush_debug_writes()
         return result_bundles
 
     async def predict_at_datetime(self) -> dtfcore.ResultBundle:
@@ -370,16 +370,29 @@ class RealTimeDataSource(dtfcore.DataSource):
         timedelta: pd.Timedelta,
         ts_col_name: str,
         multiindex_output: bool,
+        *,
+        incremental: bool = False,
+        refetch_overlap: pd.Timedelta = pd.Timedelta(0),
     ) -> None:
         """
         Constructor.
 
         :param timedelta: how much history is needed from the real-time
             node. See `MarketData.get_data()` for details.
+        :param incremental: if True, keep the data returned at the previous
+            bar and fetch only the data newer than the previous wall clock
+            time, instead of re-fetching the entire `timedelta` of history
+            at every bar. The output is the same as the non-incremental mode
+        :param refetch_overlap: in incremental mode, also re-fetch this
+            amount of data before the previous wall clock time, to pick up
+            data that is delivered late by the `MarketData`
         """
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug(
-                hprint.to_str("nid market_data timedelta multiindex_output")
+                hprint.to_str(
+                    "nid market_data timedelta multiindex_output incremental "
+                    "refetch_overlap"
+                )
             )
         super().__init__(nid)
         hdbg.dassert_isinstance(market_data, mdata.MarketData)
@@ -391,6 +404,21 @@ class RealTimeDataSource(dtfcore.DataSource):
         self._ts_col_name = ts_col_name
         hdbg.dassert_isinstance(multiindex_output, bool)
         self._multiindex_output = multiindex_output
+        hdbg.dassert_isinstance(incremental, bool)
+        self._incremental = incremental
+        hdbg.dassert_isinstance(refetch_overlap, pd.Timedelta)
+        hdbg.dassert_lte(pd.Timedelta(0), refetch_overlap)
+        self._refetch_overlap = refetch_overlap
+        # State of the incremental mode.
+        # Wall clock time of the previous fetch.
+        self._watermark: Optional[pd.Timestamp] = None
+        # Data in `MarketData` format and its multiindex version returned at
+        # the previous bar.
+        self._cached_df: Optional[pd.DataFrame] = None
+        self._cached_multiindex_df: Optional[pd.DataFrame] = None
+        # Whether the fallback to the full fetch because of a missing
+        # timestamp column was already reported.
+        self._is_missing_ts_col_logged = False
 
     # TODO(gp): Can we use a run and move it inside fit?
     async def wait_for_latest_data(
@@ -412,12 +440,131 @@ class RealTimeDataSource(dtfcore.DataSource):
         #  makes the code difficult to understand.
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("timedelta=%s", self._timedelta)
+        if self._incremental:
+            self._get_data_incrementally()
+            return
         self.df = self._market_data.get_data_for_last_period(
             self._timedelta, ts_col_name=self._ts_col_name
         )
         if self._multiindex_output:
             self.df = dtfcorutil.convert_to_multiindex(self.df, self._asset_id_col)
 
+    def _get_data_incrementally(self) -> None:
+        """
+        Update the data of the previous bar with the data of the new bars.
+
+        The data is the same as the one returned by
+        `MarketData.get_data_for_last_period()`, but only the data in
+        `[watermark - refetch_overlap, wall_clock_time)` is fetched, the
+        data older than the lookback period is evicted, and the new rows are
+        appended to the multiindex df of the previous bar.
+        """
+        wall_clock_time = self._market_data.get_wall_clock_time()
+        # Same as `MarketData.get_data_for_last_period()`.
+        hdbg.dassert_lt(pd.Timedelta(0), self._timedelta)
+        start_ts = wall_clock_time - self._timedelta
+        fetch_start_ts = None
+        if self._watermark is not None and self._watermark <= wall_clock_time:
+            fetch_start_ts = max(
+                start_ts, self._watermark - self._refetch_overlap
+            )
+        df = None
+        multiindex_df = None
+        if fetch_start_ts is not None:
+            new_df = self._market_data.get_data_for_interval(
+                fetch_start_ts, wall_clock_time, self._ts_col_name, None
+            )
+            # Keep the cached rows in `[start_ts, fetch_start_ts)`.
+            cached_ts = self._get_timestamps(self._cached_df)
+            if cached_ts is not None:
+                mask = np.asarray(
+                    (cached_ts >= start_ts) & (cached_ts < fetch_start_ts)
+                )
+                old_df = self._cached_df[mask]
+                df = pd.concat([old_df, new_df]) if not new_df.empty else old_df
+                if not df.index.is_monotonic_increasing:
+                    # The data can't be appended preserving the order.
+                    df = None
+            if df is not None and self._multiindex_output:
+                multiindex_df = self._append_to_multiindex(
+                    old_df, new_df, mask
+                )
+        if df is None:
+            # Fetch all the data.
+            _LOG.debug("Fetching the entire lookback period")
+            df = self._market_data.get_data_for_interval(
+                start_ts, wall_clock_time, self._ts_col_name, None
+            )
+        if self._multiindex_output and multiindex_df is None:
+            multiindex_df = dtfcorutil.convert_to_multiindex(
+                df, self._asset_id_col
+            )
+        # Update the state.
+        self._watermark = wall_clock_time
+        self._cached_df = df
+        self._cached_multiindex_df = multiindex_df
+        self.df = multiindex_df if self._multiindex_output else df
+
+    def _append_to_multiindex(
+        self,
+        old_df: pd.DataFrame,
+        new_df: pd.DataFrame,
+        old_mask: np.ndarray,
+    ) -> Optional[pd.DataFrame]:
+        """
+        Append the new rows to the cached multiindex df.
+
+        :param old_df: cached rows that are kept
+        :param new_df: fetched rows
+        :param old_mask: mask of the cached rows that are kept
+        :return: the same as `convert_to_multiindex()` on the concatenation
+            of `old_df` and `new_df`, or `None` if the
+            result can't be built by appending the new rows (e.g., a new asset
+            appeared or the column types changed)
+        """
+        if new_df.empty or old_df.empty:
+            return None
+        # A timestamp must be entirely kept or evicted, otherwise the rows of
+        # the multiindex df are not the same.
+        evicted_index = self._cached_df.index[~np.asarray(old_mask)]
+        if old_df.index.isin(evicted_index).any():
+            return None
+        cached_multiindex_df = self._cached_multiindex_df
+        kept_multiindex_df = cached_multiindex_df[
+            cached_multiindex_df.index.isin(old_df.index)
+        ]
+        new_multiindex_df = dtfcorutil.convert_to_multiindex(
+            new_df, self._asset_id_col
+        )
+        if not new_multiindex_df.columns.equals(
+            kept_multiindex_df.columns
+        ) or not new_multiindex_df.dtypes.equals(kept_multiindex_df.dtypes):
+            return None
+        multiindex_df = pd.concat([kept_multiindex_df, new_multiindex_df])
+        return multiindex_df
+
+    def _get_timestamps(self, df: Optional[pd.DataFrame]) -> Optional[pd.Index]:
+        """
+        Return the values of `ts_col_name` for the rows of `df`.
+
+        :return: `None` if the values are not available
+        """
+        if df is None:
+            return None
+        if df.index.name == self._ts_col_name:
+            return df.index
+        if self._ts_col_name in df.columns:
+            return pd.Index(df[self._ts_col_name])
+        if not self._is_missing_ts_col_logged:
+            # Log only once, since the columns are the same at every bar.
+            _LOG.warning(
+                "Can't find column '%s' in the data: fetching the entire "
+                "lookback period",
+                self._ts_col_name,
+            )
+            self._is_missing_ts_col_logged = True
+        return None
+
 
 # #############################################################################
 
@@ -140,6 +140,18 @@ class System(abc.ABC):
         self.config.save_to_file(log_dir, tag)
         return dag_runner
 
+    def get_new_dag(
+        self,
+    ) -> dtfcore.DAG:
+        """
+        Build a new instance of the DAG, without caching it.
+
+        This is used to run independent instances of the DAG, e.g., in
+        parallel.
+        """
+        dag = self._get_dag()
+        return dag
+
     # /////////////////////////////////////////////////////////////////////////
     # Private methods.
     # /////////////////////////////////////////////////////////////////////////
@@ -156,6 +168,15 @@ class System(abc.ABC):
         """
         ...
 
+    @abc.abstractmethod
+    def _get_dag(
+        self,
+    ) -> dtfcore.DAG:
+        """
+        Given a completely filled `system_config` build and return the DAG.
+        """
+        ...
+
     # TODO(gp): Now a DagRunner runs a System which is a little weird, but maybe
     #  ok.
     @abc.abstractmethod
@@ -260,15 +281,6 @@ class ForecastSystem(System, abc.ABC):
     ) -> mdata.MarketData:
         ...
 
-    @abc.abstractmethod
-    def _get_dag(
-        self,
-    ) -> dtfcore.DAG:
-        """
-        Given a completely filled `system_config` build and return the DAG.
-        """
-        ...
-
 
 # #############################################################################
 # Df_ForecastSystem
@@ -309,15 +321,6 @@ class Df_ForecastSystem(System, abc.ABC):
     # Private methods.
     # /////////////////////////////////////////////////////////////////////////
 
-    @abc.abstractmethod
-    def _get_dag(
-        self,
-    ) -> dtfcore.DAG:
-        """
-        Given a completely filled `system_config` build and return the DAG.
-        """
-        ...
-
     @abc.abstractmethod
     def _get_df(
         self,
@@ -666,12 +666,17 @@ def add_real_time_data_source(
     # The DAG works on multi-index dataframe containing multiple
     # features for multiple assets.
     multiindex_output = True
+    # Fetch only the new bars instead of the entire history, if requested.
+    incremental = system.config.get_and_mark_as_used(
+        ("market_data_config", "incremental"), default_value=False
+    )
     node = dtfsysonod.RealTimeDataSource(
         stage,
         market_data,
         market_data_history_lookback,
         ts_col_name,
         multiindex_output,
+        incremental=incremental,
     )
     dag = build_dag_with_data_source_node(system, node)
     return dag
@@ -1221,6 +1226,9 @@ def get_RealTimeDagRunner_from_System(
     max_distance_in_secs = system.config.get_and_mark_as_used(
         ("dag_runner_config", "max_distance_in_secs"), default_value=30
     )
+    incremental_predict = system.config.get_and_mark_as_used(
+        ("dag_runner_config", "incremental_predict"), default_value=False
+    )
     execute_rt_loop_config = {
         "get_wall_clock_time": get_wall_clock_time,
         "bar_duration_in_secs": bar_duration_in_secs,
@@ -1240,6 +1248,7 @@ def get_RealTimeDagRunner_from_System(
         "wake_up_timestamp": wake_up_timestamp,
         "bar_duration_in_secs": bar_duration_in_secs,
         "max_distance_in_secs": max_distance_in_secs,
+        "incremental_predict": incremental_predict,
     }
     # if _LOG.isEnabledFor(logging.DEBUG): _LOG.debug("system=\n%s", str(system.config))
     dag_runner = dtfsrtdaru.RealTimeDagRunner(**dag_runner_kwargs)
@@ -1258,6 +1267,15 @@ def get_RollingFitPredictDagRunner_from_System(
     predict_end_timestamp = system.config["backtest_config", "end_timestamp"]
     retraining_freq = system.config["backtest_config", "retraining_freq"]
     retraining_lookback = system.config["backtest_config", "retraining_lookback"]
+    num_threads = system.config.get_and_mark_as_used(
+        ("backtest_config", "num_threads"), default_value="serial"
+    )
+    backend = system.config.get_and_mark_as_used(
+        ("backtest_config", "backend"), default_value="loky"
+    )
+    max_windows_in_flight = system.config.get_and_mark_as_used(
+        ("backtest_config", "max_windows_in_flight"), default_value=None
+    )
     #
     dag_runner = dtfcore.RollingFitPredictDagRunner(
         dag,
@@ -1265,5 +1283,9 @@ def get_RollingFitPredictDagRunner_from_System(
         predict_end_timestamp,
         retraining_freq,
         retraining_lookback,
+        dag_builder_func=system.get_new_dag,
+        num_threads=num_threads,
+        backend=backend,
+        max_windows_in_flight=max_windows_in_flight,
     )
     return dag_runner
@@ -1,8 +1,15 @@
+import asyncio
+import unittest.mock as umock
+from typing import List, Tuple
+
+import pandas as pd
 import pytest
 
 import dataflow.system.source_nodes as dtfsysonod
+import helpers.hasyncio as hasynci
 import helpers.hpandas as hpandas
 import helpers.hunit_test as hunitest
+import market_data as mdata
 
 
 @pytest.mark.skip(reason="Kibot Equity Reader not in use ref. #5582.")
@@ -19,3 +26,95 @@ class TestKibotEquityReader(hunitest.TestCase):
         df = node.fit()["df_out"]
         df_str = hpandas.df_to_str(df, num_rows=None)
         self.check_string(df_str)
+
+
+# #############################################################################
+# TestRealTimeDataSource1
+# #############################################################################
+
+
+class TestRealTimeDataSource1(hunitest.TestCase):
+    """
+    Check that the incremental mode returns the same data as re-fetching the
+    entire lookback period at every bar.
+    """
+
+    @staticmethod
+    async def _run(
+        event_loop: asyncio.AbstractEventLoop,
+        ts_col_name: str,
+        multiindex_output: bool,
+        refetch_overlap: pd.Timedelta,
+    ) -> Tuple[List[pd.DataFrame], List[pd.DataFrame]]:
+        start_datetime = pd.Timestamp("2000-01-01 09:31:00-05:00")
+        end_datetime = pd.Timestamp("2000-01-01 10:10:00-05:00")
+        asset_ids = [101, 202, 303]
+        market_data, _ = mdata.get_ReplayedTimeMarketData_example4(
+            event_loop,
+            start_datetime,
+            end_datetime,
+            asset_ids,
+            replayed_delay_in_mins_or_timestamp=5,
+        )
+        nodes = []
+        for incremental in [False, True]:
+            node = dtfsysonod.RealTimeDataSource(
+                "read_data",
+                market_data,
+                pd.Timedelta("7T"),
+                ts_col_name,
+                multiindex_output,
+                incremental=incremental,
+                refetch_overlap=refetch_overlap,
+            )
+            nodes.append(node)
+        expected = []
+        actual = []
+        for _ in range(15):
+            expected.append(nodes[0].fit()["df_out"])
+            actual.append(nodes[1].fit()["df_out"])
+            await asyncio.sleep(60)
+        return expected, actual
+
+    def helper(
+        self,
+        ts_col_name: str,
+        multiindex_output: bool,
+        refetch_overlap: pd.Timedelta,
+    ) -> None:
+        with hasynci.solipsism_context() as event_loop:
+            coroutine = self._run(
+                event_loop, ts_col_name, multiindex_output, refetch_overlap
+            )
+            expected, actual = hasynci.run(coroutine, event_loop=event_loop)
+        for expected_df, actual_df in zip(expected, actual):
+            hunitest.compare_df(expected_df, actual_df)
+
+    def test_multiindex1(self) -> None:
+        self.helper("end_datetime", True, pd.Timedelta(0))
+
+    def test_multiindex2(self) -> None:
+        self.helper("start_datetime", True, pd.Timedelta("2T"))
+
+    def test_no_multiindex1(self) -> None:
+        self.helper("end_datetime", False, pd.Timedelta(0))
+
+    def test_missing_ts_col1(self) -> None:
+        """
+        Check that the fallback to the full fetch is logged only once.
+        """
+        market_data = umock.create_autospec(mdata.MarketData, instance=True)
+        market_data.asset_id_col = "asset_id"
+        node = dtfsysonod.RealTimeDataSource(
+            "read_data",
+            market_data,
+            pd.Timedelta("7T"),
+            "end_datetime",
+            True,
+            incremental=True,
+        )
+        df = pd.DataFrame({"asset_id": [101], "close": [1.0]})
+        with umock.patch.object(dtfsysonod._LOG, "warning") as warning_mock:
+            for _ in range(3):
+                self.assertIsNone(node._get_timestamps(df))
+        self.assertEqual(warning_mock.call_count, 1)
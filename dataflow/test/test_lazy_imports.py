@@ -0,0 +1,145 @@
+import ast
+import importlib
+import json
+import logging
+import sys
+import types
+from typing import List
+
+import helpers.hintrospection as hintros
+import helpers.hio as hio
+import helpers.hsystem as hsystem
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+# Packages exporting the names of their modules lazily.
+_LAZY_PACKAGE_NAMES = [
+    "dataflow.backtest",
+    "dataflow.core",
+    "dataflow.model",
+    "dataflow.system",
+    "im_v2.ccxt.data.client",
+    "im_v2.common.data.client",
+    "oms",
+]
+
+
+def _get_loaded_modules(code: str) -> List[str]:
+    """
+    Run `code` in a new Python process and return the loaded modules.
+    """
+    code += "; import json, sys; print(json.dumps(sorted(sys.modules)))"
+    cmd = f'{sys.executable} -W ignore -c "{code}"'
+    _, output = hsystem.system_to_string(cmd)
+    # Skip the lines logged while importing.
+    modules = json.loads(output.strip().split("\n")[-1])
+    return modules
+
+
+def _get_exported_module_names(package: types.ModuleType) -> List[str]:
+    """
+    Return the names of the modules passed to `get_lazy_package_getattr()` in
+    the `__init__.py` of a package.
+    """
+    tree = ast.parse(hio.from_file(package.__file__))
+    module_names = [
+        node.value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Constant)
+        and isinstance(node.value, str)
+        and node.value.startswith(package.__name__ + ".")
+    ]
+    return module_names
+
+
+# #############################################################################
+# TestLazyImports1
+# #############################################################################
+
+
+class TestLazyImports1(hunitest.TestCase):
+    """
+    Check that a minimal import doesn't load the whole package trees.
+    """
+
+    def check_not_loaded(self, code: str, module_names: List[str]) -> None:
+        loaded_modules = _get_loaded_modules(code)
+        actual = sorted(set(module_names) & set(loaded_modules))
+        self.assertEqual(actual, [])
+
+    def test_dataflow_core1(self) -> None:
+        """
+        Check the modules loaded to build a DAG.
+        """
+        code = "import dataflow.core as dtfcore; dtfcore.DAG"
+        module_names = [
+            "ccxt",
+            "cvxpy",
+            "dataflow.backtest",
+            "dataflow.core.nodes.sarimax_models",
+            "dataflow.core.nodes.sklearn_models",
+            "dataflow.model",
+            "dataflow.system",
+            "im_v2.ccxt",
+            "oms",
+            "sklearn",
+        ]
+        self.check_not_loaded(code, module_names)
+
+    def test_oms1(self) -> None:
+        code = "import oms; oms.Fill"
+        module_names = [
+            "ccxt",
+            "cvxpy",
+            "dataflow",
+            "im_v2.ccxt",
+            "oms.broker.ccxt",
+            "oms.portfolio.portfolio",
+            "sklearn",
+        ]
+        self.check_not_loaded(code, module_names)
+
+    def test_im_v2_client1(self) -> None:
+        code = "import im_v2.common.data.client as icdc; icdc.ImClient"
+        module_names = [
+            "ccxt",
+            "cvxpy",
+            "dataflow",
+            "im_v2.ccxt",
+            "im_v2.common.data.client.historical_pq_clients",
+            "oms",
+        ]
+        self.check_not_loaded(code, module_names)
+
+
+# #############################################################################
+# TestLazyImports2
+# #############################################################################
+
+
+class TestLazyImports2(hunitest.TestCase):
+    def test_exported_names1(self) -> None:
+        """
+        Check that each name exported by a package refers to a single object
+        in its modules, so that the lazy lookup returns the same object as the
+        star-imports it replaces.
+        """
+        for package_name in _LAZY_PACKAGE_NAMES:
+            package = importlib.import_module(package_name)
+            module_names = _get_exported_module_names(package)
+            self.assertNotEqual(module_names, [])
+            # Import all the modules.
+            names = package.__all__
+            for name in names:
+                actual = getattr(package, name)
+                if isinstance(actual, types.ModuleType):
+                    continue
+                for module_name in module_names:
+                    module = sys.modules[module_name]
+                    if name in hintros._get_public_names(module):
+                        self.assertIs(
+                            getattr(module, name),
+                            actual,
+                            msg=f"{module_name}.{name}",
+                        )
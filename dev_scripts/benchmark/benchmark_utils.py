@@ -0,0 +1,202 @@
+"""
+Run benchmarks at several scales and compare the results against a baseline.
+
+Import as:
+
+import dev_scripts.benchmark.benchmark_utils as dsbebeut
+"""
+
+import datetime
+import logging
+import platform
+from typing import Any, Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.hsystem as hsystem
+
+_LOG = logging.getLogger(__name__)
+
+# A benchmark builds the synthetic data for `num_assets` and `num_bars`, runs
+# the code under test once and returns the time spent running it, excluding
+# the time to build the data. The time is measured with `time.perf_counter()`,
+# since `htimer` rounds the elapsed time to 1 ms, which is comparable to the
+# timings at small scales.
+BenchmarkFunc = Callable[[int, int], float]
+# A scale is a pair `(num_assets, num_bars)`.
+Scale = Tuple[int, int]
+
+
+def parse_scales(scales: List[str]) -> List[Scale]:
+    """
+    Parse scales in the format `{num_assets}x{num_bars}`, e.g., `10x1000`.
+    """
+    parsed_scales = []
+    for scale in scales:
+        tokens = scale.split("x")
+        hdbg.dassert_eq(len(tokens), 2, "Invalid scale='%s'", scale)
+        num_assets, num_bars = map(int, tokens)
+        hdbg.dassert_lte(1, num_assets)
+        hdbg.dassert_lte(1, num_bars)
+        parsed_scales.append((num_assets, num_bars))
+    return parsed_scales
+
+
+def run_benchmarks(
+    benchmarks: Dict[str, BenchmarkFunc],
+    scales: List[Scale],
+    *,
+    num_repeats: int = 5,
+    num_warmups: int = 1,
+) -> Dict[str, Any]:
+    """
+    Run each benchmark at each scale multiple times.
+
+    :param benchmarks: benchmark name to function
+    :param scales: scales to run each benchmark at
+    :param num_repeats: number of timed runs of each benchmark at each scale
+    :param num_warmups: number of runs before the timed ones, e.g., to fill
+        the caches and import lazily loaded modules
+    :return: the metadata of the run and the timings, e.g.,
+        ```
+        {
+            "metadata": {"timestamp": "2024-01-05T10:00:00", ...},
+            "results": [
+                {
+                    "benchmark": "dag_run_leq_node",
+                    "num_assets": 10,
+                    "num_bars": 1000,
+                    "min_in_secs": 0.01,
+                    "median_in_secs": 0.012,
+                    ...
+                },
+                ...
+            ]
+        }
+        ```
+    """
+    hdbg.dassert_lte(1, num_repeats)
+    hdbg.dassert_lte(0, num_warmups)
+    results = []
+    for name, func in benchmarks.items():
+        for num_assets, num_bars in scales:
+            _LOG.info(
+                "Running benchmark='%s' with num_assets=%s num_bars=%s",
+                name,
+                num_assets,
+                num_bars,
+            )
+            for _ in range(num_warmups):
+                func(num_assets, num_bars)
+            timings = np.array(
+                [func(num_assets, num_bars) for _ in range(num_repeats)]
+            )
+            result = {
+                "benchmark": name,
+                "num_assets": num_assets,
+                "num_bars": num_bars,
+                "num_repeats": num_repeats,
+                "min_in_secs": float(timings.min()),
+                "median_in_secs": float(np.median(timings)),
+                "mean_in_secs": float(timings.mean()),
+                "max_in_secs": float(timings.max()),
+            }
+            _LOG.info("median_in_secs=%.6f", result["median_in_secs"])
+            results.append(result)
+    benchmark_results = {
+        "metadata": _get_metadata(),
+        "results": results,
+    }
+    return benchmark_results
+
+
+def save_benchmark_results(
+    benchmark_results: Dict[str, Any], file_name: str
+) -> None:
+    """
+    Save the output of `run_benchmarks()` as JSON.
+    """
+    hio.create_enclosing_dir(file_name, incremental=True)
+    hio.to_json(file_name, benchmark_results)
+    _LOG.info("Saved benchmark results to '%s'", file_name)
+
+
+def load_benchmark_results(file_name: str) -> Dict[str, Any]:
+    """
+    Load the benchmark results saved by `save_benchmark_results()`.
+    """
+    benchmark_results = hio.from_json(file_name)
+    hdbg.dassert_in("results", benchmark_results)
+    return benchmark_results
+
+
+def compare_benchmark_results(
+    baseline_results: Dict[str, Any],
+    current_results: Dict[str, Any],
+    *,
+    stat: str = "median_in_secs",
+    max_slowdown: float = 0.1,
+) -> pd.DataFrame:
+    """
+    Compare the timings of two benchmark runs and flag the regressions.
+
+    Only the benchmarks and scales present in both runs are compared. The
+    slowdown of a benchmark with a zero baseline timing is undefined, so it is
+    reported as NaN and flagged in `is_zero_baseline` instead of as a
+    regression.
+
+    :param baseline_results, current_results: as returned by
+        `run_benchmarks()`
+    :param stat: timing statistic to compare, e.g., "median_in_secs"
+    :param max_slowdown: relative slowdown above which a benchmark is
+        considered a regression, e.g., 0.1 for 10%
+    :return: one row per benchmark and scale, e.g.,
+        ```
+                  benchmark  num_assets  num_bars  baseline  current  slowdown  is_zero_baseline  is_regression
+        0  dag_run_leq_node          10      1000     0.010    0.013      0.30             False           True
+        ```
+    """
+    hdbg.dassert_lte(0, max_slowdown)
+    keys = ["benchmark", "num_assets", "num_bars"]
+    baseline_df = pd.DataFrame(baseline_results["results"])
+    current_df = pd.DataFrame(current_results["results"])
+    hdbg.dassert_in(stat, baseline_df.columns)
+    hdbg.dassert_in(stat, current_df.columns)
+    df = pd.merge(
+        baseline_df[keys + [stat]].rename(columns={stat: "baseline"}),
+        current_df[keys + [stat]].rename(columns={stat: "current"}),
+        on=keys,
+        how="inner",
+    )
+    is_zero_baseline = df["baseline"] == 0
+    if is_zero_baseline.any():
+        _LOG.warning(
+            "Can't compute the slowdown with a zero baseline for:\n%s",
+            df.loc[is_zero_baseline, keys].to_string(),
+        )
+    df["slowdown"] = df["current"] / df["baseline"].mask(is_zero_baseline) - 1
+    df["is_zero_baseline"] = is_zero_baseline
+    df["is_regression"] = df["slowdown"] > max_slowdown
+    return df
+
+
+def _get_metadata() -> Dict[str, Any]:
+    """
+    Get the information about the environment of a benchmark run.
+    """
+    rc, git_hash = hsystem.system_to_one_line(
+        "git rev-parse --short HEAD", abort_on_error=False
+    )
+    metadata = {
+        "timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+        "git_hash": git_hash if rc == 0 else None,
+        "hostname": platform.node(),
+        "python_version": platform.python_version(),
+        "numpy_version": np.__version__,
+        "pandas_version": pd.__version__,
+    }
+    return metadata
+
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+
+"""
+Compare the timings of a benchmark run against a baseline run and fail if a
+benchmark is slower than the allowed slowdown.
+
+> compare_benchmarks.py \
+    --baseline_file benchmarks.baseline.json \
+    --current_file tmp.benchmarks.json \
+    --max_slowdown 0.1
+
+Import as:
+
+"""
+
+import argparse
+import logging
+import sys
+
+import dev_scripts.benchmark.benchmark_utils as dsbebeut
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+
+_LOG = logging.getLogger(__name__)
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--baseline_file",
+        required=True,
+        help="JSON file with the baseline timings",
+    )
+    parser.add_argument(
+        "--current_file",
+        required=True,
+        help="JSON file with the timings to check",
+    )
+    parser.add_argument(
+        "--stat",
+        default="median_in_secs",
+        help="Timing statistic to compare",
+    )
+    parser.add_argument(
+        "--max_slowdown",
+        type=float,
+        default=0.1,
+        help="Relative slowdown considered a regression, e.g., 0.1 for 10%%",
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    #
+    baseline_results = dsbebeut.load_benchmark_results(args.baseline_file)
+    current_results = dsbebeut.load_benchmark_results(args.current_file)
+    df = dsbebeut.compare_benchmark_results(
+        baseline_results,
+        current_results,
+        stat=args.stat,
+        max_slowdown=args.max_slowdown,
+    )
+    print(df.to_string())
+    num_regressions = int(df["is_regression"].sum())
+    if num_regressions > 0:
+        _LOG.error(
+            "Found %s regressions above max_slowdown=%s",
+            num_regressions,
+            args.max_slowdown,
+        )
+        sys.exit(1)
+    _LOG.info("No regressions found")
+
+
+if __name__ == "__main__":
+    _main(_parse())
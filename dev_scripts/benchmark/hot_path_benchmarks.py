@@ -0,0 +1,333 @@
+"""
+Benchmark the hot paths of the DAG, `MarketData`, `Portfolio` and `ImClient`
+on synthetic data.
+
+Import as:
+
+import dev_scripts.benchmark.hot_path_benchmarks as dsbhpabe
+"""
+
+import asyncio
+import datetime
+import logging
+import time
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+import core.finance_data_example as cfidaexa
+import core.signal_processing as csigproc
+import dataflow.core as dtfcore
+import dataflow.model.forecast_evaluator_from_prices as dtfmfefrpr
+import dev_scripts.benchmark.benchmark_utils as dsbebeut
+import helpers.hasyncio as hasynci
+import im_v2.common.data.client.data_frame_im_clients as imvcdcdfimc
+import market_data as mdata
+import oms.order_processing.process_forecasts_ as oopprfo
+import oms.portfolio.portfolio_example as opopoexa
+
+_LOG = logging.getLogger(__name__)
+
+# Start of the synthetic data, at the beginning of a trading day.
+_START_DATETIME = pd.Timestamp("2000-01-03 09:30:00", tz="America/New_York")
+
+
+# #############################################################################
+# Synthetic data
+# #############################################################################
+
+
+def get_synthetic_bars(
+    num_assets: int, num_bars: int, *, seed: int = 1
+) -> pd.DataFrame:
+    """
+    Generate 1-minute bars with a random walk price for each asset.
+
+    :return: bars in the format of `ReplayedMarketData`, e.g.,
+        ```
+                      start_datetime              end_datetime              timestamp_db    price  volume  asset_id
+        0  2000-01-03 09:30:00-05:00 2000-01-03 09:31:00-05:00 2000-01-03 09:31:00-05:00  1000.12     512       100
+        ```
+    """
+    rng = np.random.default_rng(seed)
+    start_datetimes = pd.date_range(
+        _START_DATETIME, periods=num_bars, freq="1T"
+    )
+    end_datetimes = start_datetimes + pd.Timedelta(minutes=1)
+    prices = 1000 + (rng.random((num_assets, num_bars)) - 0.5).cumsum(axis=1)
+    volumes = rng.integers(1, 1000, (num_assets, num_bars))
+    asset_ids = 100 + np.arange(num_assets)
+    df = pd.DataFrame(
+        {
+            "start_datetime": np.tile(start_datetimes, num_assets),
+            "end_datetime": np.tile(end_datetimes, num_assets),
+            "timestamp_db": np.tile(end_datetimes, num_assets),
+            "price": prices.ravel(),
+            "volume": volumes.ravel(),
+            "asset_id": np.repeat(asset_ids, num_bars),
+        }
+    )
+    return df
+
+
+def _get_replayed_market_data(
+    event_loop: asyncio.AbstractEventLoop,
+    bars: pd.DataFrame,
+    replayed_timestamp: pd.Timestamp,
+) -> mdata.ReplayedMarketData:
+    """
+    Build a `ReplayedMarketData` starting at `replayed_timestamp`.
+    """
+    market_data, _ = mdata.get_ReplayedTimeMarketData_from_df(
+        event_loop,
+        replayed_timestamp,
+        bars,
+        delay_in_secs=0,
+        sleep_in_secs=30,
+        time_out_in_secs=60 * 5,
+    )
+    return market_data
+
+
+# #############################################################################
+# Benchmarks
+# #############################################################################
+
+
+def benchmark_dag_run_leq_node(num_assets: int, num_bars: int) -> float:
+    """
+    Time `DAG.run_leq_node()` on a DAG computing returns and their z-scores.
+    """
+    bars = get_synthetic_bars(num_assets, num_bars)
+    df = bars.pivot(
+        index="end_datetime", columns="asset_id", values=["price", "volume"]
+    )
+    dag = dtfcore.DAG(mode="strict")
+    dag.append_to_tail(dtfcore.DfDataSource("load_data", df))
+    dag.append_to_tail(
+        dtfcore.SeriesToSeriesTransformer(
+            "compute_ret_0",
+            in_col_group=("price",),
+            out_col_group=("ret_0",),
+            transformer_func=lambda srs: srs.pct_change(),
+        )
+    )
+    dag.append_to_tail(
+        dtfcore.SeriesToSeriesTransformer(
+            "compute_zscore",
+            in_col_group=("ret_0",),
+            out_col_group=("ret_0_zscored",),
+            transformer_func=csigproc.compute_rolling_zscore,
+            transformer_kwargs={"tau": 10},
+        )
+    )
+    start = time.perf_counter()
+    dag.run_leq_node("compute_zscore", "fit", progress_bar=False)
+    elapsed_time = time.perf_counter() - start
+    return elapsed_time
+
+
+def benchmark_market_data_get_data_for_interval(
+    num_assets: int, num_bars: int
+) -> float:
+    """
+    Time `ReplayedMarketData.get_data_for_interval()` reading all the
+    available bars.
+    """
+    bars = get_synthetic_bars(num_assets, num_bars)
+    # Replay at the start of the last bar, since the replayed time needs to be
+    # before the end of the data.
+    end_ts = bars["start_datetime"].max()
+    market_data = _get_replayed_market_data(None, bars, end_ts)
+    start = time.perf_counter()
+    market_data.get_data_for_interval(
+        _START_DATETIME,
+        end_ts,
+        "end_datetime",
+        None,
+        right_close=True,
+    )
+    elapsed_time = time.perf_counter() - start
+    return elapsed_time
+
+
+def benchmark_portfolio_mark_to_market(num_assets: int, num_bars: int) -> float:
+    """
+    Time `Portfolio.mark_to_market()` after the initial one.
+    """
+    bars = get_synthetic_bars(num_assets, num_bars)
+    # Replay at the start of the last bar, since the replayed time needs to be
+    # before the end of the data.
+    end_ts = bars["start_datetime"].max()
+    asset_ids = bars["asset_id"].unique().tolist()
+    with hasynci.solipsism_context() as event_loop:
+        market_data = _get_replayed_market_data(event_loop, bars, end_ts)
+        portfolio = opopoexa.get_DataFramePortfolio_example1(
+            event_loop, market_data=market_data, asset_ids=asset_ids
+        )
+        # The first call only sets the initial holdings.
+        portfolio.mark_to_market()
+        # Move the clock forward.
+        hasynci.run(
+            asyncio.sleep(1), event_loop=event_loop, close_event_loop=False
+        )
+        start = time.perf_counter()
+        portfolio.mark_to_market()
+        elapsed_time = time.perf_counter() - start
+    return elapsed_time
+
+
+def _get_process_forecasts_dict() -> Dict:
+    dict_ = {
+        "order_config": {
+            "order_type": "price@twap",
+            "order_duration_in_mins": 5,
+            "execution_frequency": "1T",
+        },
+        "optimizer_config": {
+            "backend": "pomo",
+            "asset_class": "equities",
+            "apply_cc_limits": None,
+            "params": {
+                "style": "cross_sectional",
+                "kwargs": {
+                    "bulk_frac_to_remove": 0.0,
+                    "bulk_fill_method": "zero",
+                    "target_gmv": 1e5,
+                },
+            },
+        },
+        "execution_mode": "batch",
+        "ath_start_time": datetime.time(9, 30),
+        "trading_start_time": datetime.time(9, 35),
+        "ath_end_time": datetime.time(16, 00),
+        "trading_end_time": datetime.time(15, 55),
+        "liquidate_at_trading_end_time": False,
+        "share_quantization": 30,
+    }
+    return dict_
+
+
+def _get_predictions(
+    asset_ids: List[int], num_bars: int, *, seed: int = 1
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Generate predictions and volatility every 5 minutes within the bars and
+    the trading hours.
+    """
+    rng = np.random.default_rng(seed)
+    # Leave time to execute the last orders.
+    end_datetime = min(
+        _START_DATETIME + pd.Timedelta(minutes=num_bars - 10),
+        _START_DATETIME.replace(hour=15, minute=50),
+    )
+    index = pd.date_range(
+        _START_DATETIME + pd.Timedelta(minutes=5), end_datetime, freq="5T"
+    )
+    predictions = pd.DataFrame(
+        rng.normal(size=(len(index), len(asset_ids))), index, asset_ids
+    )
+    volatility = pd.DataFrame(1.0, index, asset_ids)
+    return predictions, volatility
+
+
+def benchmark_process_forecasts(num_assets: int, num_bars: int) -> float:
+    """
+    Time `process_forecasts()` on a simulated portfolio.
+
+    The predictions are every 5 minutes in the first trading day, so at most
+    ~75 predictions are processed.
+    """
+    bars = get_synthetic_bars(num_assets, num_bars)
+    asset_ids = bars["asset_id"].unique().tolist()
+    predictions, volatility = _get_predictions(asset_ids, num_bars)
+    with hasynci.solipsism_context() as event_loop:
+        market_data = _get_replayed_market_data(
+            event_loop, bars, _START_DATETIME + pd.Timedelta(minutes=5)
+        )
+        portfolio = opopoexa.get_DataFramePortfolio_example1(
+            event_loop, market_data=market_data, asset_ids=asset_ids
+        )
+        coroutine = oopprfo.process_forecasts(
+            predictions,
+            volatility,
+            portfolio,
+            _get_process_forecasts_dict(),
+            spread_df=None,
+            restrictions_df=None,
+        )
+        start = time.perf_counter()
+        hasynci.run(coroutine, event_loop=event_loop)
+        elapsed_time = time.perf_counter() - start
+    return elapsed_time
+
+
+def benchmark_im_client_read_data(num_assets: int, num_bars: int) -> float:
+    """
+    Time `ImClient.read_data()` reading all the bars from a `DataFrameImClient`.
+    """
+    bars = get_synthetic_bars(num_assets, num_bars)
+    full_symbols = [
+        f"binance::ASSET{asset_id}_USDT" for asset_id in bars["asset_id"]
+    ]
+    df = pd.DataFrame(
+        {
+            "full_symbol": full_symbols,
+            "close": bars["price"].values,
+            "volume": bars["volume"].values,
+        },
+        index=pd.DatetimeIndex(
+            bars["end_datetime"].dt.tz_convert("UTC"), name="timestamp"
+        ),
+    )
+    universe = sorted(set(full_symbols))
+    im_client = imvcdcdfimc.DataFrameImClient(df, universe)
+    start = time.perf_counter()
+    im_client.read_data(universe, None, None, None, "assert")
+    elapsed_time = time.perf_counter() - start
+    return elapsed_time
+
+
+def benchmark_forecast_evaluator_annotate_forecasts(
+    num_assets: int, num_bars: int
+) -> float:
+    """
+    Time `ForecastEvaluatorFromPrices.annotate_forecasts()` on 1-minute bars.
+
+    The bars are generated only in the trading hours, so `num_bars` minutes of
+    data contain less than `num_bars` bars when spanning multiple days.
+    """
+    asset_ids = list(100 + np.arange(num_assets))
+    df = cfidaexa.get_forecast_price_based_dataframe(
+        _START_DATETIME,
+        _START_DATETIME + pd.Timedelta(minutes=num_bars),
+        asset_ids,
+        bar_duration="1T",
+    )
+    forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+        price_col="price",
+        volatility_col="volatility",
+        prediction_col="prediction",
+    )
+    start = time.perf_counter()
+    forecast_evaluator.annotate_forecasts(
+        df, target_gmv=1e5, liquidate_at_end_of_day=False
+    )
+    elapsed_time = time.perf_counter() - start
+    return elapsed_time
+
+
+# Benchmarks run by `run_benchmarks.py`.
+BENCHMARKS: Dict[str, dsbebeut.BenchmarkFunc] = {
+    "dag_run_leq_node": benchmark_dag_run_leq_node,
+    "market_data_get_data_for_interval": (
+        benchmark_market_data_get_data_for_interval
+    ),
+    "portfolio_mark_to_market": benchmark_portfolio_mark_to_market,
+    "process_forecasts": benchmark_process_forecasts,
+    "im_client_read_data": benchmark_im_client_read_data,
+    "forecast_evaluator_annotate_forecasts": (
+        benchmark_forecast_evaluator_annotate_forecasts
+    ),
+}
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+
+"""
+Run the hot path benchmarks on synthetic data and save the timings as JSON.
+
+# Run all the benchmarks at 2 scales:
+> run_benchmarks.py \
+    --scales 10x1000 100x10000 \
+    --output_file tmp.benchmarks.json
+
+# Run only some benchmarks:
+> run_benchmarks.py \
+    --benchmarks dag_run_leq_node portfolio_mark_to_market \
+    --scales 10x1000 \
+    --num_repeats 3 \
+    --output_file tmp.benchmarks.json
+
+Import as:
+
+"""
+
+import argparse
+import logging
+
+import dev_scripts.benchmark.benchmark_utils as dsbebeut
+import dev_scripts.benchmark.hot_path_benchmarks as dsbhpabe
+import helpers.hdbg as hdbg
+import helpers.hparser as hparser
+
+_LOG = logging.getLogger(__name__)
+
+
+def _parse() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--scales",
+        nargs="+",
+        default=["10x1000"],
+        help="Scales as `{num_assets}x{num_bars}`",
+    )
+    parser.add_argument(
+        "--benchmarks",
+        nargs="+",
+        default=None,
+        choices=sorted(dsbhpabe.BENCHMARKS.keys()),
+        help="Benchmarks to run (default: all)",
+    )
+    parser.add_argument(
+        "--num_repeats",
+        type=int,
+        default=5,
+        help="Number of timed runs of each benchmark at each scale",
+    )
+    parser.add_argument(
+        "--num_warmups",
+        type=int,
+        default=1,
+        help="Number of untimed runs before the timed ones",
+    )
+    parser.add_argument(
+        "--output_file",
+        required=True,
+        help="JSON file to save the timings to",
+    )
+    hparser.add_verbosity_arg(parser)
+    return parser
+
+
+def _main(parser: argparse.ArgumentParser) -> None:
+    args = parser.parse_args()
+    hdbg.init_logger(verbosity=args.log_level, use_exec_path=True)
+    #
+    benchmark_names = args.benchmarks or list(dsbhpabe.BENCHMARKS.keys())
+    benchmarks = {name: dsbhpabe.BENCHMARKS[name] for name in benchmark_names}
+    scales = dsbebeut.parse_scales(args.scales)
+    benchmark_results = dsbebeut.run_benchmarks(
+        benchmarks,
+        scales,
+        num_repeats=args.num_repeats,
+        num_warmups=args.num_warmups,
+    )
+    dsbebeut.save_benchmark_results(benchmark_results, args.output_file)
+
+
+if __name__ == "__main__":
+    _main(_parse())
@@ -0,0 +1,106 @@
+import logging
+import os
+
+import numpy as np
+
+import helpers.hunit_test as hunitest
+import dev_scripts.benchmark.benchmark_utils as dsbebeut
+import dev_scripts.benchmark.hot_path_benchmarks as dsbhpabe
+
+_LOG = logging.getLogger(__name__)
+
+
+def _get_benchmark_results(median_in_secs: float) -> dict:
+    benchmark_results = {
+        "metadata": {},
+        "results": [
+            {
+                "benchmark": "dag_run_leq_node",
+                "num_assets": 10,
+                "num_bars": 1000,
+                "median_in_secs": median_in_secs,
+            },
+            {
+                "benchmark": "im_client_read_data",
+                "num_assets": 10,
+                "num_bars": 1000,
+                "median_in_secs": 1.0,
+            },
+        ],
+    }
+    return benchmark_results
+
+
+# #############################################################################
+# TestBenchmarkUtils1
+# #############################################################################
+
+
+class TestBenchmarkUtils1(hunitest.TestCase):
+    def test_parse_scales1(self) -> None:
+        actual = dsbebeut.parse_scales(["10x1000", "100x50000"])
+        self.assertEqual(actual, [(10, 1000), (100, 50000)])
+
+    def test_parse_scales2(self) -> None:
+        """
+        Check that an invalid scale is rejected.
+        """
+        with self.assertRaises(AssertionError):
+            dsbebeut.parse_scales(["10-1000"])
+
+    def test_compare_benchmark_results1(self) -> None:
+        baseline_results = _get_benchmark_results(1.0)
+        current_results = _get_benchmark_results(1.5)
+        df = dsbebeut.compare_benchmark_results(
+            baseline_results, current_results, max_slowdown=0.1
+        )
+        self.assertEqual(df["slowdown"].tolist(), [0.5, 0.0])
+        self.assertEqual(df["is_regression"].tolist(), [True, False])
+
+    def test_compare_benchmark_results2(self) -> None:
+        """
+        Check that a zero baseline is flagged instead of being a regression.
+        """
+        baseline_results = _get_benchmark_results(0.0)
+        current_results = _get_benchmark_results(0.001)
+        df = dsbebeut.compare_benchmark_results(
+            baseline_results, current_results, max_slowdown=0.1
+        )
+        self.assertTrue(np.isnan(df["slowdown"].iloc[0]))
+        self.assertEqual(df["slowdown"].iloc[1], 0.0)
+        self.assertEqual(df["is_zero_baseline"].tolist(), [True, False])
+        self.assertEqual(df["is_regression"].tolist(), [False, False])
+
+    def test_save_load_benchmark_results1(self) -> None:
+        benchmark_results = _get_benchmark_results(1.0)
+        file_name = os.path.join(self.get_scratch_space(), "benchmarks.json")
+        dsbebeut.save_benchmark_results(benchmark_results, file_name)
+        actual = dsbebeut.load_benchmark_results(file_name)
+        self.assertEqual(actual, benchmark_results)
+
+    def test_run_benchmarks1(self) -> None:
+        """
+        Run some hot path benchmarks at a small scale.
+        """
+        benchmarks = {
+            name: dsbhpabe.BENCHMARKS[name]
+            for name in ["dag_run_leq_node", "im_client_read_data"]
+        }
+        benchmark_results = dsbebeut.run_benchmarks(
+            benchmarks, [(2, 30), (3, 60)], num_repeats=2, num_warmups=0
+        )
+        self.assertIn("git_hash", benchmark_results["metadata"])
+        results = benchmark_results["results"]
+        actual = [
+            (result["benchmark"], result["num_assets"], result["num_bars"])
+            for result in results
+        ]
+        expected = [
+            ("dag_run_leq_node", 2, 30),
+            ("dag_run_leq_node", 3, 60),
+            ("im_client_read_data", 2, 30),
+            ("im_client_read_data", 3, 60),
+        ]
+        self.assertEqual(actual, expected)
+        for result in results:
+            self.assertLessEqual(result["min_in_secs"], result["max_in_secs"])
@@ -499,3 +499,68 @@ async def async_wait_until(
     hprint.log_frame(
         _LOG, "%s: wall_clock_time=%s: done waiting", tag, get_wall_clock_time()
     )
+
+
+# #############################################################################
+# TokenBucketRateLimiter
+# #############################################################################
+
+
+class TokenBucketRateLimiter:
+    """
+    Limit the rate of operations of coroutines with a token bucket.
+
+    The bucket holds up to `capacity` tokens and it's refilled at
+    `rate_per_sec` tokens per second. Each operation consumes one token,
+    waiting for the bucket to be refilled when it's empty. This allows bursts
+    of up to `capacity` operations while keeping the long-term rate below
+    `rate_per_sec`.
+
+    The time is measured through the event loop clock, so that the limiter
+    works also with simulated time (e.g., `solipsism_context()`).
+    """
+
+    def __init__(self, rate_per_sec: float, *, capacity: Optional[int] = None):
+        """
+        Constructor.
+
+        :param rate_per_sec: number of tokens added to the bucket per second
+        :param capacity: max number of tokens in the bucket, `None` to use
+            `max(1, rate_per_sec)`
+        """
+        hdbg.dassert_lt(0, rate_per_sec)
+        if capacity is None:
+            capacity = max(1, int(rate_per_sec))
+        hdbg.dassert_lte(1, capacity)
+        self._rate_per_sec = rate_per_sec
+        self._capacity = capacity
+        # The bucket starts full.
+        self._num_tokens = float(capacity)
+        self._last_refill_time: Optional[float] = None
+        # The lock is created lazily to bind it to the running event loop.
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        """
+        Wait until a token is available and consume it.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        # Serve the waiting coroutines in order.
+        async with self._lock:
+            self._refill()
+            if self._num_tokens < 1:
+                wait_in_secs = (1 - self._num_tokens) / self._rate_per_sec
+                await asyncio.sleep(wait_in_secs)
+                self._refill()
+            self._num_tokens -= 1
+
+    def _refill(self) -> None:
+        now = asyncio.get_event_loop().time()
+        if self._last_refill_time is not None:
+            elapsed_time = now - self._last_refill_time
+            self._num_tokens = min(
+                self._capacity,
+                self._num_tokens + elapsed_time * self._rate_per_sec,
+            )
+        self._last_refill_time = now
@@ -7,16 +7,22 @@ import helpers.hcache as hcache
 """
 
 import atexit
+import collections
 import copy
 import functools
+import io
+import itertools
 import logging
 import os
+import shutil
 import time
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import joblib
 import joblib.func_inspect as jfunci
 import joblib.memory as jmemor
+import numpy as np
+import pandas as pd
 
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
@@ -279,6 +285,9 @@ def clear_global_cache(
             clear_global_cache(cache_type_tmp, tag=tag, destroy=destroy)
         return
     _dassert_is_valid_cache_type(cache_type)
+    # The LRU cache is in front of the global caches, so it would return the
+    # values that are cleared.
+    clear_lru_cache()
     # Clear and / or destroy the cache `cache_type` with the given `tag`.
     cache_path = _get_global_cache_path(cache_type, tag)
     if not _IS_CLEAR_CACHE_ENABLED:
@@ -321,6 +330,338 @@ def clear_global_cache(
     _LOG.info("After clear_global_cache: %s", info_after)
 
 
+# #############################################################################
+# Cache size limits
+# #############################################################################
+
+
+# Max size in bytes of the global caches by cache type, `None` for no limit.
+_CACHE_MAX_SIZE_IN_BYTES: Dict[str, Optional[int]] = {
+    "mem": None,
+    "disk": None,
+}
+
+
+def set_cache_max_size(
+    cache_type: str, max_size_in_bytes: Optional[int]
+) -> None:
+    """
+    Set the max size of a cache, evicting the least recently accessed items
+    when a new item makes the cache larger.
+
+    The limit applies to caches on the local file system, e.g., not to
+    caches on S3.
+
+    :param cache_type: type of a cache
+    :param max_size_in_bytes: max size of the cache, `None` for no limit
+    """
+    _dassert_is_valid_cache_type(cache_type)
+    if max_size_in_bytes is not None:
+        hdbg.dassert_lte(0, max_size_in_bytes)
+    _LOG.warning(
+        "Setting max size of '%s' cache to %s -> %s",
+        cache_type,
+        _CACHE_MAX_SIZE_IN_BYTES[cache_type],
+        max_size_in_bytes,
+    )
+    _CACHE_MAX_SIZE_IN_BYTES[cache_type] = max_size_in_bytes
+
+
+def _reduce_cache_size(
+    cache_backend: joblib.Memory, max_size_in_bytes: int
+) -> int:
+    """
+    Remove the least recently accessed items until the cache fits the size.
+
+    :return: number of removed items
+    """
+    store_backend = cache_backend.store_backend
+    if store_backend is None:
+        return 0
+    # Each item is the dir storing the output of a call of a cached function.
+    items = store_backend.get_items()
+    size_in_bytes = sum(item.size for item in items)
+    num_removed_items = 0
+    for item in sorted(items, key=lambda item: item.last_access):
+        if size_in_bytes <= max_size_in_bytes:
+            break
+        _LOG.debug("Evicting '%s' from the cache", item.path)
+        shutil.rmtree(item.path, ignore_errors=True)
+        size_in_bytes -= item.size
+        num_removed_items += 1
+    if num_removed_items > 0:
+        _LOG.info(
+            "Evicted %s items from the cache at '%s'",
+            num_removed_items,
+            store_backend.location,
+        )
+    return num_removed_items
+
+
+# #############################################################################
+# In-process LRU cache
+# #############################################################################
+
+
+def _get_size_in_bytes(obj: Any) -> int:
+    """
+    Return the memory used by an object, including the referenced objects.
+    """
+    if isinstance(obj, pd.DataFrame):
+        size_in_bytes = int(obj.memory_usage(deep=True).sum())
+    elif isinstance(obj, pd.Series):
+        size_in_bytes = int(obj.memory_usage(deep=True))
+    elif isinstance(obj, np.ndarray):
+        size_in_bytes = obj.nbytes
+    else:
+        size_in_bytes = hintros.get_size_in_bytes(obj)
+    return size_in_bytes
+
+
+class _LruCache:
+    """
+    Store objects in the memory of the process up to a total size, evicting
+    the least recently used objects.
+
+    Unlike the "mem" and "disk" caches, the objects are not pickled, but they
+    are stored as they are and `CachedFunction` returns a copy of them (see
+    `_copy_lru_cache_value()`), so that callers can't modify the cached
+    values.
+    """
+
+    def __init__(self, max_size_in_bytes: int) -> None:
+        self._objs: collections.OrderedDict = collections.OrderedDict()
+        self._sizes_in_bytes: Dict[Any, int] = {}
+        self._size_in_bytes = 0
+        self._num_hits = 0
+        self._num_misses = 0
+        self._num_evictions = 0
+        self.set_max_size(max_size_in_bytes)
+
+    def set_max_size(self, max_size_in_bytes: int) -> None:
+        hdbg.dassert_lte(0, max_size_in_bytes)
+        self._max_size_in_bytes = max_size_in_bytes
+        self._evict(0)
+
+    def get(self, key: Any) -> Tuple[bool, Any]:
+        """
+        Return the object stored for `key`, if any.
+
+        :return: whether the object was found and the object
+        """
+        if key not in self._objs:
+            self._num_misses += 1
+            return False, None
+        self._num_hits += 1
+        # Mark the object as the most recently used.
+        self._objs.move_to_end(key)
+        return True, self._objs[key]
+
+    def put(self, key: Any, obj: Any) -> None:
+        """
+        Store `obj` for `key`, unless it is larger than the cache.
+        """
+        self.remove(key)
+        size_in_bytes = _get_size_in_bytes(obj)
+        if size_in_bytes > self._max_size_in_bytes:
+            _LOG.debug(
+                "Skipping object of size=%s larger than the cache",
+                hintros.format_size(size_in_bytes),
+            )
+            return
+        self._evict(size_in_bytes)
+        self._objs[key] = obj
+        self._sizes_in_bytes[key] = size_in_bytes
+        self._size_in_bytes += size_in_bytes
+
+    def remove(self, key: Any) -> None:
+        if key in self._objs:
+            del self._objs[key]
+            self._size_in_bytes -= self._sizes_in_bytes.pop(key)
+
+    def remove_if(self, predicate: Callable[[Any], bool]) -> None:
+        """
+        Remove the objects whose key satisfies `predicate`.
+        """
+        for key in [key for key in self._objs if predicate(key)]:
+            self.remove(key)
+
+    def clear(self) -> None:
+        self._objs.clear()
+        self._sizes_in_bytes.clear()
+        self._size_in_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        stats = {
+            "num_objects": len(self._objs),
+            "size_in_bytes": self._size_in_bytes,
+            "max_size_in_bytes": self._max_size_in_bytes,
+            "num_hits": self._num_hits,
+            "num_misses": self._num_misses,
+            "num_evictions": self._num_evictions,
+        }
+        return stats
+
+    def _evict(self, size_in_bytes: int) -> None:
+        """
+        Evict the least recently used objects to make room for `size_in_bytes`.
+        """
+        while (
+            self._objs
+            and self._size_in_bytes + size_in_bytes > self._max_size_in_bytes
+        ):
+            key = next(iter(self._objs))
+            self.remove(key)
+            self._num_evictions += 1
+
+
+# This is the global in-process LRU cache shared by all the cached functions.
+_LRU_CACHE = _LruCache(1024**3)
+
+# Generate the ids of the cached functions, used to tell apart their objects in
+# the LRU cache.
+_CACHED_FUNC_IDS = itertools.count()
+
+
+def _copy_lru_cache_value(obj: Any) -> Any:
+    """
+    Return a copy of an object stored in the LRU cache.
+
+    Copying a dataframe in memory is still much cheaper than unpickling it
+    from the memory cache.
+    """
+    if isinstance(obj, (pd.DataFrame, pd.Series, np.ndarray)):
+        obj = obj.copy()
+    else:
+        obj = copy.deepcopy(obj)
+    return obj
+
+
+def set_lru_cache_max_size(max_size_in_bytes: int) -> None:
+    """
+    Set the max total size of the objects in the in-process LRU cache.
+
+    The size of dataframes is measured with `memory_usage(deep=True)`.
+    """
+    _LOG.warning(
+        "Setting max size of 'lru' cache to %s -> %s",
+        _LRU_CACHE.get_stats()["max_size_in_bytes"],
+        max_size_in_bytes,
+    )
+    _LRU_CACHE.set_max_size(max_size_in_bytes)
+
+
+def get_lru_cache_stats() -> Dict[str, int]:
+    """
+    Return the size and the hit / miss stats of the in-process LRU cache.
+    """
+    return _LRU_CACHE.get_stats()
+
+
+def clear_lru_cache() -> None:
+    """
+    Remove all the objects from the in-process LRU cache.
+    """
+    _LOG.warning("Resetting 'lru' cache")
+    _LRU_CACHE.clear()
+
+
+# #############################################################################
+# Serializers
+# #############################################################################
+
+
+class Serializer:
+    """
+    Convert the values of a cached function before storing them in the "mem"
+    and "disk" caches, which pickle them, and back after loading them.
+
+    This serializer stores the values as they are.
+    """
+
+    def serialize(self, obj: Any) -> Any:
+        return obj
+
+    def deserialize(self, obj: Any) -> Any:
+        return obj
+
+
+class _ParquetPayload:
+    """
+    Store a dataframe or a series as Parquet bytes.
+    """
+
+    def __init__(
+        self, data: bytes, is_series: bool, name: Any, freq: Any
+    ) -> None:
+        self.data = data
+        self.is_series = is_series
+        # Name of the series.
+        self.name = name
+        # Frequency of the index, which is not stored in Parquet.
+        self.freq = freq
+
+
+class ParquetSerializer(Serializer):
+    """
+    Store dataframes and series as Parquet, and any other value as it is.
+
+    Pickling Parquet bytes is much faster and smaller than pickling a
+    dataframe, in particular with columns of Python objects like strings.
+    """
+
+    def serialize(self, obj: Any) -> Any:
+        if not isinstance(obj, (pd.DataFrame, pd.Series)):
+            return obj
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        is_series = isinstance(obj, pd.Series)
+        name = obj.name if is_series else None
+        df = obj.to_frame() if is_series else obj
+        try:
+            table = pa.Table.from_pandas(df)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError, ValueError) as e:
+            # E.g., columns mixing lists and scalars can't be stored as Parquet.
+            _LOG.debug("Can't convert to Parquet, pickling instead: %s", e)
+            return obj
+        buffer = io.BytesIO()
+        pq.write_table(table, buffer)
+        freq = getattr(obj.index, "freq", None)
+        payload = _ParquetPayload(buffer.getvalue(), is_series, name, freq)
+        return payload
+
+    def deserialize(self, obj: Any) -> Any:
+        if not isinstance(obj, _ParquetPayload):
+            return obj
+        import pyarrow.parquet as pq
+
+        df = pq.read_table(io.BytesIO(obj.data)).to_pandas()
+        if obj.freq is not None:
+            df.index.freq = obj.freq
+        if obj.is_series:
+            srs = df.iloc[:, 0]
+            srs.name = obj.name
+            return srs
+        return df
+
+
+_SERIALIZERS = {
+    "pickle": Serializer(),
+    "parquet": ParquetSerializer(),
+}
+
+
+def _get_serializer(serializer: Union[str, Serializer]) -> Serializer:
+    """
+    Return a serializer by name, e.g., "pickle", "parquet", or as it is.
+    """
+    if isinstance(serializer, Serializer):
+        return serializer
+    hdbg.dassert_in(serializer, _SERIALIZERS)
+    return _SERIALIZERS[serializer]
+
+
 # #############################################################################
 
 
@@ -354,6 +695,10 @@ class _Cached:
       a process or in notebooks without resetting the state
     - disk cache: useful for retrieving the state among different executions of a
       process or when a notebook is reset
+
+    Optionally, an in-process LRU cache in front of the memory cache returns
+    the values without unpickling them. The values are copied when returned, so
+    that the caller can modify them without changing the cached ones.
     """
 
     # TODO(gp): Either allow users to initialize `mem_cache_path` here or with
@@ -371,6 +716,8 @@ class _Cached:
         tag: Optional[str] = None,
         disk_cache_path: Optional[str] = None,
         aws_profile: Optional[str] = "am",
+        use_lru_cache: bool = False,
+        serializer: Union[str, Serializer] = "pickle",
     ):
         """
         Construct the class.
@@ -387,6 +734,11 @@ class _Cached:
             when running unit tests we want to use a different cache)
         :param disk_cache_path: path of the function-specific cache
         :param aws_profile: the AWS profile to use in case of S3 backend
+        :param use_lru_cache: whether to store the values in the in-process LRU
+            cache, whose size is set with `set_lru_cache_max_size()`
+        :param serializer: how to store the values in the memory and disk
+            caches, e.g., "pickle", "parquet" to store dataframes and series
+            as Parquet, or a `Serializer`
         """
         # Make the class have the same attributes (e.g., `__name__`, `__doc__`,
         # `__dict__`) as the called function.
@@ -403,6 +755,14 @@ class _Cached:
         self._tag = tag
         self._disk_cache_path = disk_cache_path
         self._aws_profile = aws_profile
+        self._use_lru_cache = use_lru_cache
+        self._serializer = _get_serializer(serializer)
+        self._id = next(_CACHED_FUNC_IDS)
+        # Number of hits and misses for each cache type.
+        self._stats = {
+            cache_type: {"num_hits": 0, "num_misses": 0}
+            for cache_type in ["lru"] + _get_cache_types()
+        }
         #
         self._reset_cache_tracing()
         # Create the memory and disk cache objects for this function.
@@ -438,6 +798,7 @@ class _Cached:
             # No caching is allowed: execute the function.
             _LOG.warning("All caching is disabled")
             self._last_used_disk_cache = self._last_used_mem_cache = False
+            self._last_used_lru_cache = False
             obj = self._func(*args, **kwargs)
         else:
             # Caching is allowed.
@@ -500,7 +861,9 @@ class _Cached:
         """
         if _TRACE:
             _LOG.trace("")
-        if self._last_used_mem_cache:
+        if self._last_used_lru_cache:
+            ret = "lru"
+        elif self._last_used_mem_cache:
             ret = "mem"
         elif self._last_used_disk_cache:
             # If the disk cache was used, then the memory cache should not been used.
@@ -510,6 +873,21 @@ class _Cached:
             ret = "no_cache"
         return ret
 
+    def get_cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Return the number of hits and misses of each cache for this function.
+
+        E.g.,
+        ```
+        {
+            "lru": {"num_hits": 0, "num_misses": 0},
+            "mem": {"num_hits": 3, "num_misses": 1},
+            "disk": {"num_hits": 0, "num_misses": 1},
+        }
+        ```
+        """
+        return copy.deepcopy(self._stats)
+
     def enable_read_only(self, val: bool) -> None:
         """
         If set to True, the cached function can only read from the cache but
@@ -635,6 +1013,8 @@ class _Cached:
             hio.delete_dir(cache_path)
         else:
             self._disk_cache.clear()
+        # Remove the values of this function from the LRU cache.
+        _LRU_CACHE.remove_if(lambda key: key[0] == self._id)
         # Print stats.
         info_after = _get_cache_size(cache_path, description)
         _LOG.info("After clear_function_cache: %s", info_after)
@@ -751,8 +1131,8 @@ class _Cached:
         """
         if _TRACE:
             _LOG.trace("")
-        if cache_type == "no_cache":
-            return "no_cache"
+        if cache_type in ("no_cache", "lru"):
+            return cache_type
         if self.has_function_cache():
             hdbg.dassert_eq(cache_type, "disk")
             ret = self._disk_cache_path
@@ -866,8 +1246,22 @@ class _Cached:
         func_code, _, first_line = jfunci.get_func_code(memorized_result.func)
         memorized_result._write_func_code(func_code, first_line)
         # Store the returned value into the cache.
+        obj = self._serializer.serialize(obj)
         memorized_result.store_backend.dump_item([func_id, args_id], obj)
-        #
+        self._reduce_cache_size(cache_type)
+
+    def _reduce_cache_size(self, cache_type: str) -> None:
+        """
+        Evict items from a cache larger than its max size, if any.
+        """
+        max_size_in_bytes = _CACHE_MAX_SIZE_IN_BYTES[cache_type]
+        if max_size_in_bytes is None:
+            return
+        if cache_type == "mem":
+            cache_backend = get_global_cache(cache_type, self._tag)
+        else:
+            cache_backend = self._disk_cache
+        _reduce_cache_size(cache_backend, max_size_in_bytes)
 
     # ///////////////////////////////////////////////////////////////////////////
 
@@ -881,6 +1275,7 @@ class _Cached:
         # The reset values depend on which caches are enabled.
         self._last_used_disk_cache = self._use_disk_cache
         self._last_used_mem_cache = self._use_mem_cache
+        self._last_used_lru_cache = self._use_lru_cache
 
     def _execute_func_from_disk_cache(self, *args: Any, **kwargs: Any) -> Any:
         if _TRACE:
@@ -892,15 +1287,18 @@ class _Cached:
         func_id, args_id = self._get_identifiers("disk", *args, **kwargs)
         if self._has_cached_version("disk", func_id, args_id):
             _LOG.debug("There is a disk cached version")
+            self._stats["disk"]["num_hits"] += 1
             with htimer.TimedScope(
                 logging.INFO, "Loading cached version from disk"
             ):
                 obj = self._disk_cached_func(*args, **kwargs)
+                obj = self._serializer.deserialize(obj)
             if self._check_only_if_present:
                 raise CachedValueException(func_info)
         else:
             # INV: we didn't hit neither memory nor the disk cache.
             self._last_used_disk_cache = False
+            self._stats["disk"]["num_misses"] += 1
             #
             _LOG.debug(
                 "%s: execute the intrinsic function",
@@ -913,7 +1311,14 @@ class _Cached:
             with htimer.TimedScope(
                 logging.INFO, "Updating cached version on disk"
             ):
-                obj = self._disk_cached_func(*args, **kwargs)
+                if type(self._serializer) is Serializer:
+                    obj = self._disk_cached_func(*args, **kwargs)
+                    self._reduce_cache_size("disk")
+                else:
+                    # Store the serialized value, since Joblib would store
+                    # the value returned by the function.
+                    obj = self._execute_intrinsic_function(*args, **kwargs)
+                    self._store_cached_version("disk", func_id, args_id, obj)
             # obj = self._execute_intrinsic_function(*args, **kwargs)
             # The function was not cached in disk, so now we need to update the
             # memory cache.
@@ -934,6 +1339,7 @@ class _Cached:
         func_id, args_id = self._get_identifiers("mem", *args, **kwargs)
         if self._has_cached_version("mem", func_id, args_id):
             _LOG.debug("There is a mem cached version")
+            self._stats["mem"]["num_hits"] += 1
             if self._check_only_if_present:
                 raise CachedValueException(func_info)
             # The function execution was cached in the mem cache.
@@ -941,11 +1347,13 @@ class _Cached:
                 logging.INFO, "Loading cached version from memory"
             ):
                 obj = self._memory_cached_func(*args, **kwargs)
+                obj = self._serializer.deserialize(obj)
         else:
             # INV: we know that we didn't hit the memory cache, but we don't know
             # about the disk cache.
             _LOG.debug("There is not a mem cached version")
             self._last_used_mem_cache = False
+            self._stats["mem"]["num_misses"] += 1
             #
             if self._use_disk_cache:
                 # Try the disk cache.
@@ -975,7 +1383,47 @@ class _Cached:
             obj = self._func(*args, **kwargs)
         return obj
 
+    def _execute_func_from_lru_cache(self, *args: Any, **kwargs: Any) -> Any:
+        """
+        Execute the function from the in-process LRU cache and if not possible
+        try the lower cache levels.
+        """
+        if _TRACE:
+            _LOG.trace("")
+        # Use the values of the params, so that passing a param by position or
+        # by name yields the same key.
+        params = jfunci.filter_args(self._func, [], args, kwargs)
+        key = (self._id, joblib.hash(params))
+        found, obj = _LRU_CACHE.get(key)
+        if found:
+            _LOG.debug("There is a lru cached version")
+            self._stats["lru"]["num_hits"] += 1
+            if self._check_only_if_present:
+                func_info = (
+                    f"{self._func.__name__}(args={str(args)} "
+                    f"kwargs={str(kwargs)})"
+                )
+                raise CachedValueException(func_info)
+            return _copy_lru_cache_value(obj)
+        _LOG.debug("There is not a lru cached version")
+        self._last_used_lru_cache = False
+        self._stats["lru"]["num_misses"] += 1
+        obj = self._execute_func_from_mem_and_disk_cache(*args, **kwargs)
+        _LRU_CACHE.put(key, obj)
+        return _copy_lru_cache_value(obj)
+
     def _execute_func(self, *args: Any, **kwargs: Any) -> Any:
+        if _TRACE:
+            _LOG.trace("")
+        if self._use_lru_cache:
+            obj = self._execute_func_from_lru_cache(*args, **kwargs)
+        else:
+            obj = self._execute_func_from_mem_and_disk_cache(*args, **kwargs)
+        return obj
+
+    def _execute_func_from_mem_and_disk_cache(
+        self, *args: Any, **kwargs: Any
+    ) -> Any:
         if _TRACE:
             _LOG.trace("")
         func_info = (
@@ -1021,6 +1469,8 @@ def cache(
     tag: Optional[str] = None,
     disk_cache_path: Optional[str] = None,
     aws_profile: Optional[str] = None,
+    use_lru_cache: bool = False,
+    serializer: Union[str, Serializer] = "pickle",
 ) -> Union[Callable, _Cached]:
     """
     Decorate a function with a cache.
@@ -1038,6 +1488,10 @@ def cache(
     @hcache.cache(use_mem_cache=False)
     def add(x: int, y: int) -> int:
         return x + y
+
+    @hcache.cache(use_lru_cache=True, serializer="parquet")
+    def load_data(start: str, end: str) -> pd.DataFrame:
+        ...
     ```
     """
 
@@ -1050,6 +1504,8 @@ def cache(
             tag=tag,
             disk_cache_path=disk_cache_path,
             aws_profile=aws_profile,
+            use_lru_cache=use_lru_cache,
+            serializer=serializer,
         )
 
     return wrapper
@@ -9,7 +9,19 @@ import logging
 import os
 import pprint
 import sys
-from typing import Any, Dict, Iterable, List, Optional, Set, Tuple, Type, Union
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
 
 # This module can depend only on:
 # - Python standard modules
@@ -72,13 +84,224 @@ def dfatal(message: str, assertion_type: Optional[Any] = None) -> None:
 
 
 # #############################################################################
-# dassert.
+# Check level.
+# #############################################################################
+
+# Assertions can be tagged with the minimum check level needed to run them
+# through the `check_level()` decorator:
+# - "off": no tagged assertion is run
+# - "cheap": only tagged assertions with constant cost (e.g., type checks) are
+#   run
+# - "full": all assertions are run, including the ones that are linear (or
+#   worse) in the size of the checked containers / dataframes
+# Untagged assertions (e.g., `dassert()`, `dassert_eq()`) are always run.
+# The default check level is "full" and it can be changed with the env var
+# `AM_DBG_CHECK_LEVEL` or at run-time with `set_check_level()`, e.g., to run
+# production systems with `set_check_level("cheap")`.
+#
+# To avoid any overhead on the enabled assertions, the name of a tagged
+# assertion in its module is bound to the original function, to a no-op, or to
+# a profiling wrapper according to the check level and the profiling state, and
+# it is re-bound when they change. Thus the tagged assertions must be called
+# through their module (e.g., `hdbg.dassert_is_subset()`) and not imported by
+# name.
+_CHECK_LEVELS = {"off": 0, "cheap": 1, "full": 2}
+
+
+def _get_check_level_from_env() -> int:
+    level = os.environ.get("AM_DBG_CHECK_LEVEL", "full")
+    if level not in _CHECK_LEVELS:
+        raise ValueError(
+            f"Invalid AM_DBG_CHECK_LEVEL='{level}': valid values are "
+            f"{list(_CHECK_LEVELS.keys())}"
+        )
+    return _CHECK_LEVELS[level]
+
+
+_CHECK_LEVEL = _get_check_level_from_env()
+
+# Whether to collect timing stats about the tagged assertions.
+_PROFILE_CHECKS = False
+
+# Map `(assertion name, call site)` to `[num calls, total elapsed time in secs]`.
+_CHECK_STATS: Dict[Tuple[str, str], List[Union[int, float]]] = {}
+
+
 # #############################################################################
+# _TaggedCheck
+# #############################################################################
+
+
+class _TaggedCheck:
+    """
+    Store the implementations of an assertion tagged with a check level.
+    """
+
+    def __init__(self, func: Callable, level_as_int: int) -> None:
+        self.func = func
+        self.level_as_int = level_as_int
+
+        @functools.wraps(func)
+        def skipped_func(*args: Any, **kwargs: Any) -> None:
+            _ = args, kwargs
+
+        @functools.wraps(func)
+        def profiled_func(*args: Any, **kwargs: Any) -> Any:
+            # Time the assertion and attribute the cost to the caller.
+            # pylint: disable=protected-access
+            frame = sys._getframe(1)
+            call_site = f"{frame.f_code.co_filename}:{frame.f_lineno}"
+            start_time = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed_time = time.perf_counter() - start_time
+                key = (func.__name__, call_site)
+                stats = _CHECK_STATS.setdefault(key, [0, 0.0])
+                stats[0] += 1
+                stats[1] += elapsed_time
+
+        self.skipped_func = skipped_func
+        self.profiled_func = profiled_func
+
+    def get_func(self) -> Callable:
+        """
+        Return the implementation for the current check level and profiling.
+        """
+        if _CHECK_LEVEL < self.level_as_int:
+            func = self.skipped_func
+        elif _PROFILE_CHECKS:
+            func = self.profiled_func
+        else:
+            func = self.func
+        return func
+
 
-# TODO(gp): Would be nice to have a way to disable the assertions in certain
-#  builds, or at least know how much time is spent in the assertions.
-#  To disable we could have a fake_dbg.py that has all `dassert_*`, `logging`
-#   defined as `lambda x: 0`.
+# The assertions tagged with `check_level()`.
+_TAGGED_CHECKS: List[_TaggedCheck] = []
+
+
+def _rebind_tagged_checks() -> None:
+    """
+    Bind the name of each tagged assertion to its current implementation.
+    """
+    for tagged_check in _TAGGED_CHECKS:
+        module = sys.modules[tagged_check.func.__module__]
+        setattr(module, tagged_check.func.__name__, tagged_check.get_func())
+
+
+def set_check_level(level: str) -> None:
+    """
+    Set the check level for the tagged assertions.
+
+    :param level: one of "off", "cheap", "full"
+    """
+    global _CHECK_LEVEL
+    assert level in _CHECK_LEVELS, f"Invalid level='{level}'"
+    _CHECK_LEVEL = _CHECK_LEVELS[level]
+    _rebind_tagged_checks()
+
+
+def get_check_level() -> str:
+    """
+    Return the current check level.
+    """
+    level = [k for k, v in _CHECK_LEVELS.items() if v == _CHECK_LEVEL][0]
+    return level
+
+
+def is_check_enabled(level: str) -> bool:
+    """
+    Return whether assertions tagged with `level` are run.
+
+    This can be used to guard expensive checks written inline, e.g.,
+    ```
+    if hdbg.is_check_enabled("full"):
+        hdbg.dassert(df.index.is_unique)
+    ```
+    """
+    return _CHECK_LEVEL >= _CHECK_LEVELS[level]
+
+
+def check_level(level: str) -> Callable:
+    """
+    Decorator to tag a module-level assertion with the minimum check level to
+    run it.
+
+    When check profiling is enabled, the number of calls and the time spent in
+    the assertion are also accumulated per call site.
+    """
+    level_as_int = _CHECK_LEVELS[level]
+
+    def decorator(func: Callable) -> Callable:
+        tagged_check = _TaggedCheck(func, level_as_int)
+        _TAGGED_CHECKS.append(tagged_check)
+        return tagged_check.get_func()
+
+    return decorator
+
+
+def enable_check_profiling(enable: bool) -> None:
+    """
+    Enable / disable collecting the timing stats of the tagged assertions.
+    """
+    global _PROFILE_CHECKS
+    _PROFILE_CHECKS = enable
+    _rebind_tagged_checks()
+
+
+def reset_check_profiling() -> None:
+    """
+    Clear the timing stats of the tagged assertions.
+    """
+    _CHECK_STATS.clear()
+
+
+def get_check_profiling_stats() -> List[Tuple[str, str, int, float]]:
+    """
+    Return the timing stats of the tagged assertions.
+
+    Note that the time of nested tagged assertions (e.g., an assertion calling
+    another tagged assertion) is counted for both call sites.
+
+    :return: list of `(assertion name, call site, num calls, total secs)`
+        sorted by decreasing total time
+    """
+    stats = [
+        (name, call_site, int(num_calls), float(tot_time))
+        for (name, call_site), (num_calls, tot_time) in _CHECK_STATS.items()
+    ]
+    stats = sorted(stats, key=lambda x: x[3], reverse=True)
+    return stats
+
+
+def get_check_profiling_report(num_rows: Optional[int] = None) -> str:
+    """
+    Return a report with the time spent in the tagged assertions per call site.
+
+    :param num_rows: number of most expensive call sites to report, `None` for
+        all
+    """
+    stats = get_check_profiling_stats()
+    if num_rows is not None:
+        stats = stats[:num_rows]
+    txt = []
+    txt.append("check_level=%s" % get_check_level())
+    tot_time = sum(stat[3] for stat in stats)
+    txt.append("tot_time=%.6f secs" % tot_time)
+    for name, call_site, num_calls, time_ in stats:
+        avg_time = time_ / num_calls if num_calls else 0.0
+        txt.append(
+            "%s %s: num_calls=%s tot_time=%.6f avg_time=%.6f"
+            % (name, call_site, num_calls, time_, avg_time)
+        )
+    txt = "\n".join(txt)
+    return txt
+
+
+# #############################################################################
+# dassert.
+# #############################################################################
 
 
 # INVARIANTS:
@@ -339,6 +562,7 @@ def dassert_is_not(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("cheap")
 def dassert_type_is(
     val1: Any,
     val2: Any,
@@ -354,6 +578,7 @@ def dassert_type_is(
 
 
 # TODO(gp): This is redundant with dassert_isinstance(..., (str, float)).
+@check_level("cheap")
 def dassert_type_in(
     val1: Any,
     val2: Any,
@@ -368,6 +593,7 @@ def dassert_type_in(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("cheap")
 def dassert_isinstance(
     val1: Any,
     val2: Union[type, Iterable[type]],
@@ -381,6 +607,7 @@ def dassert_isinstance(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("cheap")
 def dassert_issubclass(
     val1: Any,
     val2: Union[type, Iterable[type]],
@@ -400,6 +627,7 @@ def dassert_issubclass(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("cheap")
 def dassert_is_integer(
     val: Union[int, float],
     msg: Optional[str] = None,
@@ -421,6 +649,7 @@ def dassert_is_integer(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("cheap")
 def dassert_callable(
     func: Any,
     msg: Optional[str] = None,
@@ -473,6 +702,7 @@ def _set_to_str(set_: Set[Any], thr: Optional[int] = 20) -> str:
     return txt
 
 
+@check_level("full")
 def dassert_set_eq(
     val1: Any,
     val2: Any,
@@ -499,6 +729,7 @@ def dassert_set_eq(
 
 
 # TODO(gp): -> dassert_issubset to match Python set function.
+@check_level("full")
 def dassert_is_subset(
     val1: Any,
     val2: Any,
@@ -521,6 +752,7 @@ def dassert_is_subset(
 
 
 # TODO(gp): -> dassert_no_intersection to match other functions.
+@check_level("full")
 def dassert_not_intersection(
     val1: Any,
     val2: Any,
@@ -547,6 +779,7 @@ def dassert_not_intersection(
 # #############################################################################
 
 
+@check_level("full")
 def dassert_no_duplicates(
     val1: Any, msg: Optional[str] = None, *args: Any, only_warning: bool = False
 ) -> None:
@@ -563,6 +796,7 @@ def dassert_no_duplicates(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("full")
 def dassert_is_sorted(
     val1: Union[List, Tuple],
     sort_kwargs: Optional[Dict[Any, Any]] = None,
@@ -583,6 +817,7 @@ def dassert_is_sorted(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("full")
 def dassert_eq_all(
     val1: Any,
     val2: Any,
@@ -618,6 +853,7 @@ def _get_first_type(obj: Iterable, tag: str) -> Type:
 
 # TODO(gp): IMO a bit overfit to the use case. Move this to the files that are
 # using is.
+@check_level("full")
 def dassert_all_attributes_are_same(
     list_: List[Any],
     attribute_name: str,
@@ -641,6 +877,7 @@ def dassert_all_attributes_are_same(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("full")
 def dassert_array_has_same_type_element(
     obj1: Any,
     obj2: Any,
@@ -675,6 +912,7 @@ def dassert_array_has_same_type_element(
         _dfatal(txt, msg, *args, only_warning=only_warning)
 
 
+@check_level("full")
 def dassert_container_type(
     obj: Any,
     container_type: Optional[Any],
@@ -707,6 +945,7 @@ def dassert_container_type(
 
 
 # TODO(gp): @all Replace calls to this with calls to `dassert_container_type()`.
+@check_level("full")
 def dassert_list_of_strings(
     list_: List[str],
     msg: Optional[str] = None,
@@ -4,15 +4,17 @@ Import as:
 import helpers.hintrospection as hintros
 """
 
+import ast
 import collections.abc as cabc
 import importlib
+import importlib.util
 import inspect
 import logging
 import pickle
 import re
 import sys
 import types
-from typing import Any, Callable, List, Optional, cast
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
 
 import helpers.hdbg as hdbg
 
@@ -274,3 +276,157 @@ def stacktrace_to_str() -> str:
     txt = traceback.format_stack()
     txt = "".join(txt)
     return txt
+
+
+# #############################################################################
+# Lazy imports
+# #############################################################################
+
+
+def _get_public_names(module: types.ModuleType) -> List[str]:
+    """
+    Return the names exported by `from module import *`.
+    """
+    names = getattr(module, "__all__", None)
+    if names is None:
+        names = [name for name in vars(module) if not name.startswith("_")]
+    return list(names)
+
+
+def _get_statically_defined_names(module_name: str) -> List[str]:
+    """
+    Return the names defined at the top level of a module without importing
+    it.
+
+    The names are found by parsing the source code, so the names defined
+    dynamically, e.g., with `globals()`, are not returned.
+    """
+    spec = importlib.util.find_spec(module_name)
+    if spec is None or spec.origin is None or not spec.origin.endswith(".py"):
+        return []
+    with open(spec.origin, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=spec.origin)
+    names = []
+    # Visit also the statements nested in `if` and `try` blocks, e.g., for
+    # the optional imports.
+    nodes = list(tree.body)
+    while nodes:
+        node = nodes.pop(0)
+        if isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        ):
+            names.append(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                names.append(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, (ast.Assign, ast.AnnAssign, ast.AugAssign)):
+            targets = (
+                node.targets if isinstance(node, ast.Assign) else [node.target]
+            )
+            for target in targets:
+                names.extend(
+                    elem.id
+                    for elem in ast.walk(target)
+                    if isinstance(elem, ast.Name)
+                )
+        elif isinstance(node, (ast.If, ast.Try)):
+            nodes.extend(node.body)
+            nodes.extend(node.orelse)
+            for handler in getattr(node, "handlers", []):
+                nodes.extend(handler.body)
+            nodes.extend(getattr(node, "finalbody", []))
+    return names
+
+
+def get_lazy_package_getattr(
+    package_name: str, module_names: List[str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build the module-level `__getattr__` and `__dir__` of a package that
+    exports the names of its modules lazily.
+
+    This replaces the star-imports in the `__init__.py` of a package, e.g.,
+    ```
+    from dataflow.core.dag import *
+    from dataflow.core.node import *
+    ```
+    with
+    ```
+    __getattr__, __dir__ = hintros.get_lazy_package_getattr(
+        __name__, ["dataflow.core.dag", "dataflow.core.node"]
+    )
+    ```
+    so that a module is imported only when one of its names is accessed
+    through the package, e.g., `dtfcore.DAG` imports only
+    `dataflow.core.dag` and its dependencies, instead of all the modules of
+    the package.
+
+    A name is looked up in the modules in the order of `module_names` and the
+    first module exporting it wins. The module defining a name is found by
+    parsing the source code of the modules, falling back to importing the
+    modules in order for the names defined dynamically. The subpackages and
+    modules of the package are accessible as attributes without importing
+    them explicitly, e.g., `dataflow.core` after `import dataflow`.
+
+    :param package_name: name of the package, i.e., `__name__` in its
+        `__init__.py`
+    :param module_names: full names of the modules whose names are exported
+    :return: the `__getattr__` and `__dir__` functions of the package
+    """
+    module_names = list(module_names)
+    # Map each name to the modules defining it statically, in the order of
+    # `module_names`. It is built on the first access.
+    name_to_module_names: Dict[str, List[str]] = {}
+
+    def _get_candidate_module_names(name: str) -> List[str]:
+        if not name_to_module_names and module_names:
+            for module_name in module_names:
+                for defined_name in _get_statically_defined_names(module_name):
+                    name_to_module_names.setdefault(defined_name, [])
+                    if module_name not in name_to_module_names[defined_name]:
+                        name_to_module_names[defined_name].append(module_name)
+        # Try first the modules defining the name statically and then all the
+        # modules.
+        candidates = name_to_module_names.get(name, []) + module_names
+        return list(dict.fromkeys(candidates))
+
+    def __getattr__(name: str) -> Any:
+        package = sys.modules[package_name]
+        if name == "__all__":
+            # Support `from package import *` by exporting the names of all
+            # the modules.
+            all_names = []
+            for module_name in module_names:
+                module = importlib.import_module(module_name)
+                all_names.extend(_get_public_names(module))
+            value = list(dict.fromkeys(all_names))
+            setattr(package, name, value)
+            return value
+        if name.startswith("__"):
+            # Do not import anything for the special attributes probed by
+            # tools, e.g., `__wrapped__`.
+            raise AttributeError(
+                f"module '{package_name}' has no attribute '{name}'"
+            )
+        # Look for a subpackage or a module of the package.
+        full_name = f"{package_name}.{name}"
+        if importlib.util.find_spec(full_name) is not None:
+            return importlib.import_module(full_name)
+        # Look for the name in the exported modules.
+        for module_name in _get_candidate_module_names(name):
+            module = importlib.import_module(module_name)
+            if name in _get_public_names(module):
+                value = getattr(module, name)
+                # Cache the value so that `__getattr__` is not called again.
+                setattr(package, name, value)
+                return value
+        raise AttributeError(
+            f"module '{package_name}' has no attribute '{name}'"
+        )
+
+    def __dir__() -> List[str]:
+        package = sys.modules[package_name]
+        names = set(vars(package)) | set(__getattr__("__all__"))
+        return sorted(names)
+
+    return __getattr__, __dir__
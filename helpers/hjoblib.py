@@ -4,20 +4,36 @@ Import as:
 import helpers.hjoblib as hjoblib
 """
 
+import collections
 import concurrent.futures
+import hashlib
 import logging
 import math
+import multiprocessing
+import multiprocessing.connection
 import os
 import pprint
 import random
+import re
 import sys
 import traceback
 from functools import wraps
 from multiprocessing import Process, Queue
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import joblib
 from joblib._store_backends import StoreBackendBase, StoreBackendMixin
+from joblib.externals.loky import get_reusable_executor
 from tqdm.autonotebook import tqdm
 
 import helpers.hdatetime as hdateti
@@ -203,6 +219,20 @@ def task_to_string(task: Task, *, use_pprint: bool = True) -> str:
     return txt
 
 
+def get_task_id(task: Task) -> str:
+    """
+    Return an id of a task that is stable across runs of a workload.
+
+    The id is used to match a task with its cost in the log of a previous
+    run.
+    """
+    txt = task_to_string(task, use_pprint=False)
+    # Remove the memory addresses, e.g., `<function f at 0x7f0c>`.
+    txt = re.sub(r" at 0x[0-9a-f]+", "", txt)
+    task_id = hashlib.md5(txt.encode("utf-8")).hexdigest()
+    return task_id
+
+
 # #############################################################################
 # Workload
 # #############################################################################
@@ -518,6 +548,7 @@ def _parallel_execute_decorator(
     txt.append(f"workload_func={workload_func.__name__}")
     txt.append(f"func_name={func_name}")
     txt.append(task_to_string(task))
+    txt.append(f"task_id={get_task_id(task)}")
     # Run the workload.
     args, kwargs = task
     kwargs.update({"incremental": incremental, "num_attempts": num_attempts})
@@ -567,6 +598,420 @@ def _parallel_execute_decorator(
     return res
 
 
+# #############################################################################
+# Cost-aware scheduling.
+# #############################################################################
+
+
+# The cost of executing a task, e.g.,
+# `{"elapsed_time_in_secs": 12.3, "peak_mem_in_bytes": 1073741824}`.
+TaskCost = Dict[str, float]
+
+
+def get_task_costs(log_files: List[str]) -> Dict[str, TaskCost]:
+    """
+    Parse the cost of the tasks from `parallel_execute()` log files.
+
+    The elapsed time is reported only for the tasks executed successfully,
+    while the peak memory is reported also for the failed tasks (e.g., the
+    tasks killed for exceeding the memory limit). The peak memory is logged
+    only by the `scheduled_multiprocessing` backend, since the memory of a task
+    can't be measured when multiple tasks are executed in the same process.
+
+    :param log_files: log files of previous runs of a workload
+    :return: task id (see `get_task_id()`) to the cost of the task, as the max
+        over the runs, since a task can be skipped quickly in incremental mode
+    """
+    task_costs: Dict[str, TaskCost] = collections.defaultdict(dict)
+
+    def _update_cost(task_id: str, key: str, value: float) -> None:
+        task_cost = task_costs[task_id]
+        task_cost[key] = max(task_cost.get(key, value), value)
+
+    for log_file in log_files:
+        hdbg.dassert_file_exists(log_file)
+        txt = hio.from_file(log_file)
+        task_id = None
+        elapsed_time = None
+        for line in txt.split("\n"):
+            # The result of the function is indented, so only the lines
+            # starting with a key are parsed.
+            if line.startswith("task_id="):
+                task_id = line[len("task_id=") :]
+                elapsed_time = None
+            elif task_id is None:
+                continue
+            elif line.startswith("elapsed_time_in_secs="):
+                elapsed_time = float(line.split("=", 1)[1])
+            elif line.startswith("peak_mem_in_bytes="):
+                value = float(line.split("=", 1)[1])
+                _update_cost(task_id, "peak_mem_in_bytes", value)
+            elif line.startswith("error="):
+                if line == "error=False" and elapsed_time is not None:
+                    _update_cost(task_id, "elapsed_time_in_secs", elapsed_time)
+                task_id = None
+    return dict(task_costs)
+
+
+def _get_scheduled_task_order(
+    tasks: List[Task], task_costs: Dict[str, TaskCost]
+) -> List[int]:
+    """
+    Return the indices of the tasks in the order of execution.
+
+    The tasks without a known cost are executed first, since they might be the
+    longest ones, and then the other tasks from the longest to the shortest
+    one, so that the last tasks to complete are short.
+    """
+    unknown_idxs = []
+    known_idxs = []
+    for task_idx, task in enumerate(tasks):
+        task_cost = task_costs.get(get_task_id(task), {})
+        if "elapsed_time_in_secs" in task_cost:
+            known_idxs.append(task_idx)
+        else:
+            unknown_idxs.append(task_idx)
+    known_idxs.sort(
+        key=lambda idx: -task_costs[get_task_id(tasks[idx])][
+            "elapsed_time_in_secs"
+        ]
+    )
+    task_idxs = unknown_idxs + known_idxs
+    return task_idxs
+
+
+def _get_process_tree_mem_in_bytes(pid: int) -> int:
+    """
+    Return the current memory used by a process and by all its descendants.
+
+    The memory of each process is its PSS (proportional set size), so that the
+    pages shared copy-on-write by the forked processes are not counted
+    multiple times. The USS is used on the platforms without PSS (e.g.,
+    macOS).
+    """
+    import psutil
+
+    try:
+        process = psutil.Process(pid)
+        processes = [process] + process.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return 0
+    mem = 0
+    for process in processes:
+        try:
+            mem_info = process.memory_full_info()
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            # The process terminated after listing it.
+            continue
+        mem += getattr(mem_info, "pss", mem_info.uss)
+    return mem
+
+
+def _kill_process_tree(pid: int) -> None:
+    """
+    Kill a process and all its descendants.
+    """
+    import psutil
+
+    try:
+        process = psutil.Process(pid)
+        processes = process.children(recursive=True) + [process]
+    except psutil.NoSuchProcess:
+        return
+    for process in processes:
+        try:
+            process.kill()
+        except psutil.NoSuchProcess:
+            pass
+    psutil.wait_procs(processes, timeout=10)
+
+
+def _scheduled_task_process_func(
+    conn: multiprocessing.connection.Connection,
+    task_idx: int,
+    task_len: int,
+    incremental: bool,
+    num_attempts: int,
+    log_file: str,
+    workload_func: Callable,
+    func_name: str,
+    task: Task,
+) -> None:
+    """
+    Execute a task in a child process, sending `(is_success, result)` or
+    `(is_success, exception)` to the parent process.
+    """
+    try:
+        # Propagate the exception to report it to the parent process, which
+        # handles `abort_on_error`.
+        abort_on_error = True
+        processify_func = False
+        res = _parallel_execute_decorator(
+            task_idx,
+            task_len,
+            incremental,
+            abort_on_error,
+            num_attempts,
+            log_file,
+            #
+            workload_func,
+            func_name,
+            processify_func,
+            task,
+        )
+        msg = (True, res)
+    except Exception as e:  # pylint: disable=broad-except
+        msg = (False, e)
+    try:
+        conn.send(msg)
+    except Exception as e:  # pylint: disable=broad-except
+        # The result or the exception can't be pickled.
+        conn.send((False, RuntimeError(f"Can't send the result: {str(e)}")))
+    conn.close()
+
+
+def _execute_scheduled_tasks(
+    workload: Workload,
+    incremental: bool,
+    abort_on_error: bool,
+    num_attempts: int,
+    log_file: str,
+    num_threads: int,
+    task_costs: Dict[str, TaskCost],
+    memory_budget_in_bytes: Optional[int],
+    max_mem_per_task_in_bytes: Optional[int],
+    pbar: tqdm,
+    *,
+    poll_interval_in_secs: float = 0.5,
+    num_mem_retries: int = 1,
+) -> List[Any]:
+    """
+    Execute each task in a new process with a memory-aware scheduler.
+
+    - The tasks are started in the order from `_get_scheduled_task_order()`
+    - At most `num_threads` tasks are executed at the same time and a task is
+      started only if the memory reserved by the running tasks plus the
+      memory expected for the task fits `memory_budget_in_bytes`. A task is
+      always started when no other task is running so that the workload
+      progresses
+    - The memory of a task is the PSS of its process tree (see
+      `_get_process_tree_mem_in_bytes()`), sampled every
+      `poll_interval_in_secs`, and its peak is logged in `log_file` as
+      `peak_mem_in_bytes`
+    - The memory reserved by a running task is the max of its current memory
+      and of its expected memory, which is the peak memory of the task in
+      `task_costs`, or `max_mem_per_task_in_bytes` for a task without a known
+      cost
+    - A task whose process tree exceeds `max_mem_per_task_in_bytes` is killed
+      and restarted up to `num_mem_retries` times. A restarted task waits for
+      all the running tasks to complete and runs alone, so that it can use
+      all the memory headroom, i.e., `memory_budget_in_bytes` or, without a
+      budget, the memory available on the machine when it starts
+    - A task that exceeds its memory limit after the restarts, or whose
+      headroom is not larger than `max_mem_per_task_in_bytes`, fails with a
+      `MemoryError`, which is handled like any other error according to
+      `abort_on_error`. The killed tasks are logged in `log_file` and the
+      failed ones are reported at the end of the execution
+
+    Parameters have the same meaning as in `parallel_execute()`.
+
+    :param num_mem_retries: max number of times a task killed for exceeding its
+        memory limit is restarted
+
+    :return: the results in the order of the tasks
+    """
+    workload_func, func_name, tasks = workload
+    task_len = len(tasks)
+    pending_task_idxs = collections.deque(
+        _get_scheduled_task_order(tasks, task_costs)
+    )
+    # Map task index to the process, the connection to receive its result and
+    # its peak memory.
+    running: Dict[int, Dict[str, Any]] = {}
+    results: Dict[int, Any] = {}
+    # Map task index to the number of times it was killed for exceeding its
+    # memory limit.
+    num_mem_kills: Dict[int, int] = collections.defaultdict(int)
+    failed_mem_task_ids: List[str] = []
+
+    def _get_expected_mem(task_idx: int) -> int:
+        task_cost = task_costs.get(get_task_id(tasks[task_idx]), {})
+        if "peak_mem_in_bytes" in task_cost:
+            expected_mem = int(task_cost["peak_mem_in_bytes"])
+        elif max_mem_per_task_in_bytes is not None:
+            expected_mem = max_mem_per_task_in_bytes
+        else:
+            expected_mem = 0
+        return expected_mem
+
+    def _get_reserved_mem() -> int:
+        reserved_mem = sum(
+            max(_get_expected_mem(task_idx), info["peak_mem"])
+            for task_idx, info in running.items()
+        )
+        return reserved_mem
+
+    def _get_mem_headroom() -> int:
+        """
+        Return the memory that a task running alone can use.
+        """
+        if memory_budget_in_bytes is not None:
+            return memory_budget_in_bytes
+        import psutil
+
+        return int(psutil.virtual_memory().available)
+
+    def _start_task(task_idx: int, max_mem: Optional[int]) -> None:
+        recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_scheduled_task_process_func,
+            args=(
+                send_conn,
+                task_idx,
+                task_len,
+                incremental,
+                num_attempts,
+                log_file,
+                workload_func,
+                func_name,
+                tasks[task_idx],
+            ),
+        )
+        process.start()
+        # Close the parent copy of the sending end, so that receiving from a
+        # process that died raises `EOFError`.
+        send_conn.close()
+        running[task_idx] = {
+            "process": process,
+            "conn": recv_conn,
+            "peak_mem": 0,
+            "max_mem": max_mem,
+        }
+        _LOG.debug(
+            "Started task %s/%s (pid=%s) with max_mem=%s",
+            task_idx + 1,
+            task_len,
+            process.pid,
+            max_mem,
+        )
+
+    def _log_task_mem(task_idx: int, txt: List[str]) -> None:
+        txt = [
+            "",
+            f"task_id={get_task_id(tasks[task_idx])}",
+            f"peak_mem_in_bytes={running[task_idx]['peak_mem']}",
+            *txt,
+        ]
+        hio.to_file(log_file, "\n".join(txt), mode="a")
+
+    def _handle_error(task_idx: int, exception: Exception) -> None:
+        if abort_on_error:
+            _LOG.error("Aborting since abort_on_error=%s", abort_on_error)
+            for info in running.values():
+                _kill_process_tree(info["process"].pid)
+            raise exception
+        _LOG.error("Continuing execution since abort_on_error=%s", abort_on_error)
+        results[task_idx] = str(exception)
+
+    def _fail_mem_task(task_idx: int, txt: str) -> None:
+        failed_mem_task_ids.append(get_task_id(tasks[task_idx]))
+        pbar.update(1)
+        _handle_error(task_idx, MemoryError(txt))
+
+    while pending_task_idxs or running:
+        # Start the tasks fitting the number of threads and the memory budget.
+        while pending_task_idxs and len(running) < num_threads:
+            if any(num_mem_kills[idx] > 0 for idx in running):
+                # A restarted task is running alone.
+                break
+            task_idx = pending_task_idxs[0]
+            if num_mem_kills[task_idx] > 0:
+                # A restarted task waits for the running tasks to complete and
+                # runs alone with all the memory headroom.
+                if running:
+                    break
+                pending_task_idxs.popleft()
+                hdbg.dassert_is_not(max_mem_per_task_in_bytes, None)
+                max_mem = _get_mem_headroom()
+                if max_mem <= max_mem_per_task_in_bytes:
+                    txt = (
+                        f"Can't restart task {task_idx + 1}/{task_len} since "
+                        f"the memory headroom={max_mem} is not larger than "
+                        f"max_mem_per_task_in_bytes={max_mem_per_task_in_bytes}"
+                    )
+                    _LOG.warning(txt)
+                    _fail_mem_task(task_idx, txt)
+                    continue
+                _start_task(task_idx, max_mem)
+                continue
+            if running and memory_budget_in_bytes is not None:
+                mem = _get_reserved_mem() + _get_expected_mem(task_idx)
+                if mem > memory_budget_in_bytes:
+                    break
+            pending_task_idxs.popleft()
+            _start_task(task_idx, max_mem_per_task_in_bytes)
+        # Wait for a task to complete.
+        conns = [info["conn"] for info in running.values()]
+        ready_conns = multiprocessing.connection.wait(
+            conns, timeout=poll_interval_in_secs
+        )
+        for task_idx, info in list(running.items()):
+            if info["conn"] not in ready_conns:
+                continue
+            try:
+                is_success, res = info["conn"].recv()
+            except EOFError:
+                is_success = False
+                res = RuntimeError(
+                    f"The process of task {task_idx + 1}/{task_len} died"
+                )
+            info["conn"].close()
+            info["process"].join()
+            if info["peak_mem"] > 0:
+                # The memory is unknown for a task ending before being sampled.
+                _log_task_mem(task_idx, [])
+            del running[task_idx]
+            pbar.update(1)
+            if is_success:
+                results[task_idx] = res
+            else:
+                _handle_error(task_idx, res)
+        # Kill the tasks exceeding their memory limit.
+        for task_idx, info in list(running.items()):
+            mem = _get_process_tree_mem_in_bytes(info["process"].pid)
+            info["peak_mem"] = max(info["peak_mem"], mem)
+            if info["max_mem"] is None or mem <= info["max_mem"]:
+                continue
+            _kill_process_tree(info["process"].pid)
+            info["conn"].close()
+            num_mem_kills[task_idx] += 1
+            is_restarted = num_mem_kills[task_idx] <= num_mem_retries
+            txt = (
+                f"Killed task {task_idx + 1}/{task_len} with "
+                f"task_id={get_task_id(tasks[task_idx])} since "
+                f"mem_in_bytes={mem} > max_mem_in_bytes={info['max_mem']}"
+            )
+            if is_restarted:
+                txt += ": restarting it alone"
+            _LOG.warning(txt)
+            _log_task_mem(task_idx, [f"exception='{txt}'", "error=True"])
+            del running[task_idx]
+            if is_restarted:
+                # Restart the task after the pending tasks, since it waits for
+                # all the running tasks to complete.
+                pending_task_idxs.append(task_idx)
+            else:
+                _fail_mem_task(task_idx, txt)
+    if failed_mem_task_ids:
+        _LOG.error(
+            "Failed %s tasks exceeding the memory limit:\n%s",
+            len(failed_mem_task_ids),
+            "\n".join(failed_mem_task_ids),
+        )
+    res = [results[task_idx] for task_idx in range(task_len)]
+    return res
+
+
 # TODO(gp): Pass a `task_dst_dir` to each task so it can write there.
 #  This is a generalization of `experiment_result_dir` for `run_config_list` and
 #  `run_notebook`.
@@ -581,6 +1026,9 @@ def parallel_execute(
     log_file: str,
     *,
     backend: str = "loky",
+    task_cost_log_files: Optional[List[str]] = None,
+    memory_budget_in_bytes: Optional[int] = None,
+    max_mem_per_task_in_bytes: Optional[int] = None,
 ) -> Optional[List[Any]]:
     """
     Run a workload in parallel using joblib or asyncio.
@@ -598,6 +1046,17 @@ def parallel_execute(
     :param log_file: file used to log information about the execution
     :param backend: specify the backend type (e.g., joblib `loky` or
         `asyncio_process_executor`)
+        - `scheduled_multiprocessing` executes each task in a new process,
+          ordering the tasks by their cost in previous runs and capping the
+          memory used (see `_execute_scheduled_tasks()`)
+    :param task_cost_log_files: log files of previous runs of the workload used
+        to order the tasks from the longest to the shortest one, only for the
+        `scheduled_multiprocessing` backend
+    :param memory_budget_in_bytes: max memory reserved by the tasks running at
+        the same time, only for the `scheduled_multiprocessing` backend
+    :param max_mem_per_task_in_bytes: max memory of a task before killing it
+        and restarting it alone, only for the `scheduled_multiprocessing`
+        backend
 
     :return: list with the results from executing `func` or the exception of the
         failing function
@@ -617,6 +1076,26 @@ def parallel_execute(
     # Parse the workload.
     validate_workload(workload)
     workload_func, func_name, tasks = workload
+    if backend == "scheduled_multiprocessing":
+        if num_threads == "serial":
+            # Run one task at a time with the scheduler, which measures the
+            # memory of the tasks, instead of running the tasks in this process.
+            num_threads = 1
+    else:
+        # The cost-based ordering and the memory limits are implemented only by
+        # the `scheduled_multiprocessing` backend.
+        for name, value in [
+            ("task_cost_log_files", task_cost_log_files),
+            ("memory_budget_in_bytes", memory_budget_in_bytes),
+            ("max_mem_per_task_in_bytes", max_mem_per_task_in_bytes),
+        ]:
+            hdbg.dassert_is(
+                value,
+                None,
+                "'%s' requires backend='scheduled_multiprocessing', not '%s'",
+                name,
+                backend,
+            )
     _LOG.info("Saving log info in '%s'", log_file)
     _LOG.info(
         "Number of executing threads=%s (%s)",
@@ -738,12 +1217,148 @@ def parallel_execute(
                             res_tmp = future.result()
                             res.append(res_tmp)
                             pbar.update(1)
+        elif backend == "scheduled_multiprocessing":
+            if num_threads == -1:
+                num_threads = get_num_executing_threads(num_threads)
+            hdbg.dassert_lte(1, num_threads)
+            task_costs = get_task_costs(task_cost_log_files or [])
+            _LOG.info(
+                "Found the cost of %s tasks out of %s",
+                sum(get_task_id(task) in task_costs for task in tasks),
+                task_len,
+            )
+            with tqdm_iter as pbar:
+                res = _execute_scheduled_tasks(
+                    workload,
+                    incremental,
+                    abort_on_error,
+                    num_attempts,
+                    log_file,
+                    num_threads,
+                    task_costs,
+                    memory_budget_in_bytes,
+                    max_mem_per_task_in_bytes,
+                    pbar,
+                )
         else:
             raise ValueError(f"Invalid backend='{backend}'")
     _LOG.info("Saved log info in '%s'", log_file)
     return res
 
 
+def parallel_map(
+    func: Callable,
+    tasks: List[Task],
+    *,
+    num_threads: Union[str, int] = "serial",
+    backend: str = "loky",
+) -> List[Any]:
+    """
+    Apply `func` to each task, returning the results in the order of `tasks`.
+
+    Unlike `parallel_execute()`, there is no logging, retrying, or handling of
+    errors for each task, so that this is suitable for many small tasks inside
+    a computation (e.g., fitting a model for each asset).
+
+    :param func: function to apply to the `*args` and `**kwargs` of each task
+    :param tasks: tasks to execute
+    :param num_threads: "serial" to execute the tasks in the calling thread,
+        otherwise the number of workers as in `joblib.Parallel()`
+    :param backend: `joblib` backend (e.g., "loky" or "multiprocessing" for
+        processes, "threading" for threads)
+    :return: the results of `func` for each task
+    """
+    hdbg.dassert_isinstance(tasks, list)
+    # Do not use `validate_task()` since it formats the args, which can be
+    # large.
+    for task in tasks:
+        hdbg.dassert_isinstance(task, tuple)
+        hdbg.dassert_eq(len(task), 2)
+    num_executing_threads = get_num_executing_threads(num_threads)
+    if num_executing_threads == 1 or len(tasks) <= 1:
+        res = [func(*args, **kwargs) for args, kwargs in tasks]
+    else:
+        hdbg.dassert_in(backend, ("loky", "threading", "multiprocessing"))
+        res = joblib.Parallel(n_jobs=num_executing_threads, backend=backend)(
+            joblib.delayed(func)(*args, **kwargs) for args, kwargs in tasks
+        )
+    return res
+
+
+def parallel_imap(
+    func: Callable,
+    tasks: Iterable[Task],
+    *,
+    num_threads: Union[str, int] = "serial",
+    backend: str = "loky",
+    max_tasks_in_flight: Optional[int] = None,
+) -> Iterator[Any]:
+    """
+    Apply `func` to each task lazily, yielding the results in task order.
+
+    Unlike `parallel_map()`, `tasks` is consumed only when a task can be
+    submitted, so that at most `max_tasks_in_flight` tasks are submitted and
+    not yet returned to the caller at any time. A new task is submitted as
+    soon as the result of the oldest one is returned, without waiting for a
+    batch of tasks to complete.
+
+    :param func: function to apply to the `*args` and `**kwargs` of each task
+    :param tasks: tasks to execute, which are generated in the calling thread
+    :param num_threads: "serial" to execute the tasks in the calling thread,
+        otherwise the number of workers as in `joblib.Parallel()`
+    :param backend: "loky" or "multiprocessing" for processes, "threading"
+        for threads
+    :param max_tasks_in_flight: max number of tasks submitted and not yet
+        returned, to bound the memory used by the tasks and their results.
+        `None` means the number of workers
+    :return: the results of `func` for each task
+    """
+    num_executing_threads = get_num_executing_threads(num_threads)
+    if num_executing_threads == 1:
+        for args, kwargs in tasks:
+            yield func(*args, **kwargs)
+        return
+    if max_tasks_in_flight is None:
+        max_tasks_in_flight = num_executing_threads
+    hdbg.dassert_lte(1, max_tasks_in_flight)
+    if backend == "loky":
+        # The loky executor is reused across calls, so it is not shut down.
+        executor = get_reusable_executor(max_workers=num_executing_threads)
+    elif backend == "multiprocessing":
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=num_executing_threads
+        )
+    elif backend == "threading":
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=num_executing_threads
+        )
+    else:
+        raise ValueError(f"Invalid backend='{backend}'")
+    tasks_iter = iter(tasks)
+    futures: collections.deque = collections.deque()
+    try:
+        while True:
+            # Top up the tasks in flight.
+            while len(futures) < max_tasks_in_flight:
+                task = next(tasks_iter, None)
+                if task is None:
+                    break
+                hdbg.dassert_isinstance(task, tuple)
+                hdbg.dassert_eq(len(task), 2)
+                args, kwargs = task
+                futures.append(executor.submit(func, *args, **kwargs))
+            if not futures:
+                break
+            yield futures.popleft().result()
+    finally:
+        # Do not start the remaining tasks, e.g., if the caller stops
+        # iterating or a task fails.
+        for future in futures:
+            future.cancel()
+        if backend != "loky":
+            executor.shutdown(wait=True)
+
+
 # #############################################################################
 # joblib storage backend for S3.
 # #############################################################################
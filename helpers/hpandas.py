@@ -98,6 +98,7 @@ def _get_index(obj: Union[pd.Index, pd.DataFrame, pd.Series]) -> pd.Index:
 
 # TODO(gp): Maybe for symmetry with the other functions, rename to
 #  dassert_datetime_index
+@hdbg.check_level("cheap")
 def dassert_index_is_datetime(
     obj: Union[pd.Index, pd.DataFrame, pd.Series],
     msg: Optional[str] = None,
@@ -119,6 +120,7 @@ def dassert_index_is_datetime(
         hdbg.dassert_isinstance(index, pd.DatetimeIndex, msg, *args)
 
 
+@hdbg.check_level("full")
 def dassert_unique_index(
     obj: Union[pd.Index, pd.DataFrame, pd.Series],
     msg: Optional[str] = None,
@@ -140,6 +142,7 @@ def dassert_unique_index(
 
 
 # TODO(gp): @all Add unit tests.
+@hdbg.check_level("full")
 def dassert_increasing_index(
     obj: Union[pd.Index, pd.DataFrame, pd.Series],
     msg: Optional[str] = None,
@@ -180,6 +183,7 @@ def dassert_increasing_index(
 
 
 # TODO(gp): @all Add more info in case of failures and unit tests.
+@hdbg.check_level("full")
 def dassert_strictly_increasing_index(
     obj: Union[pd.Index, pd.DataFrame, pd.Series],
     msg: Optional[str] = None,
@@ -193,6 +197,7 @@ def dassert_strictly_increasing_index(
 
 
 # TODO(gp): Not sure it's used or useful?
+@hdbg.check_level("full")
 def dassert_monotonic_index(
     obj: Union[pd.Index, pd.DataFrame, pd.Series],
     msg: Optional[str] = None,
@@ -209,6 +214,7 @@ def dassert_monotonic_index(
 
 
 # TODO(Paul): @gp -> dassert_datetime_indexed_df
+@hdbg.check_level("full")
 def dassert_time_indexed_df(
     df: pd.DataFrame, allow_empty: bool, strictly_increasing: bool
 ) -> None:
@@ -244,6 +250,7 @@ def dassert_time_indexed_df(
     hdateti.dassert_has_tz(index_item)
 
 
+@hdbg.check_level("full")
 def dassert_valid_remap(to_remap: List[str], remap_dict: Dict[str, str]) -> None:
     """
     Ensure that remapping rows / columns is valid.
@@ -263,6 +270,7 @@ def dassert_valid_remap(to_remap: List[str], remap_dict: Dict[str, str]) -> None
     hdbg.dassert_not_intersection(remap_dict.values(), to_remap)
 
 
+@hdbg.check_level("cheap")
 def dassert_series_type_is(
     srs: pd.Series,
     type_: type,
@@ -282,6 +290,7 @@ def dassert_series_type_is(
     hdbg.dassert_eq(srs.dtype.type, type_, msg, *args)
 
 
+@hdbg.check_level("cheap")
 def dassert_series_type_in(
     srs: pd.Series,
     types: List[type],
@@ -296,6 +305,7 @@ def dassert_series_type_in(
     hdbg.dassert_in(srs.dtype.type, types, msg, *args)
 
 
+@hdbg.check_level("full")
 def dassert_indices_equal(
     df1: pd.DataFrame,
     df2: pd.DataFrame,
@@ -324,6 +334,7 @@ def dassert_indices_equal(
     )
 
 
+@hdbg.check_level("full")
 def dassert_columns_equal(
     df1: pd.DataFrame,
     df2: pd.DataFrame,
@@ -351,6 +362,7 @@ def dassert_columns_equal(
     )
 
 
+@hdbg.check_level("full")
 def dassert_axes_equal(
     df1: pd.DataFrame, df2: pd.DataFrame, *, sort_cols: bool = False
 ) -> None:
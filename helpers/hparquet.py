@@ -9,7 +9,8 @@ import datetime
 import glob
 import logging
 import os
-from typing import Any, Iterator, List, Optional, Tuple, Union
+import weakref
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -288,6 +289,106 @@ def to_parquet(
         )
 
 
+# #############################################################################
+# ParquetRowGroupWriter
+# #############################################################################
+
+
+class ParquetRowGroupWriter:
+    """
+    Append dataframes to a local Parquet file, one row group per dataframe.
+
+    While the file is open, the data is written to a file with the same name
+    prefixed by `_`, which is skipped when reading the enclosing dir as a
+    Parquet dataset. The file is renamed to `file_name` when it is closed,
+    i.e., when it has a Parquet footer, so that a reader never sees a
+    partially written file.
+
+    The file is closed also when the object is garbage collected or the
+    interpreter exits.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        """
+        Constructor.
+
+        :param file_name: path to the Parquet file to write, e.g.,
+            `.../node_io.metrics/node_metrics.20220808_161502.parquet`
+        """
+        hdbg.dassert_isinstance(file_name, str)
+        hdbg.dassert(
+            not hs3.is_s3_path(file_name),
+            "Only local files are supported: file_name='%s'",
+            file_name,
+        )
+        hdbg.dassert_file_extension(file_name, ["parquet", "pq"])
+        hdbg.dassert_path_not_exists(file_name)
+        self._file_name = file_name
+        dir_name, basename = os.path.split(file_name)
+        self._tmp_file_name = os.path.join(dir_name, f"_{basename}")
+        self._writer: Optional[pq.ParquetWriter] = None
+        self._finalizer: Optional[weakref.finalize] = None
+
+    @property
+    def file_name(self) -> str:
+        return self._file_name
+
+    @property
+    def schema(self) -> Optional[pa.Schema]:
+        """
+        Return the schema of the file, or `None` if nothing was written.
+        """
+        return None if self._writer is None else self._writer.schema
+
+    def append(self, df: pd.DataFrame) -> None:
+        """
+        Write `df` as a new row group.
+
+        The first dataframe sets the schema of the file, and the next ones
+        are cast to it.
+
+        :param df: data to write; it must have the same columns as the
+            first dataframe
+        """
+        hdbg.dassert_isinstance(df, pd.DataFrame)
+        table = pa.Table.from_pandas(df)
+        if self._writer is None:
+            _create_enclosing_dir(self._file_name)
+            if os.path.exists(self._tmp_file_name):
+                # Remove a file left by a writer that was interrupted.
+                os.remove(self._tmp_file_name)
+            self._writer = pq.ParquetWriter(self._tmp_file_name, table.schema)
+            self._finalizer = weakref.finalize(
+                self,
+                _close_parquet_writer,
+                self._writer,
+                self._tmp_file_name,
+                self._file_name,
+            )
+        elif not table.schema.equals(self._writer.schema, check_metadata=False):
+            # E.g., an int column that is float in the first dataframe.
+            table = table.cast(self._writer.schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        """
+        Write the Parquet footer and rename the file to `file_name`.
+        """
+        if self._finalizer is None:
+            # Nothing was written.
+            return
+        self._finalizer()
+        self._finalizer = None
+        self._writer = None
+
+
+def _close_parquet_writer(
+    writer: pq.ParquetWriter, tmp_file_name: str, file_name: str
+) -> None:
+    writer.close()
+    os.replace(tmp_file_name, file_name)
+
+
 # #############################################################################
 
 
@@ -824,6 +925,7 @@ def to_partitioned_parquet(
     dst_dir: str,
     *,
     aws_profile: hs3.AwsProfile = None,
+    row_group_catalog_kwargs: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
     Save the given dataframe as Parquet file partitioned along the given
@@ -833,6 +935,9 @@ def to_partitioned_parquet(
     :param partition_columns: partitioning columns
     :param dst_dir: location of partitioned dataset
     :param aws_profile: the name of an AWS profile or a s3fs filesystem
+    :param row_group_catalog_kwargs: if not `None`, add the written files to
+        the row group catalog of the dataset, passing these kwargs to
+        `update_row_group_catalog()` (e.g., `timestamp_col`)
 
     E.g., in case of partition using `date`, the file layout looks like:
     ```
@@ -884,11 +989,18 @@ def to_partitioned_parquet(
         #  how to do it. Either setting permissions to read-only before writing.
         #  Or having a list of files that will be written and ensure that none of
         #  those files already existing.
+        written_file_paths = []
         pq.write_to_dataset(
             table,
             dst_dir,
             partition_cols=partition_columns,
             filesystem=filesystem,
+            file_visitor=lambda file: written_file_paths.append(file.path),
+        )
+    if row_group_catalog_kwargs is not None:
+        hdbg.dassert_is(aws_profile, None, "Only local paths are supported")
+        update_row_group_catalog(
+            dst_dir, file_paths=written_file_paths, **row_group_catalog_kwargs
         )
 
 
@@ -1001,6 +1113,272 @@ def list_and_merge_pq_files(
             data.to_parquet(os.path.join(folder, file_name))
 
 
+# #############################################################################
+# Row group catalog
+# #############################################################################
+
+# The catalog is saved in the root dir of the dataset. The leading underscore
+# makes Arrow ignore it when reading the dataset.
+ROW_GROUP_CATALOG_FILE_NAME = "_row_group_catalog.parquet"
+
+
+def _get_row_group_stats(
+    root_dir: str,
+    file_path: str,
+    timestamp_col: str,
+    asset_id_col: Optional[str],
+) -> List[Dict[str, Any]]:
+    """
+    Get the stats of each row group of a Parquet file from its footer.
+
+    :param root_dir: root dir of the Parquet dataset
+    :param file_path: path of the Parquet file
+    :param timestamp_col, asset_id_col: as in `update_row_group_catalog()`
+    :return: one dict per row group with the catalog columns
+    """
+    metadata = pq.ParquetFile(file_path).metadata
+    column_names = [
+        metadata.schema.column(idx).name for idx in range(metadata.num_columns)
+    ]
+    # The asset id can be a partitioning column, i.e., stored in the path.
+    tiles = dict(_get_parquet_tiles_from_file_path(file_path))
+
+    def _get_min_max(row_group: pq.RowGroupMetaData, col: str) -> Tuple:
+        if col not in column_names:
+            return None, None
+        stats = row_group.column(column_names.index(col)).statistics
+        if stats is None or not stats.has_min_max:
+            return None, None
+        return stats.min, stats.max
+
+    rows = []
+    for idx in range(metadata.num_row_groups):
+        row_group = metadata.row_group(idx)
+        min_timestamp, max_timestamp = _get_min_max(row_group, timestamp_col)
+        if asset_id_col in tiles:
+            min_asset_id = max_asset_id = tiles[asset_id_col]
+        elif asset_id_col is not None:
+            min_asset_id, max_asset_id = _get_min_max(row_group, asset_id_col)
+        else:
+            min_asset_id = max_asset_id = None
+        rows.append(
+            {
+                "file_path": os.path.relpath(file_path, root_dir),
+                "row_group": idx,
+                "num_rows": row_group.num_rows,
+                "min_timestamp": min_timestamp,
+                "max_timestamp": max_timestamp,
+                "min_asset_id": min_asset_id,
+                "max_asset_id": max_asset_id,
+            }
+        )
+    return rows
+
+
+def update_row_group_catalog(
+    root_dir: str,
+    *,
+    file_paths: Optional[List[str]] = None,
+    timestamp_col: str = "timestamp",
+    asset_id_col: Optional[str] = "asset_id",
+) -> pd.DataFrame:
+    """
+    Build or update the catalog with the stats of the row groups of a dataset.
+
+    The catalog has one row per file and row group, with the number of rows
+    and the min / max of the timestamp and of the asset id, e.g.,
+    ```
+                                file_path  row_group  num_rows              min_timestamp              max_timestamp  min_asset_id  max_asset_id
+    0  asset_id=1/year=2022/month=1/data.parquet          0      1000  2022-01-01 00:00:00+00:00  2022-01-01 16:39:00+00:00             1             1
+    ```
+    The stats are read from the Parquet footers, so the data is not loaded.
+
+    :param root_dir: root dir of the Parquet dataset (only local filesystem
+        is supported)
+    :param file_paths: files to add or refresh in the catalog, e.g., the files
+        just written. `None` to rebuild the catalog from all the files
+    :param timestamp_col: name of the timestamp column (or of the index, when
+        saved by Pandas)
+    :param asset_id_col: name of the asset id column, which can also be a
+        partitioning column. `None` if there is no asset id
+    :return: the updated catalog
+    """
+    hdbg.dassert_dir_exists(root_dir)
+    hdbg.dassert(not hs3.is_s3_path(root_dir), "Only local paths are supported")
+    catalog_path = os.path.join(root_dir, ROW_GROUP_CATALOG_FILE_NAME)
+    if file_paths is None:
+        file_paths = sorted(
+            glob.glob(os.path.join(root_dir, "**", "*.parquet"), recursive=True)
+        )
+        file_paths = [
+            file_path
+            for file_path in file_paths
+            if os.path.basename(file_path) != ROW_GROUP_CATALOG_FILE_NAME
+        ]
+        catalog = None
+    elif os.path.exists(catalog_path):
+        catalog = load_row_group_catalog(root_dir)
+        # Remove the stale rows of the updated files.
+        rel_file_paths = [
+            os.path.relpath(file_path, root_dir) for file_path in file_paths
+        ]
+        catalog = catalog[~catalog["file_path"].isin(rel_file_paths)]
+    else:
+        catalog = None
+    rows = []
+    for file_path in file_paths:
+        rows.extend(
+            _get_row_group_stats(root_dir, file_path, timestamp_col, asset_id_col)
+        )
+    new_catalog = pd.DataFrame(
+        rows,
+        columns=[
+            "file_path",
+            "row_group",
+            "num_rows",
+            "min_timestamp",
+            "max_timestamp",
+            "min_asset_id",
+            "max_asset_id",
+        ],
+    )
+    if catalog is not None and not catalog.empty:
+        new_catalog = pd.concat([catalog, new_catalog], ignore_index=True)
+    new_catalog = new_catalog.sort_values(
+        ["file_path", "row_group"], ignore_index=True
+    )
+    # Write to a temporary file and rename it, so that readers never see a
+    # partially written catalog.
+    tmp_catalog_path = catalog_path + ".tmp"
+    new_catalog.to_parquet(tmp_catalog_path, index=False)
+    os.replace(tmp_catalog_path, catalog_path)
+    return new_catalog
+
+
+def load_row_group_catalog(root_dir: str) -> pd.DataFrame:
+    """
+    Load the catalog built by `update_row_group_catalog()`.
+    """
+    catalog_path = os.path.join(root_dir, ROW_GROUP_CATALOG_FILE_NAME)
+    hdbg.dassert_file_exists(catalog_path)
+    catalog = pd.read_parquet(catalog_path)
+    return catalog
+
+
+def prune_row_groups(
+    catalog: pd.DataFrame,
+    *,
+    start_timestamp: Optional[pd.Timestamp] = None,
+    end_timestamp: Optional[pd.Timestamp] = None,
+    asset_ids: Optional[List[Any]] = None,
+) -> pd.DataFrame:
+    """
+    Select the row groups that can contain data in the requested interval and
+    assets.
+
+    The row groups without stats are always selected.
+
+    :param catalog: as returned by `load_row_group_catalog()`
+    :param start_timestamp, end_timestamp: interval of timestamps, with both
+        bounds included. `None` means no bound
+    :param asset_ids: assets to select. `None` means all the assets
+    :return: the rows of the catalog for the selected row groups
+    """
+    mask = pd.Series(True, index=catalog.index)
+    if start_timestamp is not None:
+        max_timestamp = catalog["max_timestamp"]
+        mask &= max_timestamp.isna() | (max_timestamp >= start_timestamp)
+    if end_timestamp is not None:
+        min_timestamp = catalog["min_timestamp"]
+        mask &= min_timestamp.isna() | (min_timestamp <= end_timestamp)
+    if asset_ids is not None:
+        min_asset_id = catalog["min_asset_id"]
+        max_asset_id = catalog["max_asset_id"]
+        # Check whether any of the assets is in the range of each row group.
+        asset_mask = min_asset_id.isna() | max_asset_id.isna()
+        for asset_id in asset_ids:
+            asset_mask |= (min_asset_id <= asset_id) & (asset_id <= max_asset_id)
+        mask &= asset_mask
+    return catalog[mask]
+
+
+def from_parquet_with_row_group_catalog(
+    root_dir: str,
+    *,
+    start_timestamp: Optional[pd.Timestamp] = None,
+    end_timestamp: Optional[pd.Timestamp] = None,
+    asset_ids: Optional[List[Any]] = None,
+    columns: Optional[List[str]] = None,
+    timestamp_col: str = "timestamp",
+    asset_id_col: Optional[str] = "asset_id",
+) -> pd.DataFrame:
+    """
+    Load the data in an interval and for some assets, reading only the row
+    groups that can contain it according to the catalog.
+
+    The partitioning columns are added to the data as in `from_parquet()`.
+
+    :param root_dir: root dir of the Parquet dataset with a catalog built by
+        `update_row_group_catalog()`
+    :param start_timestamp, end_timestamp, asset_ids: as in
+        `prune_row_groups()`
+    :param columns: columns to read. `None` means all the columns
+    :param timestamp_col, asset_id_col: as in `update_row_group_catalog()`
+    :return: data in the interval and for the assets
+    """
+    catalog = load_row_group_catalog(root_dir)
+    selected = prune_row_groups(
+        catalog,
+        start_timestamp=start_timestamp,
+        end_timestamp=end_timestamp,
+        asset_ids=asset_ids,
+    )
+    _LOG.debug(
+        "Reading %s / %s row groups from %s / %s files",
+        selected.shape[0],
+        catalog.shape[0],
+        selected["file_path"].nunique(),
+        catalog["file_path"].nunique(),
+    )
+    dfs = []
+    for file_path, file_row_groups in selected.groupby("file_path", sort=True):
+        file_path = os.path.join(root_dir, file_path)
+        parquet_file = pq.ParquetFile(file_path)
+        table = parquet_file.read_row_groups(
+            file_row_groups["row_group"].tolist(),
+            columns=columns,
+            use_pandas_metadata=True,
+        )
+        df = table.to_pandas(coerce_temporal_nanoseconds=True)
+        for col, value in _get_parquet_tiles_from_file_path(file_path):
+            if columns is None or col in columns:
+                df[col] = value
+        dfs.append(df)
+    if not dfs:
+        return pd.DataFrame(columns=columns)
+    df = pd.concat(dfs)
+    if isinstance(df.index, pd.DatetimeIndex):
+        df.index = df.index.as_unit("ns")
+    # Filter the rows exactly, since a row group can contain also data outside
+    # the interval or for other assets.
+    if timestamp_col == df.index.name:
+        timestamps = df.index.to_series()
+    elif timestamp_col in df.columns:
+        timestamps = df[timestamp_col]
+    else:
+        timestamps = None
+    mask = pd.Series(True, index=df.index)
+    if timestamps is not None:
+        if start_timestamp is not None:
+            mask &= (timestamps >= start_timestamp).values
+        if end_timestamp is not None:
+            mask &= (timestamps <= end_timestamp).values
+    if asset_ids is not None and asset_id_col in df.columns:
+        mask &= df[asset_id_col].isin(asset_ids).values
+    df = df[mask.values]
+    return df
+
+
 def maybe_cast_to_int(string: str) -> Union[str, int]:
     """
     Return `string` as an `int` if convertible, otherwise a no-op.
@@ -777,6 +777,82 @@ def execute_insert_on_conflict_do_nothing_query(
         raise e
 
 
+def get_staging_table_name(table_name: str) -> str:
+    """
+    Return the name of the temporary table used to stage the inserts into
+    `table_name`.
+    """
+    return f"tmp_staging_{table_name}"
+
+
+def execute_insert_on_conflict_do_nothing_query_via_staging_table(
+    connection: DbConnection,
+    df: pd.DataFrame,
+    table_name: str,
+    unique_columns: List[str],
+) -> None:
+    """
+    Insert rows into a table through a staging table, skipping the duplicates.
+
+    The rows are copied with `COPY FROM` into a temporary table with the same
+    columns as `table_name` and then moved into it with a single
+    `INSERT ... SELECT ... ON CONFLICT DO NOTHING`. This is faster than
+    `execute_insert_on_conflict_do_nothing_query()` for batches of thousands
+    of rows, since the values are not rendered into the query.
+
+    The temporary table lives as long as the DB session, so it is created only
+    at the first insert through a connection. Unlike the other insert
+    functions, the existence of the target table is not checked, so that the
+    caller can check it only once.
+
+    :param connection: connection to the DB
+    :param df: data to insert
+    :param table_name: name of the table for insertion
+    :param unique_columns: as in `execute_insert_on_conflict_do_nothing_query()`
+    """
+    hdbg.dassert_isinstance(df, pd.DataFrame)
+    hdbg.dassert_is_subset(unique_columns, list(df.columns))
+    staging_table_name = get_staging_table_name(table_name)
+    columns = ",".join(list(df.columns))
+    if unique_columns:
+        unique_columns_str = ",".join(unique_columns)
+        on_conflict = f"ON CONFLICT ({unique_columns_str}) DO NOTHING"
+    else:
+        # Same as in `execute_insert_on_conflict_do_nothing_query()`.
+        on_conflict = ""
+    # Serialize the data, e.g., NaNs are saved as empty strings that are
+    # loaded as NULL values.
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    cur = connection.cursor()
+    try:
+        cur.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS {staging_table_name} "
+            f"(LIKE {table_name} INCLUDING DEFAULTS)"
+        )
+        cur.execute(f"TRUNCATE {staging_table_name}")
+        cur.copy_expert(
+            f"COPY {staging_table_name}({columns}) FROM STDIN WITH (FORMAT CSV)",
+            buffer,
+        )
+        cur.execute(
+            f"INSERT INTO {table_name}({columns}) "
+            f"SELECT {columns} FROM {staging_table_name} {on_conflict}"
+        )
+        connection.commit()
+    except Exception as e:
+        _LOG.error(
+            "Failed to insert %s rows into '%s' with the '%s'",
+            df.shape[0],
+            table_name,
+            str(e),
+        )
+        # Leave the connection usable for the next insert.
+        connection.rollback()
+        raise e
+
+
 def execute_query(connection: DbConnection, query: str) -> List[tuple]:
     """
     Use for generic simple operations.
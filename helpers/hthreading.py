@@ -1,6 +1,10 @@
 #!/usr/bin/env python
 """
-`timeout` decorator which is used to limit function execution time.
+Utilities for threads, e.g.,:
+
+- `timeout` decorator which is used to limit function execution time
+- `BackgroundWorker` to run functions (e.g., writing files) off the
+  critical path
 
 Import as:
 
@@ -8,9 +12,16 @@ import helpers.hthreading as hthread
 """
 
 import _thread
+import atexit
+import logging
+import queue
 import sys
 import threading
-from typing import Any
+from typing import Any, Callable, Optional
+
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
 
 
 def _timeout_handler() -> None:
@@ -41,3 +52,116 @@ def timeout(timeout_sec: int) -> Any:
         return inner
 
     return outer
+
+
+# #############################################################################
+# BackgroundWorker
+# #############################################################################
+
+
+class BackgroundWorker:
+    """
+    Execute functions in a background thread, in the order of submission.
+
+    The queue of pending functions is bounded: when it's full `submit()`
+    either blocks until there is space (backpressure) or drops the function.
+
+    An exception raised by a function is re-raised by the next call to
+    `submit()` or `flush()`, so that errors are not lost.
+
+    The pending functions are executed before the interpreter exits.
+    """
+
+    def __init__(
+        self,
+        max_queue_size: int,
+        *,
+        drop_when_full: bool = False,
+        name: str = "background_worker",
+    ) -> None:
+        """
+        Constructor.
+
+        :param max_queue_size: max number of functions waiting to be executed
+        :param drop_when_full: drop the submitted function if the queue is
+            full, instead of blocking until there is space
+        :param name: name of the thread
+        """
+        hdbg.dassert_lte(1, max_queue_size)
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._drop_when_full = drop_when_full
+        self._name = name
+        self.num_dropped = 0
+        self._exception: Optional[BaseException] = None
+        self._is_closed = False
+        self._thread = threading.Thread(
+            target=self._work, name=name, daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, func: Callable, *args: Any, **kwargs: Any) -> bool:
+        """
+        Enqueue `func(*args, **kwargs)` for execution.
+
+        :return: whether the function was enqueued or dropped
+        """
+        hdbg.dassert(not self._is_closed, "Worker '%s' is closed", self._name)
+        self._raise_exception()
+        task = (func, args, kwargs)
+        if not self._drop_when_full:
+            self._queue.put(task)
+            return True
+        try:
+            self._queue.put_nowait(task)
+        except queue.Full:
+            self.num_dropped += 1
+            _LOG.warning(
+                "Queue of worker '%s' is full: dropped %s (num_dropped=%s)",
+                self._name,
+                func.__name__,
+                self.num_dropped,
+            )
+            return False
+        return True
+
+    def flush(self) -> None:
+        """
+        Wait until all the submitted functions are executed.
+        """
+        self._queue.join()
+        self._raise_exception()
+
+    def close(self) -> None:
+        """
+        Execute the pending functions and stop the thread.
+        """
+        if self._is_closed:
+            return
+        self._is_closed = True
+        atexit.unregister(self.close)
+        # Signal the thread to stop after the pending functions.
+        self._queue.put(None)
+        self._thread.join()
+        self._raise_exception()
+
+    def _work(self) -> None:
+        while True:
+            task = self._queue.get()
+            try:
+                if task is None:
+                    break
+                func, args, kwargs = task
+                func(*args, **kwargs)
+            except BaseException as e:  # pylint: disable=broad-except
+                _LOG.error("Worker '%s' failed: %s", self._name, e)
+                if self._exception is None:
+                    self._exception = e
+            finally:
+                self._queue.task_done()
+
+    def _raise_exception(self) -> None:
+        if self._exception is not None:
+            exception = self._exception
+            self._exception = None
+            raise exception
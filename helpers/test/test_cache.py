@@ -933,3 +933,177 @@ class TestCacheEnableCheckOnlyIfPresent1(_ResetGlobalCacheHelper):
 
 # TODO(gp): Add a test for verbose mode in __call__
 # TODO(gp): get_function_cache_info
+
+
+# #############################################################################
+# TestLruCache1
+# #############################################################################
+
+
+class TestLruCache1(hunitest.TestCase):
+    def test_evict1(self) -> None:
+        """
+        Check that the least recently used objects are evicted first.
+        """
+        obj = np.zeros(100)
+        lru_cache = hcache._LruCache(3 * obj.nbytes)
+        for key in ["a", "b", "c"]:
+            lru_cache.put(key, obj.copy())
+        # Use "a" so that "b" is the least recently used object.
+        found, _ = lru_cache.get("a")
+        self.assertTrue(found)
+        lru_cache.put("d", obj.copy())
+        self.assertFalse(lru_cache.get("b")[0])
+        self.assertTrue(lru_cache.get("a")[0])
+        actual = lru_cache.get_stats()
+        expected = {
+            "num_objects": 3,
+            "size_in_bytes": 3 * obj.nbytes,
+            "max_size_in_bytes": 3 * obj.nbytes,
+            "num_hits": 2,
+            "num_misses": 1,
+            "num_evictions": 1,
+        }
+        self.assertDictEqual(actual, expected)
+
+    def test_size1(self) -> None:
+        """
+        Check that the size of a dataframe includes its Python objects.
+        """
+        df = pd.DataFrame({"a": ["x" * 1000] * 10})
+        lru_cache = hcache._LruCache(5000)
+        lru_cache.put("df", df)
+        # The strings don't fit in the cache.
+        self.assertEqual(lru_cache.get_stats()["num_objects"], 0)
+
+
+# #############################################################################
+# TestLruCacheTier1
+# #############################################################################
+
+
+class TestLruCacheTier1(_ResetGlobalCacheHelper):
+    def test_lru_cache1(self) -> None:
+        """
+        Check that the LRU cache returns the value without executing the
+        function.
+        """
+        hcache.clear_lru_cache()
+        f, cf = self._get_f_cf_functions(
+            use_mem_cache=False, use_disk_cache=False, use_lru_cache=True
+        )
+        self._execute_and_check_state(f, cf, 3, 4, exp_cf_state="no_cache")
+        self._execute_and_check_state(f, cf, 3, 4, exp_cf_state="lru")
+        # Passing the params by name hits the same value.
+        act = cf(3, y=4)
+        self.assertEqual(act, 7)
+        self.assertEqual(cf.get_last_cache_accessed(), "lru")
+        self._execute_and_check_state(f, cf, 4, 4, exp_cf_state="no_cache")
+        actual = cf.get_cache_stats()["lru"]
+        expected = {"num_hits": 2, "num_misses": 2}
+        self.assertDictEqual(actual, expected)
+
+    def test_copy1(self) -> None:
+        """
+        Check that modifying a value returned by the LRU cache doesn't change
+        the cached value.
+        """
+        hcache.clear_lru_cache()
+
+        def _get_df(val: float) -> pd.DataFrame:
+            return pd.DataFrame({"a": [val, val]})
+
+        cf = hcache._Cached(
+            _get_df,
+            tag=self.cache_tag,
+            use_mem_cache=False,
+            use_disk_cache=False,
+            use_lru_cache=True,
+        )
+        df = cf(1.0)
+        df.iloc[0, 0] = 2.0
+        df = cf(1.0)
+        self.assertEqual(cf.get_last_cache_accessed(), "lru")
+        df.iloc[1, 0] = 3.0
+        df = cf(1.0)
+        self.assertEqual(df["a"].tolist(), [1.0, 1.0])
+
+    def test_clear_global_cache1(self) -> None:
+        """
+        Check that clearing a global cache also clears the LRU cache.
+        """
+        hcache.clear_lru_cache()
+        f, cf = self._get_f_cf_functions(
+            use_mem_cache=False, use_disk_cache=False, use_lru_cache=True
+        )
+        self._execute_and_check_state(f, cf, 3, 4, exp_cf_state="no_cache")
+        self._execute_and_check_state(f, cf, 3, 4, exp_cf_state="lru")
+        hcache.clear_global_cache("mem", tag=self.cache_tag)
+        self.assertEqual(hcache.get_lru_cache_stats()["num_objects"], 0)
+
+
+# #############################################################################
+# TestParquetSerializer1
+# #############################################################################
+
+
+class TestParquetSerializer1(hunitest.TestCase):
+    def test_dataframe1(self) -> None:
+        """
+        Check that a dataframe is stored as Parquet and read back.
+        """
+        df = pd.DataFrame(
+            {"a": [1.0, np.nan], "b": ["x", "y"]},
+            index=pd.date_range("2022-01-01", periods=2, tz="UTC"),
+        )
+        serializer = hcache.ParquetSerializer()
+        payload = serializer.serialize(df)
+        self.assertIsInstance(payload, hcache._ParquetPayload)
+        hunitest.compare_df(serializer.deserialize(payload), df)
+
+    def test_series1(self) -> None:
+        """
+        Check that a series is read back with its name.
+        """
+        srs = pd.Series([1, 2, 3])
+        serializer = hcache.ParquetSerializer()
+        actual = serializer.deserialize(serializer.serialize(srs))
+        self.assertTrue(actual.equals(srs))
+        self.assertIsNone(actual.name)
+
+    def test_not_supported1(self) -> None:
+        """
+        Check that values not supported by Parquet are stored as they are.
+        """
+        serializer = hcache.ParquetSerializer()
+        df = pd.DataFrame({"a": [[1], 2]})
+        self.assertIs(serializer.serialize(df), df)
+        self.assertEqual(serializer.serialize(3), 3)
+
+
+# #############################################################################
+# TestReduceCacheSize1
+# #############################################################################
+
+
+class TestReduceCacheSize1(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that the least recently accessed items are evicted.
+        """
+        import joblib
+
+        memory = joblib.Memory(self.get_scratch_space(), verbose=0)
+        cached_func = memory.cache(np.ones)
+        for size in [1000, 2000, 3000]:
+            cached_func(size)
+            time.sleep(0.01)
+        items = memory.store_backend.get_items()
+        self.assertEqual(len(items), 3)
+        size_in_bytes = sum(item.size for item in items)
+        # Leave room only for the 2 most recent items.
+        max_size_in_bytes = size_in_bytes - min(item.size for item in items)
+        num_removed_items = hcache._reduce_cache_size(memory, max_size_in_bytes)
+        self.assertEqual(num_removed_items, 1)
+        items = memory.store_backend.get_items()
+        self.assertEqual(len(items), 2)
@@ -1,8 +1,13 @@
 import collections
 import logging
+import os
+import unittest.mock as umock
 from typing import List, Tuple
 
+import pytest
+
 import helpers.hdbg as hdbg
+import helpers.hpandas as hpandas
 import helpers.hunit_test as hunitest
 
 _LOG = logging.getLogger(__name__)
@@ -713,3 +718,114 @@ class Test_dassert_all_attributes_are_same1(hunitest.TestCase):
         Obj = collections.namedtuple("Obj", ["a", "b"])
         list_ = [Obj(1, 2), Obj(1, 2)]
         hdbg.dassert_all_attributes_are_same(list_, "b")
+
+
+# #############################################################################
+
+
+class Test_check_level1(hunitest.TestCase):
+    """
+    Test gating the tagged assertions with `hdbg.set_check_level()`.
+    """
+
+    # This will be run before and after each test.
+    @pytest.fixture(autouse=True)
+    def setup_teardown_test(self):
+        # Run before each test.
+        self.set_up_test()
+        yield
+        # Run after each test.
+        self.tear_down_test()
+
+    def set_up_test(self) -> None:
+        self._old_check_level = hdbg.get_check_level()
+
+    def tear_down_test(self) -> None:
+        hdbg.set_check_level(self._old_check_level)
+        hdbg.enable_check_profiling(False)
+        hdbg.reset_check_profiling()
+
+    def test_full1(self) -> None:
+        """
+        Expensive assertions are run at level "full".
+        """
+        hdbg.set_check_level("full")
+        with self.assertRaises(AssertionError):
+            hdbg.dassert_is_subset([1, 4], [1, 2, 3])
+        with self.assertRaises(AssertionError):
+            hdbg.dassert_isinstance(1, str)
+
+    def test_cheap1(self) -> None:
+        """
+        Only the cheap assertions are run at level "cheap".
+        """
+        hdbg.set_check_level("cheap")
+        self.assertEqual(hdbg.get_check_level(), "cheap")
+        # Expensive assertions are skipped.
+        hdbg.dassert_is_subset([1, 4], [1, 2, 3])
+        hdbg.dassert_set_eq([1], [2])
+        # Cheap assertions are still run.
+        with self.assertRaises(AssertionError):
+            hdbg.dassert_isinstance(1, str)
+
+    def test_off1(self) -> None:
+        """
+        Only the untagged assertions are run at level "off".
+        """
+        hdbg.set_check_level("off")
+        self.assertFalse(hdbg.is_check_enabled("cheap"))
+        hdbg.dassert_is_subset([1, 4], [1, 2, 3])
+        hdbg.dassert_isinstance(1, str)
+        # Untagged assertions are always run.
+        with self.assertRaises(AssertionError):
+            hdbg.dassert_eq(1, 2)
+        # Numerical correctness checks are always run.
+        with self.assertRaises(AssertionError):
+            hpandas.dassert_approx_eq(1.0, 2.0)
+
+    def test_invalid_level1(self) -> None:
+        with self.assertRaises(AssertionError):
+            hdbg.set_check_level("paranoid")
+
+    def test_invalid_env_level1(self) -> None:
+        """
+        Check that an invalid `AM_DBG_CHECK_LEVEL` is reported clearly.
+        """
+        with umock.patch.dict(os.environ, {"AM_DBG_CHECK_LEVEL": "paranoid"}):
+            with self.assertRaises(ValueError) as cm:
+                hdbg._get_check_level_from_env()
+        self.assertIn("AM_DBG_CHECK_LEVEL='paranoid'", str(cm.exception))
+
+    def test_no_overhead1(self) -> None:
+        """
+        Check that the enabled assertions are called without any wrapper.
+        """
+        hdbg.set_check_level("full")
+        func = hdbg.dassert_is_subset
+        self.assertFalse(hasattr(func, "__wrapped__"))
+        # The assertion is wrapped while profiling.
+        hdbg.enable_check_profiling(True)
+        self.assertIs(hdbg.dassert_is_subset.__wrapped__, func)
+        hdbg.enable_check_profiling(False)
+        self.assertIs(hdbg.dassert_is_subset, func)
+
+    def test_profiling1(self) -> None:
+        """
+        Check that the time of the tagged assertions is reported per call site.
+        """
+        hdbg.set_check_level("full")
+        hdbg.enable_check_profiling(True)
+        for _ in range(3):
+            hdbg.dassert_set_eq([1, 2], [2, 1])
+        hdbg.dassert_isinstance(1, int)
+        stats = hdbg.get_check_profiling_stats()
+        num_calls = {name: num_calls for name, _, num_calls, _ in stats}
+        self.assertEqual(num_calls, {"dassert_set_eq": 3, "dassert_isinstance": 1})
+        # All the call sites are in this file.
+        for _, call_site, _, _ in stats:
+            self.assertIn("test_dbg.py", call_site)
+        report = hdbg.get_check_profiling_report()
+        self.assertIn("dassert_set_eq", report)
+        # Resetting clears the stats.
+        hdbg.reset_check_profiling()
+        self.assertEqual(hdbg.get_check_profiling_stats(), [])
@@ -1,6 +1,6 @@
 import asyncio
 import logging
-from typing import Optional
+from typing import List, Optional
 
 import helpers.hasyncio as hasynci
 import helpers.hdatetime as hdateti
@@ -89,3 +89,54 @@ class Test_hasyncio1(hunitest.TestCase):
             )
             # Run.
             self.run_test(event_loop, get_wall_clock_time)
+
+
+# #############################################################################
+# Test_TokenBucketRateLimiter1
+# #############################################################################
+
+
+class Test_TokenBucketRateLimiter1(hunitest.TestCase):
+    @staticmethod
+    async def workload(
+        event_loop: asyncio.AbstractEventLoop,
+        rate_limiter: hasynci.TokenBucketRateLimiter,
+        num_operations: int,
+    ) -> List[float]:
+        """
+        Run operations limited by `rate_limiter` and return their start times.
+        """
+        start_time = event_loop.time()
+        times = []
+
+        async def _operation() -> None:
+            await rate_limiter.acquire()
+            times.append(round(event_loop.time() - start_time, 3))
+
+        await asyncio.gather(*[_operation() for _ in range(num_operations)])
+        return times
+
+    def run_test(
+        self, rate_per_sec: float, capacity: Optional[int], num_operations: int
+    ) -> List[float]:
+        with hasynci.solipsism_context() as event_loop:
+            rate_limiter = hasynci.TokenBucketRateLimiter(
+                rate_per_sec, capacity=capacity
+            )
+            coroutine = self.workload(event_loop, rate_limiter, num_operations)
+            times = hasynci.run(coroutine, event_loop=event_loop)
+        return times
+
+    def test1(self) -> None:
+        """
+        Check that operations are spaced according to the rate.
+        """
+        times = self.run_test(2.0, 1, 4)
+        self.assertEqual(times, [0.0, 0.5, 1.0, 1.5])
+
+    def test2(self) -> None:
+        """
+        Check that a full bucket allows a burst of operations.
+        """
+        times = self.run_test(2.0, None, 5)
+        self.assertEqual(times, [0.0, 0.0, 0.5, 1.0, 1.5])
@@ -1,10 +1,14 @@
+import importlib
 import logging
 import os
+import sys
 from typing import Any, Callable
 
 import helpers.hdbg as hdbg
 import helpers.hintrospection as hintros
+import helpers.hio as hio
 import helpers.hpickle as hpickle
+import helpers.hprint as hprint
 import helpers.hstring as hstring
 import helpers.hunit_test as hunitest
 
@@ -361,3 +365,88 @@ class TestGetFunctionFromString1(hunitest.TestCase):
         # Run.
         hdbg.dassert_isinstance(act_func, Callable)
         self.assert_equal(act, exp)
+
+
+# #############################################################################
+# Test_get_lazy_package_getattr1
+# #############################################################################
+
+
+class Test_get_lazy_package_getattr1(hunitest.TestCase):
+    """
+    Check a package exporting lazily the names of its modules.
+    """
+
+    def setUp(self) -> None:
+        super().setUp()
+        # Create a package with a subpackage and 2 modules defining `Foo`.
+        self._dir_name = self.get_scratch_space()
+        self._package_name = f"tmp_lazy_package_{os.getpid()}"
+        package_dir = os.path.join(self._dir_name, self._package_name)
+        hio.create_dir(os.path.join(package_dir, "subpackage"), incremental=True)
+        hio.to_file(os.path.join(package_dir, "subpackage", "__init__.py"), "")
+        txt = f"""
+        import helpers.hintrospection as hintros
+
+        __getattr__, __dir__ = hintros.get_lazy_package_getattr(
+            __name__,
+            ["{self._package_name}.module1", "{self._package_name}.module2"],
+        )
+        """
+        hio.to_file(
+            os.path.join(package_dir, "__init__.py"), hprint.dedent(txt)
+        )
+        txt = """
+        class Foo:
+            pass
+
+        _PRIVATE = 1
+        """
+        hio.to_file(os.path.join(package_dir, "module1.py"), hprint.dedent(txt))
+        txt = """
+        Foo = 2
+
+        globals()["bar"] = 3
+        """
+        hio.to_file(os.path.join(package_dir, "module2.py"), hprint.dedent(txt))
+        sys.path.insert(0, self._dir_name)
+
+    def tearDown(self) -> None:
+        sys.path.remove(self._dir_name)
+        for module_name in list(sys.modules):
+            if module_name.startswith(self._package_name):
+                del sys.modules[module_name]
+        super().tearDown()
+
+    def test_getattr1(self) -> None:
+        """
+        Check that only the module defining a name is imported.
+        """
+        package = importlib.import_module(self._package_name)
+        self.assertNotIn(f"{self._package_name}.module1", sys.modules)
+        # The first module defining a name wins.
+        self.assertEqual(package.Foo.__name__, "Foo")
+        self.assertIn(f"{self._package_name}.module1", sys.modules)
+        self.assertNotIn(f"{self._package_name}.module2", sys.modules)
+
+    def test_getattr2(self) -> None:
+        """
+        Check the names defined dynamically and the subpackages.
+        """
+        package = importlib.import_module(self._package_name)
+        self.assertEqual(package.bar, 3)
+        self.assertEqual(
+            package.subpackage.__name__, f"{self._package_name}.subpackage"
+        )
+        with self.assertRaises(AttributeError):
+            _ = package._PRIVATE
+        with self.assertRaises(AttributeError):
+            _ = package.baz
+
+    def test_all1(self) -> None:
+        """
+        Check the names exported by `from package import *`.
+        """
+        package = importlib.import_module(self._package_name)
+        self.assertEqual(package.__all__, ["Foo", "bar"])
+        self.assertIn("Foo", dir(package))
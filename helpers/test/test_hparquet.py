@@ -11,6 +11,7 @@ import pytest
 
 import helpers.hdbg as hdbg
 import helpers.henv as henv
+import helpers.hio as hio
 import helpers.hmoto as hmoto
 import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
@@ -1333,3 +1334,178 @@ class TestBuildFilterWithOnlyEqualities(hunitest.TestCase):
         actual = str(filters)
         expected = r"[]"
         self.assert_equal(actual, expected)
+
+
+# #############################################################################
+
+
+class TestRowGroupCatalog(hunitest.TestCase):
+    @staticmethod
+    def write_corpus(dst_dir: str) -> pd.DataFrame:
+        """
+        Write 2 assets x 2 days of 1-minute data in tiles by asset, with row
+        groups of 6 hours.
+        """
+        index = pd.date_range(
+            "2022-01-01", "2022-01-02 23:59", freq="1T", tz="UTC", name="timestamp"
+        )
+        dfs = []
+        for asset_id in [1, 2]:
+            df = pd.DataFrame(
+                {"close": range(len(index))}, index=index, dtype=float
+            )
+            df["asset_id"] = asset_id
+            file_dir = os.path.join(dst_dir, f"asset_id={asset_id}")
+            hio.create_dir(file_dir, incremental=False)
+            parquet.write_table(
+                pyarrow.Table.from_pandas(df.drop(columns="asset_id")),
+                os.path.join(file_dir, "data.parquet"),
+                row_group_size=360,
+            )
+            dfs.append(df)
+        df = pd.concat(dfs)
+        return df
+
+    def test_update_row_group_catalog1(self) -> None:
+        """
+        Check the catalog of a dataset partitioned by asset.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_corpus(dst_dir)
+        catalog = hparque.update_row_group_catalog(dst_dir)
+        # 2 files with 8 row groups each.
+        self.assertEqual(catalog.shape[0], 16)
+        self.assertEqual(catalog["num_rows"].sum(), 2 * 2 * 1440)
+        self.assertEqual(
+            catalog["file_path"].unique().tolist(),
+            ["asset_id=1/data.parquet", "asset_id=2/data.parquet"],
+        )
+        row = catalog.iloc[1]
+        self.assertEqual(row["min_asset_id"], 1)
+        self.assertEqual(
+            row["min_timestamp"], pd.Timestamp("2022-01-01 06:00", tz="UTC")
+        )
+        self.assertEqual(
+            row["max_timestamp"], pd.Timestamp("2022-01-01 11:59", tz="UTC")
+        )
+        # Check that the catalog is saved.
+        hunitest.compare_df(hparque.load_row_group_catalog(dst_dir), catalog)
+
+    def test_update_row_group_catalog2(self) -> None:
+        """
+        Check that an incremental update only replaces the rows of the
+        updated files.
+        """
+        dst_dir = self.get_scratch_space()
+        self.write_corpus(dst_dir)
+        hparque.update_row_group_catalog(dst_dir)
+        # Rewrite the file of an asset with less data.
+        file_path = os.path.join(dst_dir, "asset_id=2", "data.parquet")
+        df = parquet.read_table(file_path).to_pandas().iloc[:100]
+        parquet.write_table(pyarrow.Table.from_pandas(df), file_path)
+        catalog = hparque.update_row_group_catalog(
+            dst_dir, file_paths=[file_path]
+        )
+        self.assertEqual(catalog.shape[0], 9)
+        expected = hparque.update_row_group_catalog(dst_dir)
+        hunitest.compare_df(catalog, expected)
+
+    def test_from_parquet_with_row_group_catalog1(self) -> None:
+        """
+        Check that a pruned read returns the same data as a filtered full read
+        and reads only the overlapping row groups.
+        """
+        dst_dir = self.get_scratch_space()
+        df = self.write_corpus(dst_dir)
+        catalog = hparque.update_row_group_catalog(dst_dir)
+        start_timestamp = pd.Timestamp("2022-01-01 10:00", tz="UTC")
+        end_timestamp = pd.Timestamp("2022-01-01 13:00", tz="UTC")
+        pruned = hparque.prune_row_groups(
+            catalog,
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+            asset_ids=[2],
+        )
+        self.assertEqual(pruned["row_group"].tolist(), [1, 2])
+        actual = hparque.from_parquet_with_row_group_catalog(
+            dst_dir,
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+            asset_ids=[2],
+        )
+        mask = (
+            (df.index >= start_timestamp)
+            & (df.index <= end_timestamp)
+            & (df["asset_id"] == 2)
+        )
+        expected = df[mask]
+        self.assertEqual(actual.shape[0], 181)
+        hunitest.compare_df(actual, expected)
+
+    def test_to_partitioned_parquet1(self) -> None:
+        """
+        Check that the catalog is updated when writing the tiles.
+        """
+        dst_dir = self.get_scratch_space()
+        df = self.write_corpus(dst_dir)
+        df = df.reset_index()
+        df["asset_id"] = df["asset_id"] + 2
+        hparque.to_partitioned_parquet(
+            df,
+            ["asset_id"],
+            dst_dir,
+            row_group_catalog_kwargs={"timestamp_col": "timestamp"},
+        )
+        catalog = hparque.load_row_group_catalog(dst_dir)
+        self.assertEqual(
+            sorted(catalog["min_asset_id"].unique().tolist()), [3, 4]
+        )
+        actual = hparque.from_parquet_with_row_group_catalog(
+            dst_dir,
+            start_timestamp=pd.Timestamp("2022-01-02 23:00", tz="UTC"),
+            asset_ids=[4],
+        )
+        self.assertEqual(actual.shape[0], 60)
+
+
+# #############################################################################
+# TestParquetRowGroupWriter
+# #############################################################################
+
+
+class TestParquetRowGroupWriter(hunitest.TestCase):
+    def test_append1(self) -> None:
+        """
+        Check that each dataframe is written as a row group and that the file
+        is visible only after it is closed.
+        """
+        dst_dir = self.get_scratch_space()
+        file_name = os.path.join(dst_dir, "data.parquet")
+        writer = hparque.ParquetRowGroupWriter(file_name)
+        df1 = pd.DataFrame({"val": [1.0, 2.0]}, index=[0, 1])
+        writer.append(df1)
+        # The int column is cast to the float of the first dataframe.
+        df2 = pd.DataFrame({"val": [3]}, index=[2])
+        writer.append(df2)
+        # A reader of the dir doesn't see the open file.
+        self.assertFalse(os.path.exists(file_name))
+        self.assertEqual(os.listdir(dst_dir), ["_data.parquet"])
+        writer.close()
+        self.assertEqual(os.listdir(dst_dir), ["data.parquet"])
+        self.assertEqual(parquet.ParquetFile(file_name).num_row_groups, 2)
+        actual = hparque.from_parquet(dst_dir)
+        expected = pd.DataFrame({"val": [1.0, 2.0, 3.0]})
+        hunitest.compare_df(actual, expected)
+        # Closing again is a no-op.
+        writer.close()
+
+    def test_append2(self) -> None:
+        """
+        Check that a dataframe with different columns is rejected.
+        """
+        file_name = os.path.join(self.get_scratch_space(), "data.parquet")
+        writer = hparque.ParquetRowGroupWriter(file_name)
+        writer.append(pd.DataFrame({"val": [1.0]}))
+        with self.assertRaises(ValueError):
+            writer.append(pd.DataFrame({"other": [1.0]}))
+        writer.close()
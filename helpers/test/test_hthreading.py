@@ -0,0 +1,65 @@
+import logging
+import threading
+import time
+from typing import List
+
+import helpers.hthreading as hthread
+import helpers.hunit_test as hunitest
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# TestBackgroundWorker1
+# #############################################################################
+
+
+class TestBackgroundWorker1(hunitest.TestCase):
+    def test_order1(self) -> None:
+        """
+        Check that the functions are executed in the order of submission.
+        """
+        worker = hthread.BackgroundWorker(2)
+        values: List[int] = []
+        for i in range(10):
+            worker.submit(values.append, i)
+        worker.flush()
+        self.assertEqual(values, list(range(10)))
+        worker.close()
+
+    def test_drop1(self) -> None:
+        """
+        Check that the functions are dropped when the queue is full.
+        """
+        worker = hthread.BackgroundWorker(1, drop_when_full=True)
+        event = threading.Event()
+        values: List[int] = []
+        # Block the worker until the event is set.
+        worker.submit(event.wait)
+        # Wait for the worker to pick up the blocking function.
+        while worker._queue.qsize() > 0:
+            time.sleep(0.001)
+        self.assertTrue(worker.submit(values.append, 0))
+        self.assertFalse(worker.submit(values.append, 1))
+        event.set()
+        worker.close()
+        self.assertEqual(values, [0])
+        self.assertEqual(worker.num_dropped, 1)
+
+    def test_exception1(self) -> None:
+        """
+        Check that an exception in the worker is raised by `flush()`.
+        """
+        worker = hthread.BackgroundWorker(2)
+
+        def _fail() -> None:
+            raise ValueError("Failed")
+
+        worker.submit(_fail)
+        with self.assertRaises(ValueError):
+            worker.flush()
+        # The worker keeps working after an exception.
+        values: List[int] = []
+        worker.submit(values.append, 0)
+        worker.close()
+        self.assertEqual(values, [0])
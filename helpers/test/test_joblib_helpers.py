@@ -1,10 +1,11 @@
 import logging
 import os
 import time
-from typing import Any, List, Optional, Union
+from typing import Any, Iterator, List, Optional, Union
 
 import pytest
 
+import helpers.hio as hio
 import helpers.hjoblib as hjoblib
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
@@ -124,6 +125,11 @@ val1=4, val2=8, incremental=True, num_attempts=1, kwargs={'hello4': 'world8', 'g
         backend = "asyncio_threading"
         self._run_test(num_threads, backend)
 
+    def test_parallel_scheduled_multiprocessing1(self) -> None:
+        num_threads = "3"
+        backend = "scheduled_multiprocessing"
+        self._run_test(num_threads, backend)
+
     def _run_test(self, num_threads: Union[str, int], backend: str) -> None:
         workload = get_workload1(randomize=True)
         abort_on_error = True
@@ -366,6 +372,22 @@ val1=4, val2=8, incremental=True, num_attempts=1, kwargs={'hello4': 'world8', 'g
         should_succeed = True
         self._run_test(abort_on_error, num_threads, backend, should_succeed)
 
+    def test_parallel_scheduled_multiprocessing1(self) -> None:
+        num_threads = "3"
+        abort_on_error = True
+        backend = "scheduled_multiprocessing"
+        #
+        should_succeed = False
+        self._run_test(abort_on_error, num_threads, backend, should_succeed)
+
+    def test_parallel_scheduled_multiprocessing2(self) -> None:
+        num_threads = "3"
+        abort_on_error = False
+        backend = "scheduled_multiprocessing"
+        #
+        should_succeed = True
+        self._run_test(abort_on_error, num_threads, backend, should_succeed)
+
     # pylint: enable=line-too-long
 
     def _run_test(
@@ -402,6 +424,308 @@ val1=4, val2=8, incremental=True, num_attempts=1, kwargs={'hello4': 'world8', 'g
             )
 
 
+# #############################################################################
+# Test_scheduled_multiprocessing1
+# #############################################################################
+
+
+def _allocate_memory(
+    num_bytes: int, *, sleep_in_secs: float = 10, **kwargs: Any
+) -> int:
+    """
+    Allocate and hold `num_bytes` of memory for `sleep_in_secs`.
+    """
+    _ = kwargs
+    # Fill the memory so that it is resident.
+    data = b"x" * num_bytes
+    time.sleep(sleep_in_secs)
+    return len(data)
+
+
+class Test_scheduled_multiprocessing1(hunitest.TestCase):
+    """
+    Check the `scheduled_multiprocessing` backend of `parallel_execute()`.
+    """
+
+    def test_get_task_costs1(self) -> None:
+        """
+        Check that the elapsed time of the successful tasks is parsed from the
+        log.
+        """
+        workload = get_workload3(randomize=False)
+        log_file = self._run_workload(workload, 2)
+        task_costs = hjoblib.get_task_costs([log_file])
+        # The failing task is not reported.
+        _, _, tasks = workload
+        task_ids = [hjoblib.get_task_id(task) for task in tasks[:-1]]
+        actual = [
+            task_id
+            for task_id, task_cost in task_costs.items()
+            if "elapsed_time_in_secs" in task_cost
+        ]
+        self.assertEqual(sorted(actual), sorted(task_ids))
+        for task_id in task_ids:
+            self.assertGreater(task_costs[task_id]["elapsed_time_in_secs"], 0)
+
+    def test_get_task_costs2(self) -> None:
+        """
+        Check that the peak memory is parsed also for the failed tasks and
+        that the max over the runs is reported.
+        """
+        txt = """
+        task_id=task1
+        func_res=
+          res
+        elapsed_time_in_secs=2.0
+        error=False
+
+        task_id=task1
+        peak_mem_in_bytes=1000
+
+        task_id=task2
+        exception='Killed task 2/2'
+        peak_mem_in_bytes=3000
+        error=True
+
+        task_id=task1
+        func_res=
+          res
+        elapsed_time_in_secs=1.0
+        error=False
+
+        task_id=task1
+        peak_mem_in_bytes=2000
+        """
+        txt = hprint.dedent(txt)
+        log_file = os.path.join(self.get_scratch_space(), "log.0.txt")
+        hio.to_file(log_file, txt)
+        actual = hjoblib.get_task_costs([log_file])
+        expected = {
+            "task1": {"elapsed_time_in_secs": 2.0, "peak_mem_in_bytes": 2000.0},
+            "task2": {"peak_mem_in_bytes": 3000.0},
+        }
+        self.assertDictEqual(actual, expected)
+
+    def test_longest_first1(self) -> None:
+        """
+        Check that the tasks are executed from the longest to the shortest one
+        in a previous run, after the tasks without a known cost.
+        """
+        workload = get_workload1(randomize=False)
+        _, _, tasks = workload
+        # Build the log of a previous run where the task `i` took `i` seconds,
+        # without the first task.
+        txt = []
+        for i, task in enumerate(tasks[1:], start=1):
+            txt.append(f"task_id={hjoblib.get_task_id(task)}")
+            txt.append("func_res=\n  res")
+            txt.append(f"elapsed_time_in_secs={i}")
+            txt.append("error=False")
+            txt.append(f"task_id={hjoblib.get_task_id(task)}")
+            txt.append("peak_mem_in_bytes=1000")
+        cost_log_file = os.path.join(self.get_scratch_space(), "log.0.txt")
+        hio.to_file(cost_log_file, "\n".join(txt))
+        #
+        log_file = self._run_workload(
+            workload, 1, task_cost_log_files=[cost_log_file]
+        )
+        # Check the order of execution from the tags, e.g.,
+        # `tag=1/5 (20230101_093500)`.
+        act = [
+            int(line[len("tag=") :].split("/")[0]) - 1
+            for line in hio.from_file(log_file).split("\n")
+            if line.startswith("tag=")
+        ]
+        self.assertEqual(act, [0, 4, 3, 2, 1])
+
+    def test_max_mem1(self) -> None:
+        """
+        Check that a task exceeding the memory limit is killed, restarted alone
+        and reported as failed when it exceeds the memory budget.
+        """
+        max_mem_per_task_in_bytes = 200 * 1024**2
+        tasks = [((max_mem_per_task_in_bytes + 200 * 1024**2,), {})]
+        workload = (_allocate_memory, "_allocate_memory", tasks)
+        log_file = self._run_workload(
+            workload,
+            1,
+            abort_on_error=False,
+            memory_budget_in_bytes=300 * 1024**2,
+            max_mem_per_task_in_bytes=max_mem_per_task_in_bytes,
+        )
+        # Check.
+        txt = hio.from_file(log_file)
+        self.assertEqual(txt.count("exception='Killed task 1/1"), 2)
+        self.assertEqual(txt.count(": restarting it alone'"), 1)
+        task_costs = hjoblib.get_task_costs([log_file])
+        task_cost = task_costs[hjoblib.get_task_id(tasks[0])]
+        self.assertNotIn("elapsed_time_in_secs", task_cost)
+        self.assertGreater(
+            task_cost["peak_mem_in_bytes"], max_mem_per_task_in_bytes
+        )
+
+    def test_max_mem2(self) -> None:
+        """
+        Check that a task exceeding the memory limit succeeds when it is
+        restarted alone within the memory budget.
+        """
+        max_mem_per_task_in_bytes = 200 * 1024**2
+        num_bytes = max_mem_per_task_in_bytes + 100 * 1024**2
+        tasks = [
+            ((num_bytes,), {"sleep_in_secs": 3}),
+            ((1024,), {"sleep_in_secs": 1}),
+        ]
+        workload = (_allocate_memory, "_allocate_memory", tasks)
+        log_file = self._run_workload(
+            workload,
+            2,
+            abort_on_error=True,
+            memory_budget_in_bytes=600 * 1024**2,
+            max_mem_per_task_in_bytes=max_mem_per_task_in_bytes,
+        )
+        # Check.
+        txt = hio.from_file(log_file)
+        self.assertEqual(txt.count("exception='Killed task 1/2"), 1)
+        self.assertEqual(txt.count(": restarting it alone'"), 1)
+        task_costs = hjoblib.get_task_costs([log_file])
+        for task in tasks:
+            self.assertIn(
+                "elapsed_time_in_secs", task_costs[hjoblib.get_task_id(task)]
+            )
+
+    def test_other_backend1(self) -> None:
+        """
+        Check that the memory limits are rejected by the other backends.
+        """
+        workload = get_workload1(randomize=False)
+        log_file = os.path.join(self.get_scratch_space(), "log.txt")
+        with self.assertRaises(AssertionError) as cm:
+            hjoblib.parallel_execute(
+                workload,
+                False,
+                2,
+                True,
+                False,
+                1,
+                log_file,
+                backend="loky",
+                max_mem_per_task_in_bytes=1024**3,
+            )
+        self.assertIn(
+            "requires backend='scheduled_multiprocessing'", str(cm.exception)
+        )
+
+    def _run_workload(
+        self,
+        workload: hjoblib.Workload,
+        num_threads: int,
+        *,
+        abort_on_error: bool = False,
+        num_attempts: int = 1,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Run a workload and return the log file.
+        """
+        dry_run = False
+        incremental = True
+        log_file = os.path.join(self.get_scratch_space(), "log.txt")
+        hjoblib.parallel_execute(
+            workload,
+            dry_run,
+            num_threads,
+            incremental,
+            abort_on_error,
+            num_attempts,
+            log_file,
+            backend="scheduled_multiprocessing",
+            **kwargs,
+        )
+        return log_file
+
+
+# #############################################################################
+# Test_parallel_map1
+# #############################################################################
+
+
+def _add(val1: int, val2: int, *, sleep: float = 0.0) -> int:
+    time.sleep(sleep)
+    return val1 + val2
+
+
+class Test_parallel_map1(hunitest.TestCase):
+    """
+    Check that the results are returned in the order of the tasks.
+    """
+
+    def helper(self, num_threads: Union[str, int], backend: str) -> None:
+        # Make the first tasks slower so that they end last.
+        tasks = [((i, 10 * i), {"sleep": 0.01 * (5 - i)}) for i in range(6)]
+        actual = hjoblib.parallel_map(
+            _add, tasks, num_threads=num_threads, backend=backend
+        )
+        expected = [0, 11, 22, 33, 44, 55]
+        self.assertEqual(actual, expected)
+
+    def test_serial1(self) -> None:
+        self.helper("serial", "loky")
+
+    def test_parallel_threading1(self) -> None:
+        self.helper(3, "threading")
+
+    def test_parallel_loky1(self) -> None:
+        self.helper(2, "loky")
+
+
+# #############################################################################
+# Test_parallel_imap1
+# #############################################################################
+
+
+class Test_parallel_imap1(hunitest.TestCase):
+    """
+    Check that the results are returned in the order of the tasks and that the
+    tasks are consumed lazily.
+    """
+
+    def helper(self, num_threads: Union[str, int], backend: str) -> None:
+        num_generated_tasks = []
+
+        def _get_tasks() -> Iterator[hjoblib.Task]:
+            for i in range(6):
+                num_generated_tasks.append(i)
+                # Make the first tasks slower so that they end last.
+                yield (i, 10 * i), {"sleep": 0.01 * (5 - i)}
+
+        max_tasks_in_flight = 2
+        actual = []
+        for res in hjoblib.parallel_imap(
+            _add,
+            _get_tasks(),
+            num_threads=num_threads,
+            backend=backend,
+            max_tasks_in_flight=max_tasks_in_flight,
+        ):
+            # At most `max_tasks_in_flight` tasks are generated and not yet
+            # returned.
+            self.assertLessEqual(
+                len(num_generated_tasks) - len(actual), max_tasks_in_flight
+            )
+            actual.append(res)
+        expected = [0, 11, 22, 33, 44, 55]
+        self.assertEqual(actual, expected)
+
+    def test_serial1(self) -> None:
+        self.helper("serial", "loky")
+
+    def test_parallel_threading1(self) -> None:
+        self.helper(3, "threading")
+
+    def test_parallel_loky1(self) -> None:
+        self.helper(2, "loky")
+
+
 # #############################################################################
 
 
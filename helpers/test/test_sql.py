@@ -119,6 +119,37 @@ class TestSql1(imvcddbut.TestImDbHelper):
         # Delete the table.
         hsql.remove_table(self.connection, "test_table")
 
+    @pytest.mark.slow("16 seconds.")
+    def test_insert_via_staging_table1(self) -> None:
+        """
+        Verify that the insertion via a staging table skips the duplicates.
+        """
+        self._create_test_table()
+        test_data = self._get_test_data()
+        # Upload the data twice, overlapping the first upload.
+        hsql.execute_insert_on_conflict_do_nothing_query_via_staging_table(
+            self.connection, test_data.iloc[:3], "test_table", ["id"]
+        )
+        hsql.execute_insert_on_conflict_do_nothing_query_via_staging_table(
+            self.connection, test_data, "test_table", ["id"]
+        )
+        # Load data.
+        df = hsql.execute_query_to_df(
+            self.connection, "SELECT * FROM test_table ORDER BY id"
+        )
+        actual = hpandas.df_to_str(df, num_rows=None)
+        expected = r"""
+           id  column_1       column_2
+        0   1      1000  test_string_1
+        1   2      1001  test_string_2
+        2   3      1002  test_string_3
+        3   4      1003  test_string_4
+        4   5      1004  test_string_5
+        """
+        self.assert_equal(actual, expected, dedent=True, fuzzy_match=True)
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
     @pytest.mark.slow("9 seconds.")
     def test_duplicate_removal1(self) -> None:
         """
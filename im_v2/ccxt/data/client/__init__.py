@@ -4,5 +4,14 @@ Import as:
 import im_v2.ccxt.data.client as icdcl
 """
 
-from im_v2.ccxt.data.client.ccxt_clients import *  # pylint: disable=unused-import # NOQA
-from im_v2.ccxt.data.client.ccxt_clients_example import *  # pylint: disable=unused-import # NOQA
+import helpers.hintrospection as hintros
+
+# Import the modules only when one of their names is accessed, instead of
+# star-importing all of them.
+__getattr__, __dir__ = hintros.get_lazy_package_getattr(
+    __name__,
+    [
+        "im_v2.ccxt.data.client.ccxt_clients",
+        "im_v2.ccxt.data.client.ccxt_clients_example",
+    ],
+)
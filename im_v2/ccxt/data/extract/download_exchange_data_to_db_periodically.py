@@ -57,6 +57,30 @@ def _parse() -> argparse.ArgumentParser:
         "on_buffer_full: Save data to the database when the buffer is full. \n"
         "on_sufficient_time: Save data to the database based on a predefined time interval.",
     )
+    parser.add_argument(
+        "--use_async_db_writer",
+        action="store_true",
+        required=False,
+        help="Save the websocket data to the DB from a background task, \n"
+        "instead of waiting for each insert in the download loop",
+    )
+    parser.add_argument(
+        "--db_resampled_table",
+        action="store",
+        required=False,
+        type=str,
+        help="Table to save the bid/ask data resampled to 1 minute in real "
+        "time, for all the downloaded levels",
+    )
+    parser.add_argument(
+        "--bid_ask_resampling_delay_in_secs",
+        action="store",
+        required=False,
+        type=float,
+        default=10,
+        help="Seconds to wait after the end of a minute before closing its "
+        "resampled bid/ask bars, so that late snapshots are included",
+    )
     parser.add_argument(
         "--watch_multiple_symbols",
         action="store_true",
@@ -215,6 +215,20 @@ class CcxtExtractor(imvcdexex.Extractor):
         """
         return list(self._sync_exchange.load_markets().keys())
 
+    def get_worker_extractor(self) -> "CcxtExtractor":
+        """
+        Return a copy of the extractor with its own sync CCXT exchange.
+
+        A CCXT exchange is not thread-safe (e.g., its throttler and HTTP
+        session), so each worker thread logs into the exchange separately.
+        """
+        extractor = copy.copy(self)
+        extractor._worker_extractors = []
+        extractor._sync_exchange = self.log_into_exchange(async_=False)
+        # Reuse the markets loaded in the constructor to avoid a request.
+        extractor._sync_exchange.set_markets(self._sync_exchange.markets)
+        return extractor
+
     async def sleep(self, time: int):
         """
         :param time: sleep time in milliseconds
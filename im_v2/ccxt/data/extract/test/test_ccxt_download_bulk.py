@@ -58,7 +58,9 @@ class TestDownloadBulkData1(hunitest.TestCase):
             "dst_dir": None,
             "pq_save_mode": "append",
             "version": "v1_0_0",
-            "download_period": "daily"
+            "download_period": "daily",
+            "max_concurrent_requests": 1,
+            "max_requests_per_sec": None,
         }
         self.assertDictEqual(actual, expected)
 
@@ -64,6 +64,8 @@ class TestDownloadRealtimeForOneExchange1(hunitest.TestCase):
             "s3_path": None,
             "dst_dir": None,
             "pq_save_mode": "append",
+            "max_concurrent_requests": 1,
+            "max_requests_per_sec": None,
         }
         self.assertDictEqual(actual, expected)
 
@@ -4,12 +4,21 @@ Import as:
 import im_v2.common.data.client as icdc
 """
 
-from im_v2.common.data.client.abstract_im_clients import *  # pylint: disable=unused-import # NOQA
-from im_v2.common.data.client.data_frame_im_clients import *  # pylint: disable=unused-import # NOQA
-from im_v2.common.data.client.data_frame_im_clients_example import *  # pylint: disable=unused-import # NOQA
-from im_v2.common.data.client.historical_pq_clients import *  # pylint: disable=unused-import # NOQA
-from im_v2.common.data.client.historical_pq_clients_example import *  # pylint: disable=unused-import # NOQA
-from im_v2.common.data.client.im_client_test_case import *  # pylint: disable=unused-import # NOQA
-from im_v2.common.data.client.im_raw_data_client import *  # pylint: disable=unused-import # NOQA
-from im_v2.common.data.client.real_time_im_client import *  # pylint: disable=unused-import # NOQA
-from im_v2.common.data.client.real_time_im_clients_examples import *  # pylint: disable=unused-import # NOQA
+import helpers.hintrospection as hintros
+
+# Import the modules only when one of their names is accessed, instead of
+# star-importing all of them.
+__getattr__, __dir__ = hintros.get_lazy_package_getattr(
+    __name__,
+    [
+        "im_v2.common.data.client.abstract_im_clients",
+        "im_v2.common.data.client.data_frame_im_clients",
+        "im_v2.common.data.client.data_frame_im_clients_example",
+        "im_v2.common.data.client.historical_pq_clients",
+        "im_v2.common.data.client.historical_pq_clients_example",
+        "im_v2.common.data.client.im_client_test_case",
+        "im_v2.common.data.client.im_raw_data_client",
+        "im_v2.common.data.client.real_time_im_client",
+        "im_v2.common.data.client.real_time_im_clients_examples",
+    ],
+)
@@ -126,12 +126,20 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         :param full_symbols: assets as full symbols
         :return: assets as numerical ids
         """
-        hdbg.dassert_container_type(full_symbols, list, ivcu.FullSymbol)
-        numerical_asset_id = [
-            ivcu.string_to_numerical_id(full_symbol)
-            for full_symbol in full_symbols
-        ]
-        return numerical_asset_id
+        hdbg.dassert_isinstance(full_symbols, list)
+        # Encode the full symbols once, since `full_symbols` is typically a
+        # column of data with many rows for the same asset, and map the
+        # categories through the registry of the assets in the data, which is
+        # built once per set of assets.
+        full_symbols = pd.Categorical(full_symbols)
+        hdbg.dassert_container_type(
+            full_symbols.categories.tolist(), list, ivcu.FullSymbol
+        )
+        registry = ivcu.get_symbol_registry_from_full_symbols(
+            full_symbols.categories.tolist()
+        )
+        numerical_asset_id = registry.map_full_symbols(full_symbols).tolist()
+        return numerical_asset_id  # type: ignore[no-any-return]
 
     # TODO(gp): Each derived class should call the proper function instead of
     #  delegating to the same function but using vendor to distinguish, since this
@@ -329,14 +337,14 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         :param asset_ids: assets ids
         :return: assets as full symbols
         """
-        # Check that provided ids are part of the universe.
-        hdbg.dassert_is_subset(asset_ids, self._asset_id_to_full_symbol_mapping)
-        # Convert ids to full symbols.
-        full_symbols = [
-            self._asset_id_to_full_symbol_mapping[asset_id]
-            for asset_id in asset_ids
-        ]
-        return full_symbols
+        # Convert ids to full symbols through the registry of the universe,
+        # which is the same one used to build the mapping and checks that the
+        # ids are part of the universe.
+        registry = ivcu.get_symbol_registry_from_full_symbols(
+            list(self._asset_id_to_full_symbol_mapping.values())
+        )
+        full_symbols = registry.map_asset_ids(asset_ids).tolist()
+        return full_symbols  # type: ignore[no-any-return]
 
     # /////////////////////////////////////////////////////////////////////////
     # Private methods.
@@ -166,9 +166,10 @@ class SqlRealTimeImClient(RealTimeImClient):
             data["exchange_id"], data["currency_pair"]
         )
         data = data.drop(["exchange_id", "currency_pair"], axis=1)
-        # Convert timestamp column with Unix epoch to timestamp format.
-        data[self._timestamp_col_name] = data[self._timestamp_col_name].apply(
-            hdateti.convert_unix_epoch_to_timestamp
+        # Convert timestamp column with Unix epoch to timestamp format, with
+        # a vectorized conversion instead of one per row.
+        data[self._timestamp_col_name] = pd.to_datetime(
+            data[self._timestamp_col_name], unit="ms", utc=True
         )
         # Set timestamp column as index.
         data = data.set_index(self._timestamp_col_name)
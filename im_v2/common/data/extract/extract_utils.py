@@ -24,12 +24,16 @@ import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hparquet as hparque
 import helpers.hs3 as hs3
+import helpers.hsql as hsql
 import helpers.htimer as htimer
 import im_v2.ccxt.data.extract.cryptocom_extractor as imvcdecrex
 import im_v2.ccxt.data.extract.extractor as imvcdexex
 import im_v2.common.data.extract.extractor as ivcdexex
+import im_v2.common.data.transform.incremental_bid_ask_resampler as imvcdtinbiasre
 import im_v2.common.data.transform.transform_utils as imvcdttrut
+import im_v2.common.data.transform.websocket_ohlcv_aggregator as imvcdtweohag
 import im_v2.common.db.db_utils as imvcddbut
+import im_v2.common.db.db_writer as imvcddbwr
 import im_v2.common.universe as ivcu
 from helpers.hthreading import timeout
 
@@ -176,6 +180,23 @@ def _add_common_download_args(
             groups of 10 pairs, 'y' denotes which part should be downloaded \
             (e.g. 10, 1 - download first 10 symbols)",
     )
+    parser.add_argument(
+        "--max_concurrent_requests",
+        action="store",
+        required=False,
+        default=1,
+        type=int,
+        help="Max number of REST requests for different symbols to issue \
+            concurrently (applies when method=rest)",
+    )
+    parser.add_argument(
+        "--max_requests_per_sec",
+        action="store",
+        required=False,
+        default=None,
+        type=float,
+        help="Max rate of REST requests to the exchange, no limit if not set",
+    )
     return parser
 
 
@@ -362,30 +383,110 @@ def download_exchange_data_to_db(
             "Downloading for %s data_type is not implemented.", data_type
         )
     # Download data for specified time period.
-    for currency_pair in currency_pairs:
-        # Download data.
-        #  Note: timestamp arguments are ignored since historical data is absent
-        #  from CCXT and only current state can be downloaded.
-        data = exchange.download_data(
-            data_type=data_type,
-            currency_pair=currency_pair,
-            exchange_id=exchange_id,
-            start_timestamp=start_timestamp,
-            end_timestamp=end_timestamp,
-            depth=bid_ask_depth,
-        )
+    #  Note: timestamp arguments are ignored since historical data is absent
+    #  from CCXT and only current state can be downloaded.
+    data_per_currency_pair = _download_data_concurrently(
+        args,
+        exchange,
+        currency_pairs,
+        start_timestamp=start_timestamp,
+        end_timestamp=end_timestamp,
+        depth=bid_ask_depth,
+    )
+    failed_currency_pairs = [
+        currency_pair
+        for currency_pair in currency_pairs
+        if currency_pair not in data_per_currency_pair
+    ]
+    for currency_pair, data in data_per_currency_pair.items():
         # Assign pair and exchange columns.
         data["currency_pair"] = currency_pair
         data["exchange_id"] = exchange_id
         # Add exchange specific filter.
         if data_type == "ohlcv" and exchange_id == "binance":
             data = imvcdttrut.remove_unfinished_ohlcv_bars(data)
-        # Save data to the database.
-        imvcddbut.save_data_to_db(
-            data, data_type, db_connection, db_table, str(start_timestamp.tz)
+        data_per_currency_pair[currency_pair] = data
+    if data_per_currency_pair:
+        # Save the data of all the currency pairs with a single insert.
+        data = pd.concat(data_per_currency_pair.values(), ignore_index=True)
+        try:
+            imvcddbut.save_data_to_db(
+                data,
+                data_type,
+                db_connection,
+                db_table,
+                str(start_timestamp.tz),
+            )
+        except Exception as e:
+            # Save the data of each currency pair separately, so that the
+            # currency pairs that fail are reported and the data of the other
+            # currency pairs is still saved.
+            _LOG.warning(
+                "Failed to save data for all currency pairs: %s", repr(e)
+            )
+            for currency_pair, data in data_per_currency_pair.items():
+                try:
+                    imvcddbut.save_data_to_db(
+                        data,
+                        data_type,
+                        db_connection,
+                        db_table,
+                        str(start_timestamp.tz),
+                    )
+                except Exception as e:
+                    _LOG.error(
+                        "Failed to save data for %s: %s",
+                        currency_pair,
+                        repr(e),
+                    )
+                    failed_currency_pairs.append(currency_pair)
+    if failed_currency_pairs:
+        raise RuntimeError(
+            f"Failed to download or save data for {failed_currency_pairs}"
         )
 
 
+# Event loop used to download REST data concurrently from synchronous code.
+_EVENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _download_data_concurrently(
+    args: Dict[str, Any],
+    exchange: ivcdexex.Extractor,
+    currency_pairs: List[str],
+    **kwargs: Any,
+) -> Dict[str, pd.DataFrame]:
+    """
+    Download REST data for multiple currency pairs with concurrent requests.
+
+    The concurrency is controlled by `max_concurrent_requests` and
+    `max_requests_per_sec` in `args`.
+
+    :param args: arguments passed on script run
+    :param exchange: exchange used in script run
+    :param currency_pairs: currency pairs to download
+    :param kwargs: passed to `Extractor.download_data()`
+    :return: map from currency pair to the downloaded data, in the same order
+        as `currency_pairs`
+    """
+    max_concurrent_requests = args.get("max_concurrent_requests") or 1
+    coroutine = exchange.download_data_concurrently(
+        args["data_type"],
+        args["exchange_id"],
+        currency_pairs,
+        max_concurrent_requests=max_concurrent_requests,
+        max_requests_per_sec=args.get("max_requests_per_sec"),
+        **kwargs,
+    )
+    # Reuse the same event loop across the calls, since this is called from
+    # synchronous code.
+    global _EVENT_LOOP
+    if _EVENT_LOOP is None:
+        _EVENT_LOOP = asyncio.new_event_loop()
+    data = hasynci.run(coroutine, _EVENT_LOOP, close_event_loop=False)
+    return data
+
+
 @timeout(TIMEOUT_SEC)
 def _download_exchange_data_to_db_with_timeout(
     args: Dict[str, Any],
@@ -604,9 +705,7 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     """
     data_type = args["data_type"]
     # Time related arguments.
-    start_time = pd.Timestamp(args["start_time"])
-    stop_time = pd.Timestamp(args["stop_time"])
-    tz = start_time.tz
+    tz = pd.Timestamp(args["start_time"]).tz
     # Data related arguments
     universe = ivcu.get_vendor_universe(
         exchange.vendor, mode="download", version=args["universe"]
@@ -627,11 +726,92 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     _LOG.info("Subscribed to %s websocket data successfully", exchange_id)
     db_connection = imvcddbut.DbConnectionManager.get_connection(args["db_stage"])
     db_table = args["db_table"]
+    # Save the data from a background task so that slow inserts don't delay
+    # the next websocket poll.
+    db_writer = None
+    if args.get("use_async_db_writer"):
+        # The writer inserts from a thread, so it needs its own connection.
+        db_writer_connection = imvcddbut.DbConnectionManager.get_new_connection(
+            args["db_stage"]
+        )
+        db_writer = imvcddbwr.AsyncDbWriter(
+            db_writer_connection, db_table, data_type
+        )
+        db_writer.start()
+    # Resample bid/ask data to 1 minute alongside the raw data collection and
+    # save the bars from another background task with its own connection.
+    resampled_db_writer = None
+    db_resampled_table = args.get("db_resampled_table")
+    if db_resampled_table is not None:
+        hdbg.dassert_eq(data_type, "bid_ask")
+        resampled_db_writer_connection = (
+            imvcddbut.DbConnectionManager.get_new_connection(args["db_stage"])
+        )
+        # The resampled bars carry `end_download_timestamp` instead of a
+        # knowledge timestamp.
+        resampled_db_writer = imvcddbwr.AsyncDbWriter(
+            resampled_db_writer_connection,
+            db_resampled_table,
+            data_type,
+            add_knowledge_timestamp=False,
+        )
+        resampled_db_writer.start()
+    try:
+        await _download_websocket_data_until_stop_time(
+            args,
+            exchange,
+            currency_pairs,
+            db_connection,
+            db_writer,
+            resampled_db_writer,
+        )
+    finally:
+        # Save the data still in the queues, also when the download fails.
+        if db_writer is not None:
+            await db_writer.stop()
+            db_writer_connection.close()
+        if resampled_db_writer is not None:
+            await resampled_db_writer.stop()
+            resampled_db_writer_connection.close()
+    _LOG.info("Websocket download finished at %s", pd.Timestamp.now(tz))
+
+
+async def _download_websocket_data_until_stop_time(
+    args: Dict[str, Any],
+    exchange: ivcdexex.Extractor,
+    currency_pairs: List[str],
+    db_connection: hsql.DbConnection,
+    db_writer: Optional[imvcddbwr.AsyncDbWriter],
+    resampled_db_writer: Optional[imvcddbwr.AsyncDbWriter],
+) -> None:
+    """
+    Poll the subscribed websocket data and save it until `stop_time`.
+
+    :param args: arguments passed on script run
+    :param exchange: exchange subscribed to the websocket data
+    :param currency_pairs: subscribed currency pairs
+    :param db_connection: connection used to save the data synchronously
+    :param db_writer: writer used to save the raw data in the background,
+        `None` to save it synchronously
+    :param resampled_db_writer: writer used to save the bid/ask data
+        resampled to 1 minute, `None` to skip the resampling
+    """
+    data_type = args["data_type"]
+    start_time = pd.Timestamp(args["start_time"])
+    stop_time = pd.Timestamp(args["stop_time"])
+    tz = start_time.tz
+    exchange_id = args["exchange_id"]
+    db_table = args["db_table"]
     # In order not to bombard the database with many small insert operations
     # a buffer is created, its size is determined by the config specific to each
     # data type.
     data_buffer = []
-    data_buffer_to_resample: List[pd.DataFrame] = []
+    bid_ask_resampler = None
+    if resampled_db_writer is not None:
+        number_levels_of_order_book = args.get("bid_ask_depth") or 10
+        bid_ask_resampler = imvcdtinbiasre.IncrementalBidAskResampler(
+            exchange_id, number_levels_of_order_book=number_levels_of_order_book
+        )
     # Sync to the specified start_time.
     start_delay = max(0, ((start_time - datetime.now(tz)).total_seconds()))
     _LOG.info("Syncing with the start time, waiting for %s seconds", start_delay)
@@ -641,12 +821,32 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     await exchange.sleep(start_delay * 1000)
     # Start data collection.
     timestamps_dict = {}
-    # If bid/ask data is resampled alongside side raw data collection, the resampling is done exactly after
-    # a given minutes ends.
+    # If bid/ask data is resampled alongside side raw data collection, the
+    # resampling is done after a given minute ends and a grace period passes.
+    bid_ask_resampling_delay = pd.Timedelta(
+        seconds=args.get("bid_ask_resampling_delay_in_secs") or 0
+    )
     next_bid_ask_resampling_threshold = pd.Timestamp.now(tz).replace(
         second=0, microsecond=0
     ) + pd.Timedelta(minutes=1)
     start_time_unix_epoch = hdateti.convert_timestamp_to_unix_epoch(start_time)
+    # CCXT OHLCV bars are built incrementally, instead of re-processing the
+    # entire websocket buffer at every iteration.
+    use_ohlcv_aggregator = args.get("vendor") == "ccxt" and data_type in (
+        "ohlcv",
+        "ohlcv_from_trades",
+    )
+    # Number of websocket messages consumed by the aggregator since the last
+    # save, so that `max_buffer_size` counts messages for all the data types.
+    num_buffered_messages = 0
+    if use_ohlcv_aggregator:
+        ohlcv_aggregator = imvcdtweohag.WebsocketOhlcvAggregator(
+            exchange_id,
+            # Only the bars built from trades are filtered by start time.
+            start_timestamp_unix_epoch=(
+                start_time_unix_epoch if data_type == "ohlcv_from_trades" else 0
+            ),
+        )
     while pd.Timestamp.now(tz) < stop_time:
         if data_type == "bid_ask" and args.get("vendor") == "ccxt":
             try:
@@ -669,21 +869,16 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
             data_point = exchange.download_websocket_data(
                 data_type, exchange_id, curr_pair
             )
-            if data_type == "ohlcv_from_trades" and args.get("vendor") == "ccxt":
-                since = (
-                    timestamps_dict[curr_pair]
-                    if curr_pair in timestamps_dict
-                    else 0
-                )
+            if use_ohlcv_aggregator:
                 # Building ohlcv every iteration because there is a limit on trades which we can store
-                # as ccxt follows FIFO approach. This has been observed that building ohlcv every minute
-                # adds an extra layer of complexity and corner cases which is unnecessary considering the
-                # speed is already very fast. Still adding a todo for future improvements.
-                # TODO(Sonaal): Build ohlcv every minute instead of every iteration.
-                data_point["ohlcv"] = exchange.build_ohlcvc(
-                    curr_pair, data_point["trades"], timeframe="1m", since=since
-                )
-                del data_point["trades"]
+                # as ccxt follows FIFO approach. The aggregator processes only the part of the buffer
+                # belonging to bars that are not finalized yet.
+                if data_type == "ohlcv_from_trades":
+                    ohlcv_aggregator.update_from_trades(data_point)
+                else:
+                    ohlcv_aggregator.update_from_ohlcv(data_point)
+                num_buffered_messages += 1
+                continue
             # Check if the data point is not a duplicate one.
             is_fresh, timestamps_dict, data_point = _is_fresh_data_point(
                 curr_pair,
@@ -698,11 +893,16 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
             pd.Timestamp.now(tz) - iter_start_time
         ).total_seconds() * 1000
         # If the buffer is full or this is the last iteration, process and save buffered data.
+        if use_ohlcv_aggregator:
+            buffer_size = num_buffered_messages
+            is_non_empty_buffer = ohlcv_aggregator.get_num_finalized_bars() > 0
+        else:
+            buffer_size = len(data_buffer)
+            is_non_empty_buffer = buffer_size > 0
         is_buffer_full = (
-            len(data_buffer) >= WEBSOCKET_CONFIG[data_type]["max_buffer_size"]
+            buffer_size >= WEBSOCKET_CONFIG[data_type]["max_buffer_size"]
         )
         is_last_iteration = pd.Timestamp.now(tz) >= stop_time
-        is_non_empty_buffer = len(data_buffer) > 0
         # Save the data if the download was faster.
         is_download_fast = (
             download_time
@@ -712,37 +912,57 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
         if (
             is_buffer_full or is_last_iteration or is_download_fast
         ) and is_non_empty_buffer:
-            df = imvcdttrut.transform_raw_websocket_data(
-                data_buffer,
-                data_type,
-                exchange_id,
-                max_num_levels=args.get("bid_ask_depth"),
-            )
+            if use_ohlcv_aggregator:
+                # Finalized bars from all the symbols are inserted in one batch.
+                df = ohlcv_aggregator.flush()
+            else:
+                df = imvcdttrut.transform_raw_websocket_data(
+                    data_buffer,
+                    data_type,
+                    exchange_id,
+                    max_num_levels=args.get("bid_ask_depth"),
+                )
             # Store the names of currency pairs that were successfully downloaded
             # to log missing symbols every iteration.
             downloaded_currency_pairs = df["currency_pair"].unique().tolist()
             hdbg.dassert_set_eq(
                 currency_pairs, downloaded_currency_pairs, only_warning=True
             )
-            # TODO(Juraj): experimental feature, the problem is speed for now.
-            # data_buffer_to_resample.append(df)
-            imvcddbut.save_data_to_db(
-                df, data_type, db_connection, db_table, str(tz)
-            )
-            # TODO(Juraj): experimental feature, the problem is speed for now.
-            # if args.resample_bid_ask_data_to_1min and pd.Timestamp.now(tz) > next_bid_ask_resampling_threshold:
-            #    with htimer.TimedScope(logging.DEBUG, "# Resample 1-minute of raw data"):
-            #        df_resampled = imvcdttrut.transform_and_resample_rt_bid_ask_data(
-            #            pd.concat(data_buffer_to_resample)
-            #        )
-            # imvcddbut.save_data_to_db(
-            #    df_resampled, data_type, db_connection, db_resampled_table, str(tz), add_knowledge_timestamp=False
-            # )
-            # Reset resampling variables to start over.
-            # data_buffer_to_resample = []
-            # next_bid_ask_resampling_threshold += pd.Timedelta(minutes=1)
+            if bid_ask_resampler is not None:
+                bid_ask_resampler.update(df)
+            if db_writer is not None:
+                db_writer.put(df)
+            else:
+                imvcddbut.save_data_to_db(
+                    df, data_type, db_connection, db_table, str(tz)
+                )
+            if (
+                bid_ask_resampler is not None
+                and pd.Timestamp.now(tz) - bid_ask_resampling_delay
+                > next_bid_ask_resampling_threshold
+            ):
+                # Close the bars of the minutes that ended at least a grace
+                # period ago, so that the snapshots still in the websocket
+                # buffer are included. This includes the bars of the symbols
+                # without new snapshots.
+                bars_end_timestamp = (
+                    pd.Timestamp.now(tz) - bid_ask_resampling_delay
+                ).floor("min")
+                bid_ask_resampler.close_bars(bars_end_timestamp)
+                df_resampled = bid_ask_resampler.flush()
+                if not df_resampled.empty:
+                    df_resampled = imvcdttrut.transform_resampled_bid_ask_data_to_db_format(
+                        df_resampled,
+                        number_levels_of_order_book=number_levels_of_order_book,
+                    )
+                    df_resampled["end_download_timestamp"] = pd.Timestamp.now(tz)
+                    resampled_db_writer.put(df_resampled)
+                next_bid_ask_resampling_threshold = (
+                    bars_end_timestamp + pd.Timedelta(minutes=1)
+                )
             # Empty buffer after persisting the data.
             data_buffer = []
+            num_buffered_messages = 0
         # Determine actual sleep time needed based on the difference
         # between value set in config and actual time it took to complete
         # an iteration, this provides an "time align" mechanism.
@@ -759,7 +979,6 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
             actual_sleep_time,
         )
         await exchange.sleep(actual_sleep_time)
-    _LOG.info("Websocket download finished at %s", pd.Timestamp.now(tz))
 
 
 def _download_rest_realtime_for_one_exchange_periodically(
@@ -1171,19 +1390,32 @@ def download_historical_data(
     # Convert timestamps.
     start_timestamp = pd.Timestamp(args["start_timestamp"])
     end_timestamp = pd.Timestamp(args["end_timestamp"])
-    for currency_pair in currency_pairs:
-        # Download data.
-        data = exchange.download_data(
-            args["data_type"],
-            args["exchange_id"],
-            currency_pair,
+    # Download the currency pairs in chunks of concurrent requests, so that
+    # only the data of one chunk is kept in memory.
+    chunk_size = args.get("max_concurrent_requests") or 1
+    failed_currency_pairs = []
+    for idx in range(0, len(currency_pairs), chunk_size):
+        data_per_currency_pair = _download_data_concurrently(
+            args,
+            exchange,
+            currency_pairs[idx : idx + chunk_size],
             start_timestamp=start_timestamp,
             end_timestamp=end_timestamp,
             # If data_type = ohlcv, depth is ignored.
             depth=args.get("bid_ask_depth"),
         )
-        process_downloaded_historical_data(
-            data, args, currency_pair, path_to_dataset
+        for currency_pair, data in data_per_currency_pair.items():
+            process_downloaded_historical_data(
+                data, args, currency_pair, path_to_dataset
+            )
+        failed_currency_pairs.extend(
+            currency_pair
+            for currency_pair in currency_pairs[idx : idx + chunk_size]
+            if currency_pair not in data_per_currency_pair
+        )
+    if failed_currency_pairs:
+        raise RuntimeError(
+            f"Failed to download data for {failed_currency_pairs}"
         )
 
 
@@ -7,12 +7,19 @@ import im_v2.common.data.extract.extractor as ivcdexex
 """
 
 import abc
-from typing import Any, Dict, List
+import asyncio
+import concurrent.futures
+import functools
+import logging
+from typing import Any, Dict, List, Optional
 
 import pandas as pd
 
+import helpers.hasyncio as hasynci
 import helpers.hdbg as hdbg
 
+_LOG = logging.getLogger(__name__)
+
 
 # TODO(gp): -> MarketDataExtractor and descends from Data
 class Extractor(abc.ABC):
@@ -22,6 +29,9 @@ class Extractor(abc.ABC):
 
     def __init__(self) -> None:
         super().__init__()
+        # Extractors used by the worker threads of
+        # `download_data_concurrently()`, reused across calls.
+        self._worker_extractors: List["Extractor"] = []
 
     # TODO(Juraj): rename `download_data_rest` to clarify after addition of
     #  websocket based download in #CmTask2912.
@@ -53,6 +63,118 @@ class Extractor(abc.ABC):
             hdbg.dfatal(f"Unknown data type {data_type}.")
         return data
 
+    async def download_data_concurrently(
+        self,
+        data_type: str,
+        exchange_id: str,
+        currency_pairs: List[str],
+        *,
+        max_concurrent_requests: int = 10,
+        max_requests_per_sec: Optional[float] = None,
+        **kwargs: Any,
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Download exchange data for multiple currency pairs concurrently.
+
+        Each currency pair is downloaded with `download_data()` in a worker
+        thread, so that the round trips to the exchange overlap instead of
+        being serialized. Each worker uses its own extractor returned by
+        `get_worker_extractor()`, so that the clients of an extractor are
+        never used by multiple threads at the same time.
+
+        The currency pairs whose download fails are logged and omitted from
+        the output, so that a single failure doesn't discard the data of
+        all the other currency pairs.
+
+        :param currency_pairs: currency pairs to get data about, e.g.,
+            `["ETH_USDT", "BTC_USDT"]`
+        :param max_concurrent_requests: max number of requests in flight
+        :param max_requests_per_sec: max rate of requests to the exchange
+            enforced with a token bucket, `None` for no limit
+        :param kwargs: same as `download_data()`
+        :return: map from currency pair to the downloaded data, in the same
+            order as `currency_pairs`
+        """
+        hdbg.dassert_lte(1, max_concurrent_requests)
+        hdbg.dassert_no_duplicates(currency_pairs)
+        rate_limiter = None
+        if max_requests_per_sec is not None:
+            rate_limiter = hasynci.TokenBucketRateLimiter(max_requests_per_sec)
+        # The pool of idle worker extractors also bounds the number of
+        # requests in flight.
+        worker_extractors: asyncio.Queue = asyncio.Queue()
+        for idx in range(max_concurrent_requests):
+            worker_extractors.put_nowait(self._get_worker_extractor(idx))
+        loop = asyncio.get_event_loop()
+
+        async def _download(
+            executor: concurrent.futures.Executor, currency_pair: str
+        ) -> pd.DataFrame:
+            extractor = await worker_extractors.get()
+            try:
+                if rate_limiter is not None:
+                    await rate_limiter.acquire()
+                func = functools.partial(
+                    extractor.download_data,
+                    data_type,
+                    exchange_id,
+                    currency_pair,
+                    **kwargs,
+                )
+                data = await loop.run_in_executor(executor, func)
+            finally:
+                worker_extractors.put_nowait(extractor)
+            return data
+
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrent_requests
+        ) as executor:
+            tasks = [
+                _download(executor, currency_pair)
+                for currency_pair in currency_pairs
+            ]
+            # `gather()` returns the results in the order of the tasks.
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        data = {}
+        for currency_pair, result in zip(currency_pairs, results):
+            if isinstance(result, Exception):
+                _LOG.error(
+                    "Failed to download %s data for %s: %s",
+                    data_type,
+                    currency_pair,
+                    repr(result),
+                )
+                continue
+            data[currency_pair] = result
+        return data
+
+    def get_worker_extractor(self) -> "Extractor":
+        """
+        Return a new extractor to be used by a single worker thread.
+
+        The extractor must not share with `self` any client that is not
+        thread-safe (e.g., a CCXT exchange or an HTTP session), so the derived
+        classes that support `max_concurrent_requests > 1` must override this
+        method.
+        """
+        raise NotImplementedError(
+            f"{self.__class__.__name__} doesn't support concurrent downloads"
+        )
+
+    def _get_worker_extractor(self, idx: int) -> "Extractor":
+        """
+        Return the extractor of the worker `idx`, creating it if needed.
+        """
+        # The first worker uses `self`, since the caller waits for the
+        # workers, so that the serial download doesn't create new clients.
+        if not self._worker_extractors:
+            self._worker_extractors.append(self)
+        while len(self._worker_extractors) <= idx:
+            extractor = self.get_worker_extractor()
+            hdbg.dassert_is_not(extractor, self)
+            self._worker_extractors.append(extractor)
+        return self._worker_extractors[idx]
+
     # #########################################################################
 
     def download_websocket_data(
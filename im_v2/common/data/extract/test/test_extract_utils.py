@@ -3,7 +3,7 @@ import asyncio
 import os
 import unittest.mock as umock
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import pandas as pd
 import pytest
@@ -572,6 +572,90 @@ class TestDownloadExchangeDataToDb1(
         self.assertEqual(mock_get_current_timestamp_as_string.call_args, None)
 
 
+# #############################################################################
+# TestDownloadExchangeDataToDb2
+# #############################################################################
+
+
+class TestDownloadExchangeDataToDb2(hunitest.TestCase):
+    """
+    Check how the downloaded data is saved, without a DB.
+    """
+
+    def call_download_exchange_data_to_db(
+        self, save_data_to_db_side_effect: Any
+    ) -> Tuple[umock.MagicMock, str]:
+        """
+        Download the data of 3 currency pairs, where the download of "EOS_USDT"
+        fails.
+
+        :return: the mock of `save_data_to_db()` and the raised error
+        """
+        args = {
+            "start_timestamp": "2021-11-10 10:11:00+00:00",
+            "end_timestamp": "2021-11-10 10:12:00+00:00",
+            "exchange_id": "okx",
+            "universe": "v7",
+            "data_type": "ohlcv",
+            "db_stage": "test",
+            "db_table": "ccxt_ohlcv_spot",
+        }
+        currency_pairs = ["BTC_USDT", "ETH_USDT", "EOS_USDT"]
+        data_per_currency_pair = {
+            currency_pair: pd.DataFrame({"timestamp": [1636539060000]})
+            for currency_pair in ["BTC_USDT", "ETH_USDT"]
+        }
+        extractor = umock.MagicMock(vendor="CCXT")
+        with umock.patch.object(
+            imvcdeexut.ivcu,
+            "get_vendor_universe",
+            return_value={"okx": currency_pairs},
+        ), umock.patch.object(
+            imvcddbut.DbConnectionManager, "get_connection"
+        ), umock.patch.object(
+            imvcdeexut,
+            "_download_data_concurrently",
+            return_value=data_per_currency_pair,
+        ), umock.patch.object(
+            imvcddbut,
+            "save_data_to_db",
+            side_effect=save_data_to_db_side_effect,
+        ) as save_data_to_db_mock:
+            with self.assertRaises(RuntimeError) as cm:
+                imvcdeexut.download_exchange_data_to_db(args, extractor)
+        return save_data_to_db_mock, str(cm.exception)
+
+    def test1(self) -> None:
+        """
+        Check that the data of all the currency pairs is saved at once.
+        """
+        save_data_to_db_mock, error = self.call_download_exchange_data_to_db(
+            None
+        )
+        self.assertEqual(save_data_to_db_mock.call_count, 1)
+        data = save_data_to_db_mock.call_args.args[0]
+        self.assertEqual(
+            data["currency_pair"].tolist(), ["BTC_USDT", "ETH_USDT"]
+        )
+        self.assertIn("['EOS_USDT']", error)
+
+    def test2(self) -> None:
+        """
+        Check that each currency pair is saved separately when saving them at
+        once fails.
+        """
+
+        def _save_data_to_db(data: pd.DataFrame, *args: Any) -> None:
+            if "ETH_USDT" in data["currency_pair"].tolist():
+                raise ValueError("Invalid data")
+
+        save_data_to_db_mock, error = self.call_download_exchange_data_to_db(
+            _save_data_to_db
+        )
+        self.assertEqual(save_data_to_db_mock.call_count, 3)
+        self.assertIn("['EOS_USDT', 'ETH_USDT']", error)
+
+
 def get_simple_crypto_chassis_mock_data(
     start_timestamp: int,
     number_of_seconds: int,
@@ -1,7 +1,11 @@
+import threading
+import time
 import unittest.mock as umock
 
+import pandas as pd
 import pytest
 
+import helpers.hasyncio as hasynci
 import helpers.hunit_test as hunitest
 import im_v2.common.data.extract.extractor as imvcdexex
 
@@ -94,3 +98,108 @@ class TestExtractor1(hunitest.TestCase):
             Unknown data type dummy_data_type.
         """
         self.assert_equal(actual_error, expected_error, fuzzy_match=True)
+
+    def test_download_data_concurrently1(self) -> None:
+        """
+        Verify that requests are issued concurrently up to the limit and that
+        the results are returned in the order of the currency pairs.
+        """
+        lock = threading.Lock()
+        num_in_flight = 0
+        max_num_in_flight = 0
+
+        def _download_ohlcv(exchange_id: str, currency_pair: str, **kwargs):
+            nonlocal num_in_flight, max_num_in_flight
+            with lock:
+                num_in_flight += 1
+                max_num_in_flight = max(max_num_in_flight, num_in_flight)
+            # Make the first currency pairs the slowest to complete.
+            time.sleep(0.01 * (10 - int(currency_pair[-1])))
+            with lock:
+                num_in_flight -= 1
+            return pd.DataFrame({"currency_pair": [currency_pair]})
+
+        self.ohlcv_mock.side_effect = _download_ohlcv
+        dummy_extractor = imvcdexex.Extractor()
+        currency_pairs = [f"pair_{i}" for i in range(8)]
+        # Run.
+        with umock.patch.object(
+            imvcdexex.Extractor,
+            "get_worker_extractor",
+            new=lambda self_: imvcdexex.Extractor(),
+        ):
+            coroutine = dummy_extractor.download_data_concurrently(
+                "ohlcv", "dummy_id", currency_pairs, max_concurrent_requests=3
+            )
+            data = hasynci.run(coroutine, event_loop=None)
+        # Check.
+        self.assertEqual(list(data.keys()), currency_pairs)
+        for currency_pair, df in data.items():
+            self.assertEqual(df["currency_pair"].tolist(), [currency_pair])
+        self.assertEqual(self.ohlcv_mock.call_count, len(currency_pairs))
+        self.assertLessEqual(max_num_in_flight, 3)
+        self.assertGreater(max_num_in_flight, 1)
+
+    def test_download_data_concurrently2(self) -> None:
+        """
+        Verify that a failed currency pair is omitted and that an extractor is
+        never used by two worker threads at the same time.
+        """
+        dummy_extractor = imvcdexex.Extractor()
+        lock = threading.Lock()
+        in_use_extractor_ids = set()
+        used_extractor_ids = set()
+        is_shared = False
+
+        def _download_data(
+            self_: imvcdexex.Extractor,
+            data_type: str,
+            exchange_id: str,
+            currency_pair: str,
+            **kwargs,
+        ) -> pd.DataFrame:
+            nonlocal is_shared
+            with lock:
+                is_shared |= id(self_) in in_use_extractor_ids
+                in_use_extractor_ids.add(id(self_))
+                used_extractor_ids.add(id(self_))
+            time.sleep(0.01)
+            with lock:
+                in_use_extractor_ids.remove(id(self_))
+            if currency_pair == "pair_2":
+                raise ValueError("Bad currency pair")
+            return pd.DataFrame({"currency_pair": [currency_pair]})
+
+        currency_pairs = [f"pair_{i}" for i in range(6)]
+        with umock.patch.object(
+            imvcdexex.Extractor, "download_data", new=_download_data
+        ), umock.patch.object(
+            imvcdexex.Extractor,
+            "get_worker_extractor",
+            new=lambda self_: imvcdexex.Extractor(),
+        ):
+            coroutine = dummy_extractor.download_data_concurrently(
+                "ohlcv", "dummy_id", currency_pairs, max_concurrent_requests=2
+            )
+            data = hasynci.run(coroutine, event_loop=None)
+        # Check.
+        expected = [
+            currency_pair
+            for currency_pair in currency_pairs
+            if currency_pair != "pair_2"
+        ]
+        self.assertEqual(list(data.keys()), expected)
+        self.assertFalse(is_shared)
+        self.assertEqual(len(used_extractor_ids), 2)
+
+    def test_download_data_concurrently3(self) -> None:
+        """
+        Verify that an extractor without worker extractors can't download
+        concurrently.
+        """
+        dummy_extractor = imvcdexex.Extractor()
+        coroutine = dummy_extractor.download_data_concurrently(
+            "ohlcv", "dummy_id", ["pair_0", "pair_1"], max_concurrent_requests=2
+        )
+        with self.assertRaises(NotImplementedError):
+            hasynci.run(coroutine, event_loop=None)
@@ -0,0 +1,366 @@
+"""
+Incrementally resample real-time bid/ask data to 1-minute bars.
+
+Import as:
+
+import im_v2.common.data.transform.incremental_bid_ask_resampler as imvcdtinbiasre
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdatetime as hdateti
+import helpers.hdbg as hdbg
+import im_v2.common.data.transform.transform_utils as imvcdttrut
+
+_LOG = logging.getLogger(__name__)
+
+# Point-in-time columns resampled for each level, i.e., the bid/ask columns
+# followed by the derived ones.
+_POINT_IN_TIME_COLS = imvcdttrut.BID_ASK_COLS + [
+    "bid_ask_midpoint",
+    "half_spread",
+    "log_size_imbalance",
+]
+# Name of the 1-minute aggregates of the point-in-time columns, in the order
+# of `imvcdttrut.resample_bid_ask_data_to_1min()`.
+_AGGREGATE_NAMES = {
+    "open": ["open"] * 7,
+    "close": ["close"] * 7,
+    "max": ["high", "max", "high", "max", "max", "max", "max"],
+    "min": ["low", "min", "low", "min", "min", "min", "min"],
+    "mean": ["mean"] * 7,
+}
+_BAR_DURATION_IN_MS = 60000
+
+
+# #############################################################################
+# _BidAskBar
+# #############################################################################
+
+
+class _BidAskBar:
+    """
+    Running aggregates of the open 1-minute bar of a currency pair.
+
+    The batch resampler samples the last value of each column on a uniform
+    grid, forward filling the missing values, and then aggregates the grid
+    points of each minute. The grid points between two updates hold the same
+    values, so they are aggregated at once, e.g., a price held for 20 grid
+    points is added 20 times to the sum for the mean.
+    """
+
+    def __init__(self, timestamp: int, num_levels: int) -> None:
+        """
+        Constructor.
+
+        :param timestamp: end of the bar as Unix epoch in ms
+        :param num_levels: number of levels of the order book
+        """
+        self.timestamp = timestamp
+        shape = (num_levels, len(_POINT_IN_TIME_COLS))
+        # Last non-NaN value of each column in the current grid bucket.
+        self.values = np.full(shape, np.nan)
+        # End of the current grid bucket as Unix epoch in ms.
+        self.bucket_timestamp: Optional[int] = None
+        #
+        self._open = np.full(shape, np.nan)
+        self._max = np.full(shape, np.nan)
+        self._min = np.full(shape, np.nan)
+        self._sum = np.zeros(shape)
+        self._count = np.zeros(shape)
+        # Sums of the variance and of the autocovariance of the midpoint
+        # changes and of the log size imbalance.
+        self._midpoint_var = np.zeros(num_levels)
+        self._midpoint_autocovar = np.zeros(num_levels)
+        self._log_size_imbalance_var = np.zeros(num_levels)
+        self._log_size_imbalance_autocovar = np.zeros(num_levels)
+        # Values at the previous grid point.
+        self._prev_midpoint = np.full(num_levels, np.nan)
+        self._prev_midpoint_diff = np.full(num_levels, np.nan)
+        self._prev_log_size_imbalance = np.full(num_levels, np.nan)
+
+    def add_grid_points(self, num_points: int) -> None:
+        """
+        Aggregate `num_points` grid points with the current values.
+        """
+        values = self.values
+        is_valid = ~np.isnan(values)
+        self._open = np.where(np.isnan(self._open), values, self._open)
+        self._max = np.fmax(self._max, values)
+        self._min = np.fmin(self._min, values)
+        self._sum += np.where(is_valid, values * num_points, 0.0)
+        self._count += is_valid * num_points
+        # Only the first grid point can change the values, the next ones
+        # have zero change.
+        midpoint = values[:, 4]
+        midpoint_diff = midpoint - self._prev_midpoint
+        self._midpoint_var += np.nan_to_num(midpoint_diff**2)
+        self._midpoint_autocovar += np.nan_to_num(
+            midpoint_diff * self._prev_midpoint_diff
+        )
+        if num_points > 1:
+            midpoint_diff = np.where(np.isnan(midpoint), np.nan, 0.0)
+        self._prev_midpoint = midpoint
+        self._prev_midpoint_diff = midpoint_diff
+        #
+        log_size_imbalance = values[:, 6]
+        log_size_imbalance_sq = np.nan_to_num(log_size_imbalance**2)
+        self._log_size_imbalance_var += log_size_imbalance_sq * num_points
+        self._log_size_imbalance_autocovar += (
+            np.nan_to_num(log_size_imbalance * self._prev_log_size_imbalance)
+            + log_size_imbalance_sq * (num_points - 1)
+        )
+        self._prev_log_size_imbalance = log_size_imbalance
+
+    def get_aggregates(self) -> Dict[str, np.ndarray]:
+        """
+        Return the aggregates of the bar.
+
+        :return: aggregate name, e.g., "open", to values of each level and
+            point-in-time column, e.g., (num_levels, 7)
+        """
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = self._sum / self._count
+        aggregates = {
+            "open": self._open,
+            "close": self.values,
+            "max": self._max,
+            "min": self._min,
+            "mean": mean,
+            "var": np.stack(
+                [
+                    self._midpoint_var,
+                    self._midpoint_autocovar,
+                    self._log_size_imbalance_var,
+                    self._log_size_imbalance_autocovar,
+                ],
+                axis=1,
+            ),
+        }
+        return aggregates
+
+
+# #############################################################################
+# IncrementalBidAskResampler
+# #############################################################################
+
+
+class IncrementalBidAskResampler:
+    """
+    Consume bid/ask snapshots and build 1-minute bars for all the levels.
+
+    Instead of re-reading the last minute of raw data and resampling it in
+    batch, for each currency pair the class keeps the running aggregates of
+    the current minute, updated as the snapshots arrive. The bars are the
+    same as the ones computed by
+    `imvcdttrut.resample_multisymbol_multilevel_bid_ask_data_to_1min()` on the
+    snapshots of each minute, i.e., the bar labeled with `timestamp` covers
+    the snapshots in `(timestamp - 1 minute, timestamp]`.
+
+    A bar is closed when a snapshot of the next minutes arrives or when the
+    bars are closed explicitly with `close_bars()`, e.g., at the end of the
+    minute for the currency pairs without updates.
+    """
+
+    def __init__(
+        self,
+        exchange_id: str,
+        *,
+        number_levels_of_order_book: int = 10,
+        time_resolution_in_ms: int = 200,
+    ) -> None:
+        """
+        Constructor.
+
+        :param exchange_id: exchange the snapshots come from, e.g., `binance`
+        :param number_levels_of_order_book: top N levels to resample
+        :param time_resolution_in_ms: as in
+            `imvcdttrut.resample_bid_ask_data_to_1min()`
+        """
+        hdbg.dassert_lte(1, number_levels_of_order_book)
+        self._exchange_id = exchange_id
+        self._num_levels = number_levels_of_order_book
+        self._grid_step_in_ms = int(time_resolution_in_ms / 2)
+        hdbg.dassert_lt(0, self._grid_step_in_ms)
+        hdbg.dassert_eq(_BAR_DURATION_IN_MS % self._grid_step_in_ms, 0)
+        # Map currency pair to its open bar.
+        self._open_bars: Dict[str, _BidAskBar] = {}
+        # Map currency pair to the timestamp of its last closed bar.
+        self._last_closed_bar_timestamp: Dict[str, int] = {}
+        # Closed bars that have not been flushed yet.
+        self._closed_bars: List[Tuple[str, _BidAskBar]] = []
+
+    def update(self, df: pd.DataFrame) -> None:
+        """
+        Consume bid/ask snapshots.
+
+        :param df: snapshots in the long format returned by
+            `imvcdttrut.transform_raw_websocket_data()`, e.g.,
+            ```
+              currency_pair      timestamp  bid_price  bid_size  ask_price  ask_size  level  ...
+            0      ETH_USDT  1664987681005    1336.70    60.789    1336.71   129.483      1
+            1      ETH_USDT  1664987681005    1336.69     3.145    1336.72    20.892      2
+            ```
+        """
+        df = df[df["level"] <= self._num_levels]
+        for currency_pair, group in df.groupby("currency_pair", sort=False):
+            timestamps, values = self._get_values(group)
+            for timestamp, values_ in zip(timestamps, values):
+                self._update_bar(currency_pair, int(timestamp), values_)
+
+    def close_bars(self, end_timestamp: pd.Timestamp) -> None:
+        """
+        Close the open bars ending at or before `end_timestamp`.
+        """
+        end_timestamp_unix = hdateti.convert_timestamp_to_unix_epoch(
+            end_timestamp
+        )
+        for currency_pair in list(self._open_bars):
+            bar = self._open_bars[currency_pair]
+            if bar.timestamp <= end_timestamp_unix:
+                self._close_bar(currency_pair)
+
+    def get_num_closed_bars(self) -> int:
+        """
+        Return the number of closed bars waiting to be flushed.
+        """
+        return len(self._closed_bars)
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Return all the closed bars and empty the queue.
+
+        :return: bars in the same format as
+            `imvcdttrut.resample_multisymbol_multilevel_bid_ask_data_to_1min()`
+        """
+        rule = f"{self._grid_step_in_ms}ms"
+        columns = []
+        for level in range(1, self._num_levels + 1):
+            for aggregate, names in _AGGREGATE_NAMES.items():
+                columns.extend(
+                    f"level_{level}.{col}.{name}"
+                    for col, name in zip(_POINT_IN_TIME_COLS, names)
+                )
+            columns.extend(
+                f"level_{level}.{col}.{rule}"
+                for col in [
+                    "bid_ask_midpoint_var",
+                    "bid_ask_midpoint_autocovar",
+                    "log_size_imbalance_var",
+                    "log_size_imbalance_autocovar",
+                ]
+            )
+        rows = []
+        for _, bar in self._closed_bars:
+            aggregates = bar.get_aggregates()
+            # Arrange the values level by level, as in `columns`.
+            values = np.concatenate(
+                [aggregates[aggregate] for aggregate in _AGGREGATE_NAMES]
+                + [aggregates["var"]],
+                axis=1,
+            )
+            rows.append(values.ravel())
+        index = pd.to_datetime(
+            [bar.timestamp for _, bar in self._closed_bars], unit="ms"
+        ).rename("timestamp")
+        df = pd.DataFrame(
+            np.array(rows).reshape(len(rows), len(columns)),
+            index=index,
+            columns=columns,
+        )
+        df["exchange_id"] = self._exchange_id
+        df["currency_pair"] = [
+            currency_pair for currency_pair, _ in self._closed_bars
+        ]
+        self._closed_bars = []
+        return df
+
+    def _get_values(
+        self, df: pd.DataFrame
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the values of the point-in-time columns of each snapshot.
+
+        :param df: snapshots of a currency pair
+        :return: sorted timestamps of the snapshots and the values of the
+            point-in-time columns of each snapshot and level, with shape
+            (num_snapshots, num_levels, 7)
+        """
+        timestamps, idxs = np.unique(
+            df["timestamp"].to_numpy(), return_inverse=True
+        )
+        values = np.full(
+            (len(timestamps), self._num_levels, len(_POINT_IN_TIME_COLS)),
+            np.nan,
+        )
+        levels = df["level"].to_numpy().astype(int) - 1
+        values[idxs, levels, :4] = df[imvcdttrut.BID_ASK_COLS].to_numpy(
+            dtype=np.float64
+        )
+        bid_price = values[..., 0]
+        bid_size = values[..., 1]
+        ask_price = values[..., 2]
+        ask_size = values[..., 3]
+        values[..., 4] = 0.5 * (ask_price + bid_price)
+        values[..., 5] = 0.5 * (ask_price - bid_price)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            values[..., 6] = np.log(bid_size) - np.log(ask_size)
+        return timestamps, values
+
+    def _update_bar(
+        self, currency_pair: str, timestamp: int, values: np.ndarray
+    ) -> None:
+        """
+        Update the open bar of a currency pair with a snapshot.
+        """
+        step = self._grid_step_in_ms
+        # Grid buckets and bars are closed on the right, e.g., the snapshot at
+        # 10:00:00.000 belongs to the bar ending at 10:00:00.
+        bucket_timestamp = -(-timestamp // step) * step
+        bar_timestamp = (
+            -(-bucket_timestamp // _BAR_DURATION_IN_MS) * _BAR_DURATION_IN_MS
+        )
+        if bar_timestamp <= self._last_closed_bar_timestamp.get(
+            currency_pair, -1
+        ):
+            _LOG.warning(
+                "Discarding the snapshot of '%s' at %s of a closed bar",
+                currency_pair,
+                timestamp,
+            )
+            return
+        bar = self._open_bars.get(currency_pair)
+        if bar is not None and bar_timestamp > bar.timestamp:
+            self._close_bar(currency_pair)
+            bar = None
+        if bar is None:
+            bar = _BidAskBar(bar_timestamp, self._num_levels)
+            self._open_bars[currency_pair] = bar
+        elif bucket_timestamp < bar.bucket_timestamp:
+            _LOG.warning(
+                "Discarding the snapshot of '%s' at %s older than %s",
+                currency_pair,
+                timestamp,
+                bar.bucket_timestamp,
+            )
+            return
+        elif bucket_timestamp > bar.bucket_timestamp:
+            # Aggregate the last bucket and the grid points forward filled
+            # until the new one.
+            bar.add_grid_points(
+                (bucket_timestamp - bar.bucket_timestamp) // step
+            )
+        bar.bucket_timestamp = bucket_timestamp
+        # Keep the last non-NaN value of each column in the bucket.
+        bar.values = np.where(np.isnan(values), bar.values, values)
+
+    def _close_bar(self, currency_pair: str) -> None:
+        bar = self._open_bars.pop(currency_pair)
+        # Aggregate the last bucket.
+        bar.add_grid_points(1)
+        self._closed_bars.append((currency_pair, bar))
+        self._last_closed_bar_timestamp[currency_pair] = bar.timestamp
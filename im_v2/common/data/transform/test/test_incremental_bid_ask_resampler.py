@@ -0,0 +1,166 @@
+import numpy as np
+import pandas as pd
+
+import core.finance.bid_ask as cfibiask
+import helpers.hunit_test as hunitest
+import im_v2.common.data.transform.incremental_bid_ask_resampler as imvcdtinbiasre
+import im_v2.common.data.transform.transform_utils as imvcdttrut
+
+# 2022-10-05 16:34:00 UTC.
+_START_TIMESTAMP = 1664987640000
+
+
+def _get_test_data(num_levels: int, *, seed: int = 1) -> pd.DataFrame:
+    """
+    Generate bid/ask snapshots at irregular times over ~3 minutes.
+
+    :return: snapshots in the format of
+        `imvcdttrut.transform_raw_websocket_data()`, e.g.,
+        ```
+          currency_pair      timestamp  bid_price  bid_size  ask_price  ask_size  level exchange_id
+        0      BTC_USDT  1664987610101      99.99       6.0     100.01       1.0      1     binance
+        ```
+    """
+    rng = np.random.default_rng(seed)
+    rows = []
+    for currency_pair in ["BTC_USDT", "ETH_USDT"]:
+        timestamp = _START_TIMESTAMP - 30000 + int(rng.integers(0, 300))
+        midpoint = 100.0
+        while timestamp < _START_TIMESTAMP + 150000:
+            if rng.random() < 0.5:
+                midpoint += 0.01 * rng.normal()
+            for level in range(1, num_levels + 1):
+                # Some sizes are missing.
+                bid_size = float(rng.integers(1, 10))
+                if rng.random() < 0.05:
+                    bid_size = np.nan
+                rows.append(
+                    [
+                        currency_pair,
+                        timestamp,
+                        midpoint - 0.01 * level,
+                        bid_size,
+                        midpoint + 0.01 * level,
+                        float(rng.integers(1, 10)),
+                        level,
+                    ]
+                )
+            # Use irregular steps with multiple snapshots per sampling period
+            # and gaps longer than the sampling period.
+            timestamp += int(rng.choice([50, 100, 130, 200, 700, 3000]))
+            if rng.random() < 0.02:
+                # Jump exactly to the end of the minute.
+                timestamp = (timestamp // 60000 + 1) * 60000
+    columns = [
+        "currency_pair",
+        "timestamp",
+        "bid_price",
+        "bid_size",
+        "ask_price",
+        "ask_size",
+        "level",
+    ]
+    df = pd.DataFrame(rows, columns=columns)
+    df = df.sort_values(
+        ["timestamp", "currency_pair", "level"], kind="stable"
+    ).reset_index(drop=True)
+    df["exchange_id"] = "binance"
+    return df
+
+
+def _resample_in_batch(
+    df: pd.DataFrame, end_timestamp: pd.Timestamp, num_levels: int
+) -> pd.DataFrame:
+    """
+    Resample the snapshots of the minute ending at `end_timestamp` with the
+    batch resampler.
+    """
+    end_timestamp_unix = (end_timestamp - pd.Timestamp("1970-01-01")) // (
+        pd.Timedelta("1ms")
+    )
+    mask = (df["timestamp"] > end_timestamp_unix - 60000) & (
+        df["timestamp"] <= end_timestamp_unix
+    )
+    df = df[mask].copy()
+    df["timestamp"] = pd.to_datetime(df["timestamp"], unit="ms")
+    df = df.set_index("timestamp")
+    df_wide = cfibiask.transform_bid_ask_long_data_to_wide(df, "timestamp")
+    resample_func = imvcdttrut.resample_multisymbol_multilevel_bid_ask_data_to_1min
+    df_resampled = resample_func(df_wide, number_levels_of_order_book=num_levels)
+    return df_resampled
+
+
+# #############################################################################
+# TestIncrementalBidAskResampler1
+# #############################################################################
+
+
+class TestIncrementalBidAskResampler1(hunitest.TestCase):
+    def test_update1(self) -> None:
+        """
+        Check that the bars are the same as the ones of the batch resampler
+        when the snapshots are consumed in chunks.
+        """
+        num_levels = 2
+        df = _get_test_data(num_levels)
+        resampler = imvcdtinbiasre.IncrementalBidAskResampler(
+            "binance", number_levels_of_order_book=num_levels
+        )
+        for idxs in np.array_split(np.arange(len(df)), 37):
+            resampler.update(df.iloc[idxs])
+        resampler.close_bars(pd.Timestamp("2022-10-05 16:37:00+00:00"))
+        actual = resampler.flush()
+        self.assertEqual(resampler.get_num_closed_bars(), 0)
+        # Compare with the batch resampler.
+        end_timestamps = sorted(set(actual.index))
+        self.assertEqual(len(end_timestamps), 4)
+        expected = pd.concat(
+            [
+                _resample_in_batch(df, end_timestamp, num_levels)
+                for end_timestamp in end_timestamps
+            ]
+        )
+        actual = self._sort(actual)
+        expected = self._sort(expected)
+        self.assertEqual(actual.columns.tolist(), expected.columns.tolist())
+        key_columns = ["exchange_id", "currency_pair", "timestamp"]
+        self.assert_dfs_close(
+            actual.drop(columns=key_columns),
+            expected.drop(columns=key_columns),
+            equal_nan=True,
+        )
+        self.assertEqual(
+            actual[key_columns].values.tolist(),
+            expected[key_columns].values.tolist(),
+        )
+
+    def test_close_bars1(self) -> None:
+        """
+        Check that only the ended bars are closed and that the snapshots of a
+        closed bar are discarded.
+        """
+        df = _get_test_data(1)
+        resampler = imvcdtinbiasre.IncrementalBidAskResampler(
+            "binance", number_levels_of_order_book=1
+        )
+        end_timestamp = pd.Timestamp("2022-10-05 16:34:00+00:00")
+        is_first_minute = df["timestamp"] <= _START_TIMESTAMP
+        resampler.update(df[is_first_minute])
+        resampler.close_bars(end_timestamp - pd.Timedelta(seconds=1))
+        self.assertEqual(resampler.get_num_closed_bars(), 0)
+        resampler.close_bars(end_timestamp)
+        self.assertEqual(resampler.get_num_closed_bars(), 2)
+        # Replay the same snapshots.
+        resampler.update(df[is_first_minute])
+        resampler.close_bars(end_timestamp)
+        actual = resampler.flush()
+        self.assertEqual(actual.shape[0], 2)
+        self.assertEqual(
+            actual.index.unique().tolist(), [end_timestamp.tz_convert(None)]
+        )
+
+    @staticmethod
+    def _sort(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.reset_index().sort_values(["timestamp", "currency_pair"])
+        df = df.reset_index(drop=True)
+        return df
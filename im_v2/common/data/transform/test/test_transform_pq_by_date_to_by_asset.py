@@ -1,10 +1,13 @@
 import argparse
+import glob
 import os
-from typing import Any, Dict, Tuple
+from typing import Any, Dict, List, Tuple
 
+import pandas as pd
 import pytest
 
 import helpers.hgit as hgit
+import helpers.hpandas as hpandas
 import helpers.hsystem as hsystem
 import helpers.hunit_test as hunitest
 import im_v2.common.data.transform.transform_pq_by_date_to_by_asset as imvcdttpbdtba
@@ -194,3 +197,162 @@ class TestPqByDateToByAsset1(hunitest.TestCase):
         self.check_directory_structure_with_file_contents(
             by_date_dir, by_asset_dir
         )
+
+
+# #############################################################################
+# TestStreamingTransform1
+# #############################################################################
+
+
+class TestStreamingTransform1(hunitest.TestCase):
+    @staticmethod
+    def get_test_data() -> pd.DataFrame:
+        """
+        Generate hourly data for 3 assets from 2022-01-30 to 2022-02-01.
+        """
+        timestamps = pd.date_range(
+            "2022-01-30", "2022-02-01 23:00:00", freq="1H", tz="UTC"
+        )
+        dfs = []
+        for asset_id in [1000, 1001, 1002]:
+            df = pd.DataFrame(
+                {
+                    "timestamp": timestamps,
+                    "asset_id": asset_id,
+                    "close": range(len(timestamps)),
+                    "volume": asset_id,
+                }
+            )
+            dfs.append(df)
+        # Interleave the assets like in by-date data.
+        df = pd.concat(dfs).sort_values("timestamp", kind="stable")
+        df = df.reset_index(drop=True)
+        return df
+
+    def write_by_date_data(self, df: pd.DataFrame) -> List[str]:
+        """
+        Write the data in by-date Parquet files with multiple row groups.
+        """
+        src_dir = os.path.join(self.get_scratch_space(), "by_date")
+        src_file_names = []
+        for date, df_date in df.groupby(df["timestamp"].dt.strftime("%Y%m%d")):
+            file_name = os.path.join(src_dir, date, "data.parquet")
+            os.makedirs(os.path.dirname(file_name))
+            df_date.to_parquet(file_name, index=False, row_group_size=10)
+            src_file_names.append(file_name)
+        return src_file_names
+
+    def run_tasks(self, src_file_names: List[str], **kwargs: Any) -> int:
+        """
+        Prepare and execute the tasks of the streaming transform.
+
+        :return: number of executed tasks
+        """
+        tasks = imvcdttpbdtba.streaming_prepare_tasks(
+            src_file_names, self.dst_dir, "asset_id", "timestamp", **kwargs
+        )
+        for args, task_kwargs in tasks:
+            imvcdttpbdtba.streaming_execute_task(
+                *args, **task_kwargs, incremental=True, num_attempts=1
+            )
+        return len(tasks)
+
+    def check_by_asset_data(self, expected: pd.DataFrame) -> None:
+        """
+        Check the by-asset files against the expected data.
+        """
+        pattern = os.path.join(self.dst_dir, "**/*.parquet")
+        file_names = sorted(glob.glob(pattern, recursive=True))
+        file_names = [os.path.relpath(f, self.dst_dir) for f in file_names]
+        actual = "\n".join(file_names)
+        expected_file_names = r"""
+        asset_id=1000/year=2022/month=1/data.parquet
+        asset_id=1000/year=2022/month=2/data.parquet
+        asset_id=1002/year=2022/month=1/data.parquet
+        asset_id=1002/year=2022/month=2/data.parquet
+        """
+        self.assert_equal(actual, expected_file_names, dedent=True)
+        # Check the content of each file.
+        for file_name in file_names:
+            df = pd.read_parquet(os.path.join(self.dst_dir, file_name))
+            asset_id = int(file_name.split("/")[0].split("=")[1])
+            month = int(file_name.split("/")[2].split("=")[1])
+            mask = (expected["asset_id"] == asset_id) & (
+                expected["timestamp"].dt.month == month
+            )
+            expected_df = expected[mask].drop(columns=["asset_id"])
+            expected_df = expected_df.reset_index(drop=True)
+            self.assert_equal(
+                hpandas.df_to_str(df, num_rows=None),
+                hpandas.df_to_str(expected_df, num_rows=None),
+            )
+
+    def test1(self) -> None:
+        """
+        Check the by-asset data when the buffers are spilled at every row
+        group.
+        """
+        self._test_transform(max_buffer_size_in_bytes=1)
+
+    def test2(self) -> None:
+        """
+        Check the by-asset data when the buffers are never spilled.
+        """
+        self._test_transform(max_buffer_size_in_bytes=1024**3)
+
+    def test_incremental1(self) -> None:
+        """
+        Check that the completed partitions are skipped in incremental mode.
+        """
+        df = self.get_test_data()
+        src_file_names = self.write_by_date_data(df)
+        self.dst_dir = os.path.join(self.get_scratch_space(), "by_asset")
+        # Write only the February partition, like for an interrupted run.
+        num_tasks = self.run_tasks(src_file_names[-1:])
+        self.assertEqual(num_tasks, 1)
+        # Run again on all the files.
+        num_tasks = self.run_tasks(src_file_names)
+        self.assertEqual(num_tasks, 1)
+        num_tasks = self.run_tasks(src_file_names)
+        self.assertEqual(num_tasks, 0)
+        num_tasks = self.run_tasks(src_file_names, incremental=False)
+        self.assertEqual(num_tasks, 2)
+
+    def test_incremental2(self) -> None:
+        """
+        Check that a completed partition is processed again in incremental mode
+        when a source file is added to it.
+        """
+        df = self.get_test_data()
+        src_file_names = self.write_by_date_data(df)
+        self.dst_dir = os.path.join(self.get_scratch_space(), "by_asset")
+        kwargs = {"asset_ids": [1000, 1002], "columns": ["close"]}
+        # Complete January without its last day, e.g., before the file of the
+        # day is written.
+        file_names = [src_file_names[0], src_file_names[2]]
+        num_tasks = self.run_tasks(file_names, **kwargs)
+        self.assertEqual(num_tasks, 2)
+        # Only January is processed again with the new day.
+        num_tasks = self.run_tasks(src_file_names, **kwargs)
+        self.assertEqual(num_tasks, 1)
+        num_tasks = self.run_tasks(src_file_names, **kwargs)
+        self.assertEqual(num_tasks, 0)
+        expected = df[["timestamp", "asset_id", "close"]]
+        expected = expected[expected["asset_id"] != 1001]
+        self.check_by_asset_data(expected)
+
+    def _test_transform(self, max_buffer_size_in_bytes: int) -> None:
+        df = self.get_test_data()
+        src_file_names = self.write_by_date_data(df)
+        self.dst_dir = os.path.join(self.get_scratch_space(), "by_asset")
+        num_tasks = self.run_tasks(
+            src_file_names,
+            asset_ids=[1000, 1002],
+            columns=["close"],
+            num_spill_buckets=2,
+            max_buffer_size_in_bytes=max_buffer_size_in_bytes,
+        )
+        self.assertEqual(num_tasks, 2)
+        expected = df[["timestamp", "asset_id", "close"]]
+        expected = expected[expected["asset_id"] != 1001]
+        self.check_by_asset_data(expected)
@@ -428,6 +428,63 @@ class TestTransformRawWebsocketData(hunitest.TestCase):
             hpandas.df_to_str(expected_df), hpandas.df_to_str(actual_df)
         )
 
+    def test_transform_raw_websocket_bid_ask_data2(self) -> None:
+        """
+        Verify that the duplicated bid/ask snapshots are dropped for an
+        exchange with 3 values per level.
+        """
+        test_exchange = "cryptocom"
+        test_timestamp1 = pd.Timestamp("2022-10-05 15:06:00.019422+00:00")
+        test_timestamp2 = pd.Timestamp("2022-10-05 15:06:00.219422+00:00")
+        eth_bids = [[1336.7, 60.789, 3], [1336.69, 3.145, 1]]
+        eth_asks = [[1336.71, 129.483, 2], [1336.72, 20.892, 1]]
+        btc_asks = [[20066.6, 0.698, 1], [20066.7, 0.008, 1]]
+        test_data = [
+            {
+                "bids": eth_bids,
+                "asks": eth_asks,
+                "timestamp": 1664987681005,
+                "symbol": "ETH/USDT",
+                "end_download_timestamp": test_timestamp1,
+            },
+            {
+                "bids": [[20066.5, 39.455, 4], [20066.3, 1.346, 1]],
+                "asks": btc_asks,
+                "timestamp": 1664987681001,
+                "symbol": "BTC/USDT",
+                "end_download_timestamp": test_timestamp1,
+            },
+            # The order book didn't change.
+            {
+                "bids": eth_bids,
+                "asks": eth_asks,
+                "timestamp": 1664987681005,
+                "symbol": "ETH/USDT",
+                "end_download_timestamp": test_timestamp2,
+            },
+            # The order book changed without a change of the timestamp.
+            {
+                "bids": [[20066.5, 39.455, 4], [20066.4, 1.0, 1]],
+                "asks": btc_asks,
+                "timestamp": 1664987681001,
+                "symbol": "BTC/USDT",
+                "end_download_timestamp": test_timestamp2,
+            },
+        ]
+        actual_df = imvcdttrut.transform_raw_websocket_data(
+            test_data, "bid_ask", test_exchange, max_num_levels=3
+        ).reset_index(drop=True)
+        actual = hpandas.df_to_str(actual_df, num_rows=None)
+        expected = r"""
+          currency_pair      timestamp  bid_price  bid_size  ask_price  ask_size           end_download_timestamp  level exchange_id
+        0      ETH_USDT  1664987681005    1336.70    60.789    1336.71   129.483 2022-10-05 15:06:00.019422+00:00      1   cryptocom
+        1      ETH_USDT  1664987681005    1336.69     3.145    1336.72    20.892 2022-10-05 15:06:00.019422+00:00      2   cryptocom
+        2      BTC_USDT  1664987681001   20066.50    39.455   20066.60     0.698 2022-10-05 15:06:00.019422+00:00      1   cryptocom
+        3      BTC_USDT  1664987681001   20066.30     1.346   20066.70     0.008 2022-10-05 15:06:00.019422+00:00      2   cryptocom
+        4      BTC_USDT  1664987681001   20066.40     1.000   20066.70     0.008 2022-10-05 15:06:00.219422+00:00      3   cryptocom
+        """
+        self.assert_equal(actual, expected, dedent=True, fuzzy_match=True)
+
     def test_transform_raw_websocket_trades_data(self) -> None:
         """
         Verify that raw trades dict data received from websocket is transformed
@@ -776,3 +833,40 @@ class TestResampleBidAskData2(hunitest.TestCase):
         scratch_dir = self.get_scratch_space()
         aws_profile = "ck"
         hs3.copy_data_from_s3_to_local_dir(s3_input_dir, scratch_dir, aws_profile)
+
+
+# #############################################################################
+# TestTransformResampledBidAskDataToDbFormat
+# #############################################################################
+
+
+class TestTransformResampledBidAskDataToDbFormat(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Verify that resampled multilevel data is transformed to long format.
+        """
+        df_resampled = pd.DataFrame(
+            {
+                "timestamp": pd.to_datetime(
+                    ["2022-11-16 00:01:00", "2022-11-16 00:02:00"]
+                ),
+                "level_1.bid_price.open": [13.5, 13.6],
+                "level_1.ask_size.mean": [1.0, 2.0],
+                "level_2.bid_price.open": [13.4, 13.5],
+                "level_2.ask_size.mean": [3.0, 4.0],
+                "exchange_id": ["binance", "binance"],
+                "currency_pair": ["BTC_USDT", "BTC_USDT"],
+            }
+        ).set_index("timestamp")
+        actual_df = imvcdttrut.transform_resampled_bid_ask_data_to_db_format(
+            df_resampled, number_levels_of_order_book=2
+        )
+        actual = hpandas.df_to_str(actual_df)
+        expected = r"""
+               timestamp  bid_price_open  ask_size_mean exchange_id currency_pair  level
+        0  1668556860000            13.5            1.0     binance      BTC_USDT      1
+        1  1668556920000            13.6            2.0     binance      BTC_USDT      1
+        2  1668556860000            13.4            3.0     binance      BTC_USDT      2
+        3  1668556920000            13.5            4.0     binance      BTC_USDT      2
+        """
+        self.assert_equal(actual, expected, dedent=True, fuzzy_match=True)
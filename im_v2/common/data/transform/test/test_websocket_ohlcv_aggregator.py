@@ -0,0 +1,192 @@
+from typing import Any, Dict, List
+
+import ccxt
+import pandas as pd
+
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
+import im_v2.common.data.extract.extract_utils as imvcdeexut
+import im_v2.common.data.transform.transform_utils as imvcdttrut
+import im_v2.common.data.transform.websocket_ohlcv_aggregator as imvcdtweohag
+
+
+def _get_ohlcv_messages() -> List[Dict[str, Any]]:
+    """
+    Build websocket OHLCV messages for a growing buffer of candles.
+
+    Each message contains all the candles received so far, where the last
+    candle is still open and gets updated by the next message.
+    """
+    messages = []
+    candles = []
+    start_timestamp = 1664982180000
+    for i in range(5):
+        timestamp = start_timestamp + i * 60000
+        # The previous candle is closed with its final values.
+        candles.append(
+            [timestamp, 100.0 + i, 101.0 + i, 99.0 + i, 100.5 + i, 10.0 + i]
+        )
+        for currency_pair in ["ETH/USDT", "BTC/USDT"]:
+            end_download_timestamp = pd.Timestamp(
+                timestamp + 30000, unit="ms", tz="UTC"
+            )
+            message = {
+                "ohlcv": [list(candle) for candle in candles],
+                "currency_pair": currency_pair,
+                "end_download_timestamp": str(end_download_timestamp),
+            }
+            messages.append(message)
+    return messages
+
+
+def _get_trades_messages() -> List[Dict[str, Any]]:
+    """
+    Build websocket trades messages for a growing buffer of trades.
+    """
+    messages = []
+    trades = []
+    start_timestamp = 1664982180000
+    for i in range(12):
+        # Add 2 trades every 25 secs.
+        for j in range(2):
+            timestamp = start_timestamp + i * 25000 + j * 7000
+            trades.append(
+                {
+                    "timestamp": timestamp,
+                    "price": 100.0 + (i * 7 + j * 3) % 5,
+                    "amount": 0.5 + j,
+                }
+            )
+        message = {
+            "trades": list(trades),
+            "currency_pair": "ETH_USDT",
+            "trades_endtimestamp": trades[-1]["timestamp"],
+            "end_download_timestamp": str(
+                pd.Timestamp(trades[-1]["timestamp"] + 100, unit="ms", tz="UTC")
+            ),
+        }
+        messages.append(message)
+    return messages
+
+
+# #############################################################################
+# TestWebsocketOhlcvAggregator1
+# #############################################################################
+
+
+class TestWebsocketOhlcvAggregator1(hunitest.TestCase):
+    def test_update_from_ohlcv1(self) -> None:
+        """
+        Check that the streaming bars are the same as the ones built in batch.
+        """
+        exchange_id = "binance"
+        messages = _get_ohlcv_messages()
+        # Run the aggregator, flushing after every message.
+        aggregator = imvcdtweohag.WebsocketOhlcvAggregator(exchange_id)
+        actual = []
+        for message in messages:
+            aggregator.update_from_ohlcv(message)
+            actual.append(aggregator.flush())
+        actual = pd.concat(actual, ignore_index=True)
+        # Run the batch implementation.
+        expected = self._get_expected(messages, "ohlcv", exchange_id)
+        self.assert_equal(hpandas.df_to_str(actual), hpandas.df_to_str(expected))
+        # 4 bars are finalized for each currency pair.
+        self.assertEqual(len(actual), 8)
+        # The last candle is still open.
+        open_bar = aggregator.get_open_bar("ETH/USDT")
+        self.assertEqual(open_bar[0], 1664982180000 + 4 * 60000)
+
+    def test_update_from_trades1(self) -> None:
+        """
+        Check that the bars built incrementally from trades are the same as
+        the ones built by CCXT from the entire buffer.
+        """
+        exchange_id = "binance"
+        messages = _get_trades_messages()
+        start_timestamp_unix_epoch = 1664982180000
+        # Run the aggregator, flushing every 3 messages.
+        aggregator = imvcdtweohag.WebsocketOhlcvAggregator(
+            exchange_id, start_timestamp_unix_epoch=start_timestamp_unix_epoch
+        )
+        actual = []
+        for i, message in enumerate(messages):
+            aggregator.update_from_trades(message)
+            if i % 3 == 2:
+                actual.append(aggregator.flush())
+        actual.append(aggregator.flush())
+        actual = pd.concat(actual, ignore_index=True)
+        # Build the bars from the entire buffer of trades like in the
+        # non-incremental implementation.
+        exchange = ccxt.Exchange()
+        timestamps_dict: Dict[str, int] = {}
+        ohlcv_messages = []
+        for message in messages:
+            currency_pair = message["currency_pair"]
+            ohlcv_message = dict(message)
+            ohlcv_message["ohlcv"] = exchange.build_ohlcvc(
+                ohlcv_message.pop("trades"),
+                timeframe="1m",
+                since=timestamps_dict.get(currency_pair, 0),
+            )
+            (
+                is_fresh,
+                timestamps_dict,
+                ohlcv_message,
+            ) = imvcdeexut._is_fresh_data_point(
+                currency_pair,
+                ohlcv_message,
+                "ohlcv_from_trades",
+                timestamps_dict,
+                start_timestamp_unix_epoch,
+            )
+            if is_fresh:
+                ohlcv_messages.append(ohlcv_message)
+        expected = self._get_expected(ohlcv_messages, None, exchange_id)
+        self.assert_equal(hpandas.df_to_str(actual), hpandas.df_to_str(expected))
+        self.assertEqual(len(actual), 4)
+
+    def test_empty_message1(self) -> None:
+        aggregator = imvcdtweohag.WebsocketOhlcvAggregator("binance")
+        self.assertEqual(aggregator.update_from_ohlcv(None), 0)
+        self.assertEqual(aggregator.get_num_finalized_bars(), 0)
+        actual = aggregator.flush()
+        self.assertEqual(
+            actual.columns.tolist(), imvcdtweohag.OHLCV_WEBSOCKET_COLUMNS
+        )
+        self.assertEqual(len(actual), 0)
+
+    @staticmethod
+    def _get_expected(
+        messages: List[Dict[str, Any]], data_type: Any, exchange_id: str
+    ) -> pd.DataFrame:
+        """
+        Build the expected bars with the non-incremental implementation.
+
+        :param data_type: data type to filter the messages with, `None` if
+            the messages contain only fresh data
+        """
+        timestamps_dict: Dict[str, int] = {}
+        fresh_messages = []
+        for message in messages:
+            if data_type is not None:
+                (
+                    is_fresh,
+                    timestamps_dict,
+                    message,
+                ) = imvcdeexut._is_fresh_data_point(
+                    message["currency_pair"], message, data_type, timestamps_dict, 0
+                )
+                if not is_fresh:
+                    continue
+            fresh_messages.append(message)
+        df = pd.concat(
+            [
+                imvcdttrut.transform_raw_websocket_data(
+                    [message], "ohlcv", exchange_id
+                )
+                for message in fresh_messages
+            ],
+            ignore_index=True,
+        )
+        return df
@@ -32,10 +32,17 @@ dst_dir/
                     data.parquet
 ```
 
+By default the data is converted by streaming the source files (see
+`streaming_prepare_tasks()`), so that the memory needed doesn't depend on the
+size of the files, and an interrupted run can be resumed in incremental mode.
+
 # Example:
 > transform_pq_by_date_to_by_asset.py \
     --src_dir im_v2/common/data/transform/test_data_by_date \
     --dst_dir im_v2/common/data/transform/test_data_by_asset \
+    --asset_col_name ticker \
+    --chunk_mode by_year_month \
+    --max_buffer_size_in_mb 512 \
     --num_threads 2
 
 # To process Parquet data for LimeTask317:
@@ -51,16 +58,23 @@ dst_dir/
 """
 
 import argparse
+import json
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import tempfile
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
 from tqdm.autonotebook import tqdm
 
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hintrospection as hintros
+import helpers.hio as hio
 import helpers.hjoblib as hjoblib
 import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
@@ -299,6 +313,491 @@ def lime317_execute_task(
     hparque.to_partitioned_parquet(df, partition_columns, dst_dir)
 
 
+# #############################################################################
+# Streaming processing of files.
+# #############################################################################
+
+# The LimeTask317 flow reads all the by-date files of a task in memory and
+# regroups the rows with pandas, so the memory needed by a task grows with the
+# size of the files.
+#
+# The streaming flow processes one time partition (e.g., a month) per task:
+# - the source files are read one row group at a time
+# - the rows of each row group are hashed by asset into `num_spill_buckets`
+#   buckets, which are spilled to local Arrow files when the buffered data
+#   exceeds `max_buffer_size_in_bytes`
+# - the buckets are processed one at a time, writing the data of each asset
+#   sorted by timestamp in a single file of the time partition
+# Thus the memory of a task is bounded by the buffer size and by the size of a
+# bucket, i.e., ~1 / `num_spill_buckets` of the data of the partition.
+#
+# Different tasks write different time partitions, so they never write the same
+# file. When a partition is complete a marker file with the size of each source
+# file of the partition is written, so that a job restarted in incremental mode
+# skips the completed partitions. A partition interrupted mid-way, or whose
+# source files were added (e.g., the file of a new day of the month) or
+# rewritten after it was completed, is processed again from scratch, overwriting
+# the files already written.
+
+# The leading underscore makes Arrow ignore the dir when reading the dataset.
+_COMPLETED_PARTITIONS_DIR = "_completed_partitions"
+
+
+def _get_partition_key(src_file_name: str, chunk_mode: str) -> Tuple[int, int]:
+    """
+    Get the time partition of a by-date file from the name of its dir.
+
+    E.g., for `chunk_mode="by_year_month"`, "src_dir/20220111/data.parquet"
+    and "src_dir/date=20220111/data.parquet" both map to `(2022, 1)`.
+    """
+    dir_name = os.path.basename(os.path.dirname(src_file_name))
+    date = pd.Timestamp(dir_name.split("=")[-1])
+    if chunk_mode == "by_year_month":
+        key = (date.year, date.month)
+    elif chunk_mode == "by_year_week":
+        # Use the same week as `hparque.add_date_partition_columns()`.
+        key = (date.year, date.isocalendar()[1])
+    else:
+        raise ValueError("Invalid chunk_mode='%s'" % chunk_mode)
+    return key
+
+
+def _get_partition_dir_name(key: Tuple[int, int], chunk_mode: str) -> str:
+    """
+    Get the Hive partition dir of a time partition, e.g., "year=2022/month=1".
+    """
+    if chunk_mode == "by_year_month":
+        partition_columns = ["year", "month"]
+    elif chunk_mode == "by_year_week":
+        partition_columns = ["year", "weekofyear"]
+    else:
+        raise ValueError("Invalid chunk_mode='%s'" % chunk_mode)
+    dir_name = "/".join(
+        f"{column}={value}" for column, value in zip(partition_columns, key)
+    )
+    return dir_name
+
+
+def _get_completed_partition_file_name(
+    dst_dir: str, partition_dir_name: str
+) -> str:
+    # E.g., "dst_dir/_completed_partitions/year=2022.month=1".
+    file_name = partition_dir_name.replace("/", ".")
+    file_name = os.path.join(dst_dir, _COMPLETED_PARTITIONS_DIR, file_name)
+    return file_name
+
+
+def _get_src_file_sizes(
+    src_file_names: List[str], aws_profile: hs3.AwsProfile
+) -> Dict[str, int]:
+    """
+    Get the size in bytes of each source file.
+    """
+    if aws_profile is not None:
+        filesystem = hs3.get_s3fs(aws_profile)
+        sizes = {name: int(filesystem.size(name)) for name in src_file_names}
+    else:
+        sizes = {name: os.path.getsize(name) for name in src_file_names}
+    return sizes
+
+
+def _is_partition_completed(
+    dst_dir: str,
+    partition_dir_name: str,
+    src_file_sizes: Dict[str, int],
+    aws_profile: hs3.AwsProfile,
+) -> bool:
+    """
+    Check whether a partition was completed from the same source files.
+
+    :param src_file_sizes: source file name -> size of the source files of the
+        partition, as returned by `_get_src_file_sizes()`
+    """
+    file_name = _get_completed_partition_file_name(dst_dir, partition_dir_name)
+    if aws_profile is not None:
+        filesystem = hs3.get_s3fs(aws_profile)
+        if not filesystem.exists(file_name):
+            return False
+        with filesystem.open(file_name) as f:
+            txt = f.read()
+    else:
+        if not os.path.exists(file_name):
+            return False
+        txt = hio.from_file(file_name)
+    try:
+        marker = json.loads(txt)
+    except json.JSONDecodeError:
+        # E.g., a marker written before the sizes of the files were recorded.
+        _LOG.warning("Invalid marker for partition '%s'", partition_dir_name)
+        return False
+    is_completed = marker.get("src_file_sizes") == src_file_sizes
+    if not is_completed:
+        _LOG.info(
+            "The source files of the completed partition '%s' changed",
+            partition_dir_name,
+        )
+    return is_completed
+
+
+def _mark_partition_as_completed(
+    dst_dir: str,
+    partition_dir_name: str,
+    src_file_sizes: Dict[str, int],
+    num_assets: int,
+    aws_profile: hs3.AwsProfile,
+) -> None:
+    file_name = _get_completed_partition_file_name(dst_dir, partition_dir_name)
+    marker = {"num_assets": num_assets, "src_file_sizes": src_file_sizes}
+    txt = json.dumps(marker, indent=4, sort_keys=True)
+    if aws_profile is not None:
+        filesystem = hs3.get_s3fs(aws_profile)
+        with filesystem.open(file_name, "w") as f:
+            f.write(txt)
+    else:
+        hio.to_file(file_name, txt)
+
+
+# #############################################################################
+# _AssetSpillBuffers
+# #############################################################################
+
+
+class _AssetSpillBuffers:
+    """
+    Buffer rows in buckets by the hash of their asset, spilling the buckets to
+    local Arrow files when the buffered data is too large.
+
+    All the rows of an asset are in the same bucket.
+    """
+
+    def __init__(
+        self,
+        asset_col_name: str,
+        num_buckets: int,
+        max_buffer_size_in_bytes: int,
+        spill_dir: str,
+    ) -> None:
+        hdbg.dassert_lte(1, num_buckets)
+        hdbg.dassert_lte(1, max_buffer_size_in_bytes)
+        hdbg.dassert_dir_exists(spill_dir)
+        self._asset_col_name = asset_col_name
+        self._num_buckets = num_buckets
+        self._max_buffer_size_in_bytes = max_buffer_size_in_bytes
+        self._spill_dir = spill_dir
+        # The schema of the first added table.
+        self._schema: Optional[pa.Schema] = None
+        # Bucket -> tables buffered in memory.
+        self._buffers: List[List[pa.Table]] = [[] for _ in range(num_buckets)]
+        self._buffer_size_in_bytes = 0
+        # Bucket -> writer of the file with the spilled tables.
+        self._writers: Dict[int, pa.RecordBatchStreamWriter] = {}
+        self.num_spills = 0
+
+    def add(self, table: pa.Table) -> None:
+        """
+        Add the rows of `table` to the buckets of their assets.
+        """
+        if self._schema is None:
+            self._schema = table.schema
+        else:
+            hdbg.dassert(
+                table.schema.equals(self._schema),
+                "Inconsistent schema:\n%s\nvs\n%s",
+                table.schema,
+                self._schema,
+            )
+            # Use the same metadata for all the tables, since it can differ
+            # across source files.
+            table = table.replace_schema_metadata(self._schema.metadata)
+        if table.num_rows == 0:
+            return
+        hdbg.dassert_eq(table.column(self._asset_col_name).null_count, 0)
+        assets = table.column(self._asset_col_name).to_numpy(
+            zero_copy_only=False
+        )
+        # Hashing is deterministic across processes, unlike Python `hash()`.
+        buckets = pd.util.hash_array(assets) % self._num_buckets
+        buckets = buckets.astype(np.int64)
+        # Sort the rows by bucket so that each bucket is a slice of the table.
+        table = table.take(np.argsort(buckets, kind="stable"))
+        counts = np.bincount(buckets, minlength=self._num_buckets)
+        offset = 0
+        for bucket, count in enumerate(counts):
+            if count > 0:
+                self._buffers[bucket].append(table.slice(offset, count))
+            offset += count
+        self._buffer_size_in_bytes += table.nbytes
+        if self._buffer_size_in_bytes > self._max_buffer_size_in_bytes:
+            self._spill()
+
+    def get_buckets(self) -> Iterator[pa.Table]:
+        """
+        Yield the data of each non-empty bucket, releasing the buffers.
+        """
+        for writer in self._writers.values():
+            writer.close()
+        for bucket in range(self._num_buckets):
+            tables = self._buffers[bucket]
+            self._buffers[bucket] = []
+            if bucket in self._writers:
+                # Map the file in memory to avoid copying the spilled data.
+                source = pa.memory_map(self._get_spill_file_name(bucket))
+                tables.insert(0, pa.ipc.open_stream(source).read_all())
+            if tables:
+                yield pa.concat_tables(tables)
+        self._buffer_size_in_bytes = 0
+        self._writers = {}
+
+    def _get_spill_file_name(self, bucket: int) -> str:
+        return os.path.join(self._spill_dir, f"bucket_{bucket}.arrow")
+
+    def _spill(self) -> None:
+        """
+        Append the buffered tables to the spill files of their buckets.
+        """
+        _LOG.debug("Spilling %s bytes", self._buffer_size_in_bytes)
+        for bucket, tables in enumerate(self._buffers):
+            if not tables:
+                continue
+            if bucket not in self._writers:
+                self._writers[bucket] = pa.ipc.new_stream(
+                    self._get_spill_file_name(bucket), self._schema
+                )
+            for table in tables:
+                self._writers[bucket].write_table(table)
+            self._buffers[bucket] = []
+        self._buffer_size_in_bytes = 0
+        self.num_spills += 1
+
+
+# #############################################################################
+
+
+def _read_row_groups(
+    src_file_name: str,
+    columns: Optional[List[str]],
+    aws_profile: hs3.AwsProfile,
+) -> Iterator[pa.Table]:
+    """
+    Read a Parquet file one row group at a time.
+    """
+    filesystem = None
+    if aws_profile is not None:
+        filesystem = hs3.get_s3fs(aws_profile)
+    parquet_file = pq.ParquetFile(src_file_name, filesystem=filesystem)
+    if columns is not None:
+        # Keep the order of the columns in the file.
+        names = parquet_file.schema_arrow.names
+        hdbg.dassert_is_subset(columns, names)
+        columns = [name for name in names if name in columns]
+    for idx in range(parquet_file.num_row_groups):
+        yield parquet_file.read_row_group(idx, columns=columns)
+
+
+def _write_assets(
+    table: pa.Table,
+    asset_id_col_name: str,
+    timestamp_col_name: str,
+    dst_dir: str,
+    partition_dir_name: str,
+    aws_profile: hs3.AwsProfile,
+) -> int:
+    """
+    Write the data of each asset in `table` sorted by timestamp.
+
+    The data of an asset is written in a single file, e.g.,
+    "dst_dir/asset_id=123/year=2022/month=1/data.parquet".
+
+    :return: number of written assets
+    """
+    filesystem = None
+    if aws_profile is not None:
+        filesystem = hs3.get_s3fs(aws_profile)
+    # The sort is stable, so the rows with the same timestamp keep the order of
+    # the source files.
+    table = table.sort_by(
+        [(asset_id_col_name, "ascending"), (timestamp_col_name, "ascending")]
+    )
+    assets = table.column(asset_id_col_name).to_numpy(zero_copy_only=False)
+    # Find where each asset starts in the sorted data.
+    start_idxs = np.flatnonzero(np.r_[True, assets[1:] != assets[:-1]])
+    end_idxs = np.r_[start_idxs[1:], len(assets)]
+    # The asset is encoded in the path, like `hparque.to_partitioned_parquet()`
+    # does.
+    table = table.drop_columns([asset_id_col_name])
+    for start_idx, end_idx in zip(start_idxs, end_idxs):
+        asset_dir = f"{asset_id_col_name}={assets[start_idx]}"
+        file_name = os.path.join(
+            dst_dir, asset_dir, partition_dir_name, "data.parquet"
+        )
+        if filesystem is None:
+            hio.create_enclosing_dir(file_name, incremental=True)
+        asset_table = table.slice(start_idx, end_idx - start_idx)
+        pq.write_table(asset_table, file_name, filesystem=filesystem)
+    return len(start_idxs)
+
+
+def streaming_prepare_tasks(
+    src_file_names: List[str],
+    dst_dir: str,
+    asset_id_col_name: str,
+    timestamp_col_name: str,
+    *,
+    asset_ids: Optional[List[Any]] = None,
+    columns: Optional[List[str]] = None,
+    chunk_mode: str = "by_year_month",
+    num_spill_buckets: int = 16,
+    max_buffer_size_in_bytes: int = 1024**3,
+    aws_profile: hs3.AwsProfile = None,
+    incremental: bool = True,
+) -> List[hjoblib.Task]:
+    """
+    Prepare a task for each time partition to process with
+    `streaming_execute_task()`.
+
+    :param src_file_names: Parquet files to process, with the name of their dir
+        encoding the date, e.g., "src_dir/20220111/data.parquet"
+    :param dst_dir: directory where to save the data
+    :param asset_id_col_name: name of the column with the assets
+    :param timestamp_col_name: name of the column used to sort the data of an
+        asset
+    :param asset_ids: assets to process. `None` means all
+    :param columns: columns to process. `None` means all
+    :param chunk_mode: how to partition the data by time, i.e.,
+        "by_year_month" or "by_year_week"
+    :param num_spill_buckets: number of buckets the data of a partition is
+        split into by asset
+    :param max_buffer_size_in_bytes: max size of the data of a task buffered in
+        memory before spilling it to disk
+    :param aws_profile: AWS profile to use for `dst_dir` and the source files
+        on S3
+    :param incremental: skip the partitions already completed from the same
+        source files
+    :return: list of joblib tasks
+    """
+    hdbg.dassert_container_type(src_file_names, list, str)
+    # Build a map from time partition (e.g., `(year, month)`) to the files of
+    # that partition.
+    key_to_file_names: Dict[Tuple[int, int], List[str]] = {}
+    for src_file_name in src_file_names:
+        key = _get_partition_key(src_file_name, chunk_mode)
+        key_to_file_names.setdefault(key, []).append(src_file_name)
+    tasks = []
+    num_skipped = 0
+    for key in sorted(key_to_file_names.keys()):
+        partition_dir_name = _get_partition_dir_name(key, chunk_mode)
+        partition_file_names = sorted(key_to_file_names[key])
+        if incremental:
+            src_file_sizes = _get_src_file_sizes(
+                partition_file_names, aws_profile
+            )
+            if _is_partition_completed(
+                dst_dir, partition_dir_name, src_file_sizes, aws_profile
+            ):
+                _LOG.debug(
+                    "Skipping completed partition '%s'", partition_dir_name
+                )
+                num_skipped += 1
+                continue
+        task: hjoblib.Task = (
+            # args.
+            (
+                partition_file_names,
+                dst_dir,
+                asset_id_col_name,
+                timestamp_col_name,
+                asset_ids,
+                columns,
+                chunk_mode,
+                num_spill_buckets,
+                max_buffer_size_in_bytes,
+                aws_profile,
+            ),
+            # kwargs.
+            {},
+        )
+        tasks.append(task)
+    _LOG.info(
+        "Prepared %s tasks, skipped %s completed partitions",
+        len(tasks),
+        num_skipped,
+    )
+    return tasks
+
+
+def streaming_execute_task(
+    src_file_names: List[str],
+    dst_dir: str,
+    asset_id_col_name: str,
+    timestamp_col_name: str,
+    asset_ids: Optional[List[Any]],
+    columns: Optional[List[str]],
+    chunk_mode: str,
+    num_spill_buckets: int,
+    max_buffer_size_in_bytes: int,
+    aws_profile: hs3.AwsProfile,
+    incremental: bool,
+    num_attempts: int,
+) -> None:
+    """
+    Convert the by-date files of a time partition into by-asset files.
+
+    See `streaming_prepare_tasks()` for the params.
+    """
+    # A failed task can be re-run, since it overwrites the files it writes.
+    _ = num_attempts
+    hdbg.dassert_container_type(src_file_names, list, str)
+    keys = {_get_partition_key(name, chunk_mode) for name in src_file_names}
+    hdbg.dassert_eq(len(keys), 1, "keys=%s", str(keys))
+    partition_dir_name = _get_partition_dir_name(keys.pop(), chunk_mode)
+    # Get the sizes before reading the files, so that a file rewritten while the
+    # task reads it is processed again by the next incremental run.
+    src_file_sizes = _get_src_file_sizes(src_file_names, aws_profile)
+    if incremental and _is_partition_completed(
+        dst_dir, partition_dir_name, src_file_sizes, aws_profile
+    ):
+        _LOG.warning("Skipping completed partition '%s'", partition_dir_name)
+        return
+    if columns is not None:
+        columns = list(columns)
+        for col_name in [asset_id_col_name, timestamp_col_name]:
+            if col_name not in columns:
+                columns.append(col_name)
+    with tempfile.TemporaryDirectory() as spill_dir:
+        spill_buffers = _AssetSpillBuffers(
+            asset_id_col_name,
+            num_spill_buckets,
+            max_buffer_size_in_bytes,
+            spill_dir,
+        )
+        for src_file_name in src_file_names:
+            for table in _read_row_groups(src_file_name, columns, aws_profile):
+                if asset_ids is not None:
+                    asset_col = table.column(asset_id_col_name)
+                    value_set = pa.array(asset_ids, type=asset_col.type)
+                    table = table.filter(pc.is_in(asset_col, value_set))
+                spill_buffers.add(table)
+        num_assets = 0
+        for table in spill_buffers.get_buckets():
+            num_assets += _write_assets(
+                table,
+                asset_id_col_name,
+                timestamp_col_name,
+                dst_dir,
+                partition_dir_name,
+                aws_profile,
+            )
+    _mark_partition_as_completed(
+        dst_dir, partition_dir_name, src_file_sizes, num_assets, aws_profile
+    )
+    _LOG.info(
+        "Wrote %s assets for partition '%s' with %s spills",
+        num_assets,
+        partition_dir_name,
+        spill_buffers.num_spills,
+    )
+
+
 # #############################################################################
 # Generic processing of files.
 # #############################################################################
@@ -353,10 +852,14 @@ def _prepare_tasks(src_file_names: List[str], args: Any) -> List[hjoblib.Task]:
 
 def _run(args: argparse.Namespace) -> None:
     incremental = not args.no_incremental
+    use_streaming = args.prepare_tasks_func_name is None
     # Prepare the destination dir.
     if args.aws_profile:
+        # The streaming transform doesn't need the dir to exist and it tracks
+        # the completed partitions by itself.
         # TODO(Nikola): CMTask1439 Add S3 support to hparser's `create_incremental_dir`.
-        raise NotImplementedError("Incremental on S3 is not implemented!")
+        if not use_streaming:
+            raise NotImplementedError("Incremental on S3 is not implemented!")
     else:
         hparser.create_incremental_dir(args.dst_dir, args)
     # Get the input files to process.
@@ -372,13 +875,41 @@ def _run(args: argparse.Namespace) -> None:
     )
     hdbg.dassert_lte(1, len(src_file_names))
     _LOG.info("Found %s Parquet files in '%s'", len(src_file_names), args.src_dir)
-    # Prepare the tasks.
-    func = hintros.get_function_from_string(args.prepare_tasks_func_name)
-    hdbg.dassert_isinstance(func, Callable)
-    tasks = func(src_file_names, args)
-    # Prepare the workload.
-    func = hintros.get_function_from_string(args.execute_task_func_name)
-    hdbg.dassert_isinstance(func, Callable)
+    if use_streaming:
+        # Use the streaming transform.
+        hdbg.dassert_is(args.execute_task_func_name, None)
+        asset_ids = None
+        if args.asset_ids is not None:
+            asset_ids = [
+                hparque.maybe_cast_to_int(asset_id)
+                for asset_id in args.asset_ids.split(",")
+            ]
+        columns = None
+        if args.columns is not None:
+            columns = args.columns.split(",")
+        max_buffer_size_in_bytes = int(args.max_buffer_size_in_mb * 1024**2)
+        tasks = streaming_prepare_tasks(
+            src_file_names,
+            args.dst_dir,
+            args.asset_col_name,
+            args.timestamp_col_name,
+            asset_ids=asset_ids,
+            columns=columns,
+            chunk_mode=args.chunk_mode,
+            num_spill_buckets=args.num_spill_buckets,
+            max_buffer_size_in_bytes=max_buffer_size_in_bytes,
+            aws_profile=args.aws_profile,
+            incremental=incremental,
+        )
+        func = streaming_execute_task
+    else:
+        # Prepare the tasks.
+        func = hintros.get_function_from_string(args.prepare_tasks_func_name)
+        hdbg.dassert_isinstance(func, Callable)
+        tasks = func(src_file_names, args)
+        # Prepare the workload.
+        func = hintros.get_function_from_string(args.execute_task_func_name)
+        hdbg.dassert_isinstance(func, Callable)
     func_name = func.__name__
     workload = (func, func_name, tasks)
     hjoblib.validate_workload(workload)
@@ -424,10 +955,77 @@ def _parse() -> argparse.ArgumentParser:
     parser.add_argument(
         "--aws_profile",
         action="store",
-        required=True,
+        required=False,
+        default=None,
         type=str,
         help="The AWS profile to use for `.aws/credentials` or for env vars",
     )
+    parser.add_argument(
+        "--asset_col_name",
+        action="store",
+        type=str,
+        default="asset_id",
+        help="Name of the column with the assets",
+    )
+    parser.add_argument(
+        "--timestamp_col_name",
+        action="store",
+        type=str,
+        default="timestamp",
+        help="Name of the column used to sort the data of each asset",
+    )
+    parser.add_argument(
+        "--asset_ids",
+        action="store",
+        type=str,
+        default=None,
+        help="Comma-separated assets to process, all if not specified",
+    )
+    parser.add_argument(
+        "--columns",
+        action="store",
+        type=str,
+        default=None,
+        help="Comma-separated columns to process, all if not specified",
+    )
+    parser.add_argument(
+        "--chunk_mode",
+        action="store",
+        type=str,
+        default="by_year_month",
+        choices=["by_year_month", "by_year_week"],
+        help="Time partition of the by-asset data, processed by one task",
+    )
+    parser.add_argument(
+        "--num_spill_buckets",
+        action="store",
+        type=int,
+        default=16,
+        help="Number of buckets the data of a task is split into by asset",
+    )
+    parser.add_argument(
+        "--max_buffer_size_in_mb",
+        action="store",
+        type=float,
+        default=1024,
+        help="Max size of the data of a task buffered before spilling to disk",
+    )
+    parser.add_argument(
+        "--prepare_tasks_func_name",
+        action="store",
+        type=str,
+        default=None,
+        help="Function to prepare the tasks, the streaming transform if not "
+        "specified",
+    )
+    parser.add_argument(
+        "--execute_task_func_name",
+        action="store",
+        type=str,
+        default=None,
+        help="Function to execute a task, together with "
+        "`--prepare_tasks_func_name`",
+    )
     parser = hparser.add_parallel_processing_arg(parser)
     parser = hparser.add_verbosity_arg(parser)
     return parser
@@ -6,6 +6,7 @@ Import as:
 import im_v2.common.data.transform.transform_utils as imvcdttrut
 """
 
+import itertools
 import logging
 from typing import Dict, List
 
@@ -172,59 +173,163 @@ def remove_unfinished_ohlcv_bars(data: pd.DataFrame) -> pd.DataFrame:
 # #############################################################################
 
 
-def _transform_bid_ask_websocket_dataframe(
-    df: pd.DataFrame, exchange_id: str, max_num_levels: int
+# Number of values describing a level of the order book in the raw websocket
+# data of each exchange, e.g., `[price, size]` or `[price, size, num_orders]`.
+_BID_ASK_WEBSOCKET_LEVEL_WIDTH = {
+    "binance": 2,
+    "okx": 2,
+    "kraken": 2,
+    "cryptocom": 3,
+}
+
+
+def _flatten_order_book_side(
+    order_book_sides: List[List[List[float]]],
+    num_levels: int,
+    level_width: int,
+) -> np.ndarray:
+    """
+    Flatten one side of the order book of multiple snapshots.
+
+    :param order_book_sides: the bids (or asks) of each snapshot, e.g.,
+        `[[[1336.7, 60.789], [1336.69, 3.145]], ...]`
+    :param num_levels: number of levels in all the snapshots
+    :param level_width: number of values describing a level
+    :return: array with the price and the size of each level of each
+        snapshot, with shape (num_levels, 2)
+    """
+    # Read the values directly into an array, without building the list of
+    # levels.
+    levels = itertools.chain.from_iterable(order_book_sides)
+    values = np.fromiter(
+        itertools.chain.from_iterable(levels), dtype=np.float64
+    )
+    hdbg.dassert_eq(
+        values.size,
+        num_levels * level_width,
+        "Each level should have %s values",
+        level_width,
+    )
+    values = values.reshape(num_levels, level_width)
+    return values[:, :2]
+
+
+def _transform_bid_ask_websocket_data(
+    raw_data: List[Dict], exchange_id: str, max_num_levels: int
 ) -> pd.DataFrame:
     """
-    Transform bid/ask raw DataFrame to DataFrame representation suitable for
+    Transform raw bid/ask dict data to DataFrame representation suitable for
     database insertion.
 
-    :param df: DataFrame formed from raw bid/ask dict data.
+    The levels of all the snapshots are flattened into one array, assigning
+    the level from the position in the order book of the snapshot.
+
+    It can happen that the orderbook did not change between iterations: in
+    this case we get duplicated snapshots with different
+    `end_download_timestamp` that are dropped. If the orderbook of a symbol
+    changed without a change of the timestamp, the rows of the snapshots with
+    the same timestamp are deduplicated one by one and the levels are assigned
+    in the order of the rows.
+
+    :param raw_data: bid/ask dict data, e.g.,
+        ```
+        {
+            "bids": [[1336.7, 60.789], [1336.69, 3.145]],
+            "asks": [[1336.71, 129.483], [1336.72, 20.892]],
+            "timestamp": 1664987681005,
+            "symbol": "ETH/USDT",
+            "end_download_timestamp": ...,
+            ...
+        }
+        ```
     :param max_num_levels: filter bid ask data on level <=
         max_num_levels
     :return: transformed DataFrame
     """
-    df = df.explode(["asks", "bids"])
-    if (
-        exchange_id == "binance"
-        or exchange_id == "okx"
-        or exchange_id == "kraken"
-    ):
-        df[["bid_price", "bid_size"]] = pd.DataFrame(
-            df["bids"].to_list(), index=df.index
-        )
-        df[["ask_price", "ask_size"]] = pd.DataFrame(
-            df["asks"].to_list(), index=df.index
+    if exchange_id not in _BID_ASK_WEBSOCKET_LEVEL_WIDTH:
+        raise ValueError(f"Invalid exchange_id='{exchange_id}'")
+    level_width = _BID_ASK_WEBSOCKET_LEVEL_WIDTH[exchange_id]
+    bids = [data["bids"] for data in raw_data]
+    asks = [data["asks"] for data in raw_data]
+    num_levels = np.array([len(bids_) for bids_ in bids], dtype=np.int64)
+    hdbg.dassert_eq_all(
+        num_levels, [len(asks_) for asks_ in asks], "Bids and asks mismatch"
+    )
+    total_num_levels = int(num_levels.sum())
+    bid_values = _flatten_order_book_side(bids, total_num_levels, level_width)
+    ask_values = _flatten_order_book_side(asks, total_num_levels, level_width)
+    values = np.hstack([bid_values, ask_values])
+    # Map each row to its snapshot.
+    snapshot_ends = np.cumsum(num_levels)
+    snapshot_starts = snapshot_ends - num_levels
+    snapshot_idxs = np.repeat(np.arange(len(raw_data)), num_levels)
+    # For clarity, add +1 so the levels start from 1.
+    levels = np.arange(len(values)) - snapshot_starts[snapshot_idxs] + 1
+    # Drop the duplicated snapshots.
+    currency_pairs = pd.Series(
+        [data["symbol"] for data in raw_data]
+    ).str.replace("/", "_")
+    timestamps = pd.Series([data["timestamp"] for data in raw_data])
+    keys = list(zip(currency_pairs, timestamps))
+    seen_snapshots = set()
+    is_dropped_snapshot = np.zeros(len(raw_data), dtype=bool)
+    for idx, key in enumerate(keys):
+        snapshot = (
+            key,
+            values[snapshot_starts[idx] : snapshot_ends[idx]].tobytes(),
         )
-    elif exchange_id == "cryptocom":
-        df[["bid_price", "bid_size", "bid_quantity"]] = pd.DataFrame(
-            df["bids"].to_list(), index=df.index
+        if snapshot in seen_snapshots:
+            is_dropped_snapshot[idx] = True
+        else:
+            seen_snapshots.add(snapshot)
+    is_dropped_row = is_dropped_snapshot[snapshot_idxs]
+    # Assign the levels of the snapshots that share the timestamp with
+    # another snapshot row by row.
+    is_shared_key = np.zeros(len(raw_data), dtype=bool)
+    is_shared_key[~is_dropped_snapshot] = (
+        pd.Series(keys)[~is_dropped_snapshot].duplicated(keep=False).to_numpy()
+    )
+    if is_shared_key.any():
+        is_shared_key_row = is_shared_key[snapshot_idxs]
+        shared_key_df = pd.DataFrame(
+            values[is_shared_key_row], columns=BID_ASK_COLS
         )
-        df[["ask_price", "ask_size", "ask_quantity"]] = pd.DataFrame(
-            df["asks"].to_list(), index=df.index
+        shared_key_df["currency_pair"] = currency_pairs.to_numpy()[
+            snapshot_idxs[is_shared_key_row]
+        ]
+        shared_key_df["timestamp"] = timestamps.to_numpy()[
+            snapshot_idxs[is_shared_key_row]
+        ]
+        is_duplicated = shared_key_df.duplicated().to_numpy()
+        is_dropped_row[np.flatnonzero(is_shared_key_row)[is_duplicated]] = True
+        shared_key_df = shared_key_df[~is_duplicated]
+        levels[is_shared_key_row & ~is_dropped_row] = (
+            shared_key_df.groupby(["currency_pair", "timestamp"])
+            .cumcount()
+            .add(1)
+            .to_numpy()
         )
-    else:
-        raise ValueError(f"Invalid exchange_id='{exchange_id}'")
-    df["currency_pair"] = df["symbol"].str.replace("/", "_")
-    groupby_cols = ["currency_pair", "timestamp"]
-    # Drop duplicates before computing level column.
-    non_metadata_columns = [
-        "currency_pair",
-        "timestamp",
-        "bid_price",
-        "bid_size",
-        "ask_price",
-        "ask_size",
-    ]
-    df = df[non_metadata_columns + ["end_download_timestamp"]]
-    # It can happen that the orderbook did not change between iteration
-    #  in this case we get duplicated data with different end_download_timestamp
-    #  these can be safely dropped.
-    df = df.drop_duplicates(non_metadata_columns)
-    # For clarity, add +1 so the levels start from 1.
-    df["level"] = df.groupby(groupby_cols).cumcount().add(1)
     _LOG.info(f"Filtering bid ask data until level {max_num_levels}")
-    df = df[df["level"] <= max_num_levels]
+    mask = ~is_dropped_row & (levels <= max_num_levels)
+    row_snapshot_idxs = snapshot_idxs[mask]
+    end_download_timestamps = pd.Series(
+        [data["end_download_timestamp"] for data in raw_data]
+    )
+    df = pd.DataFrame(
+        {
+            "currency_pair": currency_pairs.iloc[row_snapshot_idxs].array,
+            "timestamp": timestamps.iloc[row_snapshot_idxs].array,
+            "bid_price": values[mask, 0],
+            "bid_size": values[mask, 1],
+            "ask_price": values[mask, 2],
+            "ask_size": values[mask, 3],
+            "end_download_timestamp": end_download_timestamps.iloc[
+                row_snapshot_idxs
+            ].array,
+            "level": levels[mask],
+        },
+        index=row_snapshot_idxs,
+    )
     # Check for NaNs in the timestamp column and drop them.
     if df["timestamp"].isnull().any():
         _LOG.warning(
@@ -322,20 +427,23 @@ def transform_raw_websocket_data(
         level <= max_num_levels
     :return: database compliant DataFrame formed from raw data
     """
-    df = pd.DataFrame(raw_data)
-    if data_type == "ohlcv" or data_type == "ohlcv_from_trades":
-        df = _transform_ohlcv_websocket_dataframe(df)
-    elif data_type == "bid_ask":
-        df = _transform_bid_ask_websocket_dataframe(
-            df, exchange_id, max_num_levels
+    if data_type == "bid_ask":
+        # The rows are already unique, since the duplicated snapshots are
+        # dropped.
+        df = _transform_bid_ask_websocket_data(
+            raw_data, exchange_id, max_num_levels
         )
-    elif data_type == "trades":
-        df = transform_trades_websocket_dataframe(df)
     else:
-        raise ValueError(
-            f"Transformation of data type: {data_type} is not supported"
-        )
-    df = df.drop_duplicates()
+        df = pd.DataFrame(raw_data)
+        if data_type == "ohlcv" or data_type == "ohlcv_from_trades":
+            df = _transform_ohlcv_websocket_dataframe(df)
+        elif data_type == "trades":
+            df = transform_trades_websocket_dataframe(df)
+        else:
+            raise ValueError(
+                f"Transformation of data type: {data_type} is not supported"
+            )
+        df = df.drop_duplicates()
     df["exchange_id"] = exchange_id
     return df
 
@@ -607,7 +715,8 @@ def transform_and_resample_rt_bid_ask_data(
     Transform raw bid/ask realtime data and resample to 1 min.
 
     Input data is assumed to be compatible with schema of `ccxt_bid_ask_futures_raw`.
-    Currently only level 1 of the orderbook is returned in the resampled DataFrame.
+    Currently only level 1 of the orderbook is returned in the resampled DataFrame,
+    see `IncrementalBidAskResampler` to resample all the levels in real time.
 
     :param df_raw: real-time bid/ask data from a single exchange
     :return: Data resampled to 1-minute output column schema
@@ -632,22 +741,64 @@ def transform_and_resample_rt_bid_ask_data(
     df_resampled = resample_multisymbol_multilevel_bid_ask_data_to_1min(
         df_raw_wide, number_levels_of_order_book=1
     )
-    # Rename column to match DB table schema.
-    # TODO(Juraj): the lambda will need to be more sophisticated for more levels.
-    df_resampled.columns = list(
-        map(
-            lambda col: col.replace("level_1.", "").replace(".", "_"),
-            df_resampled,
-        )
+    df_resampled = transform_resampled_bid_ask_data_to_db_format(
+        df_resampled, number_levels_of_order_book=1
     )
-    # Resetting index is needed before inserting to RDS,
-    # because the column is passed to the query.
-    df_resampled = df_resampled.reset_index()
-    # TODO(Juraj): librarize this, we tend to use .apply(hdateti.convert_timestamp_to_unix_epoch) but that's
-    # slow.
-    df_resampled["timestamp"] = (
-        df_resampled["timestamp"] - pd.Timestamp("1970-01-01")
-    ) // pd.Timedelta("1ms")
-    # Add back level column because DB table is in long format.
-    df_resampled["level"] = 1
     return df_resampled
+
+
+def transform_resampled_bid_ask_data_to_db_format(
+    df_resampled: pd.DataFrame,
+    *,
+    number_levels_of_order_book: int = 10,
+) -> pd.DataFrame:
+    """
+    Transform resampled multilevel bid/ask data to the DB long format.
+
+    E.g.,
+    ```
+                         level_1.bid_price.open  ...  level_2.bid_price.open  ...  exchange_id  currency_pair
+    timestamp
+    2022-11-16 00:01:00                   13.50  ...                   13.49  ...      binance       BTC_USDT
+    ```
+    to:
+    ```
+           timestamp  bid_price_open  ...  exchange_id  currency_pair  level
+    0  1668556860000           13.50  ...      binance       BTC_USDT      1
+    1  1668556860000           13.49  ...      binance       BTC_USDT      2
+    ```
+
+    :param df_resampled: data returned by
+        `resample_multisymbol_multilevel_bid_ask_data_to_1min()`
+    :param number_levels_of_order_book: top N levels to include in the
+        resulting DataFrame
+    :return: data compatible with `ccxt_bid_ask_futures_resampled_1min`
+        table
+    """
+    non_level_cols = [
+        col for col in df_resampled.columns if not col.startswith("level_")
+    ]
+    dfs = []
+    for level in range(1, number_levels_of_order_book + 1):
+        prefix = f"level_{level}."
+        level_cols = [
+            col for col in df_resampled.columns if col.startswith(prefix)
+        ]
+        df = df_resampled[level_cols + non_level_cols]
+        # Rename column to match DB table schema.
+        df.columns = [
+            col.replace(prefix, "").replace(".", "_") for col in df.columns
+        ]
+        # Resetting index is needed before inserting to RDS,
+        # because the column is passed to the query.
+        df = df.reset_index()
+        # TODO(Juraj): librarize this, we tend to use .apply(hdateti.convert_timestamp_to_unix_epoch) but that's
+        # slow.
+        df["timestamp"] = (
+            df["timestamp"] - pd.Timestamp("1970-01-01")
+        ) // pd.Timedelta("1ms")
+        # Add back level column because DB table is in long format.
+        df["level"] = level
+        dfs.append(df)
+    df = pd.concat(dfs, ignore_index=True)
+    return df
@@ -0,0 +1,275 @@
+"""
+Incrementally build finalized OHLCV bars from websocket messages.
+
+Import as:
+
+import im_v2.common.data.transform.websocket_ohlcv_aggregator as imvcdtweohag
+"""
+
+import collections
+import logging
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import helpers.hdatetime as hdateti
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
+
+# Columns of the DataFrame returned by `WebsocketOhlcvAggregator.flush()`,
+# which are the same as the ones returned by
+# `imvcdttrut.transform_raw_websocket_data()` for OHLCV data.
+OHLCV_WEBSOCKET_COLUMNS = [
+    "currency_pair",
+    "timestamp",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "end_download_timestamp",
+    "exchange_id",
+]
+
+
+class WebsocketOhlcvAggregator:
+    """
+    Consume websocket messages and keep a queue of finalized OHLCV bars.
+
+    The websocket client (e.g., CCXT) accumulates the received candles /
+    trades in a buffer that grows over time, so re-processing the entire
+    buffer at every iteration has a cost proportional to its length.
+    Instead, for each currency pair this class keeps:
+    - the timestamp of the last finalized bar, so that only the tail of the
+      buffer with newer data is scanned
+    - the current open (i.e., unfinished) bar
+    and accumulates the finalized bars across all the currency pairs in a
+    queue that is flushed into a single DataFrame for a batched DB insert.
+
+    A bar is finalized with the same rules used by
+    `imvcdeexut._is_fresh_data_point()`:
+    - for OHLCV messages, a bar labeled with `timestamp` is finalized when
+      `timestamp + bar_duration <= end_download_timestamp`
+    - for trades messages, a bar labeled with `timestamp` is finalized when
+      `timestamp + bar_duration <= trades_endtimestamp`
+    """
+
+    def __init__(
+        self,
+        exchange_id: str,
+        *,
+        start_timestamp_unix_epoch: int = 0,
+        bar_duration_in_ms: int = 60000,
+    ) -> None:
+        """
+        Constructor.
+
+        :param exchange_id: exchange the messages come from, e.g., `binance`
+        :param start_timestamp_unix_epoch: bars with a timestamp before this
+            one are discarded
+        :param bar_duration_in_ms: duration of a bar in ms
+        """
+        hdbg.dassert_lt(0, bar_duration_in_ms)
+        self._exchange_id = exchange_id
+        self._start_timestamp_unix_epoch = start_timestamp_unix_epoch
+        self._bar_duration_in_ms = bar_duration_in_ms
+        # Map currency pair to the timestamp of the last finalized bar.
+        self._last_finalized_timestamp: Dict[str, int] = {}
+        # Map currency pair to the current open bar as
+        # `[timestamp, open, high, low, close, volume]`.
+        self._open_bar: Dict[str, List[Any]] = {}
+        # Finalized bars that have not been flushed yet as tuples of values
+        # in the order of `OHLCV_WEBSOCKET_COLUMNS`.
+        self._finalized_bars: Deque[Tuple] = collections.deque()
+
+    def update_from_ohlcv(self, data_point: Optional[Dict[str, Any]]) -> int:
+        """
+        Consume a websocket message containing OHLCV candles.
+
+        E.g.,
+        ```
+        {
+            "ohlcv": [
+                [1695120600000, 1645.08, 1645.23, 1643.83, 1643.97, 1584.69],
+                [1695120660000, 1646.08, 1641.23, 1643.31, 1643.57, 1584.59],
+            ],
+            "currency_pair": "ETH_USDT",
+            "end_download_timestamp": "2023-09-19 10:51:00.120000+00:00",
+        }
+        ```
+
+        :param data_point: message returned by
+            `Extractor.download_websocket_data()`
+        :return: number of newly finalized bars
+        """
+        if data_point is None:
+            return 0
+        currency_pair = data_point["currency_pair"]
+        end_download_timestamp = data_point["end_download_timestamp"]
+        end_download_timestamp_unix = hdateti.convert_timestamp_to_unix_epoch(
+            pd.Timestamp(end_download_timestamp)
+        )
+        last_timestamp = self._last_finalized_timestamp.get(currency_pair)
+        candles = data_point["ohlcv"]
+        # Candles are sorted by timestamp, so scan the buffer from the end
+        # until the last finalized bar.
+        idx = len(candles)
+        while idx > 0 and (
+            last_timestamp is None or candles[idx - 1][0] > last_timestamp
+        ):
+            idx -= 1
+        num_finalized_bars = 0
+        for candle in candles[idx:]:
+            timestamp = candle[0]
+            if (
+                timestamp + self._bar_duration_in_ms
+                <= end_download_timestamp_unix
+            ):
+                if (
+                    last_timestamp is None or last_timestamp < timestamp
+                ) and self._start_timestamp_unix_epoch <= timestamp:
+                    self._finalize_bar(
+                        currency_pair, candle[:6], end_download_timestamp
+                    )
+                    last_timestamp = timestamp
+                    num_finalized_bars += 1
+            else:
+                # The bar is still open and it can be updated by the next
+                # messages.
+                self._open_bar[currency_pair] = list(candle[:6])
+        return num_finalized_bars
+
+    def update_from_trades(self, data_point: Optional[Dict[str, Any]]) -> int:
+        """
+        Consume a websocket message containing trades and build OHLCV bars.
+
+        This is equivalent to building the bars with CCXT
+        `Exchange.build_ohlcvc()` on all the trades and keeping the finalized
+        bars, but only the trades belonging to non-finalized bars are
+        processed.
+
+        E.g.,
+        ```
+        {
+            "trades": [
+                {"timestamp": 1695120600100, "price": 1645.08, "amount": 1.2, ...},
+                ...
+            ],
+            "currency_pair": "ETH_USDT",
+            "trades_endtimestamp": 1695120659800,
+            "end_download_timestamp": "2023-09-19 10:51:00.120000+00:00",
+        }
+        ```
+
+        :param data_point: message returned by
+            `Extractor.download_websocket_data()` for `ohlcv_from_trades`
+        :return: number of newly finalized bars
+        """
+        if data_point is None:
+            return 0
+        currency_pair = data_point["currency_pair"]
+        trades = data_point["trades"]
+        trades_end_timestamp = data_point["trades_endtimestamp"]
+        end_download_timestamp = data_point["end_download_timestamp"]
+        # Compute the first bar that can still be emitted.
+        min_bar_timestamp = self._get_bar_timestamp(
+            self._start_timestamp_unix_epoch + self._bar_duration_in_ms - 1
+        )
+        last_timestamp = self._last_finalized_timestamp.get(currency_pair)
+        if last_timestamp is not None:
+            min_bar_timestamp = max(
+                min_bar_timestamp, last_timestamp + self._bar_duration_in_ms
+            )
+        # Trades are sorted by timestamp, so scan the buffer from the end
+        # until the first trade of a bar that can be emitted.
+        idx = len(trades)
+        while (
+            idx > 0
+            and self._get_bar_timestamp(trades[idx - 1]["timestamp"])
+            >= min_bar_timestamp
+        ):
+            idx -= 1
+        # Build the bars from the trades.
+        bars: List[List[Any]] = []
+        for trade in trades[idx:]:
+            bar_timestamp = self._get_bar_timestamp(trade["timestamp"])
+            price = trade["price"]
+            if not bars or bar_timestamp >= bars[-1][0] + self._bar_duration_in_ms:
+                bars.append(
+                    [bar_timestamp, price, price, price, price, trade["amount"]]
+                )
+            else:
+                bar = bars[-1]
+                bar[2] = max(bar[2], price)
+                bar[3] = min(bar[3], price)
+                bar[4] = price
+                bar[5] = bar[5] + trade["amount"]
+        num_finalized_bars = 0
+        for bar in bars:
+            if bar[0] + self._bar_duration_in_ms <= trades_end_timestamp:
+                self._finalize_bar(currency_pair, bar, end_download_timestamp)
+                num_finalized_bars += 1
+            else:
+                self._open_bar[currency_pair] = bar
+        return num_finalized_bars
+
+    def get_open_bar(self, currency_pair: str) -> Optional[List[Any]]:
+        """
+        Return the current open bar for `currency_pair`, if any.
+
+        :return: `[timestamp, open, high, low, close, volume]`
+        """
+        return self._open_bar.get(currency_pair)
+
+    def get_last_finalized_timestamp(self, currency_pair: str) -> Optional[int]:
+        """
+        Return the timestamp of the last finalized bar for `currency_pair`.
+        """
+        return self._last_finalized_timestamp.get(currency_pair)
+
+    def get_num_finalized_bars(self) -> int:
+        """
+        Return the number of finalized bars waiting to be flushed.
+        """
+        return len(self._finalized_bars)
+
+    def flush(self) -> pd.DataFrame:
+        """
+        Return all the finalized bars and empty the queue.
+
+        :return: DataFrame with the same format as
+            `imvcdttrut.transform_raw_websocket_data()` for OHLCV data
+        """
+        bars = list(self._finalized_bars)
+        self._finalized_bars.clear()
+        df = pd.DataFrame(bars, columns=OHLCV_WEBSOCKET_COLUMNS)
+        return df
+
+    def _get_bar_timestamp(self, timestamp: int) -> int:
+        """
+        Return the timestamp of the bar `timestamp` belongs to.
+        """
+        return (timestamp // self._bar_duration_in_ms) * self._bar_duration_in_ms
+
+    def _finalize_bar(
+        self,
+        currency_pair: str,
+        bar: List[Any],
+        end_download_timestamp: Any,
+    ) -> None:
+        timestamp = bar[0]
+        self._finalized_bars.append(
+            (
+                currency_pair.replace("/", "_"),
+                timestamp,
+                *bar[1:6],
+                end_download_timestamp,
+                self._exchange_id,
+            )
+        )
+        self._last_finalized_timestamp[currency_pair] = timestamp
+        # Discard the open bar if it has been finalized.
+        open_bar = self._open_bar.get(currency_pair)
+        if open_bar is not None and open_bar[0] <= timestamp:
+            del self._open_bar[currency_pair]
@@ -88,6 +88,21 @@ class DbConnectionManager:
         cls.db_stage = db_stage
         return cls.connection
 
+    @classmethod
+    def get_new_connection(cls, db_stage: str) -> hsql.DbConnection:
+        """
+        Create a DB connection that is not shared through the manager.
+
+        A psycopg2 connection has a single transaction state, so a connection
+        used from another thread (e.g., by a background writer) must not be
+        shared with the other users.
+
+        :param db_stage: same as in `get_connection()`
+        :return: DbConnection owned by the caller
+        """
+        connection = cls._get_new_connection(db_stage)
+        return connection
+
     # #########################################################################
     # Private helpers.
     # #########################################################################
@@ -569,6 +584,24 @@ def drop_db_data_within_age(
     return num_deleted
 
 
+def get_unique_columns(data_type: str) -> List[str]:
+    """
+    Get the columns that identify a row of the given data type in the DB.
+
+    :param data_type: the type of the data, (e.g., `bid_ask` or `ohlcv`)
+    :return: unique columns, e.g., `["timestamp", "exchange_id", ...]`
+    """
+    if data_type == "ohlcv" or data_type == "ohlcv_from_trades":
+        unique_columns = OHLCV_UNIQUE_COLUMNS
+    elif data_type == "bid_ask":
+        unique_columns = BID_ASK_UNIQUE_COLUMNS
+    elif data_type == "trades":
+        unique_columns = TRADES_UNIQUE_COLUMNS
+    else:
+        raise ValueError(f"Invalid data_type='{data_type}'")
+    return unique_columns
+
+
 # TODO(Juraj): replace all occurrences of code inserting to db with a call to
 #   this function.
 # TODO(Juraj): probabl hsql is a better place for this?
@@ -604,14 +637,7 @@ def save_data_to_db(
         return
     if add_knowledge_timestamp:
         data = imvcdttrut.add_knowledge_timestamp_col(data, "UTC")
-    if data_type == "ohlcv" or data_type == "ohlcv_from_trades":
-        unique_columns = OHLCV_UNIQUE_COLUMNS
-    elif data_type == "bid_ask":
-        unique_columns = BID_ASK_UNIQUE_COLUMNS
-    elif data_type == "trades":
-        unique_columns = TRADES_UNIQUE_COLUMNS
-    else:
-        raise ValueError(f"Invalid data_type='{data_type}'")
+    unique_columns = get_unique_columns(data_type)
     hsql.execute_insert_on_conflict_do_nothing_query(
         connection=db_connection,
         obj=data,
@@ -0,0 +1,264 @@
+"""
+Write real-time data to the IM DB in the background of a download loop.
+
+Import as:
+
+import im_v2.common.db.db_writer as imvcddbwr
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import helpers.hretry as hretry
+import helpers.hsql as hsql
+import im_v2.common.data.transform.transform_utils as imvcdttrut
+import im_v2.common.db.db_utils as imvcddbut
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# AsyncDbWriter
+# #############################################################################
+
+
+class AsyncDbWriter:
+    """
+    Save dataframes to a DB table from a background task.
+
+    The producer, e.g., a websocket download loop, enqueues the data with the
+    non-blocking `put()` and a writer task coalesces the queued dataframes
+    into batches that are inserted in a thread, so that a slow insert doesn't
+    delay the producer.
+
+    A batch is written when it reaches `max_batch_size_in_rows` rows or when
+    its first dataframe has been waiting for `max_batch_delay_in_secs`. When
+    the DB can't keep up and the queue is full, the oldest queued dataframe is
+    dropped to make room for the newest one.
+
+    The writer reports its state through `get_metrics()`, e.g.,
+    ```
+    {
+        "num_rows_enqueued": 1200,
+        "num_rows_written": 1000,
+        "num_rows_dropped": 0,
+        "num_rows_failed": 0,
+        "num_batches_written": 4,
+        "queue_size": 2,
+        "last_lag_in_secs": 0.21,
+        "max_lag_in_secs": 0.35,
+    }
+    ```
+    where the lag is the time between enqueuing the oldest dataframe of a
+    batch and the end of its insert.
+    """
+
+    def __init__(
+        self,
+        db_connection: hsql.DbConnection,
+        db_table: str,
+        data_type: str,
+        *,
+        max_queue_size: int = 1000,
+        max_batch_size_in_rows: int = 10000,
+        max_batch_delay_in_secs: float = 1.0,
+        add_knowledge_timestamp: bool = True,
+    ) -> None:
+        """
+        Constructor.
+
+        :param db_connection: connection used only by the writer once started
+        :param db_table: name of the table to insert to
+        :param data_type: the type of the data, (e.g., `bid_ask` or `ohlcv`)
+        :param max_queue_size: max number of dataframes waiting to be written
+        :param max_batch_size_in_rows: number of rows that triggers a write
+        :param max_batch_delay_in_secs: max time to wait for more data before
+            writing a batch
+        :param add_knowledge_timestamp: whether to add the knowledge timestamp
+            at insert time, like in `save_data_to_db()`
+        """
+        hdbg.dassert_lte(1, max_queue_size)
+        hdbg.dassert_lte(1, max_batch_size_in_rows)
+        hdbg.dassert_lte(0, max_batch_delay_in_secs)
+        self._db_connection = db_connection
+        self._db_table = db_table
+        self._unique_columns = imvcddbut.get_unique_columns(data_type)
+        self._max_queue_size = max_queue_size
+        self._max_batch_size_in_rows = max_batch_size_in_rows
+        self._max_batch_delay_in_secs = max_batch_delay_in_secs
+        self._add_knowledge_timestamp = add_knowledge_timestamp
+        # Columns of the DB table, retrieved at the first write.
+        self._table_columns: Optional[List[str]] = None
+        # The queue and the task are created in `start()` to be bound to the
+        # running event loop.
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer_task: Optional[asyncio.Task] = None
+        self._is_stopping = False
+        #
+        self._num_rows_enqueued = 0
+        self._num_rows_written = 0
+        self._num_rows_dropped = 0
+        self._num_rows_failed = 0
+        self._num_batches_written = 0
+        self._last_lag_in_secs = 0.0
+        self._max_lag_in_secs = 0.0
+
+    def start(self) -> None:
+        """
+        Start the writer task in the running event loop.
+        """
+        hdbg.dassert_is(
+            self._writer_task, None, "The writer is already started"
+        )
+        self._queue = asyncio.Queue(maxsize=self._max_queue_size)
+        self._writer_task = asyncio.get_running_loop().create_task(
+            self._write_loop()
+        )
+
+    def put(self, df: pd.DataFrame) -> None:
+        """
+        Enqueue data to be written without waiting for the insert.
+        """
+        hdbg.dassert_is_not(self._queue, None, "The writer is not started")
+        hdbg.dassert(not self._is_stopping, "The writer is stopping")
+        if df.empty:
+            _LOG.warning("The DataFrame is empty, nothing to insert.")
+            return
+        if self._queue.full():
+            _, dropped_df = self._queue.get_nowait()
+            self._num_rows_dropped += dropped_df.shape[0]
+            _LOG.warning(
+                "The DB writer queue is full, dropped %s rows",
+                dropped_df.shape[0],
+            )
+        loop = asyncio.get_running_loop()
+        self._queue.put_nowait((loop.time(), df))
+        self._num_rows_enqueued += df.shape[0]
+
+    async def stop(self) -> None:
+        """
+        Write the queued data and stop the writer task.
+        """
+        hdbg.dassert_is_not(
+            self._writer_task, None, "The writer is not started"
+        )
+        self._is_stopping = True
+        # Signal the writer task that there is no more data.
+        await self._queue.put(None)
+        await self._writer_task
+        _LOG.info("DB writer metrics=%s", self.get_metrics())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        Get the counters of the writer.
+        """
+        queue_size = 0 if self._queue is None else self._queue.qsize()
+        metrics = {
+            "num_rows_enqueued": self._num_rows_enqueued,
+            "num_rows_written": self._num_rows_written,
+            "num_rows_dropped": self._num_rows_dropped,
+            "num_rows_failed": self._num_rows_failed,
+            "num_batches_written": self._num_batches_written,
+            "queue_size": queue_size,
+            "last_lag_in_secs": self._last_lag_in_secs,
+            "max_lag_in_secs": self._max_lag_in_secs,
+        }
+        return metrics
+
+    async def _get_batch(self) -> Tuple[List[Tuple[float, pd.DataFrame]], bool]:
+        """
+        Wait for the queued data to fill a batch or for the max delay.
+
+        :return: the enqueued timestamps and dataframes of the batch and
+            whether the writer was stopped
+        """
+        loop = asyncio.get_running_loop()
+        item = await self._queue.get()
+        if item is None:
+            return [], True
+        batch = [item]
+        num_rows = item[1].shape[0]
+        deadline = item[0] + self._max_batch_delay_in_secs
+        while num_rows < self._max_batch_size_in_rows:
+            timeout = deadline - loop.time()
+            if timeout > 0:
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+            elif not self._queue.empty():
+                # Take the data that is already queued, e.g., when the writer
+                # lags behind the producer.
+                item = self._queue.get_nowait()
+            else:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+            num_rows += item[1].shape[0]
+        return batch, False
+
+    async def _write_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        is_stopped = False
+        while not is_stopped:
+            batch, is_stopped = await self._get_batch()
+            if not batch:
+                continue
+            df = pd.concat([df for _, df in batch], ignore_index=True)
+            try:
+                # The insert blocks, so it runs outside the event loop.
+                await loop.run_in_executor(None, self._write, df)
+            except Exception as e:
+                # Keep the writer alive, e.g., the next batches can be saved
+                # once the DB is available again.
+                _LOG.error(
+                    "Failed to save %s rows to '%s': %s",
+                    df.shape[0],
+                    self._db_table,
+                    str(e),
+                )
+                self._num_rows_failed += df.shape[0]
+                continue
+            self._num_rows_written += df.shape[0]
+            self._num_batches_written += 1
+            self._last_lag_in_secs = loop.time() - batch[0][0]
+            self._max_lag_in_secs = max(
+                self._max_lag_in_secs, self._last_lag_in_secs
+            )
+            _LOG.debug(
+                "Saved %s rows to '%s' with lag=%.3f secs",
+                df.shape[0],
+                self._db_table,
+                self._last_lag_in_secs,
+            )
+
+    @hretry.sync_retry(
+        num_attempts=imvcddbut.NUMBER_OF_RETRIES_TO_SAVE,
+        exceptions=imvcddbut.RETRY_EXCEPTION,
+        retry_delay_in_sec=0.5,
+    )
+    def _write(self, df: pd.DataFrame) -> None:
+        if self._table_columns is None:
+            # Query the table schema only once, instead of at every insert.
+            self._table_columns = hsql.get_table_columns(
+                self._db_connection, self._db_table
+            )
+            hdbg.dassert_lte(
+                1,
+                len(self._table_columns),
+                "Table '%s' doesn't exist",
+                self._db_table,
+            )
+        if self._add_knowledge_timestamp:
+            # The knowledge timestamp is the time when the data is saved, as in
+            # `save_data_to_db()`.
+            df = imvcdttrut.add_knowledge_timestamp_col(df, "UTC")
+        hdbg.dassert_is_subset(df.columns, self._table_columns)
+        hsql.execute_insert_on_conflict_do_nothing_query_via_staging_table(
+            self._db_connection, df, self._db_table, self._unique_columns
+        )
@@ -0,0 +1,153 @@
+import asyncio
+import unittest.mock as umock
+from typing import Any, Generator, List
+
+import pandas as pd
+import pytest
+
+import helpers.hasyncio as hasynci
+import helpers.hunit_test as hunitest
+import im_v2.common.db.db_writer as imvcddbwr
+
+
+def _get_test_data(timestamps: List[int]) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "timestamp": timestamps,
+            "bid_price": [1.0] * len(timestamps),
+            "currency_pair": ["BTC_USDT"] * len(timestamps),
+        }
+    )
+    return df
+
+
+# #############################################################################
+# TestAsyncDbWriter1
+# #############################################################################
+
+
+class TestAsyncDbWriter1(hunitest.TestCase):
+    # This will be run before and after each test.
+    @pytest.fixture(autouse=True)
+    def setup_teardown_test(self) -> Generator[Any, Any, Any]:
+        # Run before each test.
+        self.set_up_test()
+        yield
+        # Run after each test.
+        self.tear_down_test()
+
+    def set_up_test(self) -> None:
+        self.get_table_columns_patch = umock.patch.object(
+            imvcddbwr.hsql,
+            "get_table_columns",
+            return_value=[
+                "id",
+                "timestamp",
+                "bid_price",
+                "currency_pair",
+                "knowledge_timestamp",
+            ],
+        )
+        self.insert_patch = umock.patch.object(
+            imvcddbwr.hsql,
+            "execute_insert_on_conflict_do_nothing_query_via_staging_table",
+        )
+        self.get_table_columns_mock = self.get_table_columns_patch.start()
+        self.insert_mock = self.insert_patch.start()
+
+    def tear_down_test(self) -> None:
+        self.get_table_columns_patch.stop()
+        self.insert_patch.stop()
+
+    def test_coalesce1(self) -> None:
+        """
+        Check that the data enqueued within the max delay is written in one
+        batch and that the table schema is queried once.
+        """
+        dfs = [_get_test_data([1, 2]), _get_test_data([3]), _get_test_data([4])]
+        db_writer = self._run(dfs, max_batch_delay_in_secs=60)
+        self.assertEqual(self.insert_mock.call_count, 1)
+        self.get_table_columns_mock.assert_called_once()
+        df = self.insert_mock.call_args[0][1]
+        self.assertEqual(df["timestamp"].tolist(), [1, 2, 3, 4])
+        self.assertIn("knowledge_timestamp", df.columns)
+        metrics = db_writer.get_metrics()
+        self.assertEqual(metrics["num_rows_enqueued"], 4)
+        self.assertEqual(metrics["num_rows_written"], 4)
+        self.assertEqual(metrics["num_batches_written"], 1)
+        self.assertEqual(metrics["queue_size"], 0)
+        self.assertLessEqual(0, metrics["last_lag_in_secs"])
+        self.assertLessEqual(
+            metrics["last_lag_in_secs"], metrics["max_lag_in_secs"]
+        )
+
+    def test_max_batch_size1(self) -> None:
+        """
+        Check that a batch is written as soon as it reaches the max size.
+        """
+        dfs = [_get_test_data([1, 2]), _get_test_data([3, 4])]
+        db_writer = self._run(
+            dfs, max_batch_size_in_rows=2, max_batch_delay_in_secs=60
+        )
+        self.assertEqual(self.insert_mock.call_count, 2)
+        timestamps = [
+            call[0][1]["timestamp"].tolist()
+            for call in self.insert_mock.call_args_list
+        ]
+        self.assertEqual(timestamps, [[1, 2], [3, 4]])
+        self.assertEqual(db_writer.get_metrics()["num_batches_written"], 2)
+
+    def test_drop_oldest1(self) -> None:
+        """
+        Check that the oldest data is dropped when the queue is full.
+        """
+        dfs = [_get_test_data([1, 2]), _get_test_data([3]), _get_test_data([4])]
+        db_writer = self._run(dfs, max_queue_size=2)
+        df = self.insert_mock.call_args[0][1]
+        self.assertEqual(df["timestamp"].tolist(), [3, 4])
+        metrics = db_writer.get_metrics()
+        self.assertEqual(metrics["num_rows_enqueued"], 4)
+        self.assertEqual(metrics["num_rows_dropped"], 2)
+        self.assertEqual(metrics["num_rows_written"], 2)
+
+    def test_failure1(self) -> None:
+        """
+        Check that a failed write is counted and the writer keeps going.
+        """
+        self.insert_mock.side_effect = [ValueError("Invalid data"), None]
+        dfs = [_get_test_data([1, 2]), _get_test_data([3])]
+        db_writer = self._run(dfs, max_batch_size_in_rows=1)
+        self.assertEqual(self.insert_mock.call_count, 2)
+        metrics = db_writer.get_metrics()
+        self.assertEqual(metrics["num_rows_failed"], 2)
+        self.assertEqual(metrics["num_rows_written"], 1)
+        self.assertEqual(metrics["num_batches_written"], 1)
+
+    def test_no_knowledge_timestamp1(self) -> None:
+        """
+        Check that the knowledge timestamp is not added when disabled.
+        """
+        dfs = [_get_test_data([1, 2])]
+        self._run(dfs, add_knowledge_timestamp=False)
+        df = self.insert_mock.call_args[0][1]
+        self.assertNotIn("knowledge_timestamp", df.columns)
+
+    @staticmethod
+    def _run(dfs: List[pd.DataFrame], **kwargs: Any) -> imvcddbwr.AsyncDbWriter:
+        """
+        Enqueue all the dataframes at once and stop the writer.
+        """
+        db_writer = imvcddbwr.AsyncDbWriter(
+            umock.MagicMock(), "ccxt_bid_ask_futures_raw", "bid_ask", **kwargs
+        )
+
+        async def _write() -> None:
+            db_writer.start()
+            for df in dfs:
+                db_writer.put(df)
+            # Let the writer task run.
+            await asyncio.sleep(0)
+            await db_writer.stop()
+
+        hasynci.run(_write(), event_loop=None)
+        return db_writer
@@ -5,5 +5,6 @@ import im_v2.common.universe as ivcu
 """
 
 from im_v2.common.universe.full_symbol import *  # pylint: disable=unused-import # NOQA
+from im_v2.common.universe.symbol_registry import *  # pylint: disable=unused-import # NOQA
 from im_v2.common.universe.universe import *  # pylint: disable=unused-import # NOQA
 from im_v2.common.universe.universe_utils import *  # pylint: disable=unused-import # NOQA
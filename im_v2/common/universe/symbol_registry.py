@@ -0,0 +1,270 @@
+"""
+Vectorized mapping between asset ids, full symbols and CCXT symbols.
+
+Import as:
+
+import im_v2.common.universe.symbol_registry as imvcusyre
+"""
+
+import functools
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+import im_v2.common.universe.full_symbol as imvcufusy
+import im_v2.common.universe.universe as imvcounun
+import im_v2.common.universe.universe_utils as imvcuunut
+
+_LOG = logging.getLogger(__name__)
+
+# Array-like container of values to map, e.g., a list, a numpy array, a
+# pandas Series or a categorical.
+ArrayLike = Union[List[Any], np.ndarray, pd.Series, pd.Index, pd.Categorical]
+
+
+def map_unique(values: ArrayLike, func: Callable[[Any], Any]) -> np.ndarray:
+    """
+    Apply `func` to each element of `values` calling it once per unique value.
+
+    This is equivalent to `pd.Series(values).apply(func)`, but the cost of
+    calling `func` is proportional to the number of unique values (e.g., the
+    number of assets) and not to the number of rows.
+
+    :param values: values to map
+    :param func: function to apply to each unique value
+    :return: mapped values in the same order as `values`
+    """
+    codes, uniques = pd.factorize(np.asarray(values), use_na_sentinel=False)
+    # Assign the results one by one, since `np.array()` would build a 2D
+    # array out of results that are sequences (e.g., tuples).
+    mapped_uniques = np.empty(len(uniques), dtype=object)
+    for idx, value in enumerate(uniques):
+        mapped_uniques[idx] = func(value)
+    # Use the most specific dtype, e.g., `int64` for asset ids.
+    mapped_uniques = pd.Series(mapped_uniques).infer_objects().to_numpy()
+    return mapped_uniques.take(codes)
+
+
+# #############################################################################
+# SymbolRegistry
+# #############################################################################
+
+
+class SymbolRegistry:
+    """
+    Immutable registry of a universe of assets.
+
+    The registry maps between:
+    - asset ids, e.g., `1467591036`
+    - full symbols, e.g., `binance::BTC_USDT`
+    - CCXT symbols, e.g., `BTC/USDT` or `BTC/USDT:USDT` for futures
+
+    All the mappings are computed once at construction time and the `map_*()`
+    methods are vectorized, so that mapping millions of rows has a cost
+    dominated by a hash table lookup in pandas and not by Python code.
+
+    The `encode_*()` methods return a `pd.Categorical` whose codes are the
+    positions of the assets in the universe, so that the same codes index the
+    asset ids, the full symbols and the CCXT symbols. Categorical inputs are
+    mapped looking up only their categories.
+    """
+
+    def __init__(self, full_symbols: List[imvcufusy.FullSymbol]) -> None:
+        """
+        Constructor.
+
+        :param full_symbols: full symbols in the universe
+        """
+        hdbg.dassert_isinstance(full_symbols, list)
+        hdbg.dassert_no_duplicates(full_symbols)
+        self._full_symbols = np.array(full_symbols, dtype=object)
+        self._asset_ids = np.array(
+            [
+                imvcuunut.string_to_numerical_id(full_symbol)
+                for full_symbol in full_symbols
+            ],
+            dtype=np.int64,
+        )
+        hdbg.dassert_no_duplicates(
+            self._asset_ids.tolist(), "Collision of asset ids"
+        )
+        # Make the arrays immutable, since they are shared by all the users
+        # of a cached registry.
+        self._full_symbols.setflags(write=False)
+        self._asset_ids.setflags(write=False)
+        # Build the indices used for the vectorized lookups.
+        self._full_symbol_index = pd.Index(self._full_symbols)
+        self._asset_id_index = pd.Index(self._asset_ids)
+        # Cache the CCXT symbols for each contract type.
+        self._ccxt_symbols: Dict[str, np.ndarray] = {}
+
+    def __len__(self) -> int:
+        return len(self._full_symbols)
+
+    def get_full_symbols(self) -> List[imvcufusy.FullSymbol]:
+        """
+        Return the full symbols in the universe.
+        """
+        return self._full_symbols.tolist()  # type: ignore[no-any-return]
+
+    def get_asset_ids(self) -> List[int]:
+        """
+        Return the asset ids in the universe, in the order of full symbols.
+        """
+        return self._asset_ids.tolist()  # type: ignore[no-any-return]
+
+    def get_asset_id_to_full_symbol_mapping(self) -> Dict[int, str]:
+        """
+        Return a mapping from asset ids to full symbols.
+        """
+        mapping = dict(zip(self.get_asset_ids(), self.get_full_symbols()))
+        return mapping
+
+    def map_asset_ids(self, asset_ids: ArrayLike) -> np.ndarray:
+        """
+        Convert asset ids into full symbols.
+
+        :param asset_ids: asset ids to convert, all of which must be in the
+            universe
+        :return: full symbols
+        """
+        idxs = self._get_idxs(self._asset_id_index, asset_ids, "asset ids")
+        return self._full_symbols.take(idxs)
+
+    def map_full_symbols(self, full_symbols: ArrayLike) -> np.ndarray:
+        """
+        Convert full symbols into asset ids.
+
+        :param full_symbols: full symbols to convert, all of which must be in
+            the universe
+        :return: asset ids
+        """
+        idxs = self._get_idxs(
+            self._full_symbol_index, full_symbols, "full symbols"
+        )
+        return self._asset_ids.take(idxs)
+
+    def encode_asset_ids(self, asset_ids: ArrayLike) -> pd.Categorical:
+        """
+        Encode asset ids as a categorical with the universe as categories.
+
+        :param asset_ids: asset ids to encode, all of which must be in the
+            universe
+        :return: categorical of asset ids
+        """
+        idxs = self._get_idxs(self._asset_id_index, asset_ids, "asset ids")
+        return pd.Categorical.from_codes(idxs, categories=self._asset_id_index)
+
+    def encode_full_symbols(self, full_symbols: ArrayLike) -> pd.Categorical:
+        """
+        Encode full symbols as a categorical with the universe as categories.
+
+        :param full_symbols: full symbols to encode, all of which must be in
+            the universe
+        :return: categorical of full symbols
+        """
+        idxs = self._get_idxs(
+            self._full_symbol_index, full_symbols, "full symbols"
+        )
+        return pd.Categorical.from_codes(
+            idxs, categories=self._full_symbol_index
+        )
+
+    def to_ccxt(
+        self, asset_ids: ArrayLike, *, contract_type: str = "spot"
+    ) -> np.ndarray:
+        """
+        Convert asset ids into CCXT symbols.
+
+        :param asset_ids: asset ids to convert, all of which must be in the
+            universe
+        :param contract_type: type of contract, e.g., "spot" or "futures"
+        :return: CCXT symbols, e.g., `BTC/USDT` for spot and `BTC/USDT:USDT`
+            for futures
+        """
+        if contract_type not in self._ccxt_symbols:
+            # Import locally to avoid a dependency of the common code on
+            # the vendor code.
+            import im_v2.ccxt.utils as imv2ccuti
+
+            ccxt_symbols = []
+            for full_symbol in self._full_symbols:
+                exchange_id, currency_pair = imvcufusy.parse_full_symbol(
+                    full_symbol
+                )
+                ccxt_symbol = imv2ccuti.convert_currency_pair_to_ccxt_format(
+                    currency_pair, exchange_id, contract_type
+                )
+                ccxt_symbols.append(ccxt_symbol)
+            ccxt_symbols = np.array(ccxt_symbols, dtype=object)
+            ccxt_symbols.setflags(write=False)
+            self._ccxt_symbols[contract_type] = ccxt_symbols
+        idxs = self._get_idxs(self._asset_id_index, asset_ids, "asset ids")
+        return self._ccxt_symbols[contract_type].take(idxs)
+
+    @staticmethod
+    def _get_idxs(index: pd.Index, values: ArrayLike, tag: str) -> np.ndarray:
+        """
+        Return the positions of `values` in `index`.
+
+        :param tag: name of the values used in the error message
+        """
+        if isinstance(getattr(values, "dtype", None), pd.CategoricalDtype):
+            # Look up each category once and map the codes, where the
+            # trailing -1 is the position of the missing values.
+            values = pd.Categorical(values)
+            category_idxs = np.append(index.get_indexer(values.categories), -1)
+            idxs = category_idxs.take(values.codes)
+        else:
+            idxs = index.get_indexer(np.asarray(values))
+        mask = idxs < 0
+        if mask.any():
+            missing = pd.unique(np.asarray(values)[mask])
+            hdbg.dfatal(
+                "Unknown %s=%s not in the universe" % (tag, missing.tolist())
+            )
+        return idxs
+
+
+@functools.lru_cache()
+def _get_symbol_registry(
+    full_symbols: Tuple[imvcufusy.FullSymbol, ...]
+) -> SymbolRegistry:
+    registry = SymbolRegistry(list(full_symbols))
+    return registry
+
+
+def get_symbol_registry_from_full_symbols(
+    full_symbols: List[imvcufusy.FullSymbol],
+) -> SymbolRegistry:
+    """
+    Return the registry for a list of full symbols, building it once per list.
+
+    :param full_symbols: full symbols in the universe
+    """
+    hdbg.dassert_isinstance(full_symbols, list)
+    return _get_symbol_registry(tuple(full_symbols))
+
+
+@functools.lru_cache()
+def get_symbol_registry(
+    vendor: str,
+    mode: str,
+    *,
+    version: Optional[str] = None,
+) -> SymbolRegistry:
+    """
+    Return the registry for a universe, building it once per universe version.
+
+    :param vendor: vendor to load the universe for (e.g., CCXT)
+    :param mode: download or trade universe
+    :param version: universe version, `None` for the latest one
+    """
+    full_symbols = imvcounun.get_vendor_universe(
+        vendor, mode, version=version, as_full_symbol=True
+    )
+    registry = get_symbol_registry_from_full_symbols(full_symbols)
+    return registry
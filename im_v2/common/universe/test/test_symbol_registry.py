@@ -0,0 +1,167 @@
+import pandas as pd
+
+import helpers.hunit_test as hunitest
+import im_v2.common.universe.symbol_registry as imvcusyre
+import im_v2.common.universe.universe_utils as imvcuunut
+
+
+class TestMapUnique(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Test that the function is applied once per unique value.
+        """
+        values = pd.Series(["a", "b", "a", "a", "c", "b"])
+        calls = []
+
+        def _func(value: str) -> str:
+            calls.append(value)
+            return value.upper()
+
+        actual = imvcusyre.map_unique(values, _func)
+        self.assertEqual(actual.tolist(), ["A", "B", "A", "A", "C", "B"])
+        self.assertEqual(calls, ["a", "b", "c"])
+
+    def test2(self) -> None:
+        """
+        Test empty input.
+        """
+        actual = imvcusyre.map_unique([], str)
+        self.assertEqual(actual.tolist(), [])
+
+    def test3(self) -> None:
+        """
+        Test that sequence results are kept as elements of a 1D array.
+        """
+        values = ["a", "b", "a"]
+        actual = imvcusyre.map_unique(values, lambda value: (value, 1))
+        self.assertEqual(actual.shape, (3,))
+        self.assertEqual(actual.tolist(), [("a", 1), ("b", 1), ("a", 1)])
+
+
+class TestSymbolRegistry(hunitest.TestCase):
+    def get_registry(self) -> imvcusyre.SymbolRegistry:
+        full_symbols = ["binance::BTC_USDT", "gateio::XRP_USDT", "kucoin::SOL_USDT"]
+        registry = imvcusyre.SymbolRegistry(full_symbols)
+        return registry
+
+    def test_get_asset_id_to_full_symbol_mapping1(self) -> None:
+        """
+        Test that the mapping is the same as the non-vectorized one.
+        """
+        registry = self.get_registry()
+        actual = registry.get_asset_id_to_full_symbol_mapping()
+        expected = {
+            imvcuunut.string_to_numerical_id(full_symbol): full_symbol
+            for full_symbol in registry.get_full_symbols()
+        }
+        self.assertDictEqual(actual, expected)
+        self.assertEqual(len(registry), 3)
+
+    def test_map_asset_ids1(self) -> None:
+        """
+        Test the conversion of asset ids to full symbols and back.
+        """
+        registry = self.get_registry()
+        asset_ids = pd.Series([2568064341, 1467591036, 2568064341, 2002879833])
+        full_symbols = registry.map_asset_ids(asset_ids)
+        self.assertEqual(
+            full_symbols.tolist(),
+            [
+                "kucoin::SOL_USDT",
+                "binance::BTC_USDT",
+                "kucoin::SOL_USDT",
+                "gateio::XRP_USDT",
+            ],
+        )
+        actual = registry.map_full_symbols(full_symbols)
+        self.assertEqual(actual.tolist(), asset_ids.tolist())
+
+    def test_encode_full_symbols1(self) -> None:
+        """
+        Test that the encodings of asset ids and full symbols share the codes.
+        """
+        registry = self.get_registry()
+        full_symbols = [
+            "kucoin::SOL_USDT",
+            "binance::BTC_USDT",
+            "kucoin::SOL_USDT",
+        ]
+        actual = registry.encode_full_symbols(full_symbols)
+        self.assertEqual(actual.codes.tolist(), [2, 0, 2])
+        self.assertEqual(
+            actual.categories.tolist(), registry.get_full_symbols()
+        )
+        asset_ids = registry.encode_asset_ids(registry.map_full_symbols(actual))
+        self.assertEqual(asset_ids.codes.tolist(), [2, 0, 2])
+        self.assertEqual(
+            asset_ids.categories.tolist(), registry.get_asset_ids()
+        )
+
+    def test_map_categorical1(self) -> None:
+        """
+        Test the conversion of categoricals, including unused categories.
+        """
+        registry = self.get_registry()
+        full_symbols = pd.Series(
+            pd.Categorical(
+                ["gateio::XRP_USDT", "binance::BTC_USDT", "gateio::XRP_USDT"],
+                categories=["binance::BTC_USDT", "gateio::XRP_USDT", "x::Y_Z"],
+            )
+        )
+        actual = registry.map_full_symbols(full_symbols)
+        self.assertEqual(actual.tolist(), [2002879833, 1467591036, 2002879833])
+        # Missing values are not in the universe.
+        full_symbols.iloc[1] = None
+        with self.assertRaises(AssertionError) as cm:
+            registry.map_full_symbols(full_symbols)
+        self.assertIn("Unknown full symbols=[nan]", str(cm.exception))
+
+    def test_to_ccxt1(self) -> None:
+        """
+        Test the conversion of asset ids to CCXT symbols.
+        """
+        registry = self.get_registry()
+        asset_ids = [1467591036, 2002879833]
+        actual = registry.to_ccxt(asset_ids)
+        self.assertEqual(actual.tolist(), ["BTC/USDT", "XRP/USDT"])
+        actual = registry.to_ccxt(asset_ids, contract_type="futures")
+        self.assertEqual(actual.tolist(), ["BTC/USDT:USDT", "XRP/USDT:USDT"])
+
+    def test_unknown_asset_id1(self) -> None:
+        """
+        Test that an asset id not in the universe is rejected.
+        """
+        registry = self.get_registry()
+        with self.assertRaises(AssertionError) as cm:
+            registry.map_asset_ids([1467591036, 123])
+        self.assertIn("Unknown asset ids=[123]", str(cm.exception))
+
+
+class TestGetSymbolRegistry(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Test that the registry is built once per universe version.
+        """
+        registry1 = imvcusyre.get_symbol_registry("CCXT", "trade", version="v4")
+        registry2 = imvcusyre.get_symbol_registry("CCXT", "trade", version="v4")
+        self.assertIs(registry1, registry2)
+        self.assertIn("binance::BTC_USDT", registry1.get_full_symbols())
+
+
+class TestGetSymbolRegistryFromFullSymbols(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Test that the registry is built once per list of full symbols.
+        """
+        full_symbols = ["binance::BTC_USDT", "gateio::XRP_USDT"]
+        registry1 = imvcusyre.get_symbol_registry_from_full_symbols(
+            full_symbols
+        )
+        registry2 = imvcusyre.get_symbol_registry_from_full_symbols(
+            list(full_symbols)
+        )
+        self.assertIs(registry1, registry2)
+        registry3 = imvcusyre.get_symbol_registry_from_full_symbols(
+            full_symbols[::-1]
+        )
+        self.assertIsNot(registry1, registry3)
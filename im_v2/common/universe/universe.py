@@ -3,6 +3,8 @@ Import as:
 
 import im_v2.common.universe.universe as imvcounun
 """
+import copy
+import functools
 import glob
 import os
 from typing import Dict, List, Optional, Union
@@ -147,16 +149,29 @@ def _get_vendor_universe(
         }
     """
     file_path = _get_universe_file_path(vendor, mode, version=version)
-    hdbg.dassert_path_exists(file_path)
-    universe = hio.from_json(file_path)
+    universe = _load_universe_file(file_path)
     # Convert vendor name to lowercase.
     vendor = vendor.lower()
     universe = {k.lower(): v for k, v in universe.items()}
     hdbg.dassert_in(vendor, universe, "Invalid vendor=`%s`", vendor)
-    vendor_universe = universe[vendor]
+    # Return a copy, since the parsed file is cached and shared across calls.
+    vendor_universe = copy.deepcopy(universe[vendor])
     return vendor_universe  # type: ignore[no-any-return]
 
 
+@functools.lru_cache()
+def _load_universe_file(file_path: str) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Parse a universe file once per process.
+
+    Universe files are versioned and never modified, so there is no need to
+    re-parse them on each call.
+    """
+    hdbg.dassert_path_exists(file_path)
+    universe = hio.from_json(file_path)
+    return universe  # type: ignore[no-any-return]
+
+
 def get_vendor_universe(
     vendor: str,
     mode: str,
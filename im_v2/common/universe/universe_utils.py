@@ -7,7 +7,6 @@ import im_v2.common.universe.universe_utils as imvcuunut
 import hashlib
 from typing import Dict, List
 
-import helpers.hdbg as hdbg
 
 # TODO(gp): This file is more generic than `asset_ids` vs `full_symbols` and
 #  could go in helpers.
@@ -37,20 +36,15 @@ def build_numerical_to_string_id_mapping(universe: List[str]) -> Dict[int, str]:
     """
     Build a mapping from numerical ids to string ones.
 
+    The ids are hashed once per universe by the symbol registry.
+
     :param universe: universe of string ids
     :return: numerical to string ids mapping
     """
-    hdbg.dassert_no_duplicates(universe)
-    mapping: Dict[int, str] = {}
-    for string_id in universe:
-        # Convert string to a numerical id.
-        numerical_id = string_to_numerical_id(string_id)
-        hdbg.dassert_not_in(
-            numerical_id,
-            mapping,
-            "Collision: id %s for string `%s` already exists",
-            numerical_id,
-            string_id,
-        )
-        mapping[numerical_id] = string_id
+    # Import locally to avoid an import cycle, since the registry hashes the
+    # ids with `string_to_numerical_id()`.
+    import im_v2.common.universe.symbol_registry as imvcusyre
+
+    registry = imvcusyre.get_symbol_registry_from_full_symbols(list(universe))
+    mapping: Dict[int, str] = registry.get_asset_id_to_full_symbol_mapping()
     return mapping
@@ -7,6 +7,7 @@ import market_data.im_client_market_data as mdimcmada
 import logging
 from typing import Any, List, Optional, cast
 
+import numpy as np
 import pandas as pd
 
 import helpers.hdbg as hdbg
@@ -146,9 +147,14 @@ class ImClientMarketData(mdabmada.MarketData):
         _LOG.debug("full_symbol_col_name=%s", full_symbol_col_name)
         _LOG.debug("market_data.columns=%s", sorted(list(market_data.columns)))
         hdbg.dassert_in(full_symbol_col_name, market_data.columns)
-        transformed_asset_ids = self._im_client.get_asset_ids_from_full_symbols(
-            market_data[full_symbol_col_name].tolist()
-        )
+        # Convert each unique full symbol once and map the codes, since the
+        # data has many rows for the same asset.
+        codes, full_symbols = pd.factorize(market_data[full_symbol_col_name])
+        transformed_asset_ids = np.array(
+            self._im_client.get_asset_ids_from_full_symbols(
+                full_symbols.tolist()
+            )
+        ).take(codes)
         if self._asset_id_col in market_data.columns:
             _LOG.debug(
                 "Overwriting column '%s' with asset_ids", self._asset_id_col
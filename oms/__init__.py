@@ -4,21 +4,30 @@ Import as:
 import oms as oms
 """
 
-from oms.broker.broker import *  # pylint: disable=unused-import # NOQA
-from oms.broker.database_broker import *  # pylint: disable=unused-import # NOQA
-from oms.broker.dataframe_broker import *  # pylint: disable=unused-import # NOQA
-from oms.broker.fake_fills_broker import *  # pylint: disable=unused-import # NOQA
-from oms.broker.ig.restrictions import *  # pylint: disable=unused-import # NOQA
-from oms.db.ck_credentials import *  # pylint: disable=unused-import # NOQA
-from oms.db.oms_db import *  # pylint: disable=unused-import # NOQA
-from oms.fill import *  # pylint: disable=unused-import # NOQA
-from oms.order.order import *  # pylint: disable=unused-import # NOQA
-from oms.order_processing.order_processor import *  # pylint: disable=unused-import # NOQA
-from oms.order_processing.order_processor_example import *  # pylint: disable=unused-import # NOQA
-from oms.order_processing.process_forecasts_ import *  # pylint: disable=unused-import # NOQA
-from oms.order_processing.target_position_and_order_generator import *  # pylint: disable=unused-import # NOQA
-from oms.order_processing.target_position_and_order_generator_example import *  # pylint: disable=unused-import # NOQA
-from oms.portfolio.database_portfolio import *  # pylint: disable=unused-import # NOQA
-from oms.portfolio.dataframe_portfolio import *  # pylint: disable=unused-import # NOQA
-from oms.portfolio.portfolio import *  # pylint: disable=unused-import # NOQA
-from oms.portfolio.portfolio_example import *  # pylint: disable=unused-import # NOQA
+import helpers.hintrospection as hintros
+
+# Import the modules only when one of their names is accessed, instead of
+# star-importing all of them.
+__getattr__, __dir__ = hintros.get_lazy_package_getattr(
+    __name__,
+    [
+        "oms.broker.broker",
+        "oms.broker.database_broker",
+        "oms.broker.dataframe_broker",
+        "oms.broker.fake_fills_broker",
+        "oms.broker.ig.restrictions",
+        "oms.db.ck_credentials",
+        "oms.db.oms_db",
+        "oms.fill",
+        "oms.order.order",
+        "oms.order_processing.order_processor",
+        "oms.order_processing.order_processor_example",
+        "oms.order_processing.process_forecasts_",
+        "oms.order_processing.target_position_and_order_generator",
+        "oms.order_processing.target_position_and_order_generator_example",
+        "oms.portfolio.database_portfolio",
+        "oms.portfolio.dataframe_portfolio",
+        "oms.portfolio.portfolio",
+        "oms.portfolio.portfolio_example",
+    ],
+)
@@ -276,9 +276,11 @@ class AbstractCcxtBroker(obrobrok.Broker):
         # Filter loaded data to only the broker's universe symbols.
         # Convert currency pairs to full CCXT symbol format, e.g. 'BTC_USDT' ->
         # 'BTC/USDT:USDT'
-        bid_ask_data["ccxt_symbols"] = bid_ask_data["currency_pair"].apply(
-            imv2ccuti.convert_currency_pair_to_ccxt_format,
-            args=(self._exchange_id, self._contract_type),
+        bid_ask_data["ccxt_symbols"] = ivcu.map_unique(
+            bid_ask_data["currency_pair"],
+            lambda currency_pair: imv2ccuti.convert_currency_pair_to_ccxt_format(
+                currency_pair, self._exchange_id, self._contract_type
+            ),
         )
         # Map CCXT symbols to asset IDs.
         bid_ask_data = bid_ask_data.loc[
@@ -286,8 +288,8 @@ class AbstractCcxtBroker(obrobrok.Broker):
                 self.ccxt_symbol_to_asset_id_mapping
             )
         ]
-        bid_ask_data["asset_id"] = bid_ask_data["ccxt_symbols"].apply(
-            lambda x: self.ccxt_symbol_to_asset_id_mapping[x]
+        bid_ask_data["asset_id"] = bid_ask_data["ccxt_symbols"].map(
+            self.ccxt_symbol_to_asset_id_mapping
         )
         # When creating a set from a dictionary, only the keys are included
         # in the set by default.
@@ -299,8 +301,8 @@ class AbstractCcxtBroker(obrobrok.Broker):
         # Convert original index from unix epoch to Timestamp, e.g.
         # 1691758182667 ->
         #   pd.Timestamp('2023-08-11 12:50:01.987000+0000', tz='UTC')
-        bid_ask_data.index = bid_ask_data.index.to_series().apply(
-            lambda x: hdateti.convert_unix_epoch_to_timestamp(x)
+        bid_ask_data.index = pd.to_datetime(
+            bid_ask_data.index, unit="ms", utc=True
         )
         bid_ask_data = bid_ask_data.sort_index()
         return bid_ask_data
@@ -806,29 +808,29 @@ class AbstractCcxtBroker(obrobrok.Broker):
             }
             ```
         """
-        # Get full symbol universe.
+        # Get the full symbol universe registry, which is cached across
+        # broker instances.
         vendor = "CCXT"
         mode = "trade"
-        full_symbol_universe = ivcu.get_vendor_universe(
-            vendor, mode, version=self._universe_version, as_full_symbol=True
+        registry = ivcu.get_symbol_registry(
+            vendor, mode, version=self._universe_version
         )
         # Filter symbols of the exchange corresponding to this instance.
-        exchange_symbol_universe = [
-            s for s in full_symbol_universe if s.startswith(self._exchange_id)
+        asset_ids = [
+            asset_id
+            for asset_id, full_symbol in zip(
+                registry.get_asset_ids(), registry.get_full_symbols()
+            )
+            if full_symbol.startswith(self._exchange_id)
         ]
-        # Build asset_id -> symbol mapping.
-        asset_id_to_full_symbol_mapping = (
-            ivcu.build_numerical_to_string_id_mapping(exchange_symbol_universe)
+        # Build asset_id -> symbol mapping, transforming the symbols to CCXT
+        # format, e.g. 'BTC_USDT' -> 'BTC/USDT'.
+        ccxt_symbols = registry.to_ccxt(
+            asset_ids, contract_type=self._contract_type
+        )
+        asset_id_to_symbol_mapping: Dict[int, str] = dict(
+            zip(asset_ids, ccxt_symbols.tolist())
         )
-        asset_id_to_symbol_mapping: Dict[int, str] = {}
-        for asset_id, symbol in asset_id_to_full_symbol_mapping.items():
-            # Select currency pair.
-            currency_pair = ivcu.parse_full_symbol(symbol)[1]
-            # Transform to CCXT format, e.g. 'BTC_USDT' -> 'BTC/USDT'.
-            ccxt_symbol = imv2ccuti.convert_currency_pair_to_ccxt_format(
-                currency_pair, self._exchange_id, self._contract_type
-            )
-            asset_id_to_symbol_mapping[asset_id] = ccxt_symbol
         return asset_id_to_symbol_mapping
 
     def _get_market_info(self) -> Dict[int, Any]:
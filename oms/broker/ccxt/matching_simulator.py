@@ -0,0 +1,747 @@
+"""
+Simulate the matching of limit orders against replayed market data.
+
+Import as:
+
+import oms.broker.ccxt.matching_simulator as obcmasim
+"""
+
+import logging
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
+
+# Represent a deterministic delay or a delay randomly distributed in an interval.
+DelayType = Union[float, Tuple[float, float]]
+
+_QUOTE_COLS = ["bid_price", "ask_price", "bid_size", "ask_size"]
+_TRADE_COLS = ["price", "amount"]
+
+# Order statuses, using the CCXT names.
+_STATUSES = np.array(["open", "closed", "canceled"])
+_OPEN = 0
+_CLOSED = 1
+_CANCELED = 2
+# Cancel time of the orders without a cancel request.
+_NO_CANCEL_NS = np.iinfo(np.int64).max
+# Relative tolerance to consider an order fully filled.
+_FILL_RTOL = 1e-9
+
+
+def _to_ns(timestamp: pd.Timestamp) -> int:
+    hdbg.dassert_isinstance(timestamp, pd.Timestamp)
+    hdbg.dassert_is_not(timestamp.tz, None)
+    return timestamp.value
+
+
+def _allocate(
+    groups: np.ndarray,
+    priorities: List[np.ndarray],
+    wanted: np.ndarray,
+    pools: np.ndarray,
+) -> np.ndarray:
+    """
+    Allocate the liquidity of each group to its orders by priority.
+
+    :param groups: group of each order, used to index `pools`
+    :param priorities: keys sorting the orders in a group by decreasing
+        priority, with the most significant key last as in `np.lexsort()`
+    :param wanted: quantity wanted by each order
+    :param pools: liquidity available in each group
+    :return: quantity allocated to each order
+    """
+    allocated = np.zeros_like(wanted)
+    if wanted.size == 0:
+        return allocated
+    order = np.lexsort(priorities + [groups])
+    sorted_groups = groups[order]
+    sorted_wanted = wanted[order]
+    # Compute the quantity wanted by the orders before each order in its
+    # group.
+    cum_wanted = np.cumsum(sorted_wanted)
+    is_group_start = np.r_[True, sorted_groups[1:] != sorted_groups[:-1]]
+    group_offsets = np.maximum.accumulate(
+        np.where(is_group_start, cum_wanted - sorted_wanted, 0)
+    )
+    wanted_before = cum_wanted - sorted_wanted - group_offsets
+    allocated[order] = np.clip(
+        pools[sorted_groups] - wanted_before, 0, sorted_wanted
+    )
+    return allocated
+
+
+# #############################################################################
+# MatchingSimulator
+# #############################################################################
+
+
+class MatchingSimulator:
+    """
+    Match limit orders against replayed bid / ask quotes or trades.
+
+    The orders are stored by columns and all the open orders of a symbol are
+    matched at once against each market data update, so that a large number of
+    orders can be simulated.
+
+    Matching rules for a buy order with limit price `L` (sell orders are
+    symmetric):
+    - with quotes:
+        - when the order arrives it is filled as taker at the ask price, up to
+          the ask size, if `L >= ask`, and the rest of the order rests in the
+          book
+        - a resting order is filled at `L`, up to the ask size, when the ask
+          moves to `L` or below
+        - the queue position is approximated: an order at the bid price joins
+          the back of the queue, i.e., behind the bid size, the decreases of
+          the bid size at the same price move the order forward and then fill
+          it; an order above the bid has no queue ahead; an order below the
+          bid loses its position
+    - with trades:
+        - a resting order is filled at `L`, up to the trade amount, by the
+          trades at `L` or below
+
+    The orders reach the exchange and the cancels take effect after a latency.
+
+    The orders don't impact the replayed market data, and the liquidity of
+    each market data update is shared among the orders by price / time
+    priority.
+    """
+
+    def __init__(
+        self,
+        market_data: Dict[str, pd.DataFrame],
+        *,
+        mode: str = "quotes",
+        order_latency_in_secs: DelayType = 0.0,
+        cancel_latency_in_secs: DelayType = 0.0,
+        seed: int = 0,
+    ) -> None:
+        """
+        Constructor.
+
+        :param market_data: symbol to market data indexed by tz-aware
+            timestamps, e.g.,
+            ```
+                                       bid_price  ask_price  bid_size  ask_size
+            2023-08-11 12:49:52+00:00     0.2034     0.2035   38688.0  279499.0
+            ```
+            with columns `bid_price, ask_price, bid_size, ask_size` for
+            "quotes" and `price, amount` for "trades"
+        :param mode: "quotes" or "trades"
+        :param order_latency_in_secs: delay between the submission of an order
+            and its arrival to the exchange
+        :param cancel_latency_in_secs: delay between the cancel request of an
+            order and its effect
+        :param seed: seed for the random latencies
+        """
+        hdbg.dassert_in(mode, ["quotes", "trades"])
+        self._mode = mode
+        self._order_latency_in_secs = order_latency_in_secs
+        self._cancel_latency_in_secs = cancel_latency_in_secs
+        self._rng = np.random.default_rng(seed)
+        # Store the market data by columns.
+        cols = _QUOTE_COLS if mode == "quotes" else _TRADE_COLS
+        self._symbols: List[str] = []
+        self._market_data: List[Dict[str, np.ndarray]] = []
+        for symbol, df in market_data.items():
+            hdbg.dassert_isinstance(df.index, pd.DatetimeIndex)
+            hdbg.dassert_is_not(df.index.tz, None)
+            hdbg.dassert(df.index.is_monotonic_increasing)
+            hdbg.dassert_is_subset(cols, df.columns)
+            data = {col: df[col].to_numpy(dtype=float) for col in cols}
+            data["timestamp"] = df.index.as_unit("ns").asi8
+            self._symbols.append(symbol)
+            self._market_data.append(data)
+        self._symbol_to_idx = {
+            symbol: idx for idx, symbol in enumerate(self._symbols)
+        }
+        num_symbols = len(self._symbols)
+        # Index of the next market data update to process for each symbol.
+        self._next_update_idxs = np.zeros(num_symbols, dtype=int)
+        self._current_ns = np.iinfo(np.int64).min
+        # Store the orders by columns, growing the capacity as needed.
+        self._num_orders = 0
+        self._capacity = 0
+        self._orders: Dict[str, np.ndarray] = {}
+        self._grow(1024)
+        # Ids of the orders of each symbol that have not arrived yet, sorted by
+        # arrival time, and of the resting ones.
+        self._pending_ids = [np.empty(0, dtype=int) for _ in range(num_symbols)]
+        self._resting_ids = [np.empty(0, dtype=int) for _ in range(num_symbols)]
+        # Ids of the orders submitted since the last `advance()`.
+        self._submitted_ids: List[np.ndarray] = []
+        # Store the fills by columns, as chunks.
+        self._fills: List[Dict[str, np.ndarray]] = []
+
+    @property
+    def symbols(self) -> List[str]:
+        return self._symbols
+
+    def submit_orders(
+        self,
+        timestamp: pd.Timestamp,
+        symbols: List[str],
+        sides: List[str],
+        amounts: List[float],
+        limit_prices: List[float],
+    ) -> np.ndarray:
+        """
+        Submit limit orders.
+
+        :param timestamp: submission time
+        :param symbols: symbol of each order
+        :param sides: "buy" or "sell" for each order
+        :param amounts: unsigned amount of each order
+        :param limit_prices: limit price of each order
+        :return: the ids of the orders
+        """
+        submit_ns = _to_ns(timestamp)
+        hdbg.dassert_lte(self._current_ns, submit_ns)
+        num_orders = len(symbols)
+        hdbg.dassert_eq(len(sides), num_orders)
+        hdbg.dassert_eq(len(amounts), num_orders)
+        hdbg.dassert_eq(len(limit_prices), num_orders)
+        symbol_idxs = np.array(
+            [self._symbol_to_idx[symbol] for symbol in symbols], dtype=int
+        )
+        sides = np.asarray(sides)
+        hdbg.dassert(np.isin(sides, ["buy", "sell"]).all(), "Invalid sides")
+        amounts = np.asarray(amounts, dtype=float)
+        hdbg.dassert_lt(0, amounts.min(initial=1))
+        # Append the orders.
+        while self._num_orders + num_orders > self._capacity:
+            self._grow(2 * self._capacity)
+        ids = np.arange(self._num_orders, self._num_orders + num_orders)
+        self._num_orders += num_orders
+        latencies_ns = self._get_latencies_ns(
+            self._order_latency_in_secs, num_orders
+        )
+        orders = self._orders
+        orders["symbol_idx"][ids] = symbol_idxs
+        orders["side"][ids] = np.where(sides == "buy", 1, -1)
+        orders["amount"][ids] = amounts
+        orders["limit_price"][ids] = limit_prices
+        orders["submit_ns"][ids] = submit_ns
+        orders["arrival_ns"][ids] = submit_ns + latencies_ns
+        self._submitted_ids.append(ids)
+        return ids
+
+    def submit_order(
+        self,
+        timestamp: pd.Timestamp,
+        symbol: str,
+        side: str,
+        amount: float,
+        limit_price: float,
+    ) -> int:
+        """
+        Submit a limit order.
+
+        See `submit_orders()` for the params.
+        """
+        ids = self.submit_orders(
+            timestamp, [symbol], [side], [amount], [limit_price]
+        )
+        return int(ids[0])
+
+    def cancel_orders(
+        self, timestamp: pd.Timestamp, order_ids: List[int]
+    ) -> np.ndarray:
+        """
+        Request to cancel orders.
+
+        The cancel takes effect after the cancel latency, if the order is
+        still open.
+
+        :param timestamp: time of the cancel request
+        :param order_ids: ids of the orders to cancel
+        :return: the ids of the open orders with a new cancel request
+        """
+        cancel_ns = _to_ns(timestamp)
+        hdbg.dassert_lte(self._current_ns, cancel_ns)
+        order_ids = np.asarray(order_ids, dtype=int)
+        hdbg.dassert(
+            ((0 <= order_ids) & (order_ids < self._num_orders)).all(),
+            "Invalid order ids",
+        )
+        orders = self._orders
+        mask = (orders["status"][order_ids] == _OPEN) & (
+            orders["cancel_ns"][order_ids] == _NO_CANCEL_NS
+        )
+        order_ids = order_ids[mask]
+        latencies_ns = self._get_latencies_ns(
+            self._cancel_latency_in_secs, order_ids.size
+        )
+        orders["cancel_ns"][order_ids] = cancel_ns + latencies_ns
+        return order_ids
+
+    def cancel_all_orders(
+        self, timestamp: pd.Timestamp, *, symbol: Optional[str] = None
+    ) -> np.ndarray:
+        """
+        Request to cancel all the open orders, optionally of one symbol.
+
+        See `cancel_orders()` for the params.
+        """
+        n = self._num_orders
+        mask = self._orders["status"][:n] == _OPEN
+        if symbol is not None:
+            mask &= (
+                self._orders["symbol_idx"][:n] == self._symbol_to_idx[symbol]
+            )
+        return self.cancel_orders(timestamp, np.flatnonzero(mask))
+
+    def advance(self, timestamp: pd.Timestamp) -> None:
+        """
+        Process the orders, cancels and market data up to `timestamp`
+        included.
+        """
+        current_ns = _to_ns(timestamp)
+        hdbg.dassert_lte(self._current_ns, current_ns)
+        self._current_ns = current_ns
+        self._add_submitted_orders()
+        for symbol_idx in range(len(self._symbols)):
+            data = self._market_data[symbol_idx]
+            timestamps = data["timestamp"]
+            start = self._next_update_idxs[symbol_idx]
+            end = np.searchsorted(timestamps, current_ns, side="right")
+            for update_idx in range(start, end):
+                update_ns = timestamps[update_idx]
+                # The orders arriving before the update see the prevailing
+                # market data.
+                self._process_arrivals(
+                    symbol_idx, update_ns, update_idx - 1, inclusive=False
+                )
+                self._process_update(symbol_idx, update_idx)
+                self._process_arrivals(
+                    symbol_idx, update_ns, update_idx, inclusive=True
+                )
+            self._next_update_idxs[symbol_idx] = end
+            self._process_arrivals(
+                symbol_idx, current_ns, end - 1, inclusive=True
+            )
+            resting_ids = self._resting_ids[symbol_idx]
+            self._resting_ids[symbol_idx] = self._cancel(resting_ids, current_ns)
+
+    def get_orders(
+        self, *, order_ids: Optional[List[int]] = None
+    ) -> pd.DataFrame:
+        """
+        Get the state of the orders.
+
+        :param order_ids: ids of the orders to return, `None` for all
+        :return: one row per order, indexed by order id, e.g.,
+            ```
+                  symbol  side  amount  limit_price  filled  remaining  average_price  status            submit_timestamp           arrival_timestamp
+            0  BTC/USDT   buy     1.0      30000.0     0.4        0.6        30000.0    open   2023-08-11 12:49:52+00:00   2023-08-11 12:49:53+00:00
+            ```
+        """
+        if order_ids is None:
+            order_ids = np.arange(self._num_orders)
+        else:
+            order_ids = np.asarray(order_ids, dtype=int)
+        orders = {col: values[order_ids] for col, values in self._orders.items()}
+        filled = orders["filled"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            average_price = np.where(
+                filled > 0, orders["cost"] / filled, np.nan
+            )
+        df = pd.DataFrame(
+            {
+                "symbol": np.array(self._symbols, dtype=object)[
+                    orders["symbol_idx"]
+                ],
+                "side": np.where(orders["side"] == 1, "buy", "sell"),
+                "amount": orders["amount"],
+                "limit_price": orders["limit_price"],
+                "filled": filled,
+                "remaining": orders["amount"] - filled,
+                "average_price": average_price,
+                "status": _STATUSES[orders["status"]],
+                "submit_timestamp": pd.to_datetime(
+                    orders["submit_ns"], utc=True
+                ),
+                "arrival_timestamp": pd.to_datetime(
+                    orders["arrival_ns"], utc=True
+                ),
+            },
+            index=pd.Index(order_ids, name="order_id"),
+        )
+        return df
+
+    def get_fills(self) -> pd.DataFrame:
+        """
+        Get the fills in order of time.
+
+        :return: one row per fill, e.g.,
+            ```
+               order_id    symbol  side                 timestamp    price  amount  is_maker
+            0         0  BTC/USDT   buy 2023-08-11 12:49:53+00:00  30000.0     0.4      True
+            ```
+        """
+        cols = ["order_id", "timestamp", "price", "amount", "is_maker"]
+        if self._fills:
+            fills = {
+                col: np.concatenate([chunk[col] for chunk in self._fills])
+                for col in cols
+            }
+            # Keep the order of the fills, since they are sorted by time only
+            # within a symbol.
+            order = np.argsort(fills["timestamp"], kind="stable")
+            fills = {col: values[order] for col, values in fills.items()}
+        else:
+            fills = {
+                "order_id": np.empty(0, dtype=int),
+                "timestamp": np.empty(0, dtype=np.int64),
+                "price": np.empty(0),
+                "amount": np.empty(0),
+                "is_maker": np.empty(0, dtype=bool),
+            }
+        order_ids = fills["order_id"]
+        df = pd.DataFrame(
+            {
+                "order_id": order_ids,
+                "symbol": np.array(self._symbols, dtype=object)[
+                    self._orders["symbol_idx"][order_ids]
+                ],
+                "side": np.where(
+                    self._orders["side"][order_ids] == 1, "buy", "sell"
+                ),
+                "timestamp": pd.to_datetime(fills["timestamp"], utc=True),
+                "price": fills["price"],
+                "amount": fills["amount"],
+                "is_maker": fills["is_maker"],
+            }
+        )
+        return df
+
+    # /////////////////////////////////////////////////////////////////////////
+
+    def _grow(self, capacity: int) -> None:
+        """
+        Grow the capacity of the order columns.
+        """
+        dtypes = {
+            "symbol_idx": int,
+            "side": np.int8,
+            "amount": float,
+            "limit_price": float,
+            "filled": float,
+            "cost": float,
+            "status": np.int8,
+            "submit_ns": np.int64,
+            "arrival_ns": np.int64,
+            "cancel_ns": np.int64,
+            # Size ahead of the order in the queue, NaN if the order is not at
+            # the best price.
+            "queue_ahead": float,
+        }
+        for col, dtype in dtypes.items():
+            values = np.zeros(capacity, dtype=dtype)
+            if col == "cancel_ns":
+                values[:] = _NO_CANCEL_NS
+            elif col == "queue_ahead":
+                values[:] = np.nan
+            if col in self._orders:
+                values[: self._capacity] = self._orders[col]
+            self._orders[col] = values
+        self._capacity = capacity
+
+    def _get_latencies_ns(self, latency: DelayType, size: int) -> np.ndarray:
+        if isinstance(latency, tuple):
+            hdbg.dassert_eq(len(latency), 2)
+            latencies = self._rng.uniform(latency[0], latency[1], size=size)
+        else:
+            latencies = np.full(size, latency, dtype=float)
+        hdbg.dassert_lte(0, latencies.min(initial=0))
+        return (latencies * 1e9).astype(np.int64)
+
+    def _add_submitted_orders(self) -> None:
+        """
+        Add the orders submitted since the last call to the pending ones.
+        """
+        if not self._submitted_ids:
+            return
+        ids = np.concatenate(self._submitted_ids)
+        self._submitted_ids = []
+        symbol_idxs = self._orders["symbol_idx"][ids]
+        for symbol_idx in np.unique(symbol_idxs):
+            pending_ids = np.concatenate(
+                [self._pending_ids[symbol_idx], ids[symbol_idxs == symbol_idx]]
+            )
+            # Sort by arrival time and then by id.
+            order = np.argsort(
+                self._orders["arrival_ns"][pending_ids], kind="stable"
+            )
+            self._pending_ids[symbol_idx] = pending_ids[order]
+
+    def _cancel(
+        self, order_ids: np.ndarray, current_ns: Union[int, np.ndarray]
+    ) -> np.ndarray:
+        """
+        Cancel the orders with a cancel taking effect by `current_ns`.
+
+        :param current_ns: current time for all the orders or for each order
+
+        :return: the ids of the orders that are still open
+        """
+        mask = self._orders["cancel_ns"][order_ids] <= current_ns
+        self._orders["status"][order_ids[mask]] = _CANCELED
+        return order_ids[~mask]
+
+    def _fill(
+        self,
+        order_ids: np.ndarray,
+        current_ns: Union[int, np.ndarray],
+        prices: np.ndarray,
+        amounts: np.ndarray,
+        is_maker: bool,
+    ) -> np.ndarray:
+        """
+        Fill the orders and record the fills.
+
+        :param current_ns: time of the fills, for all the orders or for each
+            order
+
+        :return: the ids of the orders that are still open
+        """
+        mask = amounts > 0
+        if mask.any():
+            filled_ids = order_ids[mask]
+            filled_amounts = amounts[mask]
+            filled_prices = prices[mask]
+            orders = self._orders
+            orders["filled"][filled_ids] += filled_amounts
+            orders["cost"][filled_ids] += filled_amounts * filled_prices
+            remaining = (
+                orders["amount"][filled_ids] - orders["filled"][filled_ids]
+            )
+            is_closed = remaining <= _FILL_RTOL * orders["amount"][filled_ids]
+            orders["status"][filled_ids[is_closed]] = _CLOSED
+            self._fills.append(
+                {
+                    "order_id": filled_ids,
+                    "timestamp": np.broadcast_to(
+                        current_ns, order_ids.shape
+                    )[mask],
+                    "price": filled_prices,
+                    "amount": filled_amounts,
+                    "is_maker": np.full(filled_ids.size, is_maker),
+                }
+            )
+        is_open = self._orders["status"][order_ids] == _OPEN
+        return order_ids[is_open]
+
+    def _get_quote(
+        self, symbol_idx: int, update_idx: int, sides: np.ndarray
+    ) -> Tuple[np.ndarray, ...]:
+        """
+        Get the quote on the side of each order and on the opposite side.
+
+        :return: own price, own size, opposite price, opposite size
+        """
+        data = self._market_data[symbol_idx]
+        bid_price = data["bid_price"][update_idx]
+        ask_price = data["ask_price"][update_idx]
+        bid_size = data["bid_size"][update_idx]
+        ask_size = data["ask_size"][update_idx]
+        is_buy = sides == 1
+        own_price = np.where(is_buy, bid_price, ask_price)
+        own_size = np.where(is_buy, bid_size, ask_size)
+        opposite_price = np.where(is_buy, ask_price, bid_price)
+        opposite_size = np.where(is_buy, ask_size, bid_size)
+        return own_price, own_size, opposite_price, opposite_size
+
+    @staticmethod
+    def _get_depletion(
+        data: Dict[str, np.ndarray], update_idx: int, side: str
+    ) -> float:
+        """
+        Get the decrease of the size at the best price on one side of the book.
+
+        The size decreases at the same price are assumed to be trades ahead of
+        the orders in the queue.
+        """
+        if update_idx == 0:
+            return 0.0
+        prices = data[f"{side}_price"]
+        sizes = data[f"{side}_size"]
+        if prices[update_idx - 1] != prices[update_idx]:
+            return 0.0
+        return max(sizes[update_idx - 1] - sizes[update_idx], 0.0)
+
+    def _get_priorities(self, order_ids: np.ndarray) -> List[np.ndarray]:
+        """
+        Get the keys sorting orders by price and then by time.
+        """
+        orders = self._orders
+        # Buy orders with higher prices and sell orders with lower prices go
+        # first.
+        price_priority = -orders["side"][order_ids] * orders["limit_price"][
+            order_ids
+        ]
+        return [order_ids, orders["arrival_ns"][order_ids], price_priority]
+
+    def _process_arrivals(
+        self,
+        symbol_idx: int,
+        current_ns: int,
+        update_idx: int,
+        *,
+        inclusive: bool,
+    ) -> None:
+        """
+        Process the orders arriving by `current_ns`.
+
+        :param update_idx: index of the prevailing market data update, -1 if
+            there is none
+        :param inclusive: whether to process also the orders arriving at
+            `current_ns`
+        """
+        pending_ids = self._pending_ids[symbol_idx]
+        side = "right" if inclusive else "left"
+        num_arrived = np.searchsorted(
+            self._orders["arrival_ns"][pending_ids], current_ns, side=side
+        )
+        if num_arrived == 0:
+            return
+        order_ids = pending_ids[:num_arrived]
+        self._pending_ids[symbol_idx] = pending_ids[num_arrived:]
+        orders = self._orders
+        # Cancel the orders with a cancel taking effect before their arrival.
+        order_ids = self._cancel(order_ids, orders["arrival_ns"][order_ids])
+        if self._mode == "quotes" and update_idx >= 0:
+            sides = orders["side"][order_ids]
+            limit_prices = orders["limit_price"][order_ids]
+            (
+                own_price,
+                own_size,
+                opposite_price,
+                _,
+            ) = self._get_quote(symbol_idx, update_idx, sides)
+            # Place the orders in the queue, in case they are not filled in
+            # full.
+            orders["queue_ahead"][order_ids] = np.where(
+                limit_prices == own_price,
+                own_size,
+                np.where(sides * (limit_prices - own_price) > 0, 0.0, np.nan),
+            )
+            # Fill the marketable orders as taker, sharing the opposite size
+            # for each side.
+            is_crossed = sides * (limit_prices - opposite_price) >= 0
+            remaining = orders["amount"][order_ids] - orders["filled"][order_ids]
+            wanted = np.where(is_crossed, remaining, 0.0)
+            groups = (sides == 1).astype(int)
+            data = self._market_data[symbol_idx]
+            pools = np.array(
+                [data["bid_size"][update_idx], data["ask_size"][update_idx]]
+            )
+            amounts = _allocate(
+                groups, self._get_priorities(order_ids), wanted, pools
+            )
+            order_ids = self._fill(
+                order_ids,
+                orders["arrival_ns"][order_ids],
+                opposite_price,
+                amounts,
+                is_maker=False,
+            )
+        self._resting_ids[symbol_idx] = np.concatenate(
+            [self._resting_ids[symbol_idx], order_ids]
+        )
+
+    def _process_update(self, symbol_idx: int, update_idx: int) -> None:
+        """
+        Match the resting orders against a market data update.
+        """
+        data = self._market_data[symbol_idx]
+        current_ns = data["timestamp"][update_idx]
+        order_ids = self._cancel(self._resting_ids[symbol_idx], current_ns)
+        if order_ids.size > 0:
+            if self._mode == "quotes":
+                order_ids = self._match_quote(symbol_idx, update_idx, order_ids)
+            else:
+                order_ids = self._match_trade(symbol_idx, update_idx, order_ids)
+        self._resting_ids[symbol_idx] = order_ids
+
+    def _match_quote(
+        self, symbol_idx: int, update_idx: int, order_ids: np.ndarray
+    ) -> np.ndarray:
+        data = self._market_data[symbol_idx]
+        current_ns = data["timestamp"][update_idx]
+        orders = self._orders
+        sides = orders["side"][order_ids]
+        limit_prices = orders["limit_price"][order_ids]
+        remaining = orders["amount"][order_ids] - orders["filled"][order_ids]
+        own_price, own_size, opposite_price, _ = self._get_quote(
+            symbol_idx, update_idx, sides
+        )
+        # The market moving through the limit price fills the orders.
+        is_crossed = sides * (limit_prices - opposite_price) >= 0
+        # Update the queue position of the orders at the best price.
+        queue_ahead = orders["queue_ahead"][order_ids]
+        is_at_best = (limit_prices == own_price) & ~is_crossed
+        depletion = np.where(
+            sides == 1,
+            self._get_depletion(data, update_idx, "bid"),
+            self._get_depletion(data, update_idx, "ask"),
+        )
+        is_joining = is_at_best & np.isnan(queue_ahead)
+        is_in_queue = is_at_best & ~is_joining
+        new_queue_ahead = queue_ahead - depletion
+        queue_wanted = np.where(
+            is_in_queue, np.clip(-new_queue_ahead, 0.0, remaining), 0.0
+        )
+        is_above_best = sides * (limit_prices - own_price) > 0
+        queue_ahead = np.select(
+            [is_joining, is_in_queue, is_above_best | is_crossed],
+            [own_size, np.maximum(new_queue_ahead, 0.0), 0.0],
+            np.nan,
+        )
+        orders["queue_ahead"][order_ids] = queue_ahead
+        # Share the liquidity among the orders: the opposite size for the
+        # crossed orders and the depletion for the orders in the queue, for
+        # each side.
+        wanted = np.where(is_crossed, remaining, queue_wanted)
+        groups = 2 * is_crossed.astype(int) + (sides == 1).astype(int)
+        pools = np.array(
+            [
+                self._get_depletion(data, update_idx, "ask"),
+                self._get_depletion(data, update_idx, "bid"),
+                data["bid_size"][update_idx],
+                data["ask_size"][update_idx],
+            ]
+        )
+        amounts = _allocate(
+            groups, self._get_priorities(order_ids), wanted, pools
+        )
+        return self._fill(
+            order_ids, current_ns, limit_prices, amounts, is_maker=True
+        )
+
+    def _match_trade(
+        self, symbol_idx: int, update_idx: int, order_ids: np.ndarray
+    ) -> np.ndarray:
+        data = self._market_data[symbol_idx]
+        current_ns = data["timestamp"][update_idx]
+        orders = self._orders
+        sides = orders["side"][order_ids]
+        limit_prices = orders["limit_price"][order_ids]
+        remaining = orders["amount"][order_ids] - orders["filled"][order_ids]
+        # A trade at the limit price or through it fills the orders.
+        is_crossed = sides * (limit_prices - data["price"][update_idx]) >= 0
+        wanted = np.where(is_crossed, remaining, 0.0)
+        groups = (sides == 1).astype(int)
+        amount = data["amount"][update_idx]
+        pools = np.array([amount, amount])
+        amounts = _allocate(
+            groups, self._get_priorities(order_ids), wanted, pools
+        )
+        return self._fill(
+            order_ids, current_ns, limit_prices, amounts, is_maker=True
+        )
@@ -11,9 +11,11 @@ import logging
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import ccxt
+import pandas as pd
 
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
+import oms.broker.ccxt.matching_simulator as obcmasim
 
 _EXCEPTIONS = [
     ccxt.ExchangeNotAvailable,
@@ -380,3 +382,156 @@ class MockCcxtExchange_withErrors(MockCcxtExchange):
             raise exception_to_raise("Some error message")
         order = await super().create_order(*args, **kwargs)
         return order
+
+
+class MockCcxtExchange_withMatching(MockCcxtExchange):
+    """
+    Invariants in this child class:
+
+    - Orders are matched against replayed market data by a
+      `MatchingSimulator`, with partial fills, queue position approximation,
+      cancels and latencies.
+    - The state of the orders is updated to the current wall clock time at
+      each call.
+    """
+
+    def __init__(
+        self,
+        matching_simulator: obcmasim.MatchingSimulator,
+        *args: Any,
+        **kwargs: Any,
+    ):
+        """
+        Initialize MockCcxtExchange_withMatching.
+
+        :param matching_simulator: simulator filling the orders
+        :param args, kwargs: params of `MockCcxtExchange`, without
+            `fill_percents` and `num_trades_per_order`
+        """
+        super().__init__(*args, 0.0, num_trades_per_order=0, **kwargs)
+        self._matching_simulator = matching_simulator
+        # Number of the simulator fills already applied to the positions.
+        self._num_applied_fills = 0
+
+    async def fetchMyTrades(
+        self, symbol: str, *, limit: Optional[int] = None
+    ) -> List[CcxtOrderStructure]:
+        self._advance()
+        fills = self._matching_simulator.get_fills()
+        fills = fills[fills["symbol"] == symbol]
+        if limit:
+            fills = fills.iloc[-limit:]
+        trades = [
+            {
+                "info": {
+                    "orderId": str(row.order_id),
+                },
+                "symbol": row.symbol,
+                "id": str(idx),
+                "order": str(row.order_id),
+                "timestamp": hdateti.convert_timestamp_to_unix_epoch(
+                    row.timestamp
+                ),
+                "type": "limit",
+                "side": row.side,
+                "takerOrMaker": "maker" if row.is_maker else "taker",
+                "price": row.price,
+                "amount": row.amount if row.side == "buy" else -row.amount,
+                "cost": row.amount * row.price,
+            }
+            for idx, row in zip(fills.index, fills.itertuples())
+        ]
+        return trades
+
+    async def fetch_orders(
+        self, symbol: str, *, limit: Optional[int] = None
+    ) -> List[CcxtOrderStructure]:
+        self._advance()
+        orders = self._matching_simulator.get_orders()
+        orders = orders[orders["symbol"] == symbol]
+        if limit:
+            orders = orders.iloc[-limit:]
+        return self._to_ccxt_orders(orders)
+
+    async def fetch_order(self, id: str, symbol: str) -> CcxtOrderStructure:
+        self._advance()
+        orders = self._matching_simulator.get_orders(order_ids=[int(id)])
+        hdbg.dassert_eq(orders["symbol"].iloc[0], symbol)
+        return self._to_ccxt_orders(orders)[0]
+
+    def cancelAllOrders(self, symbol: str) -> List[CcxtOrderStructure]:
+        order_ids = self._matching_simulator.cancel_all_orders(
+            self._get_wall_clock_time(), symbol=symbol
+        )
+        self._advance()
+        orders = self._matching_simulator.get_orders(order_ids=order_ids)
+        return self._to_ccxt_orders(orders)
+
+    async def create_order(
+        self,
+        symbol: str,
+        amount: float,
+        price: float,
+        side: str,
+        *,
+        type: str = "limit",
+        params: Optional[ParamsDict] = None,
+    ) -> CcxtOrderStructure:
+        await self._simulate_waiting_for_response()
+        hdbg.dassert_eq(type, "limit", "Only limit orders are supported")
+        order_id = self._matching_simulator.submit_order(
+            self._get_wall_clock_time(), symbol, side, amount, price
+        )
+        self._advance()
+        orders = self._matching_simulator.get_orders(order_ids=[order_id])
+        return self._to_ccxt_orders(orders)[0]
+
+    def _advance(self) -> None:
+        """
+        Update the orders to the current time and the positions with the new
+        fills.
+        """
+        self._matching_simulator.advance(self._get_wall_clock_time())
+        fills = self._matching_simulator.get_fills()
+        new_fills = fills.iloc[self._num_applied_fills :]
+        self._num_applied_fills = fills.shape[0]
+        signed_amounts = new_fills["amount"].where(
+            new_fills["side"] == "buy", -new_fills["amount"]
+        )
+        amounts = signed_amounts.groupby(new_fills["symbol"]).sum()
+        for symbol, amount in amounts.items():
+            self._update_position(symbol, amount)
+
+    @staticmethod
+    def _to_ccxt_orders(orders: pd.DataFrame) -> List[CcxtOrderStructure]:
+        """
+        Convert the orders of the simulator to CCXT order structures.
+        """
+        ccxt_orders = [
+            {
+                "id": str(order_id),
+                "status": row.status,
+                "symbol": row.symbol,
+                "type": "limit",
+                "side": row.side,
+                "price": row.limit_price,
+                "average": row.average_price,
+                "amount": row.amount if row.side == "buy" else -row.amount,
+                "filled": row.filled,
+                "remaining": row.remaining,
+                # Needed when broker calls get_fills().
+                "cost": (
+                    0.0 if row.filled == 0 else row.average_price * row.filled
+                ),
+                "timestamp": hdateti.convert_timestamp_to_unix_epoch(
+                    row.submit_timestamp
+                ),
+                "info": {
+                    "updateTime": hdateti.convert_timestamp_to_unix_epoch(
+                        row.arrival_timestamp
+                    )
+                },
+            }
+            for order_id, row in zip(orders.index, orders.itertuples())
+        ]
+        return ccxt_orders
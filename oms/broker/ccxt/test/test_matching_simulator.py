@@ -0,0 +1,268 @@
+import asyncio
+import logging
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
+import oms.broker.ccxt.matching_simulator as obcmasim
+import oms.broker.ccxt.mock_ccxt_exchange as obcmccex
+
+_LOG = logging.getLogger(__name__)
+
+_SYMBOL = "BTC/USDT"
+
+
+def _get_ts(secs: float) -> pd.Timestamp:
+    return pd.Timestamp("2023-08-11 12:00:00+00:00") + pd.Timedelta(
+        seconds=secs
+    )
+
+
+def _get_quotes(rows: List[List[float]]) -> pd.DataFrame:
+    """
+    Build quotes with one row per second.
+    """
+    df = pd.DataFrame(
+        rows,
+        columns=["bid_price", "ask_price", "bid_size", "ask_size"],
+        index=[_get_ts(secs) for secs in range(len(rows))],
+    )
+    return df
+
+
+# #############################################################################
+# TestMatchingSimulator1
+# #############################################################################
+
+
+class TestMatchingSimulator1(hunitest.TestCase):
+    def test_taker_and_maker1(self) -> None:
+        """
+        Check a buy order filled partially as taker and then as maker when the
+        ask moves through its limit price.
+        """
+        quotes = _get_quotes(
+            [
+                [99.0, 100.0, 5.0, 2.0],
+                [99.0, 100.5, 5.0, 2.0],
+                [99.0, 99.5, 5.0, 1.0],
+                [99.5, 100.5, 5.0, 5.0],
+            ]
+        )
+        simulator = obcmasim.MatchingSimulator({_SYMBOL: quotes})
+        simulator.submit_order(_get_ts(0.5), _SYMBOL, "buy", 4.0, 100.0)
+        simulator.advance(_get_ts(3))
+        actual = simulator.get_fills()[["timestamp", "price", "amount"]]
+        actual = hpandas.df_to_str(actual)
+        # Taker fill at the ask on arrival and then fill at the limit price
+        # when the ask drops below it.
+        expected = r"""
+                          timestamp  price  amount
+        0 2023-08-11 12:00:00.500000+00:00  100.0     2.0
+        1        2023-08-11 12:00:02+00:00  100.0     1.0
+        """
+        self.assert_equal(actual, expected, dedent=True, fuzzy_match=True)
+        orders = simulator.get_orders()
+        self.assertEqual(orders["status"].tolist(), ["open"])
+        self.assertEqual(orders["average_price"].tolist(), [100.0])
+
+    def test_queue_position1(self) -> None:
+        """
+        Check that an order at the bid is filled only after the size ahead of
+        it is depleted.
+        """
+        quotes = _get_quotes(
+            [
+                [99.0, 100.0, 5.0, 5.0],
+                [99.0, 100.0, 3.0, 5.0],
+                [99.0, 100.0, 1.0, 5.0],
+                [99.0, 100.0, 0.5, 5.0],
+                [98.0, 99.0, 5.0, 5.0],
+            ]
+        )
+        simulator = obcmasim.MatchingSimulator({_SYMBOL: quotes})
+        simulator.submit_order(_get_ts(0), _SYMBOL, "buy", 2.0, 99.0)
+        simulator.advance(_get_ts(3))
+        # 4.5 of the 5 ahead have been depleted.
+        orders = simulator.get_orders()
+        self.assertEqual(orders["filled"].tolist(), [0.0])
+        # The ask moving to the limit price fills the rest.
+        simulator.advance(_get_ts(4))
+        orders = simulator.get_orders()
+        self.assertEqual(orders["filled"].tolist(), [2.0])
+        self.assertEqual(orders["status"].tolist(), ["closed"])
+
+    def test_queue_position2(self) -> None:
+        """
+        Check that orders improving the bid have priority over the queue.
+        """
+        quotes = _get_quotes(
+            [
+                [99.0, 101.0, 5.0, 5.0],
+                [100.0, 101.0, 5.0, 5.0],
+                [100.0, 101.0, 2.0, 5.0],
+            ]
+        )
+        simulator = obcmasim.MatchingSimulator({_SYMBOL: quotes})
+        simulator.submit_orders(
+            _get_ts(0),
+            [_SYMBOL, _SYMBOL],
+            ["buy", "buy"],
+            [1.0, 10.0],
+            [100.0, 100.0],
+        )
+        simulator.advance(_get_ts(2))
+        # The orders join the bid at 100 with no queue ahead, since they were
+        # above the bid at 99, and share the depletion of 3 by time priority.
+        orders = simulator.get_orders()
+        self.assertEqual(orders["filled"].tolist(), [1.0, 2.0])
+        self.assertEqual(orders["status"].tolist(), ["closed", "open"])
+
+    def test_cancel1(self) -> None:
+        """
+        Check that an order is filled until its cancel takes effect.
+        """
+        quotes = _get_quotes(
+            [
+                [99.0, 100.0, 5.0, 5.0],
+                [99.0, 99.0, 5.0, 1.0],
+                [99.0, 99.0, 5.0, 1.0],
+                [99.0, 99.0, 5.0, 1.0],
+            ]
+        )
+        simulator = obcmasim.MatchingSimulator(
+            {_SYMBOL: quotes},
+            order_latency_in_secs=0.5,
+            cancel_latency_in_secs=1.5,
+        )
+        order_id = simulator.submit_order(
+            _get_ts(0), _SYMBOL, "buy", 10.0, 99.0
+        )
+        simulator.advance(_get_ts(0.5))
+        simulator.cancel_orders(_get_ts(0.5), [order_id])
+        simulator.advance(_get_ts(3))
+        orders = simulator.get_orders()
+        self.assertEqual(orders["filled"].tolist(), [1.0])
+        self.assertEqual(orders["status"].tolist(), ["canceled"])
+        self.assertEqual(
+            orders["arrival_timestamp"].tolist(), [_get_ts(0.5)]
+        )
+
+    def test_trades1(self) -> None:
+        """
+        Check the orders filled by replayed trades.
+        """
+        trades = pd.DataFrame(
+            {
+                "price": [100.0, 99.0, 101.0],
+                "amount": [1.0, 3.0, 2.0],
+            },
+            index=[_get_ts(secs) for secs in range(3)],
+        )
+        simulator = obcmasim.MatchingSimulator(
+            {_SYMBOL: trades}, mode="trades"
+        )
+        simulator.submit_orders(
+            _get_ts(0),
+            [_SYMBOL, _SYMBOL],
+            ["buy", "sell"],
+            [2.0, 5.0],
+            [99.5, 100.5],
+        )
+        simulator.advance(_get_ts(2))
+        orders = simulator.get_orders()
+        self.assertEqual(orders["filled"].tolist(), [2.0, 2.0])
+        self.assertEqual(orders["average_price"].tolist(), [99.5, 100.5])
+
+    def test_many_orders1(self) -> None:
+        """
+        Check that many orders are matched deterministically.
+        """
+
+        def _run() -> pd.DataFrame:
+            np.random.seed(0)
+            num_quotes = 600
+            mid = 100 + np.random.randn(num_quotes).cumsum() * 0.1
+            quotes = _get_quotes(
+                np.column_stack(
+                    [
+                        mid.round(1) - 0.1,
+                        mid.round(1) + 0.1,
+                        np.random.randint(1, 10, num_quotes),
+                        np.random.randint(1, 10, num_quotes),
+                    ]
+                ).tolist()
+            )
+            simulator = obcmasim.MatchingSimulator(
+                {_SYMBOL: quotes}, order_latency_in_secs=(0.1, 0.5)
+            )
+            num_orders = 20000
+            for secs in range(0, num_quotes, 60):
+                simulator.submit_orders(
+                    _get_ts(secs),
+                    [_SYMBOL] * (num_orders // 10),
+                    np.random.choice(["buy", "sell"], num_orders // 10),
+                    np.random.uniform(0.1, 1, num_orders // 10),
+                    (mid[secs] + np.random.randn(num_orders // 10)).round(1),
+                )
+                simulator.advance(_get_ts(secs + 30))
+                simulator.cancel_all_orders(_get_ts(secs + 30))
+                simulator.advance(_get_ts(secs + 59))
+            return simulator.get_orders()
+
+        orders = _run()
+        self.assertEqual(orders.shape[0], 20000)
+        self.assertEqual(
+            sorted(orders["status"].unique().tolist()), ["canceled", "closed"]
+        )
+        self.assertTrue((orders["filled"] <= orders["amount"]).all())
+        hunitest.compare_df(orders, _run())
+
+
+# #############################################################################
+# TestMockCcxtExchange_withMatching1
+# #############################################################################
+
+
+class TestMockCcxtExchange_withMatching1(hunitest.TestCase):
+    def test_create_and_fetch_orders1(self) -> None:
+        """
+        Check the CCXT orders, trades and positions of the mock exchange.
+        """
+        quotes = _get_quotes(
+            [
+                [99.0, 100.0, 5.0, 2.0],
+                [99.0, 100.5, 5.0, 2.0],
+                [98.0, 99.0, 5.0, 5.0],
+            ]
+        )
+        simulator = obcmasim.MatchingSimulator({_SYMBOL: quotes})
+        current_ts = [_get_ts(0)]
+        exchange = obcmccex.MockCcxtExchange_withMatching(
+            simulator, 0.0, None, lambda: current_ts[0]
+        )
+        exchange._positions = [
+            {"info": {"positionAmt": 0.0}, "symbol": _SYMBOL}
+        ]
+
+        async def _run() -> None:
+            order = await exchange.create_order(_SYMBOL, 5.0, 100.0, "buy")
+            self.assertEqual(order["id"], "0")
+            self.assertEqual(order["status"], "open")
+            self.assertEqual(order["filled"], 2.0)
+            current_ts[0] = _get_ts(2)
+            orders = await exchange.fetch_orders(_SYMBOL)
+            self.assertEqual(orders[0]["status"], "closed")
+            self.assertEqual(orders[0]["cost"], 500.0)
+            trades = await exchange.fetchMyTrades(_SYMBOL)
+            self.assertEqual([trade["amount"] for trade in trades], [2.0, 3.0])
+            self.assertEqual(
+                [trade["takerOrMaker"] for trade in trades], ["taker", "maker"]
+            )
+
+        asyncio.run(_run())
+        positions = exchange.fetch_positions()
+        self.assertEqual(positions[0]["info"]["positionAmt"], 5.0)
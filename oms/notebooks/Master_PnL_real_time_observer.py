@@ -146,7 +146,7 @@ dag_data_path = reconcil.get_data_type_system_log_path(
     config["system_log_dir"], data_type
 )
 _LOG.info("dag_data_path=%s", dag_data_path)
-# Points to `system_log_dir/dag/node_io/node_io.prof`.
+# Points to `system_log_dir/dag/node_io/node_io.metrics`.
 data_type = "dag_stats"
 dag_info_path = reconcil.get_data_type_system_log_path(
     config["system_log_dir"], data_type
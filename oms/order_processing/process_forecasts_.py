@@ -100,6 +100,7 @@ async def process_forecasts(
             #   trading_end_time, which must be not None.
             "liquidate_at_trading_end_time": bool
             "log_dir": Optional[str],
+            "log_format": Optional[str] ["csv", "parquet"],
           }
           ```
         - `execution_mode`:
@@ -108,6 +109,8 @@ async def process_forecasts(
             - `real_time`: place the trades only for the last prediction in the df
               (used in real-time mode)
         - `log_dir`: directory for logging state
+        - `log_format`: format of the logged state, i.e., "csv" (default) for
+          one file per bar or "parquet" for one Parquet file per day
     """
     if _LOG.isEnabledFor(logging.DEBUG):
         _LOG.debug("\n%s", hprint.frame("process_forecast"))
@@ -192,6 +195,7 @@ async def process_forecasts(
     # Get log dir.
     log_dir = config.get("log_dir", None)
     _LOG.info("log_dir=%s", log_dir)
+    log_format = config.get("log_format", "csv")
     #
     # 3) Process the predictions.
     #
@@ -232,6 +236,7 @@ async def process_forecasts(
             restrictions_df,
             share_quantization,
             log_dir=log_dir,
+            log_format=log_format,
         )
     )
     if execution_mode == "batch":
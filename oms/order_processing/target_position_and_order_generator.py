@@ -4,6 +4,7 @@ Import as:
 import oms.order_processing.target_position_and_order_generator as ooptpaoge
 """
 
+import datetime
 import logging
 import os
 from typing import Any, Dict, List, Optional
@@ -27,6 +28,7 @@ import oms.optimizer.call_optimizer as oopcaopt
 import oms.optimizer.cc_optimizer_utils as ooccoput
 import oms.order.order as oordorde
 import oms.portfolio.portfolio as oporport
+import oms.portfolio.state_log as opostlog
 
 _LOG = logging.getLogger(__name__)
 
@@ -51,6 +53,7 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         share_quantization: Optional[int],
         *,
         log_dir: Optional[str] = None,
+        log_format: str = "csv",
     ) -> None:
         """
         Build the object.
@@ -79,6 +82,10 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
                   asset_id, curr_num_shares, price, etc.
             - `portfolio`
                 - Store the output of the included `Portfolio`
+        :param log_format: format of the target positions and `Portfolio`
+            logs, i.e., "csv" for one file per bar or "parquet" for one
+            Parquet file per day, see
+            `Portfolio.log_state()`; orders are always logged as text files
         """
         self._portfolio = portfolio
         self._get_wall_clock_time = portfolio.market_data.get_wall_clock_time
@@ -100,6 +107,8 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         self._restrictions = restrictions
         self._share_quantization = share_quantization
         self._log_dir = log_dir
+        opostlog.dassert_valid_log_format(log_format)
+        self._log_format = log_format
         # Dict from timestamp to target positions.
         self._target_positions = cksoordi.KeySortedOrderedDict(pd.Timestamp)
         # Dict from timestamp to orders.
@@ -156,9 +165,17 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         *,
         tz: str = "America/New_York",
         rename_col_map: Optional[Dict[str, str]] = None,
+        start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None,
     ) -> pd.DataFrame:
         """
         Parse logged `target_position` dataframes.
+
+        The target positions can be logged both as CSV and Parquet, see
+        `log_state()`.
+
+        :param start_date, end_date: read only the target positions logged in
+            the interval of days, both included; `None` means no bound
         :return a dataframe indexed by datetimes and with two column levels. E.g.,
 
         ```
@@ -167,19 +184,28 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         ```
         """
         sub_dir = "target_positions"
-        files = TargetPositionAndOrderGenerator._get_files(log_dir, sub_dir)
+        dir_name = os.path.join(log_dir, sub_dir)
+        files = opostlog.get_log_file_names(
+            dir_name, start_date=start_date, end_date=end_date
+        )
+        if opostlog.is_daily_log(files):
+            # Read all the bars and pivot all the rows together.
+            df = opostlog.read_daily_logs(dir_name, files)
+            df = TargetPositionAndOrderGenerator._set_wall_clock_index(
+                df, rename_col_map
+            )
+            df.index = df.index.tz_convert(tz)
+            df = df.pivot(columns="asset_id")
+            return df
         dfs = []
-        for path in tqdm(files, desc=f"Loading `{sub_dir}` files..."):
+        for file_name in tqdm(files, desc=f"Loading `{sub_dir}` files..."):
+            path = os.path.join(dir_name, file_name)
             df = pd.read_csv(
                 path, index_col=0, parse_dates=["wall_clock_timestamp"]
             )
-            # Change the index from `asset_id` to the timestamp.
-            df = df.reset_index().set_index("wall_clock_timestamp")
-            # TODO(Dan): Research why column names are being incorrect sometimes
-            #  and save the data with the proper names.
-            if rename_col_map:
-                df = df.rename(columns=rename_col_map)
-            hpandas.dassert_series_type_is(df["asset_id"], np.int64)
+            df = TargetPositionAndOrderGenerator._set_wall_clock_index(
+                df, rename_col_map
+            )
             if not isinstance(df.index, pd.DatetimeIndex):
                 _LOG.info("Skipping file_name=%s", path)
                 continue
@@ -306,7 +332,10 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         # Log the state of this object and Portfolio.
         if self._log_dir:
             self._log_state()
-            self._portfolio.log_state(os.path.join(self._log_dir, "portfolio"))
+            self._portfolio.log_state(
+                os.path.join(self._log_dir, "portfolio"),
+                log_format=self._log_format,
+            )
 
     # /////////////////////////////////////////////////////////////////////////////
     # Private methods.
@@ -328,6 +357,25 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         files = [os.path.join(dir_name, file_name) for file_name in files]
         return files
 
+    @staticmethod
+    def _set_wall_clock_index(
+        df: pd.DataFrame,
+        rename_col_map: Optional[Dict[str, str]],
+    ) -> pd.DataFrame:
+        """
+        Index logged target positions by the wall clock time.
+
+        :param df: target positions indexed by asset id, as logged
+        """
+        # Change the index from `asset_id` to the timestamp.
+        df = df.reset_index().set_index("wall_clock_timestamp")
+        # TODO(Dan): Research why column names are being incorrect sometimes
+        #  and save the data with the proper names.
+        if rename_col_map:
+            df = df.rename(columns=rename_col_map)
+        hpandas.dassert_series_type_is(df["asset_id"], np.int64)
+        return df
+
     # TODO(Grisha): consider moving to a lib as a separate function.
     @staticmethod
     def _sanity_check_target_positions(target_positions: pd.DataFrame) -> None:
@@ -395,13 +443,29 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         if self._target_positions:
             _, last_target_positions = self._target_positions.peek()
             # TODO(gp): Check that last_key matches the current bar timestamp.
-            last_target_positions_filename = os.path.join(
-                self._log_dir, "target_positions", filename
-            )
-            hio.create_enclosing_dir(
-                last_target_positions_filename, incremental=True
+            if self._log_format == "csv":
+                target_positions_filename = filename
+            else:
+                target_positions_filename = opostlog.get_daily_log_file_name(
+                    bar_timestamp, wall_clock_time
+                )
+            target_positions_dir = os.path.join(
+                self._log_dir, "target_positions"
             )
-            last_target_positions.to_csv(last_target_positions_filename)
+            if self._log_format == "csv":
+                last_target_positions_filename = os.path.join(
+                    target_positions_dir, target_positions_filename
+                )
+                hio.create_enclosing_dir(
+                    last_target_positions_filename, incremental=True
+                )
+                last_target_positions.to_csv(last_target_positions_filename)
+            else:
+                opostlog.append_to_daily_log(
+                    last_target_positions,
+                    target_positions_dir,
+                    target_positions_filename,
+                )
         # Log the orders.
         if self._orders:
             _, last_orders = self._orders.peek()
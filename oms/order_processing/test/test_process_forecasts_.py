@@ -1,6 +1,7 @@
 import asyncio
 import datetime
 import logging
+import os
 from typing import Any, Dict, List, Tuple, Union
 
 import pandas as pd
@@ -16,6 +17,7 @@ import market_data as mdata
 import oms.db.oms_db as odbomdb
 import oms.order_processing.order_processor as ooprorpr
 import oms.order_processing.process_forecasts_ as oopprfo
+import oms.order_processing.target_position_and_order_generator as ooptpaog
 import oms.portfolio.database_portfolio as opdapor
 import oms.portfolio.dataframe_portfolio as opodapor
 import oms.portfolio.portfolio as oporport
@@ -340,6 +342,89 @@ class TestSimulatedProcessForecasts3(hunitest.TestCase):
         self.assert_equal(actual, expected, purify_text=True, fuzzy_match=True)
 
 
+# #############################################################################
+# TestSimulatedProcessForecasts4
+# #############################################################################
+
+
+class TestSimulatedProcessForecasts4(hunitest.TestCase):
+    """
+    Check that the state logged as CSV and Parquet is read back identically.
+    """
+
+    def test_log_format1(self) -> None:
+        csv_log_dir = os.path.join(self.get_scratch_space(), "csv")
+        self._run_simulated_system(csv_log_dir, "csv")
+        parquet_log_dir = os.path.join(self.get_scratch_space(), "parquet")
+        self._run_simulated_system(parquet_log_dir, "parquet")
+        # Check the Portfolio state.
+        portfolio_dfs = []
+        for log_dir in [csv_log_dir, parquet_log_dir]:
+            portfolio_df, stats_df = oporport.Portfolio.read_state(
+                os.path.join(log_dir, "portfolio")
+            )
+            portfolio_dfs.append((portfolio_df, stats_df))
+        self.assertEqual(len(portfolio_dfs[0][0]), 3)
+        # The CSV log rounds the floats, so the values are compared
+        # approximately.
+        for csv_df, parquet_df in zip(portfolio_dfs[0], portfolio_dfs[1]):
+            self.assertEqual(
+                csv_df.dtypes.to_dict(), parquet_df.dtypes.to_dict()
+            )
+            self.assert_dfs_close(csv_df, parquet_df, equal_nan=True)
+        # Check the target positions.
+        csv_df = ooptpaog.TargetPositionAndOrderGenerator.load_target_positions(
+            csv_log_dir
+        )
+        parquet_df = (
+            ooptpaog.TargetPositionAndOrderGenerator.load_target_positions(
+                parquet_log_dir
+            )
+        )
+        self.assertEqual(len(csv_df), 3)
+        self.assertEqual(csv_df.dtypes.to_dict(), parquet_df.dtypes.to_dict())
+        self.assert_dfs_close(csv_df, parquet_df, equal_nan=True)
+        # Check the filtering by date.
+        date = datetime.date(2000, 1, 1)
+        parquet_df = (
+            ooptpaog.TargetPositionAndOrderGenerator.load_target_positions(
+                parquet_log_dir, start_date=date, end_date=date
+            )
+        )
+        self.assertEqual(len(parquet_df), 3)
+
+    def _run_simulated_system(self, log_dir: str, log_format: str) -> None:
+        """
+        Run `process_forecasts()` logging the state in `log_dir`.
+        """
+        asset_ids = [101, 202]
+        index = [
+            pd.Timestamp("2000-01-01 09:35:00-05:00", tz="America/New_York"),
+            pd.Timestamp("2000-01-01 09:40:00-05:00", tz="America/New_York"),
+            pd.Timestamp("2000-01-01 09:45:00-05:00", tz="America/New_York"),
+        ]
+        predictions = pd.DataFrame(
+            [[0.1, 0.2], [-0.1, 0.3], [-0.3, 0.0]], index, asset_ids
+        )
+        volatility = pd.DataFrame([[1, 1], [1, 1], [1, 1]], index, asset_ids)
+        dict_ = _get_process_forecasts_dict("price@twap")
+        dict_["log_dir"] = log_dir
+        dict_["log_format"] = log_format
+        with hasynci.solipsism_context() as event_loop:
+            portfolio = TestSimulatedProcessForecasts1.get_portfolio(
+                event_loop, asset_ids
+            )
+            coroutine = oopprfo.process_forecasts(
+                predictions,
+                volatility,
+                portfolio,
+                dict_,
+                spread_df=None,
+                restrictions_df=None,
+            )
+            hasynci.run(coroutine, event_loop=event_loop)
+
+
 # #############################################################################
 # TestMockedProcessForecasts1
 # #############################################################################
@@ -82,8 +82,16 @@ class DatabasePortfolio(oporport.Portfolio):
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("After initialization:\n%s", repr(self))
 
-    def log_state(self, log_dir: str, *, num_periods: Optional[int] = 1) -> str:
-        super().log_state(log_dir, num_periods=num_periods)
+    def log_state(
+        self,
+        log_dir: str,
+        *,
+        num_periods: Optional[int] = 1,
+        log_format: str = "csv",
+    ) -> str:
+        super().log_state(
+            log_dir, num_periods=num_periods, log_format=log_format
+        )
         hdbg.dassert(log_dir, "Must specify `log_dir` to log state.")
         #
         bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
@@ -6,6 +6,7 @@ import oms.portfolio.portfolio as oporport
 
 import abc
 import collections
+import datetime
 import logging
 import os
 from typing import Any, Dict, List, Optional, Tuple
@@ -22,6 +23,7 @@ import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hwall_clock_time as hwacltim
 import oms.broker.broker as obrobrok
+import oms.portfolio.state_log as opostlog
 
 _LOG = logging.getLogger(__name__)
 
@@ -289,24 +291,31 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         *,
         tz: str = "America/New_York",
         cast_asset_ids_to_int: bool = True,
+        start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None,
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Read and process logged Portfolio state.
 
+        The state can be logged both as CSV and Parquet, see `log_state()`.
+
         :param log_dir: store the state of a Portfolio in terms of its
             components, one per dir
+        :param start_date, end_date: read only the state logged in the
+            interval of days, both included; `None` means no bound
         """
+        kwargs = {"start_date": start_date, "end_date": end_date}
         holdings_shares_df = Portfolio._load_df_from_files(
-            log_dir, "holdings_shares", tz
+            log_dir, "holdings_shares", tz, **kwargs
         )
         holdings_notional_df = Portfolio._load_df_from_files(
-            log_dir, "holdings_notional", tz
+            log_dir, "holdings_notional", tz, **kwargs
         )
         executed_trades_shares_df = Portfolio._load_df_from_files(
-            log_dir, "executed_trades_shares", tz
+            log_dir, "executed_trades_shares", tz, **kwargs
         )
         executed_trades_notional_df = Portfolio._load_df_from_files(
-            log_dir, "executed_trades_notional", tz
+            log_dir, "executed_trades_notional", tz, **kwargs
         )
         # Cast asset ids to int for all the dfs, if needed.
         if cast_asset_ids_to_int:
@@ -334,7 +343,9 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         }
         portfolio_df = pd.concat(dfs.values(), axis=1, keys=dfs.keys())
         #
-        stats_df = Portfolio._load_df_from_files(log_dir, "statistics", tz)
+        stats_df = Portfolio._load_df_from_files(
+            log_dir, "statistics", tz, **kwargs
+        )
         return portfolio_df, stats_df
 
     @classmethod
@@ -690,14 +701,39 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
 
     # /////////////////////////////////////////////////////////////////////////////
 
-    def log_state(self, log_dir: str, *, num_periods: Optional[int] = 1) -> str:
+    def log_state(
+        self,
+        log_dir: str,
+        *,
+        num_periods: Optional[int] = 1,
+        log_format: str = "csv",
+    ) -> str:
+        """
+        Log the last `num_periods` of the state of the Portfolio.
+
+        :param log_dir: dir to store the state components, one per dir
+        :param log_format: format of the log
+            - "csv": one file per call, e.g.,
+              `holdings_shares/20230101_093500.20230101_093502.csv`
+            - "parquet": one row group per call in the file of the day,
+              which is named after its first bar, e.g.,
+              `holdings_shares/20230101/20230101_093500.20230101_093502.parquet`
+        :return: name of the file written for each component, or the name of
+            the bar in the daily log for the "parquet" format
+        """
         hdbg.dassert(log_dir, "Must specify `log_dir` to log state.")
+        opostlog.dassert_valid_log_format(log_format)
         #
         bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
         #
         wall_clock_time = self._get_wall_clock_time()
-        wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
-        file_name = f"{bar_timestamp}.{wall_clock_time_str}.csv"
+        if log_format == "csv":
+            wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
+            file_name = f"{bar_timestamp}.{wall_clock_time_str}.csv"
+        else:
+            file_name = opostlog.get_daily_log_file_name(
+                bar_timestamp, wall_clock_time
+            )
         #
         holdings_shares_df = self.get_historical_holdings_shares(num_periods)
         Portfolio._write_df(
@@ -770,21 +806,31 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         log_dir: str,
         name: str,
         tz: str,
+        *,
+        start_date: Optional[datetime.date] = None,
+        end_date: Optional[datetime.date] = None,
     ) -> pd.DataFrame:
         # Find the files under `log_dir/{name}`.
         dir_name = os.path.join(log_dir, name)
-        pattern = "*"
-        only_files = True
-        use_relative_paths = True
-        files = hio.listdir(dir_name, pattern, only_files, use_relative_paths)
-        files.sort()
-        # Read each file as dataframe.
-        dfs = []
-        for file_name in tqdm(files, desc=f"Loading `{name}` files..."):
-            df = Portfolio._read_df(log_dir, name, file_name, tz)
-            dfs.append(df)
-        # Concatenate.
-        df = pd.concat(dfs)
+        files = opostlog.get_log_file_names(
+            dir_name, start_date=start_date, end_date=end_date
+        )
+        if opostlog.is_daily_log(files):
+            # Read all the bars at once.
+            df = opostlog.read_daily_logs(dir_name, files)
+            # Drop the name of the columns, e.g., `asset_id`, which is not
+            # stored in the CSV log.
+            df.columns.name = None
+            if isinstance(df.index, pd.DatetimeIndex):
+                df.index = df.index.tz_convert(tz)
+        else:
+            # Read each file as dataframe.
+            dfs = []
+            for file_name in tqdm(files, desc=f"Loading `{name}` files..."):
+                df = Portfolio._read_df(log_dir, name, file_name, tz)
+                dfs.append(df)
+            # Concatenate.
+            df = pd.concat(dfs)
         hdbg.dassert(
             not df.index.has_duplicates,
             "Duplicated indices for `%s`=\n%s",
@@ -815,9 +861,13 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         name: str,
         file_name: str,
     ) -> None:
-        path = os.path.join(log_dir, name, file_name)
-        hio.create_enclosing_dir(path, incremental=True)
-        df.to_csv(path)
+        if file_name.endswith(".parquet"):
+            dir_name = os.path.join(log_dir, name)
+            opostlog.append_to_daily_log(df, dir_name, file_name)
+        else:
+            path = os.path.join(log_dir, name, file_name)
+            hio.create_enclosing_dir(path, incremental=True)
+            df.to_csv(path)
 
     # //////////////////////////////////////////////////////////////////////////////
 
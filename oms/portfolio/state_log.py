@@ -0,0 +1,325 @@
+"""
+Log dataframes with the state of `Portfolio` and
+`TargetPositionAndOrderGenerator` in one Parquet file per day.
+
+The CSV log stores one file per bar, e.g.,
+```
+holdings_shares/
+    20230101_093500.20230101_093502.csv
+    20230101_094000.20230101_094002.csv
+    ...
+```
+while the Parquet log appends the state of each bar as a row group of the
+file of the day, which is named after the first bar it stores, e.g.,
+```
+holdings_shares/
+    20230101/
+        20230101_093500.20230101_093502.parquet
+    20230102/
+        20230102_093500.20230102_093502.parquet
+        20230102_120000.20230102_120002.parquet
+    ...
+```
+A day has more than one file when the columns of the state change, e.g.,
+when the universe changes, or when the process is restarted.
+
+Import as:
+
+import oms.portfolio.state_log as opostlog
+"""
+
+import datetime
+import logging
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+import helpers.hdbg as hdbg
+import helpers.hio as hio
+import helpers.hparquet as hparque
+
+_LOG = logging.getLogger(__name__)
+
+# Valid formats of the state logs.
+LOG_FORMATS = ["csv", "parquet"]
+
+
+def dassert_valid_log_format(log_format: str) -> None:
+    hdbg.dassert_in(log_format, LOG_FORMATS)
+
+
+def get_daily_log_file_name(
+    bar_timestamp: str, wall_clock_time: pd.Timestamp
+) -> str:
+    """
+    Return the name of the Parquet file of a daily log starting at a bar.
+
+    :param bar_timestamp: bar timestamp as string, e.g., `20230101_093500`
+    :param wall_clock_time: time when the state is logged
+    :return: file name relative to the dir of the state component, e.g.,
+        `20230101/20230101_093500.20230101_093502.parquet`
+    """
+    date_str = wall_clock_time.strftime("%Y%m%d")
+    wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
+    file_name = os.path.join(
+        date_str, f"{bar_timestamp}.{wall_clock_time_str}.parquet"
+    )
+    return file_name
+
+
+# #############################################################################
+# DailyLogWriter
+# #############################################################################
+
+
+class DailyLogWriter:
+    """
+    Append the state of a component at each bar to a daily Parquet log.
+
+    The file of the day is kept open and the state of each bar is written
+    as a row group. The file is readable once it is closed, i.e., when the
+    day or the columns change, when `close()` is called, or when the
+    writer is garbage collected or the interpreter exits.
+    """
+
+    def __init__(self, dir_name: str) -> None:
+        """
+        Constructor.
+
+        :param dir_name: dir of the state component, e.g.,
+            `.../portfolio/holdings_shares`
+        """
+        hdbg.dassert_isinstance(dir_name, str)
+        self._dir_name = dir_name
+        self._writer: Optional[hparque.ParquetRowGroupWriter] = None
+        self._date_str: Optional[str] = None
+
+    def append(self, df: pd.DataFrame, file_name: str) -> str:
+        """
+        Append the state of a bar to the log of the day.
+
+        :param df: state of the bar
+        :param file_name: name of the bar in the daily log, as returned by
+            `get_daily_log_file_name()`; it is used as name of the file
+            when a new file is started
+        :return: name of the file storing the bar, relative to the dir of
+            the state component, e.g.,
+            `20230101/20230101_093500.20230101_093502.parquet`
+        """
+        hdbg.dassert_isinstance(df, pd.DataFrame)
+        hdbg.dassert_file_extension(file_name, "parquet")
+        # Parquet supports only string column names, e.g., asset ids are
+        # saved as strings like in the CSV log.
+        df = df.copy()
+        df.columns = df.columns.astype(str)
+        # Store NumPy dtypes, since the nullable ones, e.g., `Int64`, are
+        # restored from the pandas metadata of the first file when reading
+        # and can't hold the values of the other files, e.g., floats.
+        df = _convert_to_numpy_dtypes(df)
+        date_str = os.path.dirname(file_name)
+        if self._writer is not None and (
+            date_str != self._date_str
+            or not pa.Schema.from_pandas(df).equals(
+                self._writer.schema, check_metadata=False
+            )
+        ):
+            # Start a new file when the day or the columns change.
+            self.close()
+        if self._writer is None:
+            path = os.path.join(self._dir_name, file_name)
+            self._writer = hparque.ParquetRowGroupWriter(path)
+            self._date_str = date_str
+        self._writer.append(df)
+        file_name = os.path.relpath(self._writer.file_name, self._dir_name)
+        return file_name
+
+    def close(self) -> None:
+        """
+        Close the file of the day, making it readable.
+        """
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._date_str = None
+
+
+# The logs are written by objects that can be re-created at each bar, e.g.,
+# `TargetPositionAndOrderGenerator`, so the writers are shared by the process
+# and keyed by the dir of the state component.
+_DAILY_LOG_WRITERS: Dict[str, DailyLogWriter] = {}
+
+
+def append_to_daily_log(df: pd.DataFrame, dir_name: str, file_name: str) -> str:
+    """
+    Append the state of a bar to the daily Parquet log of a component.
+
+    :param df: state of the bar
+    :param dir_name: dir of the state component, e.g.,
+        `.../portfolio/holdings_shares`
+    :param file_name: same as in `DailyLogWriter.append()`
+    :return: same as in `DailyLogWriter.append()`
+    """
+    key = os.path.abspath(dir_name)
+    if key not in _DAILY_LOG_WRITERS:
+        _DAILY_LOG_WRITERS[key] = DailyLogWriter(dir_name)
+    file_name = _DAILY_LOG_WRITERS[key].append(df, file_name)
+    return file_name
+
+
+def close_daily_log(dir_name: str) -> None:
+    """
+    Close the daily Parquet log of a component written by this process, if
+    any.
+
+    The next bars are appended to a new file.
+    """
+    writer = _DAILY_LOG_WRITERS.pop(os.path.abspath(dir_name), None)
+    if writer is not None:
+        writer.close()
+
+
+def get_log_file_names(
+    dir_name: str,
+    *,
+    start_date: Optional[datetime.date] = None,
+    end_date: Optional[datetime.date] = None,
+) -> List[str]:
+    """
+    Return the sorted names of the log files logged between two dates.
+
+    The daily log of the component written by this process, if any, is
+    closed so that its last bars are returned.
+
+    :param dir_name: dir with the log files of a state component, e.g.,
+        `.../portfolio/holdings_shares`
+    :param start_date, end_date: days of the wall clock time when the state
+        was logged, both included; `None` means no bound
+    :return: names of the CSV files, e.g.,
+        `20230101_093500.20230101_093502.csv`, or of the Parquet files, e.g.,
+        `20230101/20230101_093500.20230101_093502.parquet`
+    """
+    # Make the bars logged by this process readable.
+    close_daily_log(dir_name)
+    pattern = "*"
+    only_files = True
+    use_relative_paths = True
+    file_names = hio.listdir(dir_name, pattern, only_files, use_relative_paths)
+    # Skip the Parquet files that are still being written, see
+    # `hparque.ParquetRowGroupWriter`.
+    file_names = [
+        file_name
+        for file_name in file_names
+        if (file_name.endswith(".csv") or file_name.endswith(".parquet"))
+        and not os.path.basename(file_name).startswith("_")
+    ]
+    file_names.sort()
+    is_parquet = [file_name.endswith(".parquet") for file_name in file_names]
+    hdbg.dassert(
+        all(is_parquet) or not any(is_parquet),
+        "Both CSV and Parquet log files in dir='%s'",
+        dir_name,
+    )
+    if start_date is not None or end_date is not None:
+        file_names = [
+            file_name
+            for file_name in file_names
+            if _is_in_date_range(_get_date_str(file_name), start_date, end_date)
+        ]
+    return file_names
+
+
+def is_daily_log(file_names: List[str]) -> bool:
+    """
+    Return whether the log files returned by `get_log_file_names()` are
+    Parquet daily log files.
+    """
+    return bool(file_names) and file_names[0].endswith(".parquet")
+
+
+def read_daily_logs(dir_name: str, file_names: List[str]) -> pd.DataFrame:
+    """
+    Read the files of daily Parquet logs with a single dataset scan.
+
+    The columns can change across the files, e.g., when the universe
+    changes, so the files are read with the union of their schemas, and the
+    missing values are filled with NaNs.
+    """
+    hdbg.dassert(is_daily_log(file_names), "No daily log files to read")
+    paths = [os.path.join(dir_name, file_name) for file_name in file_names]
+    # Read only the footers to build the schema of the dataset, since a
+    # dataset infers the schema from the first file.
+    schemas = [pq.read_schema(path) for path in paths]
+    # The unified schema has the pandas metadata, e.g., the index columns, of
+    # the first schema. An empty dataframe, e.g., the trades of the first bar,
+    # stores its `RangeIndex` only in the metadata, so the schemas storing the
+    # index as a column go first.
+    schemas.sort(key=lambda schema: not _stores_index_as_column(schema))
+    schema = pa.unify_schemas(schemas, promote_options="permissive")
+    dataset = ds.dataset(paths, schema=schema, format="parquet")
+    table = dataset.to_table()
+    df = table.to_pandas(coerce_temporal_nanoseconds=True)
+    df = _convert_to_numpy_dtypes(df)
+    return df
+
+
+def _stores_index_as_column(schema: pa.Schema) -> bool:
+    """
+    Return whether a schema written by Pandas stores the index as a column.
+    """
+    pandas_metadata = schema.pandas_metadata or {}
+    index_columns = pandas_metadata.get("index_columns", [])
+    return any(isinstance(index_column, str) for index_column in index_columns)
+
+
+def _convert_to_numpy_dtypes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert the nullable numeric columns, e.g., `Float64`, to NumPy dtypes.
+
+    Parquet preserves the nullable dtypes while the CSV log is read back with
+    NumPy dtypes, so the conversion makes the two logs return the same
+    dataframes.
+    """
+    for col in df.columns:
+        dtype = df[col].dtype
+        if not isinstance(dtype, pd.api.extensions.ExtensionDtype):
+            continue
+        if pd.api.types.is_integer_dtype(dtype) and not df[col].hasnans:
+            df[col] = df[col].astype(dtype.numpy_dtype)
+        elif pd.api.types.is_numeric_dtype(dtype) and not (
+            pd.api.types.is_bool_dtype(dtype)
+        ):
+            df[col] = df[col].astype("float64")
+    return df
+
+
+def _get_date_str(file_name: str) -> str:
+    """
+    Return the logging day of a log file as `%Y%m%d`.
+    """
+    dir_name = os.path.dirname(file_name)
+    if dir_name:
+        # A Parquet file like
+        # `{date}/{bar_timestamp}.{wall_clock_time}.parquet`.
+        date_str = dir_name
+    else:
+        # A CSV file like `{bar_timestamp}.{wall_clock_time}.csv`.
+        tokens = file_name.split(".")
+        hdbg.dassert_eq(len(tokens), 3, "Invalid file_name='%s'", file_name)
+        date_str = tokens[1][:8]
+    return date_str
+
+
+def _is_in_date_range(
+    date_str: str,
+    start_date: Optional[datetime.date],
+    end_date: Optional[datetime.date],
+) -> bool:
+    if start_date is not None and date_str < start_date.strftime("%Y%m%d"):
+        return False
+    if end_date is not None and date_str > end_date.strftime("%Y%m%d"):
+        return False
+    return True
@@ -0,0 +1,133 @@
+import datetime
+import os
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+import helpers.hio as hio
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
+import oms.portfolio.state_log as opostlog
+
+
+def _get_state_df(timestamp: str) -> pd.DataFrame:
+    index = pd.DatetimeIndex(
+        [pd.Timestamp(timestamp, tz="America/New_York")],
+        name="wall_clock_timestamp",
+    )
+    df = pd.DataFrame({101: [1.5], 202: [-2.0]}, index=index)
+    return df
+
+
+def _log_state_df(df: pd.DataFrame, dir_name: str) -> None:
+    wall_clock_time = df.index[0]
+    bar_timestamp = wall_clock_time.floor("5T").strftime("%Y%m%d_%H%M%S")
+    file_name = opostlog.get_daily_log_file_name(bar_timestamp, wall_clock_time)
+    opostlog.append_to_daily_log(df, dir_name, file_name)
+
+
+# #############################################################################
+# TestDailyLog1
+# #############################################################################
+
+
+class TestDailyLog1(hunitest.TestCase):
+    def test_append1(self) -> None:
+        """
+        Check that the rows appended to a daily log are read back.
+        """
+        dir_name = self.get_scratch_space()
+        timestamps = ["2023-01-02 09:35:02", "2023-01-02 09:40:02"]
+        for timestamp in timestamps:
+            df = _get_state_df(timestamp)
+            _log_state_df(df, dir_name)
+        # Add a column, as when the universe changes.
+        df = _get_state_df("2023-01-02 09:45:02")
+        df[303] = 0.5
+        _log_state_df(df, dir_name)
+        # The bars with the same columns are appended to the same file.
+        file_names = opostlog.get_log_file_names(dir_name)
+        expected = [
+            "20230102/20230102_093500.20230102_093502.parquet",
+            "20230102/20230102_094500.20230102_094502.parquet",
+        ]
+        self.assertEqual(file_names, expected)
+        file_name = os.path.join(dir_name, file_names[0])
+        self.assertEqual(pq.ParquetFile(file_name).num_row_groups, 2)
+        self.assertTrue(opostlog.is_daily_log(file_names))
+        df = opostlog.read_daily_logs(dir_name, file_names)
+        actual = hpandas.df_to_str(df)
+        expected = r"""
+                                   101  202  303
+        wall_clock_timestamp
+        2023-01-02 09:35:02-05:00  1.5 -2.0  NaN
+        2023-01-02 09:40:02-05:00  1.5 -2.0  NaN
+        2023-01-02 09:45:02-05:00  1.5 -2.0  0.5
+        """
+        self.assert_equal(actual, expected, dedent=True, fuzzy_match=True)
+
+    def test_append2(self) -> None:
+        """
+        Check that the bars logged after the log is read are appended to a new
+        file and that a file left by an interrupted writer is skipped.
+        """
+        dir_name = self.get_scratch_space()
+        _log_state_df(_get_state_df("2023-01-02 09:35:02"), dir_name)
+        file_names = opostlog.get_log_file_names(dir_name)
+        self.assertEqual(
+            file_names, ["20230102/20230102_093500.20230102_093502.parquet"]
+        )
+        _log_state_df(_get_state_df("2023-01-02 09:40:02"), dir_name)
+        hio.to_file(
+            os.path.join(
+                dir_name, "20230102", "_20230102_094500.20230102_094502.parquet"
+            ),
+            "",
+        )
+        file_names = opostlog.get_log_file_names(dir_name)
+        expected = [
+            "20230102/20230102_093500.20230102_093502.parquet",
+            "20230102/20230102_094000.20230102_094002.parquet",
+        ]
+        self.assertEqual(file_names, expected)
+        df = opostlog.read_daily_logs(dir_name, file_names)
+        self.assertEqual(df.shape, (2, 2))
+
+    def test_get_log_file_names1(self) -> None:
+        """
+        Check filtering the log files by the day they were logged.
+        """
+        dir_name = self.get_scratch_space()
+        for timestamp in [
+            "2023-01-02 09:35:02",
+            "2023-01-03 09:35:02",
+            "2023-01-04 09:35:02",
+        ]:
+            df = _get_state_df(timestamp)
+            _log_state_df(df, dir_name)
+        file_names = opostlog.get_log_file_names(
+            dir_name,
+            start_date=datetime.date(2023, 1, 3),
+            end_date=datetime.date(2023, 1, 4),
+        )
+        expected = [
+            "20230103/20230103_093500.20230103_093502.parquet",
+            "20230104/20230104_093500.20230104_093502.parquet",
+        ]
+        self.assertEqual(file_names, expected)
+
+    def test_get_log_file_names2(self) -> None:
+        """
+        Check filtering the CSV log files by the day they were logged.
+        """
+        dir_name = self.get_scratch_space()
+        for file_name in [
+            "20230102_160000.20230102_160002.csv",
+            "20230103_093500.20230103_093502.csv",
+        ]:
+            hio.to_file(os.path.join(dir_name, file_name), "")
+        file_names = opostlog.get_log_file_names(
+            dir_name, start_date=datetime.date(2023, 1, 3)
+        )
+        self.assertEqual(file_names, ["20230103_093500.20230103_093502.csv"])
+        self.assertFalse(opostlog.is_daily_log(file_names))
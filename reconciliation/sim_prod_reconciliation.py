@@ -1191,7 +1191,7 @@ def get_data_type_system_log_path(system_log_path: str, data_type: str) -> str:
     if data_type == "dag_data":
         dir_name = os.path.join(system_log_path, "dag/node_io/node_io.data")
     elif data_type == "dag_stats":
-        dir_name = os.path.join(system_log_path, "dag/node_io/node_io.prof")
+        dir_name = os.path.join(system_log_path, "dag/node_io/node_io.metrics")
     elif data_type == "portfolio":
         dir_name = os.path.join(system_log_path, "process_forecasts/portfolio")
     elif data_type == "orders":